@@ -627,10 +627,16 @@ def calculate_metrics(properties):
 # MAIN ANALYSIS ORCHESTRATOR (UPDATED FOR MULTI-REGION)
 # ============================================================================
 
-def analyze_market_data():
+def analyze_dataset(data):
     """
-    Main analysis orchestrator
+    Analyze an in-memory raw dataset (library mode - no file I/O)
     ✅ AUTOMATICALLY DETECTS: Single vs Multi-region datasets
+    
+    Args:
+        data: Raw data dict ({'metadata': ..., 'raw_data': {'properties': [...]}})
+    
+    Returns:
+        Analysis dict (same shape as voxmill_analysis.json)
     """
     
     print("\n" + "="*70)
@@ -638,10 +644,6 @@ def analyze_market_data():
     print("="*70)
     
     try:
-        # Load data
-        with open(INPUT_FILE, 'r') as f:
-            data = json.load(f)
-        
         metadata = data['metadata']
         properties = data['raw_data'].get('properties', [])
         
@@ -699,14 +701,9 @@ def analyze_market_data():
             'top_opportunities': scored_properties[:8]
         }
         
-        # Save analysis
-        with open(OUTPUT_FILE, 'w') as f:
-            json.dump(analysis, f, indent=2)
-        
         print(f"\n" + "="*70)
         print("✅ AI ANALYSIS COMPLETE")
         print("="*70)
-        print(f"Output: {OUTPUT_FILE}")
         print(f"Mode: {'Multi-Region' if is_multi_region else 'Single Region'}")
         print(f"Properties Analyzed: {len(properties)}")
         if is_multi_region:
@@ -715,7 +712,7 @@ def analyze_market_data():
         print(f"Sentiment: {intelligence.get('market_sentiment', 'N/A')}")
         print("="*70)
         
-        return OUTPUT_FILE
+        return analysis
         
     except Exception as e:
         print(f"\n❌ ANALYSIS FAILED")
@@ -723,6 +720,23 @@ def analyze_market_data():
         raise
 
 
+def analyze_market_data():
+    """
+    File-based entry point (CLI / subprocess mode)
+    Reads INPUT_FILE, writes OUTPUT_FILE
+    """
+    with open(INPUT_FILE, 'r') as f:
+        data = json.load(f)
+    
+    analysis = analyze_dataset(data)
+    
+    with open(OUTPUT_FILE, 'w') as f:
+        json.dump(analysis, f, indent=2)
+    
+    print(f"Output: {OUTPUT_FILE}")
+    return OUTPUT_FILE
+
+
 if __name__ == "__main__":
     try:
         analyze_market_data()
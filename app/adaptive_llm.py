@@ -121,6 +121,19 @@ class AdaptiveLLMController:
         else:
             return 'very_complex'
     
+    @classmethod
+    def confidence_tier(cls, confidence_level: str, data_quality: float) -> str:
+        """
+        Collapse confidence level + data quality into the tone tier ('low', 'medium', 'high')
+        
+        The tier alone determines the tone block, so prompts can be cached per tier.
+        """
+        if confidence_level == 'low' or data_quality < 0.5:
+            return 'low'
+        elif confidence_level == 'medium' or 0.5 <= data_quality < 0.8:
+            return 'medium'
+        return 'high'
+    
     @classmethod
     def modulate_tone_for_confidence(cls, system_prompt: str, confidence_level: str, 
                                      data_quality: float) -> str:
@@ -137,9 +150,13 @@ class AdaptiveLLMController:
         Returns: Enhanced system prompt with tone instructions
         """
         
-        tone_modulation = ""
+        return system_prompt + "\n" + cls.tone_modulation_for_tier(cls.confidence_tier(confidence_level, data_quality))
+    
+    @classmethod
+    def tone_modulation_for_tier(cls, tier: str) -> str:
+        """Tone instruction block for a confidence tier (see confidence_tier)"""
         
-        if confidence_level == 'low' or data_quality < 0.5:
+        if tier == 'low':
             tone_modulation = """
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 CONFIDENCE MODULATION: LOW DATA QUALITY
@@ -156,7 +173,7 @@ Example phrasing:
 "Market shows downward pressure. Inventory +15%. Monitor."
 """
         
-        elif confidence_level == 'medium' or 0.5 <= data_quality < 0.8:
+        elif tier == 'medium':
             tone_modulation = """
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 CONFIDENCE MODULATION: MODERATE DATA QUALITY
@@ -188,10 +205,7 @@ Example phrasing:
 "Knight Frank capitulation confirmed. Inventory +22%, pricing -8.5%. Cascade probability: 82%. Position aggressively £3-5M corridor. 14-21 day window."
 """
         
-        # Insert tone modulation before the query context
-        enhanced_prompt = system_prompt + "\n" + tone_modulation
-        
-        return enhanced_prompt
+        return tone_modulation
     
     @classmethod
     def calculate_data_quality_score(cls, dataset: Dict) -> float:
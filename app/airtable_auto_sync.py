@@ -38,10 +38,11 @@ async def sync_usage_metrics(
     - preference_changed: Settings updated
     """
     
+    from app.async_executor import run_blocking
     from app.client_manager import get_client_profile
     
-    # Get current profile from MongoDB (has latest counts)
-    client = get_client_profile(whatsapp_number)
+    # Get current profile from MongoDB (has latest counts) - off the event loop
+    client = await run_blocking(get_client_profile, whatsapp_number)
     
     if not client:
         logger.warning(f"Client not found for auto-sync: {whatsapp_number}")
@@ -0,0 +1,512 @@
+"""
+VOXMILL AIRTABLE PROFILE RESOLVER
+=================================
+Client profiles from a local, indexed copy of the Airtable Control Plane
+
+FEATURES:
+- Bulk load of Accounts + Permissions + Preferences + Markets (paged list calls, in parallel)
+- Index keyed by normalised WhatsApp number - no Airtable round trip on the message path
+- Incremental background refresh by LAST_MODIFIED_TIME(), periodic full reload
+- Push invalidation from /sync-client + preference sync (fanned out to workers via Redis)
+- Targeted fetch for numbers not in the index yet (new accounts between refreshes)
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from app.upstash_client import redis_client, redis_available
+
+logger = logging.getLogger(__name__)
+
+AIRTABLE_API_URL = "https://api.airtable.com/v0"
+
+REFRESH_INTERVAL = int(os.getenv('AIRTABLE_REFRESH_INTERVAL', '60'))          # Incremental sync
+FULL_RELOAD_INTERVAL = int(os.getenv('AIRTABLE_FULL_RELOAD_INTERVAL', '1800'))  # Catches deletions
+INVALIDATION_POLL_INTERVAL = 5
+MODIFIED_SKEW = timedelta(seconds=10)   # Overlap incremental windows (clock skew)
+
+INVALIDATION_KEY = "voxmill:airtable:invalidated"  # ZSET phone → invalidated_at
+INVALIDATION_TTL = 3600
+
+TIER_MAP = {
+    'core': 'tier_1',
+    'premium': 'tier_2',
+    'sigma': 'tier_3'
+}
+
+
+def normalize_phone(raw: str) -> str:
+    """'whatsapp:+44 7700-900123' → '+447700900123'"""
+    phone = str(raw or '').replace('whatsapp:', '').replace('whatsapp%3A', '')
+    phone = ''.join(ch for ch in phone if ch.isdigit() or ch == '+')
+    if phone and not phone.startswith('+'):
+        phone = '+' + phone
+    return phone
+
+
+def _parse_execution_allowed(raw) -> bool:
+    # ✅ Defensive type normalization (formula field)
+    if isinstance(raw, bool):
+        return raw
+    if isinstance(raw, str):
+        return raw.lower() in ['1', 'true', 'yes']
+    if isinstance(raw, (int, float)):
+        return bool(raw)
+    logger.warning(f"Unexpected execution_allowed type: {type(raw)} = {raw}")
+    return False
+
+
+class AirtableProfileResolver:
+    """
+    Local copy of the Control Plane tables, indexed for profile resolution
+
+    Usage:
+        profile = airtable_profiles.get_profile('whatsapp:+447700900123')
+        airtable_profiles.invalidate('+447700900123')   # after an Airtable edit
+    """
+
+    def __init__(self):
+        self.api_key = os.getenv('AIRTABLE_API_KEY')
+        self.base_id = os.getenv('AIRTABLE_BASE_ID')
+
+        self._session = requests.Session()
+        self._session.headers['Authorization'] = f"Bearer {self.api_key}"
+        self._fetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='airtable-sync')
+
+        self._lock = threading.RLock()
+        self._accounts: Dict[str, dict] = {}             # account_id → fields
+        self._phone_index: Dict[str, str] = {}           # phone → account_id
+        self._account_phone: Dict[str, str] = {}         # account_id → phone (re-key on number change)
+        self._permissions: Dict[str, dict] = {}          # account_id → fields
+        self._preferences: Dict[str, dict] = {}          # account_id → fields
+        self._markets: Dict[str, dict] = {}              # market_id → fields (Airtable order)
+
+        self._loaded = False
+        self._last_sync: Optional[datetime] = None
+        self._last_full_reload = 0.0
+        self._last_invalidation_check = time.time()
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.stats = {
+            'index_hits': 0,
+            'targeted_fetches': 0,
+            'not_found': 0,
+            'incremental_refreshes': 0,
+            'full_reloads': 0,
+            'invalidations': 0
+        }
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key and self.base_id)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    # ============================================================
+    # AIRTABLE I/O
+    # ============================================================
+
+    def _list(self, table: str, formula: Optional[str] = None) -> List[dict]:
+        """All records of a table (follows pagination)"""
+        url = f"{AIRTABLE_API_URL}/{self.base_id}/{table}"
+        params = {'pageSize': 100}
+        if formula:
+            params['filterByFormula'] = formula
+
+        records = []
+        while True:
+            response = self._session.get(url, params=params, timeout=10)
+            if response.status_code != 200:
+                raise RuntimeError(f"Airtable {table} list failed: {response.status_code} {response.text[:200]}")
+
+            payload = response.json()
+            records.extend(payload.get('records', []))
+
+            offset = payload.get('offset')
+            if not offset:
+                return records
+            params['offset'] = offset
+
+    def _list_tables(self, formulas: Dict[str, Optional[str]]) -> Dict[str, List[dict]]:
+        """List several tables concurrently"""
+        futures = {table: self._fetch_pool.submit(self._list, table, formula) for table, formula in formulas.items()}
+        return {table: future.result() for table, future in futures.items()}
+
+    # ============================================================
+    # INDEX MAINTENANCE
+    # ============================================================
+
+    def _apply_account(self, record: dict):
+        account_id = record['id']
+        fields = record.get('fields', {})
+        phone = normalize_phone(fields.get('WhatsApp Number'))
+
+        old_phone = self._account_phone.get(account_id)
+        if old_phone and old_phone != phone:
+            self._phone_index.pop(old_phone, None)
+
+        self._accounts[account_id] = fields
+        if phone:
+            self._phone_index[phone] = account_id
+            self._account_phone[account_id] = phone
+
+    @staticmethod
+    def _apply_linked(target: Dict[str, dict], record: dict):
+        fields = record.get('fields', {})
+        for account_id in fields.get('account_id', []) or []:
+            target[account_id] = fields
+
+    def _apply(self, tables: Dict[str, List[dict]]):
+        for record in tables.get('Accounts', []):
+            self._apply_account(record)
+        for record in tables.get('Permissions', []):
+            self._apply_linked(self._permissions, record)
+        for record in tables.get('Preferences', []):
+            self._apply_linked(self._preferences, record)
+        for record in tables.get('Markets', []):
+            self._markets[record['id']] = record.get('fields', {})
+
+    def full_reload(self):
+        """Replace the index with a fresh copy of all four tables"""
+        started = time.time()
+        sync_started = datetime.now(timezone.utc)
+
+        tables = self._list_tables({'Accounts': None, 'Permissions': None, 'Preferences': None, 'Markets': None})
+
+        with self._lock:
+            self._accounts, self._phone_index, self._account_phone = {}, {}, {}
+            self._permissions, self._preferences, self._markets = {}, {}, {}
+            self._apply(tables)
+            self._loaded = True
+            self._last_sync = sync_started
+            self._last_full_reload = time.time()
+
+        self.stats['full_reloads'] += 1
+        logger.info(
+            f"✅ Airtable index loaded: {len(self._accounts)} accounts, {len(self._markets)} markets "
+            f"({time.time() - started:.1f}s)"
+        )
+
+    def incremental_refresh(self):
+        """Pull only records modified since the last sync"""
+        if not self._loaded:
+            return self.full_reload()
+
+        sync_started = datetime.now(timezone.utc)
+        since = (self._last_sync - MODIFIED_SKEW).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        formula = f"IS_AFTER(LAST_MODIFIED_TIME(), '{since}')"
+
+        tables = self._list_tables({t: formula for t in ('Accounts', 'Permissions', 'Preferences', 'Markets')})
+        changed = sum(len(records) for records in tables.values())
+
+        with self._lock:
+            self._apply(tables)
+            self._last_sync = sync_started
+
+        self.stats['incremental_refreshes'] += 1
+        if changed:
+            logger.info(f"🔄 Airtable index: {changed} record(s) changed since {since}")
+
+    def _fetch_account(self, phone: str) -> Optional[str]:
+        """Targeted load of one account + its linked rows (index miss)"""
+        self.stats['targeted_fetches'] += 1
+
+        accounts = self._list('Accounts', f"{{WhatsApp Number}}='{phone}'")
+        if not accounts:
+            return None
+
+        account = accounts[0]
+        account_id = account['id']
+        linked = f"SEARCH('{account_id}', ARRAYJOIN({{account_id}}))"
+
+        formulas = {'Permissions': linked, 'Preferences': linked}
+        if not self._markets:
+            formulas['Markets'] = None
+        tables = self._list_tables(formulas)
+        tables['Accounts'] = [account]
+
+        with self._lock:
+            # Linked rows may have been deleted - don't keep stale ones
+            self._permissions.pop(account_id, None)
+            self._preferences.pop(account_id, None)
+            self._apply(tables)
+            # Targeted result is authoritative for this number even if the
+            # Accounts field is formatted differently
+            self._phone_index[phone] = account_id
+
+        return account_id
+
+    def invalidate(self, phone: str, broadcast: bool = True):
+        """
+        Drop one number from the index (next lookup re-fetches it)
+
+        broadcast=True also tells the other workers via Redis.
+        """
+        phone = normalize_phone(phone)
+        if not phone:
+            return
+
+        with self._lock:
+            self._phone_index.pop(phone, None)
+
+        self.stats['invalidations'] += 1
+        logger.info(f"🗑️ Airtable profile invalidated: {phone}")
+
+        if broadcast and redis_available and redis_client:
+            try:
+                pipe = redis_client.pipeline()
+                pipe.command("ZADD", INVALIDATION_KEY, time.time(), phone)
+                pipe.command("ZREMRANGEBYSCORE", INVALIDATION_KEY, "-inf", time.time() - INVALIDATION_TTL)
+                pipe.expire(INVALIDATION_KEY, INVALIDATION_TTL)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"Airtable invalidation broadcast failed: {e}")
+
+    def _poll_invalidations(self):
+        if not (redis_available and redis_client):
+            return
+
+        since = self._last_invalidation_check
+        self._last_invalidation_check = time.time()
+
+        try:
+            phones = redis_client.execute("ZRANGEBYSCORE", INVALIDATION_KEY, since, "+inf") or []
+        except Exception as e:
+            logger.debug(f"Airtable invalidation poll failed: {e}")
+            return
+
+        for phone in phones:
+            self.invalidate(phone, broadcast=False)
+
+    # ============================================================
+    # BACKGROUND SYNC
+    # ============================================================
+
+    def _run(self):
+        try:
+            self.full_reload()
+        except Exception as e:
+            logger.error(f"❌ Airtable index initial load failed: {e} (falling back to targeted fetches)")
+
+        last_refresh = time.time()
+
+        while not self._stop.wait(INVALIDATION_POLL_INTERVAL):
+            self._poll_invalidations()
+
+            try:
+                if time.time() - self._last_full_reload >= FULL_RELOAD_INTERVAL:
+                    self.full_reload()
+                    last_refresh = time.time()
+                elif time.time() - last_refresh >= REFRESH_INTERVAL:
+                    self.incremental_refresh()
+                    last_refresh = time.time()
+            except Exception as e:
+                logger.warning(f"Airtable index refresh failed: {e}")
+                last_refresh = time.time()
+
+    def start(self):
+        """Start background sync (initial load runs off the startup path)"""
+        if not self.configured:
+            logger.warning("⚠️ Airtable not configured - profile index disabled")
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='airtable-profile-sync', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ============================================================
+    # LOOKUPS
+    # ============================================================
+
+    def available_markets(self, industry_code: str) -> Optional[List[str]]:
+        """Active + selectable market names for an industry (None if index not loaded)"""
+        if not self._markets:
+            return None
+        with self._lock:
+            return [
+                fields['market_name'] for fields in self._markets.values()
+                if fields.get('industry') == industry_code and fields.get('is_active')
+                and fields.get('Selectable') and fields.get('market_name')
+            ]
+
+    def find_market(self, industry_code: str, market_name: str) -> Tuple[bool, Optional[dict]]:
+        """(index_loaded, market fields or None)"""
+        if not self._markets:
+            return False, None
+        with self._lock:
+            for fields in self._markets.values():
+                if fields.get('industry') == industry_code and fields.get('market_name') == market_name:
+                    return True, fields
+        return True, None
+
+    def market_name(self, market_id: str) -> Optional[str]:
+        fields = self._markets.get(market_id)
+        return fields.get('market_name') if fields else None
+
+    def get_profile(self, sender: str) -> Optional[dict]:
+        """
+        Resolve a WhatsApp sender to the Control Plane profile dict
+
+        Index hit: no network. Miss: one targeted fetch (Accounts, then
+        Permissions + Preferences in parallel), merged into the index.
+        """
+        if not self.configured:
+            logger.error("Airtable credentials missing")
+            return None
+
+        phone = normalize_phone(sender)
+
+        try:
+            with self._lock:
+                account_id = self._phone_index.get(phone)
+
+            if account_id:
+                self.stats['index_hits'] += 1
+            else:
+                account_id = self._fetch_account(phone)
+
+            if not account_id:
+                self.stats['not_found'] += 1
+                logger.warning(f"No account found for {sender}")
+                return None
+
+            with self._lock:
+                fields = dict(self._accounts.get(account_id, {}))
+                permissions = dict(self._permissions.get(account_id, {}))
+                preferences = dict(self._preferences.get(account_id, {}))
+
+            return self._build_profile(phone, account_id, fields, permissions, preferences)
+
+        except Exception as e:
+            logger.error(f"Error resolving Airtable profile: {e}", exc_info=True)
+            return None
+
+    def _default_market(self, industry_code: str) -> Optional[str]:
+        markets = self.available_markets(industry_code) or []
+        return markets[0] if markets else None
+
+    def _build_profile(self, phone: str, account_id: str, fields: dict,
+                       permissions: dict, preferences: dict) -> dict:
+        """Map Control Plane rows to the legacy client profile schema"""
+
+        industry_code = fields.get('Industry', 'real_estate')
+
+        agency_context = {
+            'agency_name': fields.get('agency_name'),
+            'agency_type': fields.get('agency_type'),
+            'role': fields.get('role'),
+            'typical_price_band': fields.get('typical_price_band'),
+            'objectives': fields.get('objectives', []),
+        }
+
+        # ========================================
+        # BLOCKED: trust execution_allowed formula
+        # ========================================
+
+        execution_allowed_raw = fields.get('execution_allowed')
+        if not _parse_execution_allowed(execution_allowed_raw):
+            status = fields.get('Account Status (Execution Safe)', 'blocked')
+            trial_expired = fields.get('Is Trial Expired') == 1
+            logger.warning(f"Execution blocked for {phone}: status={status}, trial_expired={trial_expired}, execution_allowed={execution_allowed_raw}")
+
+            default_region = self._default_market(industry_code)
+
+            return {
+                'subscription_status': status.capitalize() if status != 'blocked' else 'Blocked',
+                'access_enabled': False,
+                'trial_expired': trial_expired,
+                'name': fields.get('name', 'there'),
+                'email': '',
+                'airtable_record_id': account_id,
+                'table': 'Accounts',
+                'tier': 'tier_1',
+                'industry': industry_code,
+                **agency_context,
+                'preferences': {'preferred_regions': [default_region] if default_region else []},
+                'usage_metrics': {'messages_used_this_month': 0, 'monthly_message_limit': 0},
+                'execution_allowed': False,
+                'active_market': default_region
+            }
+
+        # ========================================
+        # ACTIVE MARKET (Preferences → Markets, else first in industry)
+        # ========================================
+
+        active_market_name = None
+        active_market_ids = preferences.get('active_market_id', [])
+        if active_market_ids:
+            active_market_name = self.market_name(active_market_ids[0])
+
+        if not active_market_name:
+            active_market_name = self._default_market(industry_code)
+            if not active_market_name:
+                logger.error(f"❌ NO MARKETS CONFIGURED for industry: {industry_code}")
+
+        tier = TIER_MAP.get(fields.get('Service Tier', 'core'), 'tier_1')
+        status = fields.get('Account Status', 'trial')
+
+        profile = {
+            'name': fields.get('name', 'there' if not active_market_name else phone),
+            'email': '',
+            'subscription_status': status.capitalize(),
+            'tier': tier,
+            'trial_expired': fields.get('Is Trial Expired') == 1,
+            'airtable_record_id': account_id,
+            'airtable_table': 'Accounts',
+            **agency_context,
+            'preferences': {
+                'preferred_regions': [active_market_name] if active_market_name else [],
+                'competitor_focus': 'medium',
+                'report_depth': 'detailed'
+            },
+            'usage_metrics': {
+                'messages_used_this_month': 0,
+                'monthly_message_limit': permissions.get('monthly_message_limit', 100),
+                'total_messages_sent': 0
+            },
+            'airtable_is_source_of_truth': True,
+            'access_enabled': True,
+            'subscription_gate_enforced': True,
+            'industry': industry_code,
+            'allowed_intelligence_modules': permissions.get('allowed_modules', []),
+            'pin_enforcement_mode': fields.get('PIN Mode', 'strict').capitalize(),
+            'execution_allowed': True,
+            'active_market': active_market_name
+        }
+
+        if not active_market_name:
+            profile['no_markets_configured'] = True
+        else:
+            logger.info(f"✅ Client found: {phone} (industry={industry_code}, status={status}, tier={tier}, market={active_market_name})")
+
+        return profile
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'loaded': self._loaded,
+            'accounts': len(self._accounts),
+            'markets': len(self._markets),
+            'last_sync': self._last_sync.isoformat() if self._last_sync else None
+        }
+
+
+# ============================================================
+# GLOBAL INSTANCE
+# ============================================================
+
+airtable_profiles = AirtableProfileResolver()
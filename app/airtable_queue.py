@@ -2,24 +2,608 @@
 AIRTABLE WRITE QUEUE
 ====================
 Batches Airtable writes to avoid rate limits
+
+FEATURES:
+- Pending updates merged per (table, record_id): later fields win, one write per record
+- PATCH / POST in batches of up to 10 records per table (Airtable's per-request max)
+- Token bucket at 5 req/s shared by all tables (Airtable's per-base limit); 429 pauses it 30s
+- Async httpx session (no blocking requests calls on the event loop)
+- Pending writes persisted to MongoDB under a per-worker lease; live workers renew,
+  orphaned writes (crashed / stopped workers) are claimed atomically by one survivor
+- Writes dropped after AIRTABLE_MAX_REQUEUES move to a dead-letter collection
+- Thread-safe enqueue: sync callers (executor threads, log writers) can queue directly
 """
 
+import os
+import time
+import uuid
+import random
+import socket
 import asyncio
 import logging
-from datetime import datetime, timezone
-from typing import Dict, Optional
-import os
-import requests
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Tuple
 
-logger = logging.getLogger(__name__)
+import httpx
+from pymongo import DeleteOne, ReplaceOne, ReturnDocument
 
-# Global queue
-_write_queue = asyncio.Queue()
-_queue_processor = None
+logger = logging.getLogger(__name__)
 
 AIRTABLE_API_KEY = os.getenv('AIRTABLE_API_KEY')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
 
+AIRTABLE_API_BASE = "https://api.airtable.com/v0"
+AIRTABLE_BATCH_SIZE = 10                    # Airtable max records per request
+AIRTABLE_RATE_LIMIT = float(os.getenv('AIRTABLE_RATE_LIMIT', '5'))   # requests/second per base
+AIRTABLE_RATE_LIMIT_PENALTY = 30            # seconds Airtable blocks a base after a 429
+AIRTABLE_MAX_ATTEMPTS = 3                   # per request
+AIRTABLE_MAX_REQUEUES = 5                   # failed batches re-enter the queue this many times
+AIRTABLE_COALESCE_WINDOW = 0.05             # seconds to let bursts merge before a flush
+AIRTABLE_MAX_BATCHES_PER_CYCLE = 10         # keeps new high-priority writes from waiting behind a backlog
+QUEUE_COLLECTION = 'airtable_write_queue'
+DEAD_LETTER_COLLECTION = 'airtable_write_dead_letter'
+AIRTABLE_QUEUE_LEASE_SECONDS = int(os.getenv('AIRTABLE_QUEUE_LEASE_SECONDS', '120'))
+AIRTABLE_QUEUE_LEASE_RENEW = AIRTABLE_QUEUE_LEASE_SECONDS / 3   # renew + claim orphans this often
+
+
+# ============================================================
+# RATE LIMITING
+# ============================================================
+
+class TokenBucket:
+    """Async token bucket (single event loop, no locking needed)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Stop issuing tokens (Airtable 429 = base blocked for 30s)"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+# ============================================================
+# WRITE QUEUE
+# ============================================================
+
+class AirtableWriteQueue:
+    """
+    Coalescing, persisted Airtable write queue
+
+    Usage:
+        airtable_queue.enqueue_update('Accounts', 'recXXX', {'PIN State': 'locked'})
+        airtable_queue.enqueue_create('Usage Logs', {...})
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # table -> record_id -> {'fields', 'version', 'priority', 'requeues'}
+        self._updates: Dict[str, Dict[str, Dict]] = {}
+        # table -> [{'key', 'fields', 'requeues'}]
+        self._creates: Dict[str, List[Dict]] = {}
+        # (table, record_id) -> fields currently being sent
+        self._inflight: Dict[Tuple[str, str], Dict] = {}
+        # persistence keys changed since the last persist
+        self._dirty = set()
+        self._version = 0
+        # Persisted docs are leased to this instance; other workers leave them alone until it expires
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Capacity 1: evenly spaced requests, never a burst above the per-second limit
+        self._bucket = TokenBucket(AIRTABLE_RATE_LIMIT, 1)
+
+        self.stats = {'enqueued': 0, 'merged': 0, 'requests': 0, 'records_written': 0,
+                      'failed': 0, 'rate_limited': 0, 'restored': 0, 'dead_lettered': 0}
+
+    # ============================================================
+    # ENQUEUE (thread-safe)
+    # ============================================================
+
+    def enqueue_update(self, table: str, record_id: str, fields: Dict, priority: str = 'normal'):
+        """Merge fields into the pending update for this record"""
+        with self._lock:
+            self._version += 1
+            table_updates = self._updates.setdefault(table, {})
+            entry = table_updates.get(record_id)
+
+            if entry is None:
+                table_updates[record_id] = {'fields': dict(fields), 'version': self._version,
+                                            'priority': priority, 'requeues': 0}
+            else:
+                entry['fields'].update(fields)
+                entry['version'] = self._version
+                if priority == 'high':
+                    entry['priority'] = 'high'
+                self.stats['merged'] += 1
+
+            self._dirty.add(('update', table, record_id))
+            self.stats['enqueued'] += 1
+
+        self._wake()
+
+    def enqueue_create(self, table: str, fields: Dict):
+        """Queue a new record (creates are batched, never merged)"""
+        key = uuid.uuid4().hex
+        with self._lock:
+            self._creates.setdefault(table, []).append({'key': key, 'fields': dict(fields), 'requeues': 0})
+            self._dirty.add(('create', table, key))
+            self.stats['enqueued'] += 1
+
+        self._wake()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(len(r) for r in self._updates.values()) + sum(len(c) for c in self._creates.values())
+
+    def _wake(self):
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass
+
+    # ============================================================
+    # LIFECYCLE
+    # ============================================================
+
+    async def start(self):
+        if self._task is not None and not self._task.done():
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._http = httpx.AsyncClient(
+            base_url=f"{AIRTABLE_API_BASE}/{AIRTABLE_BASE_ID}",
+            headers={"Authorization": f"Bearer {AIRTABLE_API_KEY}", "Content-Type": "application/json"},
+            timeout=httpx.Timeout(10.0, connect=5.0)
+        )
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0):
+        """Flush what the rate limit allows, persist the rest"""
+        if self._task is None:
+            return
+
+        self._stopping = True
+        self._wakeup.set()
+
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            logger.warning(f"⚠️ Airtable queue stopped with {self.pending_count()} pending writes (persisted)")
+        except Exception as e:
+            logger.error(f"Airtable queue stop error: {e}")
+
+        await self._persist_dirty()
+        await self._release_leases()
+        await self._http.aclose()
+        self._task = None
+        self._loop = None
+
+    async def _run(self):
+        await self._restore()
+        next_lease_tick = time.monotonic() + AIRTABLE_QUEUE_LEASE_RENEW
+
+        while True:
+            if not self._stopping and not self.pending_count():
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, next_lease_tick - time.monotonic()))
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+
+            if time.monotonic() >= next_lease_tick and not self._stopping:
+                next_lease_tick = time.monotonic() + AIRTABLE_QUEUE_LEASE_RENEW
+                await self._renew_leases()
+                await self._restore()
+
+            # Let a burst (e.g. several field updates to one record) coalesce
+            await asyncio.sleep(AIRTABLE_COALESCE_WINDOW)
+
+            try:
+                await self._persist_dirty()
+
+                batches = self._take_batches()
+                if not batches:
+                    if self._stopping:
+                        return
+                    continue
+
+                await asyncio.gather(*(self._send_batch(*batch) for batch in batches))
+            except Exception as e:
+                logger.error(f"Queue processor error: {e}", exc_info=True)
+                await asyncio.sleep(1)
+
+    # ============================================================
+    # BATCHING
+    # ============================================================
+
+    def _take_batches(self) -> List[Tuple[str, str, List[Dict]]]:
+        """Move up to AIRTABLE_MAX_BATCHES_PER_CYCLE batches from pending to in-flight"""
+        batches = []
+
+        with self._lock:
+            for table in list(self._updates.keys()):
+                table_updates = self._updates[table]
+                # High priority first, otherwise FIFO (dicts keep insertion order)
+                record_ids = sorted(
+                    (rid for rid in table_updates if (table, rid) not in self._inflight),
+                    key=lambda rid: table_updates[rid]['priority'] != 'high'
+                )
+
+                for start in range(0, len(record_ids), AIRTABLE_BATCH_SIZE):
+                    if len(batches) >= AIRTABLE_MAX_BATCHES_PER_CYCLE:
+                        break
+                    items = []
+                    for record_id in record_ids[start:start + AIRTABLE_BATCH_SIZE]:
+                        entry = table_updates.pop(record_id)
+                        self._inflight[(table, record_id)] = entry['fields']
+                        items.append({'record_id': record_id, **entry})
+                    batches.append(('update', table, items))
+
+                if not table_updates:
+                    del self._updates[table]
+
+            for table in list(self._creates.keys()):
+                queue = self._creates[table]
+                while queue and len(batches) < AIRTABLE_MAX_BATCHES_PER_CYCLE:
+                    items, self._creates[table] = queue[:AIRTABLE_BATCH_SIZE], queue[AIRTABLE_BATCH_SIZE:]
+                    queue = self._creates[table]
+                    batches.append(('create', table, items))
+
+                if not queue:
+                    del self._creates[table]
+
+        return batches
+
+    async def _send_batch(self, op: str, table: str, items: List[Dict]):
+        status, detail = await self._request(op, table, items)
+
+        if status == 200:
+            self.stats['records_written'] += len(items)
+            logger.debug(f"✅ Airtable {op} batch: {table} ({len(items)} records)")
+            self._finish(op, table, items, acked=True)
+            return
+
+        if status == 422 and len(items) > 1:
+            # One bad record fails the whole batch - isolate it
+            self._finish(op, table, items, acked=None)
+            await asyncio.gather(*(self._send_batch(op, table, [item]) for item in items))
+            return
+
+        if status == 422:
+            logger.error(f"❌ Airtable schema error (not retrying): {detail}")
+            logger.error(f"   Fields attempted: {list(items[0]['fields'].keys())}")
+            self.stats['failed'] += 1
+            self._finish(op, table, items, acked=True)
+            return
+
+        logger.warning(f"⚠️ Airtable {op} batch failed for {table} ({status}): {detail}")
+        self._finish(op, table, items, acked=False)
+
+    async def _request(self, op: str, table: str, items: List[Dict]) -> Tuple[int, str]:
+        if op == 'update':
+            payload = {'records': [{'id': i['record_id'], 'fields': i['fields']} for i in items]}
+        else:
+            payload = {'records': [{'fields': i['fields']} for i in items]}
+
+        status, detail = 0, ''
+        for attempt in range(1, AIRTABLE_MAX_ATTEMPTS + 1):
+            await self._bucket.acquire()
+            self.stats['requests'] += 1
+
+            try:
+                if op == 'update':
+                    response = await self._http.patch(f"/{table}", json=payload)
+                else:
+                    response = await self._http.post(f"/{table}", json=payload)
+            except httpx.TransportError as e:
+                status, detail = 0, str(e)
+            else:
+                status = response.status_code
+                if status == 200:
+                    return status, ''
+                try:
+                    detail = response.json().get('error', {})
+                    detail = detail.get('message', str(detail)) if isinstance(detail, dict) else str(detail)
+                except ValueError:
+                    detail = response.text
+
+                if status == 429:
+                    self.stats['rate_limited'] += 1
+                    self._bucket.pause(AIRTABLE_RATE_LIMIT_PENALTY)
+                    continue
+
+            if status not in (0, 429) and status < 500:
+                return status, detail
+
+            if attempt < AIRTABLE_MAX_ATTEMPTS:
+                delay = 2 ** (attempt - 1)
+                await asyncio.sleep(delay + random.uniform(0, delay * 0.25))
+
+        return status, detail
+
+    def _finish(self, op: str, table: str, items: List[Dict], acked: Optional[bool]):
+        """
+        Settle an in-flight batch
+
+        acked=True: written (or permanently rejected) - drop from persistence
+        acked=False: failed - merge back under any newer pending fields
+        acked=None: being re-sent as smaller batches - just release in-flight
+        """
+        acks, dead = [], []
+
+        with self._lock:
+            for item in items:
+                if op == 'update':
+                    key = (table, item['record_id'])
+                    self._inflight.pop(key, None)
+
+                    if acked:
+                        acks.append(self._ack_operation(op, table, item))
+                    elif acked is None:
+                        self._inflight[key] = item['fields']
+                    elif not self._requeue_update(table, item):
+                        dead.append((op, table, item))
+                else:
+                    if acked:
+                        acks.append(self._ack_operation(op, table, item))
+                    elif acked is False and not self._requeue_create(table, item):
+                        dead.append((op, table, item))
+
+        if dead:
+            # Dead-letter first, then remove from the queue (same version guard as an ack)
+            asyncio.get_running_loop().create_task(self._dead_letter(dead))
+        elif acks:
+            asyncio.get_running_loop().create_task(self._write_persistence(acks))
+
+    def _doc_id(self, op: str, table: str, key: str) -> str:
+        # Updates are per worker: two workers can hold pending fields for the same record
+        return f"update:{table}:{key}:{self._owner}" if op == 'update' else f"create:{table}:{key}"
+
+    def _ack_operation(self, op: str, table: str, item: Dict) -> DeleteOne:
+        """Delete the persisted doc - for updates only if no newer fields were persisted since"""
+        if op == 'update':
+            return DeleteOne({'_id': self._doc_id(op, table, item['record_id']), 'version': item['version']})
+        return DeleteOne({'_id': self._doc_id(op, table, item['key'])})
+
+    def _requeue_update(self, table: str, item: Dict) -> bool:
+        """Merge a failed update back under newer pending fields; False once it's out of requeues"""
+        if item['requeues'] >= AIRTABLE_MAX_REQUEUES:
+            logger.error(f"❌ Dropping Airtable update {table}/{item['record_id']} after {item['requeues']} requeues")
+            self.stats['failed'] += 1
+            return False
+
+        table_updates = self._updates.setdefault(table, {})
+        newer = table_updates.get(item['record_id'])
+        merged = dict(item['fields'])
+        if newer:
+            merged.update(newer['fields'])
+
+        self._version += 1
+        table_updates[item['record_id']] = {
+            'fields': merged, 'version': self._version,
+            'priority': item['priority'], 'requeues': item['requeues'] + 1
+        }
+        self._dirty.add(('update', table, item['record_id']))
+        return True
+
+    def _requeue_create(self, table: str, item: Dict) -> bool:
+        """Re-append a failed create; False once it's out of requeues"""
+        if item['requeues'] >= AIRTABLE_MAX_REQUEUES:
+            logger.error(f"❌ Dropping Airtable create for {table} after {item['requeues']} requeues")
+            self.stats['failed'] += 1
+            return False
+        self._creates.setdefault(table, []).append({**item, 'requeues': item['requeues'] + 1})
+        self._dirty.add(('create', table, item['key']))
+        return True
+
+    # ============================================================
+    # PERSISTENCE (MongoDB)
+    # ============================================================
+
+    def _collection(self, name: str = QUEUE_COLLECTION):
+        from app.mongo_pool import get_db
+        db = get_db()
+        return db[name] if db is not None else None
+
+    def _lease_expiry(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=AIRTABLE_QUEUE_LEASE_SECONDS)
+
+    async def _persist_dirty(self):
+        """Upsert every pending write touched since the last persist"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            operations = []
+
+            for op, table, key in dirty:
+                if op == 'update':
+                    entry = self._updates.get(table, {}).get(key)
+                    if entry is None:
+                        continue
+                    # Include in-flight fields so a crash mid-send loses nothing
+                    fields = {**self._inflight.get((table, key), {}), **entry['fields']}
+                    doc = {'op': 'update', 'table': table, 'record_id': key, 'fields': fields,
+                           'version': entry['version'], 'priority': entry['priority'],
+                           'requeues': entry['requeues']}
+                else:
+                    item = next((c for c in self._creates.get(table, []) if c['key'] == key), None)
+                    if item is None:
+                        continue
+                    doc = {'op': 'create', 'table': table, 'key': key, 'fields': item['fields'],
+                           'requeues': item['requeues']}
+
+                doc.update({'queued_at': datetime.now(timezone.utc), 'owner': self._owner,
+                            'lease_until': self._lease_expiry()})
+                operations.append(ReplaceOne({'_id': self._doc_id(op, table, key)}, doc, upsert=True))
+
+        if operations:
+            await self._write_persistence(operations)
+
+    async def _write_persistence(self, operations: List):
+        from app.async_executor import run_blocking
+
+        collection = self._collection()
+        if collection is None:
+            return
+
+        try:
+            await run_blocking(collection.bulk_write, operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Airtable queue persistence failed: {e}")
+
+    async def _dead_letter(self, dropped: List[Tuple[str, str, Dict]]):
+        """Keep writes that ran out of requeues for inspection; remove them from the queue"""
+        from app.async_executor import run_blocking
+
+        collection = self._collection(DEAD_LETTER_COLLECTION)
+        if collection is not None:
+            now = datetime.now(timezone.utc)
+            docs = [{
+                'op': op, 'table': table,
+                'record_id': item.get('record_id'), 'key': item.get('key'),
+                'fields': item['fields'], 'requeues': item['requeues'],
+                'owner': self._owner, 'dropped_at': now
+            } for op, table, item in dropped]
+            try:
+                await run_blocking(collection.insert_many, docs, ordered=False)
+            except Exception as e:
+                logger.error(f"Airtable dead-letter write failed: {e}")
+
+        self.stats['dead_lettered'] += len(dropped)
+        await self._write_persistence([self._ack_operation(op, table, item) for op, table, item in dropped])
+
+    async def _renew_leases(self):
+        """Extend the lease on every doc this worker owns"""
+        from app.async_executor import run_blocking
+
+        collection = self._collection()
+        if collection is None:
+            return
+
+        try:
+            await run_blocking(collection.update_many, {'owner': self._owner},
+                               {'$set': {'lease_until': self._lease_expiry()}})
+        except Exception as e:
+            logger.error(f"Airtable queue lease renewal failed: {e}")
+
+    async def _release_leases(self):
+        """On clean shutdown: make what's left claimable straight away"""
+        from app.async_executor import run_blocking
+
+        collection = self._collection()
+        if collection is None:
+            return
+
+        try:
+            await run_blocking(collection.update_many, {'owner': self._owner},
+                               {'$set': {'lease_until': datetime.now(timezone.utc)}})
+        except Exception as e:
+            logger.error(f"Airtable queue lease release failed: {e}")
+
+    def _claim_orphaned(self, collection) -> List[Dict]:
+        """Atomically take over docs whose lease expired (or that predate leases)"""
+        claimed = []
+        while True:
+            now = datetime.now(timezone.utc)
+            doc = collection.find_one_and_update(
+                {'$or': [{'lease_until': {'$lte': now}}, {'lease_until': {'$exists': False}}]},
+                {'$set': {'owner': self._owner, 'lease_until': self._lease_expiry()}},
+                return_document=ReturnDocument.AFTER
+            )
+            if doc is None:
+                return claimed
+            claimed.append(doc)
+
+    async def _restore(self):
+        """Claim writes left by stopped or crashed workers (startup + every lease tick)"""
+        from app.async_executor import run_blocking
+
+        collection = self._collection()
+        if collection is None:
+            return
+
+        try:
+            docs = await run_blocking(self._claim_orphaned, collection)
+        except Exception as e:
+            logger.error(f"Airtable queue restore failed: {e}")
+            return
+
+        if not docs:
+            return
+
+        superseded = []
+
+        with self._lock:
+            for doc in docs:
+                table = doc['table']
+                if doc['op'] == 'update':
+                    table_updates = self._updates.setdefault(table, {})
+                    current = table_updates.get(doc['record_id'])
+                    fields = {**doc['fields'], **(current['fields'] if current else {})}
+                    self._version = max(self._version, doc.get('version', 0)) + 1
+                    table_updates[doc['record_id']] = {
+                        'fields': fields, 'version': self._version,
+                        'priority': 'high' if doc.get('priority') == 'high' or (current and current['priority'] == 'high') else 'normal',
+                        'requeues': max(doc.get('requeues', 0), current['requeues'] if current else 0)
+                    }
+                    self._dirty.add(('update', table, doc['record_id']))
+                    if doc['_id'] != self._doc_id('update', table, doc['record_id']):
+                        superseded.append(DeleteOne({'_id': doc['_id'], 'owner': self._owner}))
+                else:
+                    self._creates.setdefault(table, []).append({
+                        'key': doc['key'], 'fields': doc['fields'], 'requeues': doc.get('requeues', 0)
+                    })
+
+            self.stats['restored'] += len(docs)
+
+        # Re-persist merged updates under this worker's ids before dropping the claimed copies
+        await self._persist_dirty()
+        if superseded:
+            await self._write_persistence(superseded)
+
+        logger.info(f"📋 Claimed {len(docs)} pending Airtable writes")
+        self._wakeup.set()
+
+
+# ============================================================
+# GLOBAL INSTANCE + MODULE API
+# ============================================================
+
+airtable_queue = AirtableWriteQueue()
+
 
 async def queue_airtable_update(
     table_name: str,
@@ -29,96 +613,51 @@ async def queue_airtable_update(
 ):
     """
     Queue an Airtable write (non-blocking)
-    
+
     Args:
         table_name: 'Clients' or 'Trial Users'
         record_id: Airtable record ID
         fields: Fields to update
         priority: 'high' or 'normal'
     """
-    
-    await _write_queue.put({
-        'table': table_name,
-        'record_id': record_id,
-        'fields': fields,
-        'priority': priority,
-        'queued_at': datetime.now(timezone.utc)
-    })
-    
+    airtable_queue.enqueue_update(table_name, record_id, fields, priority)
     logger.debug(f"📋 Queued Airtable update: {table_name}/{record_id}")
 
 
-async def _process_queue():
+def queue_airtable_write(
+    table_name: str,
+    record_data: Dict,
+    operation: str = 'update',
+    record_id: Optional[str] = None,
+    priority: str = 'normal'
+):
     """
-    Background worker: processes Airtable writes with retry logic
-    
-    Rate limit: Max 5 requests/second (safe for all Airtable plans)
+    Queue an Airtable create/update from sync code (safe from executor threads)
+
+    Args:
+        table_name: Airtable table
+        record_data: Fields to write
+        operation: 'update' (needs record_id) or 'create'
+        record_id: Airtable record ID for updates
     """
-    
-    while True:
-        try:
-            # Get next item (blocks if queue empty)
-            item = await _write_queue.get()
-            
-            # Execute write with retry logic
-            max_retries = 3
-            retry_delay = 1  # Start with 1 second
-            
-            for attempt in range(max_retries):
-                try:
-                    url = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{item['table'].replace(' ', '%20')}/{item['record_id']}"
-                    headers = {
-                        "Authorization": f"Bearer {AIRTABLE_API_KEY}",
-                        "Content-Type": "application/json"
-                    }
-                    
-                    payload = {"fields": item['fields']}
-                    
-                    response = requests.patch(url, headers=headers, json=payload, timeout=5)
-                    
-                    if response.status_code == 200:
-                        logger.debug(f"✅ Airtable updated: {item['table']}/{item['record_id']}")
-                        break  # Success - exit retry loop
-                    
-                    elif response.status_code == 422:
-                        # Schema error (unknown field) - don't retry
-                        error_msg = response.json().get('error', {}).get('message', 'Unknown error')
-                        logger.error(f"❌ Airtable schema error (not retrying): {error_msg}")
-                        logger.error(f"   Fields attempted: {list(item['fields'].keys())}")
-                        break
-                    
-                    else:
-                        # Retriable error
-                        logger.warning(f"⚠️ Airtable update failed (attempt {attempt + 1}/{max_retries}): {response.status_code}")
-                        
-                        if attempt < max_retries - 1:
-                            await asyncio.sleep(retry_delay)
-                            retry_delay *= 2  # Exponential backoff
-                        
-                except requests.exceptions.Timeout:
-                    logger.warning(f"⚠️ Airtable timeout (attempt {attempt + 1}/{max_retries})")
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(retry_delay)
-                        retry_delay *= 2
-                
-                except Exception as e:
-                    logger.error(f"❌ Airtable write error (attempt {attempt + 1}/{max_retries}): {e}")
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(retry_delay)
-                        retry_delay *= 2
-            
-            # Rate limit: 5 requests/second = 200ms between requests
-            await asyncio.sleep(0.2)
-            
-        except Exception as e:
-            logger.error(f"Queue processor error: {e}")
-            await asyncio.sleep(1)
+    if operation == 'create':
+        airtable_queue.enqueue_create(table_name, record_data)
+    elif record_id:
+        airtable_queue.enqueue_update(table_name, record_id, record_data, priority)
+    else:
+        raise ValueError("queue_airtable_write: update requires record_id")
 
 
 async def start_queue_processor():
     """Start background queue processor"""
-    global _queue_processor
-    
-    if _queue_processor is None:
-        _queue_processor = asyncio.create_task(_process_queue())
-        logger.info("✅ Airtable queue processor started")
+    if not AIRTABLE_API_KEY or not AIRTABLE_BASE_ID:
+        logger.warning("⚠️ Airtable not configured - queue processor not started")
+        return
+
+    await airtable_queue.start()
+    logger.info("✅ Airtable queue processor started")
+
+
+async def stop_queue_processor():
+    """Flush within the rate budget, persist anything left"""
+    await airtable_queue.stop()
@@ -0,0 +1,156 @@
+"""
+VOXMILL ALERT ENGINE
+====================
+Region-first alert evaluation, fanned out to subscribed clients
+
+Replaces the client-first loop (every client re-detecting every region it
+watches) used by the scheduler task and the alert_checker cron.
+
+FEATURES:
+- Subscription index: (region, vertical) → eligible clients, built once per run
+- detect_alerts_for_region runs once per (region, vertical), regions concurrently
+- Sends run concurrently across clients (each client's alerts stay in order)
+- alerts_sent written with one insert_many per run
+"""
+
+import os
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from app.async_executor import run_blocking
+from app.intelligence.alert_detector import detect_alerts_for_region, format_alert_message
+
+logger = logging.getLogger(__name__)
+
+ALERT_TIERS = ["tier_2", "tier_3"]
+DEFAULT_ALERT_VERTICAL = "luxury_real_estate"
+ALERT_SEND_CONCURRENCY = int(os.getenv('ALERT_SEND_CONCURRENCY', '20'))
+
+
+# ============================================================
+# SUBSCRIPTIONS
+# ============================================================
+
+def load_alert_clients(db) -> List[Dict]:
+    """Clients on alert-enabled tiers with a WhatsApp number"""
+    return list(db['client_profiles'].find({
+        "tier": {"$in": ALERT_TIERS},
+        "whatsapp_number": {"$exists": True}
+    }))
+
+
+def build_subscription_index(clients: List[Dict]) -> Dict[Tuple[str, str], List[Dict]]:
+    """
+    Invert client preferences into (region, vertical) → subscribed clients
+
+    Clients with alerts disabled, no number, or no preferred regions are left out.
+    """
+    index: Dict[Tuple[str, str], List[Dict]] = {}
+
+    for client in clients:
+        alert_preferences = client.get('alert_preferences', {})
+        preferred_regions = client.get('preferences', {}).get('preferred_regions', [])
+
+        if not alert_preferences.get('enabled', True) or not client.get('whatsapp_number') or not preferred_regions:
+            continue
+
+        vertical = alert_preferences.get('vertical', DEFAULT_ALERT_VERTICAL)
+
+        for region in dict.fromkeys(preferred_regions):
+            index.setdefault((region, vertical), []).append(client)
+
+    return index
+
+
+# ============================================================
+# EVALUATION
+# ============================================================
+
+async def evaluate_subscriptions(keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], List[Dict]]:
+    """Detect alerts once per (region, vertical); a failing region yields no alerts"""
+
+    async def _detect(region: str, vertical: str) -> List[Dict]:
+        try:
+            return await run_blocking(detect_alerts_for_region, region, vertical)
+        except Exception as e:
+            logger.error(f"Error detecting alerts for {region}: {e}", exc_info=True)
+            return []
+
+    results = await asyncio.gather(*(_detect(region, vertical) for region, vertical in keys))
+    return dict(zip(keys, results))
+
+
+async def run_alert_cycle(db) -> Dict:
+    """
+    One alert run: index subscriptions, evaluate each region once, fan out, log
+
+    Returns: Run stats (clients, regions, alerts_detected, sent, failed)
+    """
+    from app.whatsapp import send_twilio_message
+
+    clients = await run_blocking(load_alert_clients, db)
+    logger.info(f"Found {len(clients)} clients eligible for alerts")
+
+    index = build_subscription_index(clients)
+    region_alerts = await evaluate_subscriptions(list(index.keys()))
+
+    for (region, vertical), alerts in region_alerts.items():
+        logger.info(f"  - {region}: {len(alerts)} alerts detected, {len(index[(region, vertical)])} subscriber(s)")
+
+    # Per-client delivery list in (region, alert) order, messages formatted once per alert
+    formatted = {}
+    deliveries: Dict[int, Tuple[Dict, List[Tuple[str, Dict, str]]]] = {}
+
+    for (region, vertical), subscribers in index.items():
+        alerts = region_alerts.get((region, vertical), [])
+        for alert in alerts:
+            message = formatted.setdefault(id(alert), format_alert_message(alert))
+            for client in subscribers:
+                deliveries.setdefault(id(client), (client, []))[1].append((region, alert, message))
+
+    records = []
+    stats = {
+        'clients': len(clients),
+        'regions': len(index),
+        'alerts_detected': sum(len(a) for a in region_alerts.values()),
+        'sent': 0,
+        'failed': 0
+    }
+    semaphore = asyncio.Semaphore(ALERT_SEND_CONCURRENCY)
+
+    async def _deliver(client: Dict, items: List[Tuple[str, Dict, str]]):
+        client_name = client.get('name', 'Unknown')
+        whatsapp_number = client.get('whatsapp_number')
+
+        async with semaphore:
+            for region, alert, message in items:
+                try:
+                    await send_twilio_message(whatsapp_number, message)
+                    logger.info(f"✅ Sent {alert['type']} alert to {client_name}")
+
+                    records.append({
+                        "client_id": client.get('_id'),
+                        "client_name": client_name,
+                        "whatsapp_number": whatsapp_number,
+                        "alert_type": alert['type'],
+                        "region": region,
+                        "urgency": alert['urgency'],
+                        "timestamp": datetime.now(timezone.utc),
+                        "alert_data": alert
+                    })
+                    stats['sent'] += 1
+                except Exception as e:
+                    stats['failed'] += 1
+                    logger.error(f"❌ Failed to send alert to {client_name}: {e}")
+
+    await asyncio.gather(*(_deliver(client, items) for client, items in deliveries.values()))
+
+    if records:
+        try:
+            await run_blocking(db['alerts_sent'].insert_many, records, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to log {len(records)} sent alerts: {e}")
+
+    return stats
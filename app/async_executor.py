@@ -0,0 +1,132 @@
+"""
+VOXMILL ASYNC EXECUTOR
+======================
+Keeps blocking I/O off the event loop
+
+FEATURES:
+- Bounded thread pool for remaining sync calls (pymongo, Airtable, Twilio, dataset loads)
+- Context propagation (request-scoped session unit of work follows the call)
+- Fire-and-forget for log/history writes the reply doesn't depend on
+- Event-loop lag monitor: warns whenever the loop stalls > 50ms
+"""
+
+import os
+import time
+import asyncio
+import logging
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+BLOCKING_IO_WORKERS = int(os.getenv('BLOCKING_IO_WORKERS', '32'))
+LOOP_LAG_THRESHOLD_MS = float(os.getenv('LOOP_LAG_THRESHOLD_MS', '50'))
+LOOP_LAG_INTERVAL = 0.1  # seconds between probes
+
+# ============================================================
+# BOUNDED EXECUTOR
+# ============================================================
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Shared pool for blocking calls (created on first use)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=BLOCKING_IO_WORKERS, thread_name_prefix='voxmill-io')
+        logger.info(f"✅ Blocking I/O executor started ({BLOCKING_IO_WORKERS} workers)")
+    return _executor
+
+
+async def run_blocking(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Await a sync call on the bounded executor
+
+    Usage:
+        profile = await run_blocking(get_client_from_airtable, sender)
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), functools.partial(ctx.run, fn, *args, **kwargs))
+
+
+def _log_background_failure(name: str, future):
+    exc = future.exception()
+    if exc is not None:
+        logger.error(f"Background call {name} failed: {exc}")
+
+
+def fire_and_forget(fn: Callable, *args, **kwargs):
+    """Run a sync call on the executor without waiting (errors are logged)"""
+    ctx = contextvars.copy_context()
+    future = get_executor().submit(ctx.run, fn, *args, **kwargs)
+    future.add_done_callback(functools.partial(_log_background_failure, getattr(fn, '__name__', 'call')))
+    return future
+
+
+def shutdown_executor():
+    """Drain pending background writes on shutdown"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+        logger.info("✅ Blocking I/O executor stopped")
+
+
+# ============================================================
+# EVENT LOOP LAG MONITOR
+# ============================================================
+
+_lag_stats = {
+    'samples': 0,
+    'stalls': 0,
+    'max_lag_ms': 0.0,
+    'last_stall_ms': 0.0,
+    'last_stall_at': None
+}
+_lag_task: Optional[asyncio.Task] = None
+
+
+async def _monitor_loop_lag(threshold_ms: float, interval: float):
+    loop = asyncio.get_running_loop()
+
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag_ms = max(0.0, (loop.time() - expected) * 1000)
+
+        _lag_stats['samples'] += 1
+        _lag_stats['max_lag_ms'] = max(_lag_stats['max_lag_ms'], lag_ms)
+
+        if lag_ms > threshold_ms:
+            _lag_stats['stalls'] += 1
+            _lag_stats['last_stall_ms'] = round(lag_ms, 1)
+            _lag_stats['last_stall_at'] = time.time()
+            logger.warning(f"⚠️ EVENT LOOP BLOCKED: {lag_ms:.0f}ms (threshold {threshold_ms:.0f}ms)")
+
+
+def start_loop_lag_monitor(threshold_ms: float = LOOP_LAG_THRESHOLD_MS, interval: float = LOOP_LAG_INTERVAL):
+    """Start the lag probe on the running loop (call from startup)"""
+    global _lag_task
+    if _lag_task is None or _lag_task.done():
+        _lag_task = asyncio.get_running_loop().create_task(_monitor_loop_lag(threshold_ms, interval))
+        logger.info(f"✅ Event loop lag monitor started (warn > {threshold_ms:.0f}ms)")
+
+
+def stop_loop_lag_monitor():
+    global _lag_task
+    if _lag_task is not None:
+        _lag_task.cancel()
+        _lag_task = None
+
+
+def get_loop_lag_stats() -> Dict:
+    """Lag probe counters for /metrics"""
+    stats = dict(_lag_stats)
+    stats['max_lag_ms'] = round(stats['max_lag_ms'], 1)
+    stats['threshold_ms'] = LOOP_LAG_THRESHOLD_MS
+    stats['executor_workers'] = BLOCKING_IO_WORKERS
+    return stats
@@ -7,7 +7,9 @@ Target: 70% cost reduction via intelligent caching
 FEATURES:
 - Dual-layer caching: Redis (primary) + in-memory (fallback)
 - Graceful degradation if Redis unavailable
-- Thread-safe in-memory cache with automatic expiry cleanup
+- Stale-while-revalidate datasets: soft TTL (fresh) + hard TTL (served stale while refreshing)
+- Bounded in-memory tier: per-namespace LRU with byte budgets + heap-based expiry
+- Hit/miss/eviction counters per namespace
 - Zero downtime even if Redis crashes mid-operation
 """
 
@@ -17,142 +19,181 @@ import logging
 import hashlib
 import time
 import threading
+import heapq
+import sys
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
 # ============================================================
-# UPSTASH REDIS CONNECTION (REST API)
+# UPSTASH REDIS CONNECTION (shared REST client)
 # ============================================================
 
-UPSTASH_REDIS_REST_URL = os.getenv("UPSTASH_REDIS_REST_URL")
-UPSTASH_REDIS_REST_TOKEN = os.getenv("UPSTASH_REDIS_REST_TOKEN")
-redis_client = None
-redis_available = False
-
-try:
-    if UPSTASH_REDIS_REST_URL and UPSTASH_REDIS_REST_TOKEN:
-        # Upstash uses HTTP REST API, not standard Redis protocol
-        import httpx
-        
-        class UpstashRedisClient:
-            """REST API client for Upstash Redis"""
-            
-            def __init__(self, url: str, token: str):
-                self.url = url.rstrip('/')
-                self.token = token
-                self.client = httpx.Client(timeout=5.0)
-            
-            def _execute(self, command: list):
-                """Execute Redis command via REST API"""
-                try:
-                    response = self.client.post(
-                        self.url,
-                        headers={"Authorization": f"Bearer {self.token}"},
-                        json=command
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    return result.get("result")
-                except Exception as e:
-                    logger.debug(f"Upstash command failed: {e}")
-                    return None
-            
-            def ping(self):
-                """Test connection"""
-                result = self._execute(["PING"])
-                return result == "PONG"
-            
-            def get(self, key: str):
-                """Get value"""
-                return self._execute(["GET", key])
-            
-            def setex(self, key: str, seconds: int, value: str):
-                """Set value with expiry"""
-                result = self._execute(["SETEX", key, seconds, value])
-                return result == "OK"
-            
-            def delete(self, *keys):
-                """Delete keys"""
-                if not keys:
-                    return 0
-                return self._execute(["DEL", *keys])
-            
-            def exists(self, key: str):
-                """Check if key exists"""
-                result = self._execute(["EXISTS", key])
-                return result == 1
-            
-            def keys(self, pattern: str):
-                """Get keys matching pattern"""
-                result = self._execute(["KEYS", pattern])
-                return result if result else []
-            
-            def dbsize(self):
-                """Get database size"""
-                result = self._execute(["DBSIZE"])
-                return result if result else 0
-            
-            def info(self, section: str = 'stats'):
-                """Get info (limited in Upstash)"""
-                # Upstash doesn't support full INFO, return minimal stats
-                return {
-                    'keyspace_hits': 0,
-                    'keyspace_misses': 0,
-                    'used_memory_human': 'Unknown (Upstash)'
-                }
-        
-        redis_client = UpstashRedisClient(UPSTASH_REDIS_REST_URL, UPSTASH_REDIS_REST_TOKEN)
-        
-        # Test connection
-        if redis_client.ping():
-            redis_available = True
-            logger.info("✅ Upstash Redis connected successfully (REST API)")
-        else:
-            redis_client = None
-            logger.warning("⚠️ Upstash Redis ping failed")
-    else:
-        logger.warning("⚠️ UPSTASH_REDIS_REST_URL or UPSTASH_REDIS_REST_TOKEN not configured - using in-memory cache only")
-except ImportError:
-    logger.error("❌ httpx library not installed (required for Upstash)")
-    logger.warning("⚠️ Falling back to in-memory cache only")
-except Exception as e:
-    logger.error(f"❌ Upstash Redis connection failed: {e}")
-    logger.warning("⚠️ Falling back to in-memory cache only")
+from app.upstash_client import redis_client, redis_available
 
 # ============================================================
-# IN-MEMORY CACHE (Fallback)
+# IN-MEMORY CACHE (Fallback) - bounded, per-namespace LRU
 # ============================================================
 
-_memory_cache = {}  # {cache_key: {'data': ..., 'expiry': timestamp}}
-_memory_cache_lock = threading.Lock()
-_last_cleanup = time.time()
-CLEANUP_INTERVAL = 300  # Clean expired entries every 5 minutes
+def _estimate_size(value: Any) -> int:
+    """Approximate retained bytes of a cached value (serialized size)"""
+    if isinstance(value, str):
+        return len(value)
+    try:
+        return len(json.dumps(value, default=str))
+    except Exception:
+        return sys.getsizeof(value)
+
 
-def _cleanup_expired_entries():
-    """Remove expired entries from memory cache (housekeeping)"""
-    global _last_cleanup
+class MemoryCacheTier:
+    """
+    Bounded LRU namespace for the in-memory fallback
+    
+    - Entry count AND byte budget; least-recently-used entries evicted first
+    - Expiry tracked in a min-heap, so purging only touches expired entries
+    - One lock per namespace (datasets don't contend with webhook dedup)
+    """
+    
+    def __init__(self, name: str, max_entries: int, max_bytes: int):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # {cache_key: {'data', 'expiry', 'stored_at', 'size'}}
+        self._expiry_heap = []         # [(expiry, cache_key)] - stale records skipped lazily
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def _remove(self, cache_key: str) -> Optional[Dict]:
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self.current_bytes -= entry['size']
+        return entry
     
-    now = time.time()
+    def _purge_expired(self, now: float):
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expiry, cache_key = heapq.heappop(heap)
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry['expiry'] == expiry:
+                self._remove(cache_key)
+                self.expirations += 1
+        
+        # Overwritten keys leave stale heap records behind - compact occasionally
+        if len(heap) > 2 * len(self._entries) + 64:
+            self._expiry_heap = [(e['expiry'], k) for k, e in self._entries.items()]
+            heapq.heapify(self._expiry_heap)
     
-    # Only run cleanup every CLEANUP_INTERVAL seconds
-    if now - _last_cleanup < CLEANUP_INTERVAL:
-        return
+    def get(self, cache_key: str) -> Optional[Dict]:
+        """Return live entry dict (marks it most-recently-used) or None"""
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry
     
-    with _memory_cache_lock:
-        expired_keys = [
-            key for key, entry in _memory_cache.items() 
-            if now > entry['expiry']
-        ]
+    def contains(self, cache_key: str) -> bool:
+        """Liveness check without touching hit/miss counters"""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            return entry is not None and time.time() < entry['expiry']
+    
+    def set(self, cache_key: str, data: Any, ttl: int, size: Optional[int] = None) -> bool:
+        """Store entry; returns False if it alone exceeds the namespace byte budget"""
+        if size is None:
+            size = _estimate_size(data)
         
-        for key in expired_keys:
-            del _memory_cache[key]
+        if size > self.max_bytes:
+            logger.warning(f"⚠️ MEMORY CACHE [{self.name}]: {size} byte entry exceeds {self.max_bytes} byte budget, not cached")
+            return False
         
-        _last_cleanup = now
+        now = time.time()
+        expiry = now + ttl
+        
+        with self._lock:
+            self._purge_expired(now)
+            self._remove(cache_key)
+            self._entries[cache_key] = {
+                'data': data,
+                'expiry': expiry,
+                'stored_at': now,
+                'size': size
+            }
+            self.current_bytes += size
+            heapq.heappush(self._expiry_heap, (expiry, cache_key))
+            
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted['size']
+                self.evictions += 1
+                logger.debug(f"🗑️ MEMORY CACHE [{self.name}]: evicted {evicted_key} (LRU)")
         
-        if expired_keys:
-            logger.debug(f"🗑️ Cleaned {len(expired_keys)} expired memory cache entries")
+        return True
+    
+    def delete(self, cache_key: str) -> bool:
+        with self._lock:
+            return self._remove(cache_key) is not None
+    
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._expiry_heap.clear()
+            self.current_bytes = 0
+            return count
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            self._purge_expired(time.time())
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+
+_MB = 1024 * 1024
+
+# Budgets are per worker process - override via env when sizing containers
+_memory_tiers = {
+    'response': MemoryCacheTier(
+        'response',
+        max_entries=int(os.getenv('MEMORY_CACHE_RESPONSE_MAX_ENTRIES', '2000')),
+        max_bytes=int(os.getenv('MEMORY_CACHE_RESPONSE_MAX_MB', '16')) * _MB
+    ),
+    'dataset': MemoryCacheTier(
+        'dataset',
+        max_entries=int(os.getenv('MEMORY_CACHE_DATASET_MAX_ENTRIES', '64')),
+        max_bytes=int(os.getenv('MEMORY_CACHE_DATASET_MAX_MB', '64')) * _MB
+    ),
+    'profile': MemoryCacheTier(
+        'profile',
+        max_entries=int(os.getenv('MEMORY_CACHE_PROFILE_MAX_ENTRIES', '5000')),
+        max_bytes=int(os.getenv('MEMORY_CACHE_PROFILE_MAX_MB', '8')) * _MB
+    ),
+    'webhook': MemoryCacheTier(
+        'webhook',
+        max_entries=int(os.getenv('MEMORY_CACHE_WEBHOOK_MAX_ENTRIES', '20000')),
+        max_bytes=int(os.getenv('MEMORY_CACHE_WEBHOOK_MAX_MB', '4')) * _MB
+    ),
+}
 
 
 class CacheManager:
@@ -167,7 +208,8 @@ class CacheManager:
     
     # Cache TTL settings (in seconds)
     RESPONSE_CACHE_TTL = 300   # 5 minutes for GPT-4 responses
-    DATASET_CACHE_TTL = 1800   # 30 minutes for datasets (CRITICAL FOR PERFORMANCE)
+    DATASET_CACHE_TTL = 1800   # 30 minutes fresh (soft TTL) for datasets (CRITICAL FOR PERFORMANCE)
+    DATASET_HARD_TTL = int(os.getenv('DATASET_HARD_TTL', '7200'))  # Served stale + refreshed in background until this age
     CLIENT_PROFILE_TTL = 600   # 10 minutes for client profiles
     DEDUPLICATION_TTL = 60     # 1 minute for webhook deduplication
     
@@ -218,19 +260,12 @@ class CacheManager:
                 logger.warning(f"Redis read failed: {e}, trying memory cache")
         
         # FALLBACK TO IN-MEMORY CACHE
-        _cleanup_expired_entries()
+        entry = _memory_tiers['response'].get(cache_key)
         
-        with _memory_cache_lock:
-            if cache_key in _memory_cache:
-                entry = _memory_cache[cache_key]
-                
-                if time.time() < entry['expiry']:
-                    age_seconds = int(time.time() - (entry['expiry'] - cls.RESPONSE_CACHE_TTL))
-                    logger.info(f"✅ MEMORY CACHE HIT: Response ({age_seconds}s old)")
-                    return entry['data']['response']
-                else:
-                    # Expired
-                    del _memory_cache[cache_key]
+        if entry:
+            age_seconds = int(time.time() - entry['stored_at'])
+            logger.info(f"✅ MEMORY CACHE HIT: Response ({age_seconds}s old)")
+            return entry['data']['response']
         
         return None
     
@@ -266,11 +301,7 @@ class CacheManager:
                 logger.warning(f"Redis write failed: {e}, using memory cache only")
         
         # ALWAYS CACHE IN MEMORY AS BACKUP
-        with _memory_cache_lock:
-            _memory_cache[cache_key] = {
-                'data': cache_data,
-                'expiry': time.time() + cls.RESPONSE_CACHE_TTL
-            }
+        if _memory_tiers['response'].set(cache_key, cache_data, cls.RESPONSE_CACHE_TTL):
             logger.info(f"💾 Response cached in MEMORY ({cls.RESPONSE_CACHE_TTL}s TTL)")
             success = True
         
@@ -281,7 +312,8 @@ class CacheManager:
     # ============================================================
     
     @classmethod
-    def get_dataset_cache(cls, area: str, vertical: str = "real_estate") -> Optional[Dict]:
+    def get_dataset_cache(cls, area: str, vertical: str = "real_estate",
+                          log_miss: bool = True, max_age: Optional[float] = None) -> Optional[Dict]:
         """
         Get cached dataset - CRITICAL FOR PERFORMANCE
         
@@ -291,9 +323,29 @@ class CacheManager:
         Args:
             area: Region name (e.g., "Mayfair")
             vertical: Market vertical (default: "real_estate")
+            log_miss: Log misses (off when polling for another worker's load)
+            max_age: Reject entries older than this (seconds); None = up to hard TTL
         
         Returns: Cached dataset dict or None
         """
+        dataset, age_seconds = cls.get_dataset_cache_entry(area, vertical, log_miss=log_miss)
+        
+        if dataset is not None and (max_age is None or age_seconds <= max_age):
+            return dataset
+        
+        return None
+    
+    @classmethod
+    def get_dataset_cache_entry(cls, area: str, vertical: str = "real_estate",
+                                log_miss: bool = True) -> Tuple[Optional[Dict], Optional[float]]:
+        """
+        Get cached dataset with its age (stale-while-revalidate)
+        
+        Entries live until DATASET_HARD_TTL; anything older than
+        DATASET_CACHE_TTL (soft TTL) is stale and should be refreshed.
+        
+        Returns: (dataset, age_seconds) or (None, None)
+        """
         cache_key = cls._generate_cache_key("dataset", area, vertical)
         
         # TRY REDIS FIRST
@@ -306,32 +358,28 @@ class CacheManager:
                     cached_time = datetime.fromisoformat(result['cached_at'])
                     age_seconds = (datetime.now(timezone.utc) - cached_time).total_seconds()
                     age_minutes = int(age_seconds / 60)
+                    freshness = "stale" if age_seconds > cls.DATASET_CACHE_TTL else "saved 10-15s load"
                     
-                    logger.info(f"✅ REDIS CACHE HIT: Dataset for {area} ({age_minutes}m old, saved 10-15s load)")
-                    return result['dataset']
+                    logger.info(f"✅ REDIS CACHE HIT: Dataset for {area} ({age_minutes}m old, {freshness})")
+                    return result['dataset'], age_seconds
                 
             except Exception as e:
                 logger.warning(f"Redis read failed: {e}, trying memory cache")
         
         # FALLBACK TO IN-MEMORY CACHE
-        _cleanup_expired_entries()
+        entry = _memory_tiers['dataset'].get(cache_key)
         
-        with _memory_cache_lock:
-            if cache_key in _memory_cache:
-                entry = _memory_cache[cache_key]
-                
-                if time.time() < entry['expiry']:
-                    age_seconds = time.time() - (entry['expiry'] - cls.DATASET_CACHE_TTL)
-                    age_minutes = int(age_seconds / 60)
-                    logger.info(f"✅ MEMORY CACHE HIT: Dataset for {area} ({age_minutes}m old)")
-                    return entry['data']
-                else:
-                    # Expired
-                    del _memory_cache[cache_key]
+        if entry:
+            age_seconds = time.time() - entry['stored_at']
+            age_minutes = int(age_seconds / 60)
+            freshness = ", stale" if age_seconds > cls.DATASET_CACHE_TTL else ""
+            logger.info(f"✅ MEMORY CACHE HIT: Dataset for {area} ({age_minutes}m old{freshness})")
+            return entry['data'], age_seconds
         
         # MISS ON BOTH
-        logger.info(f"❌ CACHE MISS: Dataset for {area} (will load fresh, ~15s)")
-        return None
+        if log_miss:
+            logger.info(f"❌ CACHE MISS: Dataset for {area} (will load fresh, ~15s)")
+        return None, None
     
     @classmethod
     def set_dataset_cache(cls, area: str, dataset: Dict, vertical: str = "real_estate") -> bool:
@@ -344,6 +392,7 @@ class CacheManager:
         cache_key = cls._generate_cache_key("dataset", area, vertical)
         
         success = False
+        payload_size = None
         
         # TRY REDIS FIRST
         if redis_available and redis_client:
@@ -355,27 +404,26 @@ class CacheManager:
                     "cached_at": datetime.now(timezone.utc).isoformat()
                 }
                 
+                payload = json.dumps(cache_data, default=str)  # default=str handles datetime/ObjectId
+                payload_size = len(payload)
+                
                 redis_client.setex(
                     cache_key,
-                    cls.DATASET_CACHE_TTL,
-                    json.dumps(cache_data, default=str)  # default=str handles datetime/ObjectId
+                    cls.DATASET_HARD_TTL,
+                    payload
                 )
                 
                 ttl_minutes = int(cls.DATASET_CACHE_TTL / 60)
-                logger.info(f"💾 Dataset cached in REDIS for {ttl_minutes}m (distributed cache)")
+                logger.info(f"💾 Dataset cached in REDIS, fresh for {ttl_minutes}m (distributed cache)")
                 success = True
                 
             except Exception as e:
                 logger.warning(f"Redis write failed: {e}, using memory cache only")
         
-        # ALWAYS CACHE IN MEMORY AS BACKUP
-        with _memory_cache_lock:
-            _memory_cache[cache_key] = {
-                'data': dataset,
-                'expiry': time.time() + cls.DATASET_CACHE_TTL
-            }
+        # ALWAYS CACHE IN MEMORY AS BACKUP (reuse serialized size when we have it)
+        if _memory_tiers['dataset'].set(cache_key, dataset, cls.DATASET_HARD_TTL, size=payload_size):
             ttl_minutes = int(cls.DATASET_CACHE_TTL / 60)
-            logger.info(f"💾 Dataset cached in MEMORY for {ttl_minutes}m (process-local)")
+            logger.info(f"💾 Dataset cached in MEMORY, fresh for {ttl_minutes}m (process-local)")
             success = True
         
         return success
@@ -400,16 +448,11 @@ class CacheManager:
                 logger.warning(f"Redis read failed: {e}")
         
         # FALLBACK TO MEMORY
-        _cleanup_expired_entries()
-        
-        with _memory_cache_lock:
-            if cache_key in _memory_cache:
-                entry = _memory_cache[cache_key]
-                if time.time() < entry['expiry']:
-                    logger.info(f"✅ MEMORY CACHE HIT: Client profile")
-                    return entry['data']
-                else:
-                    del _memory_cache[cache_key]
+        entry = _memory_tiers['profile'].get(cache_key)
+        
+        if entry:
+            logger.info(f"✅ MEMORY CACHE HIT: Client profile")
+            return entry['data']
         
         return None
     
@@ -438,11 +481,7 @@ class CacheManager:
                 logger.warning(f"Redis write failed: {e}")
         
         # MEMORY BACKUP
-        with _memory_cache_lock:
-            _memory_cache[cache_key] = {
-                'data': profile,
-                'expiry': time.time() + cls.CLIENT_PROFILE_TTL
-            }
+        if _memory_tiers['profile'].set(cache_key, profile, cls.CLIENT_PROFILE_TTL):
             success = True
         
         return success
@@ -461,10 +500,8 @@ class CacheManager:
                 logger.warning(f"Redis delete failed: {e}")
         
         # Clear from memory
-        with _memory_cache_lock:
-            if cache_key in _memory_cache:
-                del _memory_cache[cache_key]
-                logger.info(f"🗑️ Memory cache invalidated for client")
+        if _memory_tiers['profile'].delete(cache_key):
+            logger.info(f"🗑️ Memory cache invalidated for client")
 
     @classmethod
     def clear_dataset_cache(cls, area: str, vertical: str = "real_estate"):
@@ -488,10 +525,8 @@ class CacheManager:
                 logger.warning(f"Redis delete failed: {e}")
         
         # Clear from memory
-        with _memory_cache_lock:
-            if cache_key in _memory_cache:
-                del _memory_cache[cache_key]
-                logger.info(f"🗑️ Memory dataset cache cleared for {area}")
+        if _memory_tiers['dataset'].delete(cache_key):
+            logger.info(f"🗑️ Memory dataset cache cleared for {area}")
     
     # ============================================================
     # WEBHOOK DEDUPLICATION
@@ -520,19 +555,14 @@ class CacheManager:
                 logger.warning(f"Redis duplicate check failed: {e}, using memory")
         
         # FALLBACK TO MEMORY
-        with _memory_cache_lock:
-            if cache_key in _memory_cache:
-                entry = _memory_cache[cache_key]
-                if time.time() < entry['expiry']:
-                    logger.warning(f"⚠️ DUPLICATE WEBHOOK (Memory): {message_sid}")
-                    return True
-            
-            # Mark as processed
-            _memory_cache[cache_key] = {
-                'data': True,
-                'expiry': time.time() + cls.DEDUPLICATION_TTL
-            }
-            return False
+        webhook_tier = _memory_tiers['webhook']
+        if webhook_tier.contains(cache_key):
+            logger.warning(f"⚠️ DUPLICATE WEBHOOK (Memory): {message_sid}")
+            return True
+        
+        # Mark as processed
+        webhook_tier.set(cache_key, True, cls.DEDUPLICATION_TTL, size=len(cache_key))
+        return False
     
     # ============================================================
     # CACHE MANAGEMENT & DIAGNOSTICS
@@ -543,7 +573,8 @@ class CacheManager:
         """Get cache performance statistics"""
         stats = {
             "redis_available": redis_available,
-            "memory_cache_entries": len(_memory_cache),
+            "memory_cache_entries": sum(len(tier._entries) for tier in _memory_tiers.values()),
+            "memory_cache": cls.get_memory_cache_size(),
         }
         
         if redis_available and redis_client:
@@ -580,10 +611,9 @@ class CacheManager:
             from app.dataset_loader import load_dataset
             
             logger.info(f"🔥 Cache warming started for {area}...")
-            dataset = load_dataset(area=area)
+            dataset = load_dataset(area=area, force_refresh=True)  # Publishes to cache itself
             
             if dataset and not dataset.get('metadata', {}).get('is_fallback'):
-                cls.set_dataset_cache(area, dataset)
                 logger.info(f"✅ Cache warmed for {area}")
                 return True
             else:
@@ -615,34 +645,23 @@ class CacheManager:
                 logger.error(f"Redis clear failed: {e}")
         
         # Clear memory
-        with _memory_cache_lock:
-            count = len(_memory_cache)
-            _memory_cache.clear()
-            logger.warning(f"🗑️ Cleared {count} memory cache entries")
+        count = sum(tier.clear() for tier in _memory_tiers.values())
+        logger.warning(f"🗑️ Cleared {count} memory cache entries")
     
     @classmethod
     def get_memory_cache_size(cls) -> Dict:
-        """Get memory cache statistics"""
-        import sys
-        
-        with _memory_cache_lock:
-            total_entries = len(_memory_cache)
-            
-            # Estimate memory usage (rough)
-            try:
-                memory_bytes = sys.getsizeof(_memory_cache)
-                for key, value in _memory_cache.items():
-                    memory_bytes += sys.getsizeof(key)
-                    memory_bytes += sys.getsizeof(value)
-                
-                memory_mb = memory_bytes / (1024 * 1024)
-            except:
-                memory_mb = 0
-            
-            return {
-                "total_entries": total_entries,
-                "estimated_memory_mb": round(memory_mb, 2)
-            }
+        """Get memory cache statistics (byte-accounted, per namespace)"""
+        namespaces = {name: tier.stats() for name, tier in _memory_tiers.items()}
+        total_bytes = sum(ns['bytes'] for ns in namespaces.values())
+        
+        return {
+            "total_entries": sum(ns['entries'] for ns in namespaces.values()),
+            "estimated_memory_mb": round(total_bytes / _MB, 2),
+            "hits": sum(ns['hits'] for ns in namespaces.values()),
+            "misses": sum(ns['misses'] for ns in namespaces.values()),
+            "evictions": sum(ns['evictions'] for ns in namespaces.values()),
+            "namespaces": namespaces
+        }
 
 
 # ============================================================
@@ -656,11 +675,11 @@ class CacheMetrics:
     def log_cache_hit(cls, cache_type: str, details: Dict = None):
         """Log cache hit for analytics (saves API costs)"""
         try:
-            from pymongo import MongoClient
+            from app.mongo_pool import get_mongo_client
             
             MONGODB_URI = os.getenv("MONGODB_URI")
             if MONGODB_URI:
-                mongo_client = MongoClient(MONGODB_URI)
+                mongo_client = get_mongo_client()
                 db = mongo_client['Voxmill']
                 
                 db['cache_metrics'].insert_one({
@@ -683,13 +702,13 @@ class CacheMetrics:
         - Average cost per query: ~$0.095
         """
         try:
-            from pymongo import MongoClient
+            from app.mongo_pool import get_mongo_client
             
             MONGODB_URI = os.getenv("MONGODB_URI")
             if not MONGODB_URI:
                 return {"error": "MongoDB not connected"}
             
-            mongo_client = MongoClient(MONGODB_URI)
+            mongo_client = get_mongo_client()
             db = mongo_client['Voxmill']
             
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
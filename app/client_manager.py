@@ -1,12 +1,12 @@
 import logging
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client
 import os
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
 MONGODB_URI = os.getenv("MONGODB_URI")
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
 
 
 def normalize_phone_number(phone: str) -> str:
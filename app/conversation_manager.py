@@ -8,12 +8,15 @@ WORLD-CLASS UPDATE:
 - Dual-layer storage: Redis (primary) + in-memory (fallback)
 - Zero dependency on Redis for core functionality
 - Automatic entity extraction from conversations
+- Request-scoped session snapshot: one load + one versioned write-back per message
 """
 
 import os
 import logging
 import threading
 import time
+import contextvars
+from contextlib import contextmanager, asynccontextmanager
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Optional, Tuple
 import json
@@ -21,103 +24,10 @@ import json
 logger = logging.getLogger(__name__)
 
 # ============================================================
-# UPSTASH REDIS CONNECTION (REST API)
+# UPSTASH REDIS CONNECTION (shared REST client)
 # ============================================================
 
-UPSTASH_REDIS_REST_URL = os.getenv("UPSTASH_REDIS_REST_URL")
-UPSTASH_REDIS_REST_TOKEN = os.getenv("UPSTASH_REDIS_REST_TOKEN")
-redis_client = None
-redis_available = False
-
-try:
-    if UPSTASH_REDIS_REST_URL and UPSTASH_REDIS_REST_TOKEN:
-        # Upstash uses HTTP REST API, not standard Redis protocol
-        import httpx
-        
-        class UpstashRedisClient:
-            """REST API client for Upstash Redis"""
-            
-            def __init__(self, url: str, token: str):
-                self.url = url.rstrip('/')
-                self.token = token
-                self.client = httpx.Client(timeout=5.0)
-            
-            def _execute(self, command: list):
-                """Execute Redis command via REST API"""
-                try:
-                    response = self.client.post(
-                        self.url,
-                        headers={"Authorization": f"Bearer {self.token}"},
-                        json=command
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    return result.get("result")
-                except Exception as e:
-                    logger.debug(f"Upstash command failed: {e}")
-                    return None
-            
-            def ping(self):
-                """Test connection"""
-                result = self._execute(["PING"])
-                return result == "PONG"
-            
-            def get(self, key: str):
-                """Get value"""
-                return self._execute(["GET", key])
-            
-            def setex(self, key: str, seconds: int, value: str):
-                """Set value with expiry"""
-                result = self._execute(["SETEX", key, seconds, value])
-                return result == "OK"
-            
-            def delete(self, *keys):
-                """Delete keys"""
-                if not keys:
-                    return 0
-                return self._execute(["DEL", *keys])
-            
-            def exists(self, key: str):
-                """Check if key exists"""
-                result = self._execute(["EXISTS", key])
-                return result == 1
-            
-            def keys(self, pattern: str):
-                """Get keys matching pattern"""
-                result = self._execute(["KEYS", pattern])
-                return result if result else []
-            
-            def dbsize(self):
-                """Get database size"""
-                result = self._execute(["DBSIZE"])
-                return result if result else 0
-            
-            def info(self, section: str = 'stats'):
-                """Get info (limited in Upstash)"""
-                # Upstash doesn't support full INFO, return minimal stats
-                return {
-                    'keyspace_hits': 0,
-                    'keyspace_misses': 0,
-                    'used_memory_human': 'Unknown (Upstash)'
-                }
-        
-        redis_client = UpstashRedisClient(UPSTASH_REDIS_REST_URL, UPSTASH_REDIS_REST_TOKEN)
-        
-        # Test connection
-        if redis_client.ping():
-            redis_available = True
-            logger.info("✅ Upstash Redis connected successfully (REST API)")
-        else:
-            redis_client = None
-            logger.warning("⚠️ Upstash Redis ping failed")
-    else:
-        logger.warning("⚠️ UPSTASH_REDIS_REST_URL or UPSTASH_REDIS_REST_TOKEN not configured - using in-memory cache only")
-except ImportError:
-    logger.error("❌ httpx library not installed (required for Upstash)")
-    logger.warning("⚠️ Falling back to in-memory cache only")
-except Exception as e:
-    logger.error(f"❌ Upstash Redis connection failed: {e}")
-    logger.warning("⚠️ Falling back to in-memory cache only")
+from app.upstash_client import redis_client, redis_available
 
 # ============================================================
 # IN-MEMORY STORAGE (Fallback)
@@ -128,6 +38,120 @@ _memory_sessions_lock = threading.Lock()
 _last_cleanup = time.time()
 CLEANUP_INTERVAL = 600  # Clean stale sessions every 10 minutes
 SESSION_TTL = 3600  # 1 hour
+SESSION_COMMIT_RETRIES = 3  # Version-conflict retries for unit-of-work write-back
+
+# ============================================================
+# REQUEST-SCOPED SESSION SNAPSHOT (UNIT OF WORK)
+# ============================================================
+
+_active_unit_of_work = contextvars.ContextVar('voxmill_session_unit_of_work', default=None)
+
+# KEYS: session, version | ARGV: expected_version ('*' = unconditional), payload, ttl
+# Returns the new version, or -1 if expected_version is stale
+_SESSION_CAS_LUA = """
+local current = tonumber(redis.call('GET', KEYS[2]) or '0')
+if ARGV[1] ~= '*' and current ~= tonumber(ARGV[1]) then
+    return -1
+end
+redis.call('SETEX', KEYS[1], ARGV[3], ARGV[2])
+local version = redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return version
+"""
+
+_session_cas = None
+
+
+def _session_cas_script():
+    global _session_cas
+    if _session_cas is None:
+        _session_cas = redis_client.register_script(_SESSION_CAS_LUA)
+    return _session_cas
+
+
+class SessionUnitOfWork:
+    """
+    One client's session, loaded once per inbound message
+    
+    All ConversationSession instances for the same client inside the
+    scope read and mutate this copy; changes are written back once.
+    """
+    
+    def __init__(self, client_id: str):
+        self.client_id = client_id
+        self.session: Optional[Dict] = None
+        self.version = 0
+        self.dirty_fields = set()
+        self.appended_messages: List[Dict] = []
+        self.loads = 0
+        self.deferred_writes = 0
+        self.closed = False
+    
+    def reset(self):
+        self.session = None
+        self.version = 0
+        self.dirty_fields.clear()
+        self.appended_messages.clear()
+
+
+@contextmanager
+def session_unit_of_work(client_id: str):
+    """
+    Scope a single inbound message's session reads/writes
+    
+    Usage:
+        with session_unit_of_work(sender):
+            await handle_whatsapp_message(sender, message_text)
+    """
+    
+    existing = _active_unit_of_work.get()
+    if existing is not None and not existing.closed and existing.client_id == client_id:
+        # Nested scope for the same client - outer scope owns the write-back
+        yield existing
+        return
+    
+    uow = SessionUnitOfWork(client_id)
+    token = _active_unit_of_work.set(uow)
+    try:
+        yield uow
+    finally:
+        _active_unit_of_work.reset(token)
+        # Tasks spawned inside the scope inherit the context - make them write through
+        uow.closed = True
+        try:
+            ConversationSession(client_id)._commit_unit_of_work(uow)
+        except Exception as e:
+            logger.error(f"Session write-back failed for {client_id}: {e}", exc_info=True)
+
+
+@asynccontextmanager
+async def async_session_unit_of_work(client_id: str):
+    """
+    session_unit_of_work for async handlers: the write-back runs on the
+    blocking I/O executor instead of the event loop
+    
+    Usage:
+        async with async_session_unit_of_work(sender):
+            await handle_whatsapp_message(sender, message_text)
+    """
+    
+    existing = _active_unit_of_work.get()
+    if existing is not None and not existing.closed and existing.client_id == client_id:
+        yield existing
+        return
+    
+    uow = SessionUnitOfWork(client_id)
+    token = _active_unit_of_work.set(uow)
+    try:
+        yield uow
+    finally:
+        _active_unit_of_work.reset(token)
+        uow.closed = True
+        try:
+            from app.async_executor import run_blocking
+            await run_blocking(ConversationSession(client_id)._commit_unit_of_work, uow)
+        except Exception as e:
+            logger.error(f"Session write-back failed for {client_id}: {e}", exc_info=True)
 
 
 
@@ -186,6 +210,7 @@ class ConversationSession:
         self.client_id = client_id
         self.phone_number = client_id
         self.session_key = f"voxmill:session:{client_id}"
+        self.version_key = f"voxmill:session_version:{client_id}"
         self.data_limitation_mentioned = False
 
     def has_mentioned_data_limitation(self):
@@ -194,25 +219,56 @@ class ConversationSession:
     def mark_data_limitation_mentioned(self):
         self.data_limitation_mentioned = True
     
+    def _active_unit_of_work(self) -> Optional['SessionUnitOfWork']:
+        """Request-scoped snapshot for this client, if one is open"""
+        uow = _active_unit_of_work.get()
+        if uow is not None and not uow.closed and uow.client_id == self.client_id:
+            return uow
+        return None
+    
     def get_session(self) -> Dict:
         """
         Get current session state with automatic fallback
         
+        Inside session_unit_of_work() the session is loaded once and every
+        accessor shares that in-memory copy until the final write-back.
+        
         Priority:
-        1. Try Redis (if connected)
-        2. Fall back to in-memory storage
-        3. Return empty session if neither has data
+        1. Request-scoped snapshot (if a unit of work is open)
+        2. Try Redis (if connected)
+        3. Fall back to in-memory storage
+        4. Return empty session if neither has data
         """
         
+        uow = self._active_unit_of_work()
+        if uow is not None and uow.session is not None:
+            return uow.session
+        
+        session, version = self._load_session()
+        
+        if uow is not None:
+            uow.session = session
+            uow.version = version
+            uow.loads += 1
+        
+        return session
+    
+    def _load_session(self) -> Tuple[Dict, int]:
+        """Load session + write version from Redis, memory, or a fresh session"""
+        
         # TRY REDIS FIRST
         if redis_available and redis_client:
             try:
-                session_data = redis_client.get(self.session_key)
+                session_data, version = redis_client.mget(self.session_key, self.version_key)
                 
                 if session_data:
                     session = json.loads(session_data)
                     logger.debug(f"✅ REDIS: Loaded session for {self.client_id}: {len(session['messages'])} messages")
-                    return session
+                    return session, int(version or 0)
+                
+                if version is not None:
+                    # Session expired but version survives - keep CAS ordering intact
+                    return self._empty_session(), int(version)
                 
             except Exception as e:
                 logger.warning(f"Redis session read failed: {e}, trying memory")
@@ -231,7 +287,7 @@ class ConversationSession:
                     
                     if age < SESSION_TTL:
                         logger.debug(f"✅ MEMORY: Loaded session for {self.client_id}: {len(session['messages'])} messages")
-                        return session
+                        return session, 0
                     else:
                         # Stale, remove it
                         del _memory_sessions[self.client_id]
@@ -240,7 +296,127 @@ class ConversationSession:
         
         # NO SESSION FOUND - return empty
         logger.debug(f"❌ No session found for {self.client_id}, creating new")
-        return self._empty_session()
+        return self._empty_session(), 0
+    
+    def _save_session(self, session: Dict, *fields: str, appended_message: Dict = None):
+        """
+        Persist session changes
+        
+        Inside a unit of work the write is deferred: the changed top-level
+        fields are recorded and flushed once by _commit_unit_of_work().
+        Otherwise the session is written through immediately.
+        """
+        
+        uow = self._active_unit_of_work()
+        if uow is not None:
+            uow.session = session
+            uow.dirty_fields.update(fields)
+            if appended_message is not None:
+                uow.appended_messages.append(appended_message)
+            uow.deferred_writes += 1
+            return
+        
+        self._write_session(session)
+    
+    def _write_session(self, session: Dict, expected_version: Optional[int] = None) -> Optional[int]:
+        """
+        Write session to Redis (versioned) + memory
+        
+        Returns: new version, -1 if expected_version no longer matches,
+                 None if Redis is unavailable
+        """
+        
+        new_version = None
+        
+        if redis_available and redis_client:
+            try:
+                result = _session_cas_script()(
+                    [self.session_key, self.version_key],
+                    [
+                        '*' if expected_version is None else expected_version,
+                        json.dumps(session),
+                        self.SESSION_TTL
+                    ]
+                )
+                if result is not None:
+                    new_version = int(result)
+                    if new_version < 0:
+                        # Conflict - caller merges and retries; don't touch memory copy
+                        return new_version
+                    logger.debug(f"💾 REDIS: Session saved for {self.client_id} (v{new_version})")
+            except Exception as e:
+                logger.warning(f"Redis session write failed: {e}, using memory only")
+        
+        # ALWAYS SAVE TO MEMORY AS BACKUP
+        with _memory_sessions_lock:
+            _memory_sessions[self.client_id] = session
+        
+        return new_version
+    
+    def _commit_unit_of_work(self, uow: 'SessionUnitOfWork'):
+        """
+        Single write-back for a request-scoped session
+        
+        Guarded by the version loaded at the start of the request. If another
+        message committed in between, reload the latest session, re-apply
+        only the fields this request changed, and retry.
+        """
+        
+        if uow.session is None or not uow.dirty_fields:
+            return
+        
+        session = uow.session
+        expected_version = uow.version
+        
+        for attempt in range(SESSION_COMMIT_RETRIES):
+            result = self._write_session(session, expected_version)
+            
+            if result is None or result >= 0:
+                logger.debug(
+                    f"💾 Session committed for {self.client_id}: "
+                    f"{uow.loads} load(s), {uow.deferred_writes} deferred write(s), "
+                    f"fields={sorted(uow.dirty_fields)}"
+                )
+                return
+            
+            logger.warning(f"⚠️ Session version conflict for {self.client_id} (attempt {attempt + 1}), merging")
+            latest, expected_version = self._load_session()
+            session = self._merge_session(latest, uow)
+        
+        # Out of retries - last writer wins rather than dropping the exchange
+        logger.error(f"❌ Session commit kept conflicting for {self.client_id}, forcing write")
+        self._write_session(session)
+    
+    def _merge_session(self, latest: Dict, uow: 'SessionUnitOfWork') -> Dict:
+        """Re-apply this request's changed fields on top of a newer session"""
+        
+        merged = latest
+        
+        for field in uow.dirty_fields:
+            if field == 'messages':
+                merged['messages'] = (latest.get('messages', []) + uow.appended_messages)[-self.MAX_CONTEXT_MESSAGES:]
+            elif field == 'total_exchanges':
+                merged['total_exchanges'] = latest.get('total_exchanges', 0) + len(uow.appended_messages)
+            elif field in uow.session:
+                merged[field] = uow.session[field]
+            else:
+                merged.pop(field, None)
+        
+        return merged
+    
+    def set_fields(self, **fields):
+        """
+        Set top-level session fields and record them as changed
+        
+        Use instead of writing into get_session() directly - only recorded
+        fields are flushed (and re-applied after a version conflict).
+        """
+        try:
+            session = self.get_session()
+            session.update(fields)
+            self._save_session(session, *fields)
+        except Exception as e:
+            logger.error(f"Error setting session fields {sorted(fields)} for {self.client_id}: {e}", exc_info=True)
     
     def update_session(self, user_message: str, assistant_response: str, 
                        metadata: Dict = None):
@@ -274,22 +450,11 @@ class ConversationSession:
             # CRITICAL: Extract and update contextual entities
             self._extract_context_entities(session, user_message, metadata)
             
-            # SAVE TO REDIS (if available)
-            if redis_available and redis_client:
-                try:
-                    redis_client.setex(
-                        self.session_key,
-                        self.SESSION_TTL,
-                        json.dumps(session)
-                    )
-                    logger.debug(f"💾 REDIS: Session saved for {self.client_id}: {session['total_exchanges']} exchanges")
-                except Exception as e:
-                    logger.warning(f"Redis session write failed: {e}, using memory only")
-            
-            # ALWAYS SAVE TO MEMORY AS BACKUP
-            with _memory_sessions_lock:
-                _memory_sessions[self.client_id] = session
-                logger.debug(f"💾 MEMORY: Session saved for {self.client_id}: {session['total_exchanges']} exchanges")
+            self._save_session(
+                session, 'messages', 'last_updated', 'total_exchanges', 'context_entities',
+                appended_message=exchange
+            )
+            logger.debug(f"💾 Session updated for {self.client_id}: {session['total_exchanges']} exchanges")
             
         except Exception as e:
             logger.error(f"Error updating session: {e}", exc_info=True)
@@ -297,11 +462,11 @@ class ConversationSession:
     def get_consecutive_gibberish_count(self) -> int:
         """Get gibberish counter from MongoDB"""
         try:
-            from pymongo import MongoClient
+            from app.mongo_pool import get_mongo_client
             MONGODB_URI = os.getenv('MONGODB_URI')
         
             if MONGODB_URI:
-                mongo_client = MongoClient(MONGODB_URI)
+                mongo_client = get_mongo_client()
                 db = mongo_client['Voxmill']
             
                 session = db['conversation_sessions'].find_one({'phone_number': self.phone_number})
@@ -313,11 +478,11 @@ class ConversationSession:
     def set_consecutive_gibberish_count(self, count: int):
         """Persist gibberish counter to MongoDB"""
         try:
-            from pymongo import MongoClient
+            from app.mongo_pool import get_mongo_client
             MONGODB_URI = os.getenv('MONGODB_URI')
         
             if MONGODB_URI:
-                mongo_client = MongoClient(MONGODB_URI)
+                mongo_client = get_mongo_client()
                 db = mongo_client['Voxmill']
             
                 db['conversation_sessions'].update_one(
@@ -343,20 +508,7 @@ class ConversationSession:
             
             session['silenced_until'] = silence_until
             
-            # Save to Redis
-            if redis_available and redis_client:
-                try:
-                    redis_client.setex(
-                        self.session_key,
-                        self.SESSION_TTL,
-                        json.dumps(session)
-                    )
-                except Exception as e:
-                    logger.warning(f"Redis silence mode save failed: {e}")
-            
-            # Save to memory
-            with _memory_sessions_lock:
-                _memory_sessions[self.client_id] = session
+            self._save_session(session, 'silenced_until')
             
             logger.warning(f"🔇 SILENCED: {self.client_id} until {silence_until}")
             
@@ -384,8 +536,7 @@ class ConversationSession:
                     del session['silenced_until']
                     
                     # Save cleared state
-                    with _memory_sessions_lock:
-                        _memory_sessions[self.client_id] = session
+                    self._save_session(session, 'silenced_until')
                 
                 return False
             
@@ -718,22 +869,8 @@ class ConversationSession:
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
             
-            # Save to Redis (if available)
-            if redis_available and redis_client:
-                try:
-                    redis_client.setex(
-                        self.session_key,
-                        self.SESSION_TTL,
-                        json.dumps(session)
-                    )
-                    logger.debug(f"💾 REDIS: Stored last analysis for {self.client_id}: {len(content)} chars")
-                except Exception as e:
-                    logger.warning(f"Redis analysis storage failed: {e}, using memory only")
-            
-            # ALWAYS save to memory as backup
-            with _memory_sessions_lock:
-                _memory_sessions[self.client_id] = session
-                logger.debug(f"💾 MEMORY: Stored last analysis for {self.client_id}: {len(content)} chars")
+            self._save_session(session, 'last_analysis_payload')
+            logger.debug(f"💾 Stored last analysis for {self.client_id}: {len(content)} chars")
             
         except Exception as e:
             logger.error(f"Error storing last analysis for {self.client_id}: {e}", exc_info=True)
@@ -788,22 +925,8 @@ class ConversationSession:
                 'expires_at': (datetime.now(timezone.utc) + timedelta(minutes=10)).isoformat()
             }
             
-            # Save to Redis (if available)
-            if redis_available and redis_client:
-                try:
-                    redis_client.setex(
-                        self.session_key,
-                        self.SESSION_TTL,
-                        json.dumps(session)
-                    )
-                    logger.debug(f"🔒 REDIS: Comparison locked for {self.client_id}: {region1} vs {region2}")
-                except Exception as e:
-                    logger.warning(f"Redis comparison lock failed: {e}, using memory only")
-            
-            # ALWAYS save to memory as backup
-            with _memory_sessions_lock:
-                _memory_sessions[self.client_id] = session
-                logger.info(f"🔒 MEMORY: Comparison locked: {region1} vs {region2} (expires in 10 min)")
+            self._save_session(session, 'locked_comparison')
+            logger.info(f"🔒 Comparison locked: {region1} vs {region2} (expires in 10 min)")
             
         except Exception as e:
             logger.error(f"Error locking comparison for {self.client_id}: {e}", exc_info=True)
@@ -849,20 +972,7 @@ class ConversationSession:
             if 'locked_comparison' in session:
                 del session['locked_comparison']
                 
-                # Save to Redis
-                if redis_available and redis_client:
-                    try:
-                        redis_client.setex(
-                            self.session_key,
-                            self.SESSION_TTL,
-                            json.dumps(session)
-                        )
-                    except Exception as e:
-                        logger.warning(f"Redis lock clear failed: {e}")
-                
-                # Save to memory
-                with _memory_sessions_lock:
-                    _memory_sessions[self.client_id] = session
+                self._save_session(session, 'locked_comparison')
                 
                 logger.info(f"🔓 Comparison lock cleared for {self.client_id}")
         
@@ -883,20 +993,7 @@ class ConversationSession:
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
             
-            # Save to Redis
-            if redis_available and redis_client:
-                try:
-                    redis_client.setex(
-                        self.session_key,
-                        self.SESSION_TTL,
-                        json.dumps(session)
-                    )
-                except Exception as e:
-                    logger.warning(f"Redis save comparison response failed: {e}")
-            
-            # Save to memory
-            with _memory_sessions_lock:
-                _memory_sessions[self.client_id] = session
+            self._save_session(session, 'last_comparison_response')
             
             logger.debug(f"💾 Saved comparison response for {self.client_id}")
         
@@ -1003,7 +1100,12 @@ class ConversationSession:
     def clear_session(self):
         """Clear conversation session (start fresh)"""
         
-        # Clear from Redis
+        # Drop any request-scoped snapshot so nothing is written back over the clear
+        uow = self._active_unit_of_work()
+        if uow is not None:
+            uow.reset()
+        
+        # Clear from Redis (version key survives so in-flight commits still conflict)
         if redis_available and redis_client:
             try:
                 redis_client.delete(self.session_key)
@@ -1060,21 +1162,7 @@ class ConversationSession:
             
             session['pending_question'] = pending_question
             
-            # Save to Redis
-            if redis_available and redis_client:
-                try:
-                    redis_client.setex(
-                        self.session_key,
-                        self.SESSION_TTL,
-                        json.dumps(session)
-                    )
-                    logger.debug(f"💾 REDIS: Pending question saved for {self.client_id}")
-                except Exception as e:
-                    logger.warning(f"Redis pending question save failed: {e}")
-            
-            # Save to memory
-            with _memory_sessions_lock:
-                _memory_sessions[self.client_id] = session
+            self._save_session(session, 'pending_question')
             
             logger.info(f"✅ SACRED LOOP: Question marked for {self.client_id} (type={q_type}, intent={origin_intent})")
         
@@ -1158,20 +1246,7 @@ class ConversationSession:
             if 'pending_question' in session:
                 del session['pending_question']
                 
-                # Save to Redis
-                if redis_available and redis_client:
-                    try:
-                        redis_client.setex(
-                            self.session_key,
-                            self.SESSION_TTL,
-                            json.dumps(session)
-                        )
-                    except Exception as e:
-                        logger.warning(f"Redis clear pending question failed: {e}")
-                
-                # Save to memory
-                with _memory_sessions_lock:
-                    _memory_sessions[self.client_id] = session
+                self._save_session(session, 'pending_question')
                 
                 logger.info(f"✅ SACRED LOOP: Pending question cleared for {self.client_id}")
         
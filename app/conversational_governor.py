@@ -22,8 +22,21 @@ from typing import Optional, List, Tuple, Dict
 from dataclasses import dataclass
 from openai import AsyncOpenAI
 
+from app.intent_classifier import classify_locally, has_conversation_context, log_governance_decision
+from app.governance_cache import governance_cache
+
 logger = logging.getLogger(__name__)
 
+_mandate_client: Optional[AsyncOpenAI] = None
+
+
+def _get_mandate_client() -> AsyncOpenAI:
+    """Shared client for mandate checks (keeps the HTTP connection pool warm)"""
+    global _mandate_client
+    if _mandate_client is None:
+        _mandate_client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return _mandate_client
+
 
 class Intent(Enum):
     """Finite intent taxonomy (18 classes)"""
@@ -723,13 +736,45 @@ class ConversationalGovernor:
         # Just return False - let LLM handle everything
         return False, None
     
+    @staticmethod
+    def _apply_mandate_decision(decision: Dict) -> Tuple[bool, SemanticCategory, float, bool]:
+        # Store intent_type, dismissal flag and requested region for downstream routing
+        # Returns: (is_relevant, semantic_category, confidence, is_human_signal)
+        ConversationalGovernor._last_intent_type = decision.get('intent_type')
+        ConversationalGovernor._is_dismissal = decision.get('is_dismissal', False)
+        ConversationalGovernor._requested_region = decision.get('requested_region')
+        
+        try:
+            semantic_category = SemanticCategory(decision.get('semantic_category', 'non_domain'))
+        except ValueError:
+            semantic_category = SemanticCategory.NON_DOMAIN
+        
+        return (
+            decision.get('is_mandate_relevant', False),
+            semantic_category,
+            decision.get('confidence', 0.5),
+            decision.get('is_human_signal', False)
+        )
+    
     @staticmethod
     async def _check_mandate_relevance(message: str, conversation_context: Dict = None) -> Tuple[bool, SemanticCategory, float, bool]:
         # LLM-based mandate relevance check
         # Returns: (is_relevant, semantic_category, confidence, is_human_signal)
         # Also sets ConversationalGovernor._last_intent_type for downstream routing
         
-        client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        # Recurring message + same context: reuse the earlier LLM decision
+        cached = await governance_cache.get(message, conversation_context)
+        if cached:
+            logger.info(f"♻️ Cached mandate check: intent={cached.get('intent_type')}, relevant={cached.get('is_mandate_relevant')}")
+            return ConversationalGovernor._apply_mandate_decision(cached)
+        
+        # Local fast path: confident predictions skip the LLM round trip
+        local = classify_locally(message, conversation_context)
+        if local:
+            logger.info(f"⚡ Local mandate check: relevant={local['is_mandate_relevant']}, category={local['semantic_category']}, intent={local['intent_type']}, confidence={local['confidence']:.2f}")
+            return ConversationalGovernor._apply_mandate_decision(local)
+        
+        client = _get_mandate_client()
         
         # Build context string
         context_str = ""
@@ -839,38 +884,18 @@ META-STRATEGIC EXAMPLES (ALWAYS relevant=true, intent_type=trust_authority):
             
             result = json.loads(result_text)
             
-            is_relevant = result.get('is_mandate_relevant', False)
             category_str = result.get('semantic_category', 'non_domain')
             confidence = result.get('confidence', 0.5)
-            intent_type = result.get('intent_type')
-            is_human_signal = result.get('is_human_signal', False)
-            is_dismissal = result.get('is_dismissal', False)
             
-            # Store intent_type AND dismissal flag for downstream routing
-            ConversationalGovernor._last_intent_type = intent_type
-            ConversationalGovernor._is_dismissal = is_dismissal
-
-            # Store requested region for scope override validation
-            requested_region = result.get('requested_region')
-            ConversationalGovernor._requested_region = requested_region
-            
-            # Map string to enum
-            category_map = {
-                'competitive_intelligence': SemanticCategory.COMPETITIVE_INTELLIGENCE,
-                'market_dynamics': SemanticCategory.MARKET_DYNAMICS,
-                'strategic_positioning': SemanticCategory.STRATEGIC_POSITIONING,
-                'temporal_analysis': SemanticCategory.TEMPORAL_ANALYSIS,
-                'surveillance': SemanticCategory.SURVEILLANCE,
-                'administrative': SemanticCategory.ADMINISTRATIVE,
-                'social': SemanticCategory.SOCIAL,
-                'non_domain': SemanticCategory.NON_DOMAIN
-            }
+            logger.info(f"LLM mandate check: relevant={result.get('is_mandate_relevant', False)}, category={category_str}, intent={result.get('intent_type')}, dismissal={result.get('is_dismissal', False)}, confidence={confidence:.2f}")
             
-            semantic_category = category_map.get(category_str, SemanticCategory.NON_DOMAIN)
+            # LLM decisions are the fast-path classifier's training labels
+            from app.async_executor import fire_and_forget
+            fire_and_forget(log_governance_decision, message, result, 'llm', has_conversation_context(conversation_context))
             
-            logger.info(f"LLM mandate check: relevant={is_relevant}, category={category_str}, intent={intent_type}, dismissal={is_dismissal}, confidence={confidence:.2f}")
+            await governance_cache.put(message, conversation_context, result)
             
-            return is_relevant, semantic_category, confidence, is_human_signal
+            return ConversationalGovernor._apply_mandate_decision(result)
             
         except Exception as e:
             logger.error(f"Mandate relevance check failed: {e}")
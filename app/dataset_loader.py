@@ -8,6 +8,8 @@ VOXMILL INSTITUTIONAL-GRADE DATA STACK - PRODUCTION-SAFE EDITION
 ✅ Multi-industry routing
 ✅ Circuit breaker pattern
 ✅ Data quality validation
+✅ Single-flight cache misses + stale-while-revalidate background refresh
+✅ Precomputed intelligence layers (velocity, micromarkets, agents, trends) per build
 """
 
 import os
@@ -21,10 +23,17 @@ import statistics
 import feedparser
 import hashlib
 import json
+import queue
+import itertools
+import threading
+from collections import Counter
 from functools import wraps
 from openai import OpenAI
 from bs4 import BeautifulSoup
 
+from app.single_flight import SingleFlight, load_with_redis_lock
+from app.upstash_client import redis_client, redis_available
+
 logger = logging.getLogger(__name__)
 
 # ============================================================
@@ -132,30 +141,39 @@ class CircuitBreaker:
         self.timeout = timeout
         self.failures = {}
         self.open_until = {}
+        self._lock = threading.Lock()  # Regions are fetched concurrently
+    
+    def is_open(self, service_name: str) -> bool:
+        """True while the breaker is tripped (no reset side effects)"""
+        with self._lock:
+            return time.time() < self.open_until.get(service_name, 0)
     
     def call(self, service_name: str, func, *args, **kwargs):
         """Execute function with circuit breaker protection"""
         
-        if service_name in self.open_until:
-            if time.time() < self.open_until[service_name]:
-                logger.warning(f"Circuit breaker OPEN for {service_name}")
-                return None
-            else:
-                logger.info(f"Circuit breaker RESET for {service_name}")
-                del self.open_until[service_name]
-                self.failures[service_name] = 0
+        with self._lock:
+            if service_name in self.open_until:
+                if time.time() < self.open_until[service_name]:
+                    logger.warning(f"Circuit breaker OPEN for {service_name}")
+                    return None
+                else:
+                    logger.info(f"Circuit breaker RESET for {service_name}")
+                    del self.open_until[service_name]
+                    self.failures[service_name] = 0
         
         try:
             result = func(*args, **kwargs)
-            self.failures[service_name] = 0
+            with self._lock:
+                self.failures[service_name] = 0
             return result
             
         except Exception as e:
-            self.failures[service_name] = self.failures.get(service_name, 0) + 1
-            
-            if self.failures[service_name] >= self.failure_threshold:
-                self.open_until[service_name] = time.time() + self.timeout
-                logger.error(f"Circuit breaker OPENED for {service_name} after {self.failures[service_name]} failures")
+            with self._lock:
+                self.failures[service_name] = self.failures.get(service_name, 0) + 1
+                
+                if self.failures[service_name] >= self.failure_threshold:
+                    self.open_until[service_name] = time.time() + self.timeout
+                    logger.error(f"Circuit breaker OPENED for {service_name} after {self.failures[service_name]} failures")
             
             logger.error(f"{service_name} error: {e}")
             return None
@@ -163,6 +181,191 @@ class CircuitBreaker:
 
 circuit_breaker = CircuitBreaker(failure_threshold=3, timeout=300)
 
+# Per-source concurrency caps (regions load in parallel; each source has its own budget)
+SOURCE_CONCURRENCY = {
+    'rightmove': int(os.getenv('RIGHTMOVE_CONCURRENCY', '3')),
+    'zoopla': int(os.getenv('ZOOPLA_CONCURRENCY', '2')),
+    'onthemarket': int(os.getenv('ONTHEMARKET_CONCURRENCY', '2')),
+}
+_source_slots = {name: threading.BoundedSemaphore(limit) for name, limit in SOURCE_CONCURRENCY.items()}
+
+
+def _fetch_from_source(service_name: str, fetcher, area: str, max_properties: int):
+    """
+    Fetch from one source under its concurrency cap + circuit breaker
+    
+    An open breaker short-circuits before queueing for a slot, so a dead
+    source doesn't hold up parallel region loads.
+    """
+    if circuit_breaker.is_open(service_name):
+        logger.warning(f"Circuit breaker OPEN for {service_name}")
+        return None
+    
+    with _source_slots[service_name]:
+        return circuit_breaker.call(service_name, fetcher, area, max_properties)
+
+# Coalesce concurrent cache misses for the same (area, industry)
+_dataset_flight = SingleFlight('dataset')
+
+
+# ============================================================
+# BACKGROUND REFRESH (stale-while-revalidate)
+# ============================================================
+
+DATASET_REFRESH_WORKERS = int(os.getenv('DATASET_REFRESH_WORKERS', '2'))
+ACCESS_KEY_PREFIX = "voxmill:dataset_access"
+ACCESS_KEY_TTL = 3 * 86400
+
+_access_counts = Counter()           # Accesses since last flush {(area, industry): hits}
+_access_totals = Counter()           # Process-lifetime accesses (fallback ranking without Redis)
+_access_lock = threading.Lock()
+
+_refresh_queue = queue.PriorityQueue()  # (-access_hits, seq, area, industry, max_properties)
+_refresh_pending = set()
+_refresh_lock = threading.Lock()
+_refresh_seq = itertools.count()
+_refresh_workers: List[threading.Thread] = []
+
+
+def _record_dataset_access(area: str, industry: str):
+    """Count a dataset request (flushed to Redis by flush_dataset_access_counts)"""
+    with _access_lock:
+        _access_counts[(area, industry)] += 1
+        _access_totals[(area, industry)] += 1
+
+
+def _access_day_key(days_ago: int = 0) -> str:
+    day = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return f"{ACCESS_KEY_PREFIX}:{day.strftime('%Y%m%d')}"
+
+
+def flush_dataset_access_counts():
+    """Push buffered access counts into today's Redis sorted set (one pipeline)"""
+    with _access_lock:
+        pending = dict(_access_counts)
+        _access_counts.clear()
+    
+    if not pending or not (redis_available and redis_client):
+        return
+    
+    try:
+        pipe = redis_client.pipeline()
+        day_key = _access_day_key()
+        for (area, industry), hits in pending.items():
+            pipe.command("ZINCRBY", day_key, hits, f"{area}|{industry}")
+        pipe.expire(day_key, ACCESS_KEY_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Dataset access flush failed: {e}")
+        with _access_lock:
+            _access_counts.update(pending)
+
+
+def get_hot_datasets(limit: int = 20) -> List[Tuple[str, str, float]]:
+    """
+    Regions ranked by recent access frequency (across all workers)
+    
+    Today's hits count fully, yesterday's at half weight.
+    Returns: [(area, industry, score)]
+    """
+    flush_dataset_access_counts()
+    
+    scores = Counter()
+    
+    if redis_available and redis_client:
+        try:
+            pipe = redis_client.pipeline()
+            pipe.command("ZREVRANGE", _access_day_key(0), 0, limit * 2, "WITHSCORES")
+            pipe.command("ZREVRANGE", _access_day_key(1), 0, limit * 2, "WITHSCORES")
+            
+            for weight, flat in zip((1.0, 0.5), pipe.execute()):
+                flat = flat or []
+                for member, score in zip(flat[0::2], flat[1::2]):
+                    scores[member] += float(score) * weight
+        except Exception as e:
+            logger.warning(f"Dataset access ranking unavailable: {e}")
+    
+    if not scores:
+        with _access_lock:
+            for (area, industry), hits in _access_totals.items():
+                scores[f"{area}|{industry}"] = hits
+    
+    ranked = []
+    for member, score in scores.most_common(limit):
+        area, _, industry = member.rpartition('|')
+        ranked.append((area, industry, score))
+    return ranked
+
+
+def _refresh_worker():
+    while True:
+        _, _, area, industry, max_properties = _refresh_queue.get()
+        try:
+            start = time.time()
+            _load_coalesced(area, max_properties, industry)
+            logger.info(f"🔄 Background refresh complete: {area} ({time.time() - start:.1f}s)")
+        except Exception as e:
+            logger.error(f"Background refresh failed for {area}: {e}")
+        finally:
+            with _refresh_lock:
+                _refresh_pending.discard((area, industry))
+            _refresh_queue.task_done()
+
+
+def schedule_dataset_refresh(area: str, industry: str = "real_estate", max_properties: int = 100,
+                             priority: Optional[float] = None) -> bool:
+    """
+    Queue a background reload of a stale dataset
+    
+    Deduplicated per (area, industry); most-accessed regions refresh first.
+    Returns: True if queued, False if already pending
+    """
+    key = (area, industry)
+    
+    with _refresh_lock:
+        if key in _refresh_pending:
+            return False
+        _refresh_pending.add(key)
+        
+        if not _refresh_workers:
+            for i in range(DATASET_REFRESH_WORKERS):
+                worker = threading.Thread(target=_refresh_worker, name=f"dataset-refresh-{i}", daemon=True)
+                worker.start()
+                _refresh_workers.append(worker)
+    
+    if priority is None:
+        with _access_lock:
+            priority = _access_totals.get(key, 0)
+    
+    _refresh_queue.put((-priority, next(_refresh_seq), area, industry, max_properties))
+    logger.info(f"🔄 Background refresh queued: {area} (priority {priority:g}, {_refresh_queue.qsize()} queued)")
+    return True
+
+
+def refresh_hot_datasets(limit: int = 20) -> int:
+    """
+    Scheduler entry point: refresh the most-requested regions before they go stale
+    
+    Entries past 80% of the soft TTL (or missing) are queued by access rank.
+    Returns: number of refreshes queued
+    """
+    from app.cache_manager import CacheManager
+    
+    refresh_after = CacheManager.DATASET_CACHE_TTL * 0.8
+    queued = 0
+    
+    for area, industry, score in get_hot_datasets(limit):
+        if industry != "real_estate":
+            continue  # Only the real estate loader is cached
+        
+        dataset, age_seconds = CacheManager.get_dataset_cache_entry(area, vertical="real_estate", log_miss=False)
+        
+        if dataset is None or age_seconds > refresh_after:
+            if schedule_dataset_refresh(area, industry, priority=score):
+                queued += 1
+    
+    return queued
+
 
 # ============================================================
 # DATA QUALITY VALIDATOR
@@ -339,7 +542,8 @@ def _structural_only_dataset(canonical_area: str, original_area: str, industry:
 # MAIN DATASET LOADER
 # ============================================================
 
-def load_dataset(area: str, max_properties: int = 100, industry: str = "real_estate") -> Dict:
+def load_dataset(area: str, max_properties: int = 100, industry: str = "real_estate",
+                 force_refresh: bool = False) -> Dict:
     """
     Load institutional-grade dataset with intelligent multi-source fallback
     
@@ -353,6 +557,7 @@ def load_dataset(area: str, max_properties: int = 100, industry: str = "real_est
         area: Geographic area (REQUIRED)
         max_properties: Maximum items to fetch
         industry: Industry vertical code
+        force_refresh: Skip the cache read and reload (result is published to cache)
     
     Returns:
         Dataset dict with intelligence layers
@@ -366,11 +571,6 @@ def load_dataset(area: str, max_properties: int = 100, industry: str = "real_est
         logger.error("❌ No area provided to load_dataset")
         return _empty_dataset("Unknown", industry)
     
-    # ========================================
-    # INITIALIZE SYNTHETIC DATA FLAG
-    # ========================================
-    is_synthetic_data = False  # ✅ PATCH 4: Initialize flag
-    
     # ========================================
     # CANONICAL MARKET RESOLUTION
     # ========================================
@@ -406,21 +606,65 @@ def load_dataset(area: str, max_properties: int = 100, industry: str = "real_est
     # REAL ESTATE LOADER
     # ========================================
     
+    # ============================================================
+    # REDIS CACHE CHECK (stale-while-revalidate)
+    # ============================================================
+    try:
+        from app.cache_manager import CacheManager
+    except ImportError:
+        logger.debug("Cache manager not available")
+        return _load_real_estate_dataset(area, max_properties, industry)
+    
+    if force_refresh:
+        return _load_coalesced(area, max_properties, industry)
+    
+    _record_dataset_access(area, industry)
+    
+    cached_dataset, age_seconds = CacheManager.get_dataset_cache_entry(area, vertical="real_estate")
+    
+    if cached_dataset:
+        if age_seconds > CacheManager.DATASET_CACHE_TTL:
+            # Past soft TTL - serve now, refresh behind the caller
+            schedule_dataset_refresh(area, industry, max_properties)
+        logger.info(f"✅ CACHE HIT: Dataset for {area}")
+        return cached_dataset
+    
+    # Past hard TTL (or never loaded) - caller waits
+    return _load_coalesced(area, max_properties, industry)
+
+
+def _load_coalesced(area: str, max_properties: int, industry: str) -> Dict:
+    """
+    Single-flight load + publish (one loader per area, in-process + cross-worker)
+    
+    Followers only accept entries fresher than the soft TTL, so a stale
+    entry never satisfies a refresh.
+    """
+    from app.cache_manager import CacheManager
+    
+    def _publish(dataset: Dict) -> bool:
+        if not dataset or dataset.get('metadata', {}).get('is_fallback') or not dataset.get('properties'):
+            return False
+        return CacheManager.set_dataset_cache(area, dataset, vertical="real_estate")
+    
+    return _dataset_flight.do(
+        (area, industry),
+        lambda: load_with_redis_lock(
+            f"voxmill:dataset_loading:{area.lower()}:{industry}",
+            loader=lambda: _load_real_estate_dataset(area, max_properties, industry),
+            cache_lookup=lambda: CacheManager.get_dataset_cache(
+                area, vertical="real_estate", log_miss=False, max_age=CacheManager.DATASET_CACHE_TTL
+            ),
+            cache_store=_publish,
+            on_failure=lambda: _empty_dataset(area, industry)
+        )
+    )
+
+
+def _load_real_estate_dataset(area: str, max_properties: int, industry: str) -> Dict:
+    """Fetch, validate and build a real estate dataset (Rightmove → Zoopla → OnTheMarket)"""
+    
     try:
-        # ============================================================
-        # REDIS CACHE CHECK
-        # ============================================================
-        try:
-            from app.cache_manager import CacheManager
-            cache = CacheManager()
-            cached_dataset = cache.get_dataset_cache(area, vertical="real_estate")
-            
-            if cached_dataset:
-                logger.info(f"✅ CACHE HIT: Dataset for {area}")
-                return cached_dataset
-        except ImportError:
-            logger.debug("Cache manager not available")
-        
         logger.info(f"📊 Loading dataset for {area}...")
         start_time = time.time()
         
@@ -451,7 +695,7 @@ def load_dataset(area: str, max_properties: int = 100, industry: str = "real_est
             
             # Try Rightmove first (REAL DATA MODE)
             logger.info(f"🔍 Attempting Rightmove for {area}...")
-            properties = circuit_breaker.call(
+            properties = _fetch_from_source(
                 'rightmove',
                 RightmoveLiveData.fetch,
                 area,
@@ -466,7 +710,7 @@ def load_dataset(area: str, max_properties: int = 100, industry: str = "real_est
                 
                 # Fallback to Zoopla
                 logger.info(f"🔍 Attempting Zoopla fallback for {area}...")
-                properties = circuit_breaker.call(
+                properties = _fetch_from_source(
                     'zoopla',
                     ZooplaLiveData.fetch,
                     area,
@@ -481,7 +725,7 @@ def load_dataset(area: str, max_properties: int = 100, industry: str = "real_est
                     
                     # Final fallback to OnTheMarket
                     logger.info(f"🔍 Attempting OnTheMarket fallback for {area}...")
-                    properties = circuit_breaker.call(
+                    properties = _fetch_from_source(
                         'onthemarket',
                         OnTheMarketData.fetch,
                         area,
@@ -586,6 +830,13 @@ def load_dataset(area: str, max_properties: int = 100, industry: str = "real_est
             'micromarkets': {'error': 'not_calculated'}
         }
         
+        # Precompute intelligence layers once per build (fail-open, timings in metadata['enrichment'])
+        try:
+            from app.enrichment import enrich_dataset
+            enrich_dataset(dataset, area)
+        except Exception as e:
+            logger.warning(f"⚠️ Dataset enrichment skipped for {area}: {e}")
+        
         load_time = time.time() - start_time
         logger.info(f"✅ Dataset loaded in {load_time:.2f}s from {data_source_used}")
         
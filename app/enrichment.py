@@ -0,0 +1,431 @@
+"""
+VOXMILL DATASET ENRICHMENT
+==========================
+Precomputed intelligence layers, attached once per dataset build
+
+The analytics in app/intelligence are run here when a dataset is loaded,
+so the LLM and instant-response paths read the results straight off the
+dataset instead of computing them per query.
+
+FEATURES:
+- Layer registry: name, dataset key, dependencies, TTL, compute fn
+- Independent layers run in parallel, dependants start as soon as their inputs land
+- Per-layer cache (Redis + in-process) keyed by area, layer inputs and upstream keys
+- Fail-open: a failing or slow layer keeps its placeholder, the dataset still ships
+- Per-layer timings recorded in metadata['enrichment']
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.upstash_client import redis_client, redis_available
+
+logger = logging.getLogger(__name__)
+
+ENRICHMENT_ENABLED = os.getenv('DATASET_ENRICHMENT', 'true').lower() == 'true'
+ENRICHMENT_WORKERS = int(os.getenv('ENRICHMENT_WORKERS', '4'))
+ENRICHMENT_TIMEOUT_SECONDS = float(os.getenv('ENRICHMENT_TIMEOUT_SECONDS', '20'))
+ENRICHMENT_MAX_AGENTS = int(os.getenv('ENRICHMENT_MAX_AGENTS', '10'))
+ENRICHMENT_CACHE_PREFIX = 'enrichment'
+ENRICHMENT_LOCAL_CACHE_SIZE = 512
+
+_executor = ThreadPoolExecutor(max_workers=ENRICHMENT_WORKERS, thread_name_prefix='enrichment')
+
+
+# ============================================================
+# LAYER REGISTRY
+# ============================================================
+
+class EnrichmentLayer:
+    """
+    One precomputed dataset key
+
+    compute(ctx, deps) → result stored at dataset[key]
+    inputs(ctx) → string identifying what the result depends on (besides upstream layers)
+    """
+
+    def __init__(self, name: str, key: str, compute: Callable, inputs: Callable,
+                 depends_on: Tuple[str, ...] = (), ttl: int = 3600, default=None, version: int = 1):
+        self.name = name
+        self.key = key
+        self.compute = compute
+        self.inputs = inputs
+        self.depends_on = tuple(depends_on)
+        self.ttl = ttl
+        self.default = default
+        self.version = version
+
+
+LAYERS: Dict[str, EnrichmentLayer] = {}
+
+
+def register_layer(layer: EnrichmentLayer) -> EnrichmentLayer:
+    """Add (or replace) a layer; dependencies must already be registered"""
+    missing = [d for d in layer.depends_on if d not in LAYERS]
+    if missing:
+        raise ValueError(f"Layer {layer.name} depends on unregistered layer(s): {missing}")
+    LAYERS[layer.name] = layer
+    return layer
+
+
+# ============================================================
+# LAYER CACHE
+# ============================================================
+
+_local_cache: Dict[str, Tuple[float, object]] = {}
+_local_lock = threading.Lock()
+
+
+def _cache_get(cache_key: str):
+    now = time.time()
+
+    with _local_lock:
+        entry = _local_cache.get(cache_key)
+        if entry and entry[0] > now:
+            return True, entry[1]
+
+    if redis_available and redis_client:
+        try:
+            raw = redis_client.get(cache_key)
+            if raw:
+                value = json.loads(raw)
+                ttl = redis_client.ttl(cache_key)
+                if isinstance(ttl, int) and ttl > 0:
+                    _local_put(cache_key, value, ttl)
+                return True, value
+        except Exception as e:
+            logger.debug(f"Enrichment cache read failed for {cache_key}: {e}")
+
+    return False, None
+
+
+def _local_put(cache_key: str, value, ttl: int):
+    with _local_lock:
+        if len(_local_cache) >= ENRICHMENT_LOCAL_CACHE_SIZE:
+            now = time.time()
+            for k in [k for k, (expires, _) in _local_cache.items() if expires <= now]:
+                del _local_cache[k]
+            if len(_local_cache) >= ENRICHMENT_LOCAL_CACHE_SIZE:
+                del _local_cache[min(_local_cache, key=lambda k: _local_cache[k][0])]
+        _local_cache[cache_key] = (time.time() + ttl, value)
+
+
+def _cache_put(cache_key: str, value, ttl: int):
+    # Round-trip through JSON so local hits look exactly like Redis hits
+    try:
+        payload = json.dumps(value, default=str)
+    except Exception as e:
+        logger.debug(f"Enrichment result not cacheable ({cache_key}): {e}")
+        return
+
+    _local_put(cache_key, json.loads(payload), ttl)
+
+    if redis_available and redis_client:
+        try:
+            redis_client.setex(cache_key, ttl, payload)
+        except Exception as e:
+            logger.debug(f"Enrichment cache write failed for {cache_key}: {e}")
+
+
+def _layer_cache_key(layer: EnrichmentLayer, area: str, input_key: str, dep_keys: List[str]) -> str:
+    material = '|'.join([layer.name, str(layer.version), area, input_key, *dep_keys])
+    digest = hashlib.sha1(material.encode('utf-8')).hexdigest()[:20]
+    return f"{ENRICHMENT_CACHE_PREFIX}:{layer.name}:{area.lower().replace(' ', '_')}:{digest}"
+
+
+def clear_enrichment_cache():
+    """Drop in-process layer results (Redis entries expire on their own TTL)"""
+    with _local_lock:
+        _local_cache.clear()
+
+
+# ============================================================
+# PIPELINE
+# ============================================================
+
+class EnrichmentContext:
+    """Inputs shared by every layer of one dataset build"""
+
+    def __init__(self, area: str, dataset: Dict):
+        self.area = area
+        self.dataset = dataset
+        self.properties = dataset.get('properties', [])
+        self.today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        self._fingerprint = None
+
+    @property
+    def property_fingerprint(self) -> str:
+        """Stable hash of the listing set (address + price + agent)"""
+        if self._fingerprint is None:
+            from app.intelligence.snapshot_diff import normalize_address
+
+            rows = sorted(
+                f"{normalize_address(p.get('address'))}|{p.get('price')}|{p.get('agent', '')}"
+                for p in self.properties
+            )
+            self._fingerprint = hashlib.sha1('\n'.join(rows).encode('utf-8')).hexdigest()
+        return self._fingerprint
+
+
+def _topological_order() -> List[EnrichmentLayer]:
+    ordered, seen = [], set()
+
+    def _visit(name: str):
+        if name in seen:
+            return
+        seen.add(name)
+        for dep in LAYERS[name].depends_on:
+            _visit(dep)
+        ordered.append(LAYERS[name])
+
+    for name in LAYERS:
+        _visit(name)
+    return ordered
+
+
+def _run_layer(layer: EnrichmentLayer, ctx: EnrichmentContext, deps: Dict, cache_key: str) -> Tuple[object, Dict]:
+    started = time.perf_counter()
+
+    hit, value = _cache_get(cache_key)
+    if hit:
+        return value, {'status': 'ok', 'cached': True, 'seconds': round(time.perf_counter() - started, 4)}
+
+    value = layer.compute(ctx, deps)
+    _cache_put(cache_key, value, layer.ttl)
+    return value, {'status': 'ok', 'cached': False, 'seconds': round(time.perf_counter() - started, 4)}
+
+
+def enrich_dataset(dataset: Dict, area: str, layers: Optional[List[str]] = None) -> Dict:
+    """
+    Attach precomputed intelligence layers to a freshly built dataset (in place)
+
+    Args:
+        dataset: Dataset from the loader (properties, metrics, metadata, ...)
+        area: Market area
+        layers: Subset of layer names to run (default: all registered)
+
+    Returns: The same dataset, with layer keys filled and metadata['enrichment'] set
+    """
+    if not ENRICHMENT_ENABLED or not dataset.get('properties'):
+        return dataset
+
+    started = time.perf_counter()
+    ctx = EnrichmentContext(area, dataset)
+
+    selected = [l for l in _topological_order() if layers is None or l.name in layers]
+    pending = {l.name: l for l in selected}
+    results: Dict[str, object] = {}
+    cache_keys: Dict[str, str] = {}
+    timings: Dict[str, Dict] = {}
+    running = {}
+
+    def _schedule():
+        for name, layer in list(pending.items()):
+            if any(dep in pending or dep in running.values() for dep in layer.depends_on):
+                continue
+
+            del pending[name]
+
+            failed = [dep for dep in layer.depends_on if dep not in cache_keys]
+            if failed:
+                timings[name] = {'status': 'skipped', 'cached': False, 'seconds': 0.0,
+                                 'reason': f"dependency failed: {', '.join(failed)}"}
+                continue
+
+            deps = {dep: results[dep] for dep in layer.depends_on}
+            try:
+                input_key = layer.inputs(ctx)
+            except Exception as e:
+                timings[name] = {'status': 'error', 'cached': False, 'seconds': 0.0, 'reason': str(e)}
+                continue
+
+            cache_key = _layer_cache_key(layer, area, input_key, [cache_keys[d] for d in layer.depends_on])
+            running[_executor.submit(_run_layer, layer, ctx, deps, cache_key)] = name
+            cache_keys[name] = cache_key
+
+    _schedule()
+    deadline = started + ENRICHMENT_TIMEOUT_SECONDS
+
+    while running:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+
+        done, _ = wait(list(running), timeout=remaining, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            name = running.pop(future)
+            try:
+                results[name], timings[name] = future.result()
+            except Exception as e:
+                logger.warning(f"⚠️ Enrichment layer {name} failed for {area}: {e}")
+                timings[name] = {'status': 'error', 'cached': False, 'seconds': None, 'reason': str(e)}
+                cache_keys.pop(name, None)
+
+        _schedule()
+
+    # Whatever is still running or never got scheduled keeps its placeholder
+    for future, name in running.items():
+        future.cancel()
+        cache_keys.pop(name, None)
+        timings[name] = {'status': 'timeout', 'cached': False, 'seconds': None}
+    for name in pending:
+        timings[name] = {'status': 'skipped', 'cached': False, 'seconds': 0.0, 'reason': 'timeout'}
+
+    for layer in selected:
+        if layer.name in results:
+            dataset[layer.key] = results[layer.name]
+        elif layer.key not in dataset:
+            dataset[layer.key] = layer.default
+
+    total = time.perf_counter() - started
+    dataset.setdefault('metadata', {})['enrichment'] = {
+        'layers': timings,
+        'total_seconds': round(total, 4),
+        'computed_at': datetime.now(timezone.utc).isoformat()
+    }
+
+    cached = sum(1 for t in timings.values() if t.get('cached'))
+    failed = sum(1 for t in timings.values() if t['status'] != 'ok')
+    logger.info(f"✅ Enrichment for {area}: {len(results)}/{len(selected)} layers "
+                f"({cached} cached, {failed} failed) in {total:.2f}s")
+
+    return dataset
+
+
+# ============================================================
+# BUILT-IN LAYERS
+# ============================================================
+
+def _top_agents(properties: List[Dict], limit: int) -> List[str]:
+    counts: Dict[str, int] = {}
+    for prop in properties:
+        agent = prop.get('agent')
+        if agent and agent != 'Unknown':
+            counts[agent] = counts.get(agent, 0) + 1
+    return [a for a, _ in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]]
+
+
+def _compute_micromarkets(ctx: EnrichmentContext, deps: Dict) -> Dict:
+    from app.intelligence.micromarket_segmenter import segment_micromarkets
+    return segment_micromarkets(ctx.properties, ctx.area)
+
+
+def _compute_liquidity_velocity(ctx: EnrichmentContext, deps: Dict) -> Dict:
+    from app.historical_storage import get_snapshot_property_lists
+    from app.intelligence.liquidity_velocity import calculate_liquidity_velocity
+    return calculate_liquidity_velocity(ctx.properties, get_snapshot_property_lists(ctx.area, days=30))
+
+
+def _compute_detected_trends(ctx: EnrichmentContext, deps: Dict) -> List[Dict]:
+    from app.intelligence.trend_detector import detect_market_trends
+    return detect_market_trends(ctx.area, lookback_days=14)
+
+
+def _compute_agent_profiles(ctx: EnrichmentContext, deps: Dict) -> List[Dict]:
+    """Archetype per top agent, flattened to the shape the LLM / instant paths and clustering read"""
+    from app.historical_storage import get_agent_behavioral_history
+    from app.intelligence.agent_profiler import classify_agent_archetype_v2
+
+    profiles = []
+    for agent in _top_agents(ctx.properties, ENRICHMENT_MAX_AGENTS):
+        profile = classify_agent_archetype_v2(agent, get_agent_behavioral_history(agent, ctx.area, days=60))
+        if profile.get('error'):
+            continue
+
+        fingerprint = profile['behavioral_fingerprint']
+        profiles.append({
+            'agent': agent,
+            'archetype': profile['primary_archetype'],
+            'confidence': profile['primary_confidence'],
+            'behavioral_pattern': profile['archetype_definition']['behavior'],
+            'secondary_archetype': profile['secondary_archetype'],
+            'prediction_reliability': profile['prediction_reliability'],
+            'sample_size': profile['sample_size'],
+            # Behavioral vector inputs for clustering (0-1 scales: 1.0x market magnitude → 0.5,
+            # 10%+ move stdev → fully volatile)
+            'aggressiveness': min(1.0, fingerprint['magnitude_aggressiveness'] / 2),
+            'avg_response_days': fingerprint['avg_response_days'],
+            'premium_positioning': fingerprint['premium_positioning'],
+            'volatility': round(min(1.0, fingerprint['volatility'] / 10), 3),
+            'consistency': fingerprint['consistency'],
+            'initiation_rate': fingerprint['initiation_rate']
+        })
+
+    profiles.sort(key=lambda p: p['confidence'], reverse=True)
+    return profiles
+
+
+def _compute_liquidity_windows(ctx: EnrichmentContext, deps: Dict) -> Dict:
+    from app.historical_storage import get_historical_snapshots
+    from app.intelligence.liquidity_window_predictor import predict_liquidity_windows
+
+    velocity = deps['liquidity_velocity']
+    if not velocity or velocity.get('error'):
+        return {'error': 'no_current_velocity', 'message': 'Liquidity velocity unavailable'}
+
+    history = [{
+        'liquidity_velocity': s.get('liquidity_velocity') or {},
+        'metadata': {'analysis_timestamp': s['timestamp'].isoformat() if s.get('timestamp') else None}
+    } for s in reversed(get_historical_snapshots(ctx.area, days=60))]
+
+    return predict_liquidity_windows(ctx.area, velocity, history)
+
+
+def _compute_behavioral_clusters(ctx: EnrichmentContext, deps: Dict) -> Dict:
+    from app.intelligence.behavioral_clustering import cluster_agents_by_behavior
+    return cluster_agents_by_behavior(ctx.area, deps['agent_profiles'])
+
+
+# History-backed layers change at most once a day (daily snapshots); listing-backed
+# layers change whenever the listing set does.
+register_layer(EnrichmentLayer(
+    'micromarkets', 'micromarkets', _compute_micromarkets,
+    inputs=lambda ctx: ctx.property_fingerprint,
+    ttl=int(os.getenv('ENRICHMENT_TTL_MICROMARKETS', '21600')),
+    default={'error': 'not_calculated'}
+))
+
+register_layer(EnrichmentLayer(
+    'liquidity_velocity', 'liquidity_velocity', _compute_liquidity_velocity,
+    inputs=lambda ctx: f"{ctx.property_fingerprint}|{ctx.today}",
+    ttl=int(os.getenv('ENRICHMENT_TTL_VELOCITY', '3600')),
+    default={'error': 'not_calculated'}
+))
+
+register_layer(EnrichmentLayer(
+    'detected_trends', 'detected_trends', _compute_detected_trends,
+    inputs=lambda ctx: ctx.today,
+    ttl=int(os.getenv('ENRICHMENT_TTL_TRENDS', '1800')),
+    default=[]
+))
+
+register_layer(EnrichmentLayer(
+    'agent_profiles', 'agent_profiles', _compute_agent_profiles,
+    inputs=lambda ctx: f"{','.join(_top_agents(ctx.properties, ENRICHMENT_MAX_AGENTS))}|{ctx.today}",
+    ttl=int(os.getenv('ENRICHMENT_TTL_AGENT_PROFILES', '21600')),
+    default=[]
+))
+
+register_layer(EnrichmentLayer(
+    'liquidity_windows', 'liquidity_windows', _compute_liquidity_windows,
+    inputs=lambda ctx: ctx.today,
+    depends_on=('liquidity_velocity',),
+    ttl=int(os.getenv('ENRICHMENT_TTL_WINDOWS', '3600')),
+    default={'error': 'not_calculated'}
+))
+
+register_layer(EnrichmentLayer(
+    'behavioral_clusters', 'behavioral_clusters', _compute_behavioral_clusters,
+    inputs=lambda ctx: '',
+    depends_on=('agent_profiles',),
+    ttl=int(os.getenv('ENRICHMENT_TTL_CLUSTERS', '21600')),
+    default={'error': 'not_calculated'}
+))
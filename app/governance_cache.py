@@ -0,0 +1,179 @@
+"""
+VOXMILL GOVERNANCE DECISION CACHE
+=================================
+Memoised mandate-check decisions, shared across workers
+
+The mandate check's answer depends only on the message text and the
+conversation context (recent regions / agents / topics), not on who sent it,
+so recurring queries ("market overview", "any updates on Knightsbridge")
+are classified once and reused for every client.
+
+FEATURES:
+- Key: normalised message (typo fixes, case/whitespace folding) + context fingerprint
+- Two levels: bounded in-process LRU, then Redis (shared across workers)
+- TTL on both levels; GOVERNANCE_CACHE_VERSION invalidates everything on prompt changes
+- Hit / miss counters per level for /metrics/governance
+- Fails open: cache errors are a miss, never a failed classification
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.upstash_client import redis_client, redis_available
+from app.utils import normalize_query
+
+logger = logging.getLogger(__name__)
+
+GOVERNANCE_CACHE_ENABLED = os.getenv('GOVERNANCE_CACHE_ENABLED', 'true').lower() == 'true'
+GOVERNANCE_CACHE_TTL_SECONDS = int(os.getenv('GOVERNANCE_CACHE_TTL_SECONDS', str(6 * 3600)))
+GOVERNANCE_CACHE_LOCAL_SIZE = int(os.getenv('GOVERNANCE_CACHE_LOCAL_SIZE', '5000'))
+GOVERNANCE_CACHE_LOCAL_TTL_SECONDS = int(os.getenv('GOVERNANCE_CACHE_LOCAL_TTL_SECONDS', '900'))
+
+# Bump when the mandate-check prompt or its output fields change
+GOVERNANCE_CACHE_VERSION = 1
+GOVERNANCE_CACHE_PREFIX = f"voxmill:governance:v{GOVERNANCE_CACHE_VERSION}"
+
+# Decision fields worth reusing (everything the mandate check returns)
+CACHED_FIELDS = (
+    'is_mandate_relevant', 'semantic_category', 'confidence', 'intent_type',
+    'is_human_signal', 'is_dismissal', 'requested_region'
+)
+
+_TRAILING_PUNCTUATION = '?!.,;: '
+
+
+def normalize_governance_message(message: str) -> str:
+    """
+    Typo-corrected, case/whitespace-folded message with trailing punctuation dropped
+
+    "Any updates on  Knightsbridge?" and "any updates on knightsbridge" share a key.
+    Messages that are only punctuation ("!!!!") keep it - that is the signal.
+    """
+    folded = ' '.join(normalize_query(message or '').casefold().split())
+    return folded.rstrip(_TRAILING_PUNCTUATION) or folded
+
+
+def context_fingerprint(conversation_context: Optional[Dict]) -> str:
+    """Order-insensitive hash of the regions / agents / topics the prompt sees"""
+    if not conversation_context:
+        return '-'
+
+    parts = []
+    for field in ('regions', 'agents', 'topics'):
+        values = sorted({str(v).casefold().strip() for v in conversation_context.get(field) or [] if v})
+        parts.append(f"{field}={','.join(values)}")
+
+    if all(p.endswith('=') for p in parts):
+        return '-'  # Empty context renders the same prompt as no context
+
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def governance_cache_key(message: str, conversation_context: Optional[Dict] = None) -> str:
+    material = f"{normalize_governance_message(message)}|{context_fingerprint(conversation_context)}"
+    return f"{GOVERNANCE_CACHE_PREFIX}:{hashlib.sha1(material.encode('utf-8')).hexdigest()[:24]}"
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+class GovernanceDecisionCache:
+    """In-process LRU in front of Redis; both levels expire entries"""
+
+    def __init__(self, max_size: int = GOVERNANCE_CACHE_LOCAL_SIZE):
+        self.max_size = max_size
+        self._local: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'local_hits': 0, 'redis_hits': 0, 'misses': 0, 'stores': 0, 'errors': 0}
+
+    def _local_get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._local.get(key)
+            if not entry:
+                return None
+            if entry[0] <= time.time():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry[1]
+
+    def _local_put(self, key: str, decision: Dict, ttl: int):
+        with self._lock:
+            self._local[key] = (time.time() + min(ttl, GOVERNANCE_CACHE_LOCAL_TTL_SECONDS), decision)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+
+    async def get(self, message: str, conversation_context: Optional[Dict] = None) -> Optional[Dict]:
+        """Cached decision for this message + context, or None"""
+        if not GOVERNANCE_CACHE_ENABLED:
+            return None
+
+        key = governance_cache_key(message, conversation_context)
+
+        decision = self._local_get(key)
+        if decision is not None:
+            self.stats['local_hits'] += 1
+            return decision
+
+        if redis_available and redis_client:
+            try:
+                raw = await redis_client.aget(key)
+                if raw:
+                    decision = json.loads(raw)
+                    self._local_put(key, decision, GOVERNANCE_CACHE_TTL_SECONDS)
+                    self.stats['redis_hits'] += 1
+                    return decision
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.debug(f"Governance cache read failed: {e}")
+
+        self.stats['misses'] += 1
+        return None
+
+    async def put(self, message: str, conversation_context: Optional[Dict], decision: Dict):
+        """Store an LLM decision (only the fields the mandate check uses)"""
+        if not GOVERNANCE_CACHE_ENABLED:
+            return
+
+        key = governance_cache_key(message, conversation_context)
+        value = {field: decision.get(field) for field in CACHED_FIELDS}
+
+        self._local_put(key, value, GOVERNANCE_CACHE_TTL_SECONDS)
+        self.stats['stores'] += 1
+
+        if redis_available and redis_client:
+            try:
+                await redis_client.asetex(key, GOVERNANCE_CACHE_TTL_SECONDS, json.dumps(value))
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.debug(f"Governance cache write failed: {e}")
+
+    def clear(self):
+        """Drop the in-process level (Redis entries expire on their own)"""
+        with self._lock:
+            self._local.clear()
+
+    def get_stats(self) -> Dict:
+        hits = self.stats['local_hits'] + self.stats['redis_hits']
+        lookups = hits + self.stats['misses']
+        return {
+            **self.stats,
+            'lookups': lookups,
+            'hit_rate': round(hits / lookups, 3) if lookups else None,
+            'local_entries': len(self._local),
+            'max_local_entries': self.max_size,
+            'ttl_seconds': GOVERNANCE_CACHE_TTL_SECONDS,
+            'redis_enabled': bool(redis_available and redis_client)
+        }
+
+
+# Global instance
+governance_cache = GovernanceDecisionCache()
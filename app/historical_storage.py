@@ -4,75 +4,187 @@ VOXMILL HISTORICAL DATA STORAGE
 Daily snapshots for intelligence layer consumption
 
 Stores:
-- Property snapshots (for velocity calculations)
-- Agent behavioral events (for profiling)
-- Market metrics (for trend detection)
+- Property deltas (new listing / price change / delisted) keyed by (area, property, date)
+- Current listing state per (area, property) - the base deltas are computed against
+- Daily market summaries (metrics, sentiment, delta counts) per (area, date)
+
+FEATURES:
+- Writes only what changed since the last snapshot (no embedded property arrays)
+- Compound indexes: agent histories + price-change lookups are indexed queries
+- Past listing sets rebuilt by replaying deltas backwards from current state
+- Retention runs as its own scheduled job, never on the write path
 """
 
 import os
 import logging
-from datetime import datetime, timezone
-from pymongo import MongoClient
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.mongo_pool import get_mongo_client
+from app.intelligence.snapshot_diff import normalize_address
 
 logger = logging.getLogger(__name__)
 
 MONGODB_URI = os.getenv("MONGODB_URI")
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
+
+HISTORY_RETENTION_DAYS = int(os.getenv('HISTORY_RETENTION_DAYS', '90'))
+
+# Listing fields tracked per property (what the intelligence layers read)
+TRACKED_FIELDS = ('address', 'price', 'price_per_sqft', 'agent', 'lat', 'lng', 'type', 'bedrooms')
+
+_indexes_ready = False
+
+
+# ============================================================
+# COLLECTIONS + INDEXES
+# ============================================================
+
+def _collections():
+    db = mongo_client['Voxmill']
+    return db['historical_snapshots'], db['property_events'], db['property_state']
+
+
+def ensure_history_indexes():
+    """Create compound indexes once per process (idempotent)"""
+    global _indexes_ready
+
+    if _indexes_ready or not mongo_client:
+        return
+
+    snapshots, events, state = _collections()
+
+    snapshots.create_index([('area', ASCENDING), ('date', DESCENDING)], unique=True, name='area_date')
+    snapshots.create_index([('timestamp', ASCENDING)], name='timestamp')
+
+    events.create_index([('area', ASCENDING), ('property_key', ASCENDING), ('date', ASCENDING)],
+                        unique=True, name='area_property_date')
+    events.create_index([('area', ASCENDING), ('agent', ASCENDING), ('date', DESCENDING)], name='area_agent_date')
+    events.create_index([('area', ASCENDING), ('event', ASCENDING), ('date', DESCENDING)], name='area_event_date')
+    events.create_index([('timestamp', ASCENDING)], name='timestamp')
+
+    state.create_index([('area', ASCENDING), ('property_key', ASCENDING)], unique=True, name='area_property')
+    state.create_index([('area', ASCENDING), ('active', ASCENDING), ('agent', ASCENDING)], name='area_active_agent')
+
+    _indexes_ready = True
+    logger.info("✅ Historical storage indexes ready")
+
 
+def property_key(prop: dict) -> Optional[str]:
+    """Stable per-listing key: normalised address (same rule as the snapshot diff engine)"""
+    return normalize_address(prop.get('address')) or None
+
+
+def _listing(prop: dict) -> dict:
+    return {field: prop.get(field) for field in TRACKED_FIELDS}
+
+
+# ============================================================
+# WRITE PATH
+# ============================================================
 
 def store_daily_snapshot(dataset: dict, area: str):
     """
     Store daily market snapshot for historical analysis
-    
-    Called every time dataset is loaded (but only stores once per day per area)
+
+    Diffs today's listings against the stored state for the area and writes
+    only the deltas, plus a one-row daily summary. Runs once per area per day.
     """
-    
+
     if not mongo_client:
         logger.warning("MongoDB not available, skipping historical storage")
         return
-    
+
     try:
-        db = mongo_client['Voxmill']
-        snapshots = db['historical_snapshots']
-        
-        # Check if we already have a snapshot for today
-        today = datetime.now(timezone.utc).date().isoformat()
-        
-        existing = snapshots.find_one({
-            'area': area,
-            'date': today
-        })
-        
-        if existing:
+        ensure_history_indexes()
+        snapshots, events, state = _collections()
+
+        now = datetime.now(timezone.utc)
+        today = now.date().isoformat()
+
+        if snapshots.find_one({'area': area, 'date': today}, {'_id': 1}):
             logger.info(f"✅ Snapshot already exists for {area} on {today}")
             return
-        
-        # Extract key data for storage
+
         properties = dataset.get('properties', [])
         metrics = dataset.get('metrics', {})
         intelligence = dataset.get('intelligence', {})
-        
-        # Store compact snapshot
+
+        if not properties or dataset.get('metadata', {}).get('is_fallback'):
+            # A failed fetch would otherwise look like every listing being delisted
+            logger.warning(f"⚠️ No live listings for {area}, skipping snapshot")
+            return
+
+        current = {}
+        for prop in properties:
+            key = property_key(prop)
+            if key:
+                current[key] = _listing(prop)
+
+        previous = {
+            doc['property_key']: doc
+            for doc in state.find({'area': area, 'active': True}, {'_id': 0, 'property_key': 1, **{f: 1 for f in TRACKED_FIELDS}})
+        }
+
+        # ---- Deltas ----
+        new_events = []
+        state_updates = []
+
+        for key, listing in current.items():
+            prev = previous.get(key)
+
+            if prev is None:
+                event = {'event': 'new', **listing}
+            elif listing['price'] and prev.get('price') and listing['price'] != prev['price']:
+                event = {'event': 'price_change', 'previous_price': prev['price'], **listing}
+            else:
+                continue
+
+            new_events.append({'area': area, 'property_key': key, 'date': today, 'timestamp': now, **event})
+            state_updates.append(UpdateOne(
+                {'area': area, 'property_key': key},
+                {'$set': {**listing, 'active': True, 'updated_at': now},
+                 '$setOnInsert': {'first_seen': today}},
+                upsert=True
+            ))
+
+        for key, prev in previous.items():
+            if key not in current:
+                listing = {field: prev.get(field) for field in TRACKED_FIELDS}
+                new_events.append({'area': area, 'property_key': key, 'date': today, 'timestamp': now,
+                                   'event': 'delisted', **listing})
+                state_updates.append(UpdateOne(
+                    {'area': area, 'property_key': key},
+                    {'$set': {'active': False, 'delisted_on': today, 'updated_at': now}}
+                ))
+
+        # Events first, then state, then the summary - a retry after a crash
+        # recomputes the same deltas and the unique index drops duplicates
+        if new_events:
+            try:
+                events.insert_many(new_events, ordered=False)
+            except BulkWriteError as e:
+                if any(err.get('code') != 11000 for err in e.details.get('writeErrors', [])):
+                    raise
+
+        if state_updates:
+            state.bulk_write(state_updates, ordered=False)
+
+        delta_counts = {'new': 0, 'price_change': 0, 'delisted': 0}
+        for event in new_events:
+            delta_counts[event['event']] += 1
+
         snapshot = {
             'area': area,
             'date': today,
-            'timestamp': datetime.now(timezone.utc),
-            
-            # Properties (compressed - only essential fields)
-            'properties': [
-                {
-                    'address': p.get('address'),
-                    'price': p.get('price'),
-                    'price_per_sqft': p.get('price_per_sqft'),
-                    'agent': p.get('agent'),
-                    'lat': p.get('lat'),
-                    'lng': p.get('lng'),
-                    'type': p.get('type'),
-                    'bedrooms': p.get('bedrooms')
-                }
-                for p in properties[:200]  # Cap at 200 to save space
-            ],
-            
+            'timestamp': now,
+
+            'active_count': len(current),
+            'deltas': delta_counts,
+
             # Metrics
             'metrics': {
                 'property_count': len(properties),
@@ -81,123 +193,263 @@ def store_daily_snapshot(dataset: dict, area: str):
                 'avg_price_per_sqft': metrics.get('avg_price_per_sqft'),
                 'total_value': metrics.get('total_value')
             },
-            
+
             # Intelligence (if available)
             'intelligence': {
                 'market_sentiment': intelligence.get('market_sentiment'),
                 'sentiment_confidence': intelligence.get('sentiment_confidence'),
                 'top_agents': intelligence.get('top_agents', [])[:10]
             },
-            
+
             # Liquidity velocity (if calculated)
             'liquidity_velocity': dataset.get('liquidity_velocity', {}) if not dataset.get('liquidity_velocity', {}).get('error') else None,
-            
+
             # Agent profiles (if available)
             'agent_profiles': dataset.get('agent_profiles', [])[:10] if dataset.get('agent_profiles') else None,
-            
+
             # Detected trends (if available)
             'detected_trends': dataset.get('detected_trends', [])[:5] if dataset.get('detected_trends') else None
         }
-        
-        # Insert snapshot
-        snapshots.insert_one(snapshot)
-        
-        logger.info(f"✅ Stored historical snapshot for {area} on {today} ({len(properties)} properties)")
-        
-        # CLEANUP: Delete snapshots older than 90 days to save space
-        from datetime import timedelta
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=90)
-        
-        result = snapshots.delete_many({
-            'timestamp': {'$lt': cutoff_date}
-        })
-        
-        if result.deleted_count > 0:
-            logger.info(f"🗑️ Cleaned up {result.deleted_count} old snapshots (>90 days)")
-        
+
+        try:
+            snapshots.insert_one(snapshot)
+        except DuplicateKeyError:
+            logger.info(f"✅ Snapshot for {area} on {today} stored concurrently by another worker")
+            return
+
+        logger.info(
+            f"✅ Stored historical snapshot for {area} on {today} ({len(current)} listings: "
+            f"{delta_counts['new']} new, {delta_counts['price_change']} price changes, {delta_counts['delisted']} delisted)"
+        )
+
     except Exception as e:
         logger.error(f"Error storing historical snapshot: {e}", exc_info=True)
 
 
+def purge_expired_history(retention_days: int = HISTORY_RETENTION_DAYS) -> Dict[str, int]:
+    """
+    Retention job (scheduled separately from writes)
+
+    Drops summaries and delta events older than the window, and state rows
+    for listings delisted before it. Active listings are kept regardless -
+    they are the base the replay starts from.
+    """
+
+    if not mongo_client:
+        return {}
+
+    try:
+        ensure_history_indexes()
+        snapshots, events, state = _collections()
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        cutoff_date = cutoff.date().isoformat()
+
+        deleted = {
+            'snapshots': snapshots.delete_many({'timestamp': {'$lt': cutoff}}).deleted_count,
+            'events': events.delete_many({'timestamp': {'$lt': cutoff}}).deleted_count,
+            'state': state.delete_many({'active': False, 'delisted_on': {'$lt': cutoff_date}}).deleted_count
+        }
+
+        logger.info(f"🗑️ History retention (>{retention_days} days): {deleted}")
+        return deleted
+
+    except Exception as e:
+        logger.error(f"History retention failed: {e}", exc_info=True)
+        return {}
+
+
+# ============================================================
+# READ PATH
+# ============================================================
+
 def get_historical_snapshots(area: str, days: int = 30) -> list:
     """
-    Retrieve historical snapshots for an area
-    
-    Returns: List of snapshot dicts (newest first)
+    Retrieve daily summaries for an area (metrics, sentiment, delta counts)
+
+    Returns: List of snapshot dicts (newest first). Listing sets are not
+    embedded - use get_snapshot_listings() for those.
     """
-    
+
     if not mongo_client:
         return []
-    
+
     try:
-        from datetime import timedelta
-        
-        db = mongo_client['Voxmill']
-        snapshots = db['historical_snapshots']
-        
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-        
+        ensure_history_indexes()
+        snapshots, _, _ = _collections()
+
+        cutoff_date = (datetime.now(timezone.utc) - timedelta(days=days)).date().isoformat()
+
         results = list(snapshots.find({
             'area': area,
-            'timestamp': {'$gte': cutoff_date}
-        }).sort('timestamp', -1))  # Newest first
-        
+            'date': {'$gte': cutoff_date}
+        }).sort('date', -1))  # Newest first
+
         logger.info(f"📊 Retrieved {len(results)} historical snapshots for {area} (last {days} days)")
-        
+
         return results
-        
+
     except Exception as e:
         logger.error(f"Error retrieving historical snapshots: {e}", exc_info=True)
         return []
 
 
+def get_snapshot_listings(area: str, dates: List[str], agent: str = None) -> Dict[str, Dict[str, dict]]:
+    """
+    Rebuild the listing set as of each date (end of day)
+
+    Starts from current state and undoes newer deltas going backwards, so
+    only events inside the requested window are read.
+
+    Args:
+        area: Market area
+        dates: ISO dates to rebuild
+        agent: Only this agent's listings (uses the agent indexes)
+
+    Returns: {date: {property_key: listing}}
+    """
+
+    if not mongo_client or not dates:
+        return {}
+
+    ensure_history_indexes()
+    _, events, state = _collections()
+
+    state_query = {'area': area, 'active': True}
+    event_query = {'area': area, 'date': {'$gt': min(dates)}}
+    if agent:
+        state_query['agent'] = agent
+        event_query['agent'] = agent
+
+    listings = {
+        doc['property_key']: {field: doc.get(field) for field in TRACKED_FIELDS}
+        for doc in state.find(state_query, {'_id': 0, 'property_key': 1, **{f: 1 for f in TRACKED_FIELDS}})
+    }
+
+    newer_events = events.find(event_query, {'_id': 0}).sort('date', -1)
+
+    result = {}
+    pending_dates = sorted(set(dates), reverse=True)
+
+    for event in newer_events:
+        # Snapshot every requested date that is at or after this event's day boundary
+        while pending_dates and pending_dates[0] >= event['date']:
+            result[pending_dates.pop(0)] = {k: dict(v) for k, v in listings.items()}
+
+        key = event['property_key']
+        if event['event'] == 'new':
+            listings.pop(key, None)
+        elif event['event'] == 'price_change':
+            if key in listings:
+                listings[key]['price'] = event.get('previous_price')
+        elif event['event'] == 'delisted':
+            listings[key] = {field: event.get(field) for field in TRACKED_FIELDS}
+
+    for date in pending_dates:
+        result[date] = {k: dict(v) for k, v in listings.items()}
+
+    return result
+
+
+def get_snapshot_property_lists(area: str, days: int = 30) -> List[List[dict]]:
+    """
+    Past listing sets, oldest first - the shape liquidity velocity expects
+
+    Returns: [[listing, ...] per snapshot date]
+    """
+    summaries = get_historical_snapshots(area, days)
+    dates = [s['date'] for s in reversed(summaries)]
+
+    if not dates:
+        return []
+
+    try:
+        by_date = get_snapshot_listings(area, dates)
+    except Exception as e:
+        logger.error(f"Error rebuilding snapshot listings: {e}", exc_info=True)
+        return []
+
+    return [list(by_date.get(date, {}).values()) for date in dates]
+
+
+def get_price_changes(area: str, days: int = 30, agent: str = None) -> list:
+    """Price-change events for an area (optionally one agent), newest first - indexed"""
+
+    if not mongo_client:
+        return []
+
+    try:
+        ensure_history_indexes()
+        _, events, _ = _collections()
+
+        query = {
+            'area': area,
+            'event': 'price_change',
+            'date': {'$gte': (datetime.now(timezone.utc) - timedelta(days=days)).date().isoformat()}
+        }
+        if agent:
+            query['agent'] = agent
+
+        return list(events.find(query, {'_id': 0}).sort('date', -1))
+
+    except Exception as e:
+        logger.error(f"Error retrieving price changes: {e}", exc_info=True)
+        return []
+
+
 def get_agent_behavioral_history(agent: str, area: str, days: int = 60) -> list:
     """
     Extract agent behavioral events from historical snapshots
-    
+
+    Only this agent's state rows + delta events are read (area/agent indexes).
+
     Returns: List of events for agent profiling
     """
-    
+
     snapshots = get_historical_snapshots(area, days)
-    
+
     if not snapshots:
         return []
-    
+
+    dates = sorted(s['date'] for s in snapshots)
+
+    try:
+        by_date = get_snapshot_listings(area, dates, agent=agent)
+    except Exception as e:
+        logger.error(f"Error rebuilding agent history: {e}", exc_info=True)
+        return []
+
     events = []
-    
+
     # Track this agent's properties across snapshots
     agent_history = {}
-    
-    for snapshot in reversed(snapshots):  # Oldest first
-        snapshot_date = snapshot['date']
-        properties = snapshot.get('properties', [])
-        
-        # Find properties by this agent
-        agent_props = [p for p in properties if p.get('agent') == agent]
-        
+
+    for snapshot_date in dates:  # Oldest first
+        agent_props = list(by_date.get(snapshot_date, {}).values())
+
         if agent_props:
             avg_price = sum([p['price'] for p in agent_props if p.get('price')]) / len(agent_props)
-            
+
             agent_history[snapshot_date] = {
                 'count': len(agent_props),
                 'avg_price': avg_price,
                 'properties': agent_props
             }
-    
+
     # Detect behavioral events
     dates = sorted(agent_history.keys())
-    
+
     for i in range(1, len(dates)):
         prev_date = dates[i-1]
         curr_date = dates[i]
-        
+
         prev = agent_history[prev_date]
         curr = agent_history[curr_date]
-        
+
         # Price change event
         if prev['avg_price'] > 0:
             price_change_pct = ((curr['avg_price'] - prev['avg_price']) / prev['avg_price']) * 100
-            
+
             if abs(price_change_pct) > 2:  # >2% change
                 events.append({
                     'type': 'price_change',
@@ -207,10 +459,10 @@ def get_agent_behavioral_history(agent: str, area: str, days: int = 60) -> list:
                     'previous_avg': prev['avg_price'],
                     'days_to_respond': (datetime.fromisoformat(curr_date) - datetime.fromisoformat(prev_date)).days
                 })
-        
+
         # Inventory change event
         inventory_change = curr['count'] - prev['count']
-        
+
         if abs(inventory_change) >= 2:  # +/- 2 properties
             events.append({
                 'type': 'inventory_change',
@@ -219,19 +471,19 @@ def get_agent_behavioral_history(agent: str, area: str, days: int = 60) -> list:
                 'new_count': curr['count'],
                 'previous_count': prev['count']
             })
-    
+
     return events
 
 
 def check_historical_data_availability(area: str) -> dict:
     """
     Check if enough historical data exists for intelligence layers
-    
+
     Returns: Status dict with recommendations
     """
-    
+
     snapshots = get_historical_snapshots(area, days=90)
-    
+
     status = {
         'area': area,
         'total_snapshots': len(snapshots),
@@ -241,23 +493,23 @@ def check_historical_data_availability(area: str) -> dict:
         },
         'capabilities': {}
     }
-    
+
     # Check what's possible
     if len(snapshots) >= 2:
         status['capabilities']['liquidity_velocity'] = 'available'
     else:
         status['capabilities']['liquidity_velocity'] = 'unavailable (need 2+ days)'
-    
+
     if len(snapshots) >= 10:
         status['capabilities']['liquidity_windows'] = 'available'
     else:
         status['capabilities']['liquidity_windows'] = f'unavailable (need 10+ days, have {len(snapshots)})'
-    
+
     if len(snapshots) >= 30:
         status['capabilities']['agent_profiling'] = 'available'
         status['capabilities']['cascade_prediction'] = 'available'
     else:
         status['capabilities']['agent_profiling'] = f'limited (optimal: 30+ days, have {len(snapshots)})'
         status['capabilities']['cascade_prediction'] = f'limited (optimal: 30+ days, have {len(snapshots)})'
-    
+
     return status
@@ -15,12 +15,13 @@ import os
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Optional
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client
+from app.intelligence.snapshot_diff import SnapshotDiff, diff_snapshots
 
 logger = logging.getLogger(__name__)
 
 MONGODB_URI = os.getenv("MONGODB_URI")
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
 db = mongo_client['Voxmill'] if mongo_client else None
 
 
@@ -62,79 +63,73 @@ def detect_alerts_for_region(area: str, vertical: str = "luxury_real_estate") ->
     current_props = current_snapshot.get('properties', [])
     historical_props = historical_snapshot.get('properties', [])
     
+    # One diff shared by every detector below
+    diff = diff_snapshots(current_props, historical_props)
+    
     # ALERT TYPE 1: Price Drops
-    price_drop_alerts = detect_price_drops(current_props, historical_props, area)
+    price_drop_alerts = detect_price_drops(current_props, historical_props, area, diff=diff)
     alerts.extend(price_drop_alerts)
     
     # ALERT TYPE 2: Inventory Surges
-    inventory_alerts = detect_inventory_changes(current_props, historical_props, area)
+    inventory_alerts = detect_inventory_changes(current_props, historical_props, area, diff=diff)
     alerts.extend(inventory_alerts)
     
     # ALERT TYPE 3: Agent Behavior Shifts
-    agent_alerts = detect_agent_behavior_shifts(current_props, historical_props, area)
+    agent_alerts = detect_agent_behavior_shifts(current_props, historical_props, area, diff=diff)
     alerts.extend(agent_alerts)
     
     logger.info(f"Detected {len(alerts)} alerts for {area}")
     return alerts
 
 
-def detect_price_drops(current: List[Dict], historical: List[Dict], area: str) -> List[Dict]:
+def detect_price_drops(current: List[Dict], historical: List[Dict], area: str,
+                       diff: Optional[SnapshotDiff] = None) -> List[Dict]:
     """Detect properties with significant price drops"""
     
     alerts = []
     
-    # Build historical lookup by address
-    hist_lookup = {p.get('address', ''): p for p in historical if p.get('address')}
+    if diff is None:
+        diff = diff_snapshots(current, historical)
     
-    for curr_prop in current:
-        address = curr_prop.get('address', '')
-        if not address:
-            continue
-        
-        hist_prop = hist_lookup.get(address)
-        if not hist_prop:
+    # Alert on drops >5%
+    for move in diff.repriced(5.0):
+        price_change_pct = move['change_pct']
+        if price_change_pct >= 0:
             continue
         
-        curr_price = curr_prop.get('price', 0)
-        hist_price = hist_prop.get('price', 0)
-        
-        if curr_price and hist_price and curr_price < hist_price:
-            price_change_pct = ((curr_price - hist_price) / hist_price) * 100
-            
-            # Alert on drops >5%
-            if price_change_pct < -5:
-                alerts.append({
-                    "type": "price_drop",
-                    "urgency": "immediate" if price_change_pct < -10 else "near_term",
-                    "area": area,
-                    "property": {
-                        "address": address,
-                        "current_price": curr_price,
-                        "previous_price": hist_price,
-                        "change_pct": price_change_pct,
-                        "agent": curr_prop.get('agent', 'Unknown'),
-                        "property_type": curr_prop.get('property_type', 'Unknown')
-                    },
-                    "timestamp": datetime.now(timezone.utc)
-                })
+        curr_prop = move['current']
+        alerts.append({
+            "type": "price_drop",
+            "urgency": "immediate" if price_change_pct < -10 else "near_term",
+            "area": area,
+            "property": {
+                "address": curr_prop.get('address', ''),
+                "current_price": curr_prop.get('price'),
+                "previous_price": move['previous'].get('price'),
+                "change_pct": price_change_pct,
+                "agent": curr_prop.get('agent', 'Unknown'),
+                "property_type": curr_prop.get('property_type', 'Unknown')
+            },
+            "timestamp": datetime.now(timezone.utc)
+        })
     
     return alerts
 
 
-def detect_inventory_changes(current: List[Dict], historical: List[Dict], area: str) -> List[Dict]:
+def detect_inventory_changes(current: List[Dict], historical: List[Dict], area: str,
+                             diff: Optional[SnapshotDiff] = None) -> List[Dict]:
     """Detect significant inventory changes (new listings)"""
     
     alerts = []
     
-    # Get unique IDs/addresses
-    current_addresses = {p.get('address', '') for p in current if p.get('address')}
-    hist_addresses = {p.get('address', '') for p in historical if p.get('address')}
+    if diff is None:
+        diff = diff_snapshots(current, historical)
     
-    new_listings = current_addresses - hist_addresses
+    new_listings = diff.new_keys
     
     # Alert on 5+ new listings
     if len(new_listings) >= 5:
-        new_props = [p for p in current if p.get('address') in new_listings]
+        new_props = diff.new_listings()
         
         alerts.append({
             "type": "inventory_surge",
@@ -148,31 +143,21 @@ def detect_inventory_changes(current: List[Dict], historical: List[Dict], area:
     return alerts
 
 
-def detect_agent_behavior_shifts(current: List[Dict], historical: List[Dict], area: str) -> List[Dict]:
+def detect_agent_behavior_shifts(current: List[Dict], historical: List[Dict], area: str,
+                                 diff: Optional[SnapshotDiff] = None) -> List[Dict]:
     """Detect agents with significant inventory changes"""
     
     alerts = []
     
-    # Count properties by agent
-    def count_by_agent(props):
-        counts = {}
-        for p in props:
-            agent = p.get('agent', 'Unknown')
-            if agent != 'Unknown':
-                counts[agent] = counts.get(agent, 0) + 1
-        return counts
-    
-    current_counts = count_by_agent(current)
-    hist_counts = count_by_agent(historical)
+    if diff is None:
+        diff = diff_snapshots(current, historical)
     
     # Detect significant changes
-    for agent, curr_count in current_counts.items():
-        hist_count = hist_counts.get(agent, 0)
-        
-        if hist_count == 0:
-            continue
-        
-        change_pct = ((curr_count - hist_count) / hist_count) * 100
+    for delta in diff.agent_deltas(exclude=('Unknown',)):
+        agent = delta['agent']
+        curr_count = delta['current_count']
+        hist_count = delta['previous_count']
+        change_pct = delta['change_pct']
         
         # Alert on 30%+ change (either direction)
         if abs(change_pct) > 30:
@@ -14,7 +14,7 @@ NEW FEATURES:
 import os
 import logging
 from datetime import datetime, timedelta, timezone
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client
 import json
 import redis
 from typing import Dict, List, Tuple
@@ -26,7 +26,7 @@ REDIS_URL = os.getenv("REDIS_URL")
 redis_client = redis.from_url(REDIS_URL) if REDIS_URL else None
 
 MONGODB_URI = os.getenv("MONGODB_URI")
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
 
 
 def build_multi_timeframe_network(area: str = "Mayfair", use_cache: bool = True) -> Dict:
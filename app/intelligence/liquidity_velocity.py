@@ -1,15 +1,20 @@
 import os
 import logging
 from datetime import datetime, timedelta, timezone
-from pymongo import MongoClient
+from typing import Optional
+
+import numpy as np
+
+from app.mongo_pool import get_mongo_client
+from app.intelligence.snapshot_diff import SnapshotDiff, diff_snapshots
 
 logger = logging.getLogger(__name__)
 
 MONGODB_URI = os.getenv("MONGODB_URI")
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
 
 
-def calculate_liquidity_velocity(properties: list, historical_snapshots: list) -> dict:
+def calculate_liquidity_velocity(properties: list, historical_snapshots: list, diff: Optional[SnapshotDiff] = None) -> dict:
     """
     Calculate liquidity velocity - how fast capital is moving through the market
     
@@ -18,6 +23,7 @@ def calculate_liquidity_velocity(properties: list, historical_snapshots: list) -
     Args:
         properties: Current property listings
         historical_snapshots: List of past property snapshots (last 30 days)
+        diff: Precomputed diff of properties vs historical_snapshots[-1] (shared with alerts)
     
     Returns: Velocity score with interpretation
     """
@@ -29,54 +35,29 @@ def calculate_liquidity_velocity(properties: list, historical_snapshots: list) -
             return {'error': 'insufficient_historical_data', 'message': 'Need at least 2 historical snapshots'}
         
        
-     # 1. INVENTORY TURNOVER RATE
-        # How many properties are NEW vs carried over from last snapshot
-        current_addresses = set([
-            p.get('address', '').strip() 
-            for p in properties 
-            if p.get('address', '').strip()  # Filter out empty strings
-        ])
-        previous_addresses = set([
-            p.get('address', '').strip() 
-            for p in historical_snapshots[-1] 
-            if p.get('address', '').strip()
-        ])
+        # Shared address-indexed diff against the most recent snapshot
+        if diff is None:
+            diff = diff_snapshots(properties, historical_snapshots[-1])
         
+        # 1. INVENTORY TURNOVER RATE
+        # How many properties are NEW vs carried over from last snapshot
         # Safety check: ensure we have addresses
-        if len(current_addresses) == 0:
+        if diff.current_count == 0:
             return {'error': 'no_valid_addresses', 'message': 'All properties missing addresses'}
         
-        new_listings = len(current_addresses - previous_addresses)
-        carried_over = len(current_addresses & previous_addresses)
-        exited_listings = len(previous_addresses - current_addresses)
+        new_listings = len(diff.new_keys)
+        carried_over = diff.carried_count
+        exited_listings = len(diff.removed_keys)
         
         turnover_rate = (new_listings / len(properties)) * 100 if properties else 0
         
         # 2. PRICE MOVEMENT FREQUENCY
         # How often are prices changing for same properties week-over-week
-        price_changes = 0
-        price_change_magnitude = []
-        
-        for prop in properties:
-            addr = prop.get('address', '')
-            current_price = prop.get('price', 0)
-            
-            # Find same property in historical data
-            historical_match = None
-            for hist_prop in historical_snapshots[-1]:
-                if hist_prop.get('address', '') == addr:
-                    historical_match = hist_prop
-                    break
-            
-            if historical_match and current_price > 0:
-                hist_price = historical_match.get('price', 0)
-                if hist_price > 0 and abs(current_price - hist_price) > hist_price * 0.01:  # >1% change
-                    price_changes += 1
-                    change_pct = abs((current_price - hist_price) / hist_price) * 100
-                    price_change_magnitude.append(change_pct)
+        moved = diff.repriced_mask(1.0)  # >1% change
+        price_changes = int(moved.sum())
         
         price_dynamism_rate = (price_changes / len(properties)) * 100 if properties else 0
-        avg_price_change_magnitude = sum(price_change_magnitude) / len(price_change_magnitude) if price_change_magnitude else 0
+        avg_price_change_magnitude = float(np.abs(diff.change_pct[moved]).mean()) if price_changes else 0
         
         # 3. AGENT ACTIVITY LEVEL
         # Number of agents actively listing + diversity of activity
@@ -98,7 +79,7 @@ def calculate_liquidity_velocity(properties: list, historical_snapshots: list) -
         
         # 4. ABSORPTION RATE
         # How quickly are properties leaving the market
-        total_previous = len(previous_addresses)
+        total_previous = diff.previous_count
         absorption_rate = (exited_listings / total_previous) * 100 if total_previous > 0 else 0
         
         # CALCULATE VELOCITY SCORE (0-100)
@@ -140,11 +121,10 @@ def calculate_liquidity_velocity(properties: list, historical_snapshots: list) -
                 hist_current = historical_snapshots[i]
                 hist_previous = historical_snapshots[i-1]
                 
-                hist_current_addrs = set([p.get('address', '') for p in hist_current if p.get('address')])
-                hist_previous_addrs = set([p.get('address', '') for p in hist_previous if p.get('address')])
+                hist_diff = diff_snapshots(hist_current, hist_previous)
                 
-                if hist_previous_addrs:
-                    hist_turnover = (len(hist_current_addrs - hist_previous_addrs) / len(hist_current)) * 100 if hist_current else 0
+                if hist_diff.previous_count:
+                    hist_turnover = (len(hist_diff.new_keys) / len(hist_current)) * 100 if hist_current else 0
                     historical_velocities.append(hist_turnover * 0.35)  # Simplified proxy
         
         avg_7day_velocity = sum(historical_velocities[:7]) / 7 if len(historical_velocities) >= 7 else velocity_score
@@ -2,12 +2,12 @@ import os
 import logging
 import numpy as np
 from datetime import datetime, timezone
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client
 
 logger = logging.getLogger(__name__)
 
 MONGODB_URI = os.getenv("MONGODB_URI")
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
 
 
 def segment_micromarkets(properties: list, area: str) -> dict:
@@ -0,0 +1,180 @@
+"""
+VOXMILL SNAPSHOT DIFF ENGINE
+============================
+One diff between two listing snapshots, shared by every consumer
+
+Consumers:
+- Liquidity velocity (turnover, price dynamism, absorption)
+- Alert detector (price drops, inventory surges, agent shifts)
+
+FEATURES:
+- Addresses normalised once, previous snapshot hash-indexed (O(n + m))
+- Price deltas for carried-over listings computed as NumPy arrays
+- New / removed / carried key sets + per-agent inventory deltas
+- Consumers filter the same diff by their own thresholds
+"""
+
+import logging
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_address(address) -> str:
+    """Canonical address key: trimmed, lower-case, single-spaced"""
+    if not address or not isinstance(address, str):
+        return ''
+    return ' '.join(address.lower().split())
+
+
+def index_by_address(properties: List[Dict]) -> Dict[str, Dict]:
+    """Address → listing (first occurrence wins); listings without an address are dropped"""
+    index = {}
+    for prop in properties or []:
+        key = normalize_address(prop.get('address'))
+        if key and key not in index:
+            index[key] = prop
+    return index
+
+
+def _price(prop: Dict) -> float:
+    price = prop.get('price')
+    return float(price) if isinstance(price, (int, float)) and price > 0 else 0.0
+
+
+class SnapshotDiff:
+    """
+    Diff of a current snapshot against a previous one
+
+    Usage:
+        diff = diff_snapshots(current_props, previous_props)
+        diff.new_keys, diff.removed_keys
+        diff.repriced(threshold_pct=5.0)
+        diff.agent_deltas(exclude=('Unknown',))
+    """
+
+    def __init__(self, current: List[Dict], previous: List[Dict]):
+        self.current_index = index_by_address(current)
+        self.previous_index = index_by_address(previous)
+
+        current_keys = self.current_index.keys()
+        previous_keys = self.previous_index.keys()
+
+        self.new_keys = current_keys - previous_keys
+        self.removed_keys = previous_keys - current_keys
+
+        # Carried-over listings in a fixed order so the price arrays line up
+        self.carried_keys = [k for k in self.current_index if k in self.previous_index]
+
+        count = len(self.carried_keys)
+        self.current_prices = np.fromiter(
+            (_price(self.current_index[k]) for k in self.carried_keys), dtype=np.float64, count=count
+        )
+        self.previous_prices = np.fromiter(
+            (_price(self.previous_index[k]) for k in self.carried_keys), dtype=np.float64, count=count
+        )
+
+        # % change where both prices are known, NaN otherwise
+        priced = (self.current_prices > 0) & (self.previous_prices > 0)
+        self.change_pct = np.full(count, np.nan)
+        np.divide(
+            (self.current_prices - self.previous_prices) * 100.0,
+            self.previous_prices,
+            out=self.change_pct,
+            where=priced
+        )
+
+        self._current_agents = None
+        self._previous_agents = None
+
+    # ============================================================
+    # COUNTS
+    # ============================================================
+
+    @property
+    def current_count(self) -> int:
+        return len(self.current_index)
+
+    @property
+    def previous_count(self) -> int:
+        return len(self.previous_index)
+
+    @property
+    def carried_count(self) -> int:
+        return len(self.carried_keys)
+
+    def new_listings(self) -> List[Dict]:
+        """Current listings that were not in the previous snapshot"""
+        return [self.current_index[k] for k in self.new_keys]
+
+    def removed_listings(self) -> List[Dict]:
+        """Previous listings that are gone from the current snapshot"""
+        return [self.previous_index[k] for k in self.removed_keys]
+
+    # ============================================================
+    # PRICE MOVES
+    # ============================================================
+
+    def repriced_mask(self, threshold_pct: float = 0.0) -> np.ndarray:
+        """Boolean mask over carried_keys: |change| strictly above threshold"""
+        with np.errstate(invalid='ignore'):
+            return np.abs(self.change_pct) > threshold_pct
+
+    def repriced(self, threshold_pct: float = 0.0) -> List[Dict]:
+        """Carried-over listings whose price moved more than threshold_pct (either direction)"""
+        moves = []
+        for i in np.flatnonzero(self.repriced_mask(threshold_pct)):
+            key = self.carried_keys[i]
+            moves.append({
+                'key': key,
+                'current': self.current_index[key],
+                'previous': self.previous_index[key],
+                'current_price': self.current_prices[i].item(),
+                'previous_price': self.previous_prices[i].item(),
+                'change_pct': self.change_pct[i].item()
+            })
+        return moves
+
+    # ============================================================
+    # AGENTS
+    # ============================================================
+
+    @property
+    def current_agent_counts(self) -> Counter:
+        if self._current_agents is None:
+            self._current_agents = Counter(p.get('agent', 'Unknown') for p in self.current_index.values())
+        return self._current_agents
+
+    @property
+    def previous_agent_counts(self) -> Counter:
+        if self._previous_agents is None:
+            self._previous_agents = Counter(p.get('agent', 'Unknown') for p in self.previous_index.values())
+        return self._previous_agents
+
+    def agent_deltas(self, exclude=('Unknown',)) -> List[Dict]:
+        """Per-agent inventory change for agents present in both snapshots"""
+        deltas = []
+        previous = self.previous_agent_counts
+
+        for agent, current_count in self.current_agent_counts.items():
+            if agent in exclude:
+                continue
+            previous_count = previous.get(agent, 0)
+            if previous_count == 0:
+                continue
+            deltas.append({
+                'agent': agent,
+                'current_count': current_count,
+                'previous_count': previous_count,
+                'change_pct': ((current_count - previous_count) / previous_count) * 100
+            })
+
+        return deltas
+
+
+def diff_snapshots(current: List[Dict], previous: List[Dict]) -> SnapshotDiff:
+    """Build the shared diff for a (current, previous) snapshot pair"""
+    return SnapshotDiff(current, previous)
@@ -1,12 +1,12 @@
 import logging
 from datetime import datetime, timedelta, timezone
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client
 import os
 
 logger = logging.getLogger(__name__)
 
 MONGODB_URI = os.getenv("MONGODB_URI")
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
 
 def detect_market_trends(area: str = "Mayfair", lookback_days: int = 14) -> list:
     """
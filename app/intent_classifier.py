@@ -0,0 +1,542 @@
+"""
+VOXMILL LOCAL INTENT CLASSIFIER
+===============================
+Fast path in front of ConversationalGovernor's LLM mandate check
+
+Trained on logged governance decisions (the LLM's own labels). Confident
+predictions are answered locally; everything below the threshold still goes
+to the LLM, whose answer is logged and becomes training data.
+
+FEATURES:
+- Char n-gram TF-IDF + one linear head per decision field (intent, category, flags)
+- All heads scored from one n-gram lookup + weight gather (sub-millisecond per message)
+- Intents that need LLM-only fields (requested_region) always fall through
+- Decisions logged to governance_decisions, trained models versioned in intent_models
+- Models stored as plain data (vocabulary, idf, float weights) - nothing executable
+- Context-free only: messages sent with conversation context always go to the LLM
+- Model reloads happen in the background, never on the request path
+- Offline agreement / coverage evaluation (evaluate_intent_classifier.py)
+"""
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.mongo_pool import get_mongo_client
+
+logger = logging.getLogger(__name__)
+
+INTENT_FASTPATH_ENABLED = os.getenv('INTENT_FASTPATH_ENABLED', 'true').lower() == 'true'
+INTENT_FASTPATH_THRESHOLD = float(os.getenv('INTENT_FASTPATH_THRESHOLD', '0.9'))
+INTENT_MIN_TRAINING_SAMPLES = int(os.getenv('INTENT_MIN_TRAINING_SAMPLES', '300'))
+INTENT_TRAINING_DAYS = int(os.getenv('INTENT_TRAINING_DAYS', '90'))
+INTENT_MODEL_RELOAD_SECONDS = int(os.getenv('INTENT_MODEL_RELOAD_SECONDS', '3600'))
+INTENT_DECISION_RETENTION_DAYS = int(os.getenv('INTENT_DECISION_RETENTION_DAYS', '180'))
+INTENT_MAX_FEATURES = int(os.getenv('INTENT_MAX_FEATURES', '20000'))
+
+MODEL_VERSION = 2
+KEEP_MODEL_VERSIONS = 5
+
+# Decision fields the mandate check returns (and the classifier predicts)
+LABEL_FIELDS = ('intent_type', 'semantic_category')
+FLAG_FIELDS = ('is_mandate_relevant', 'is_human_signal', 'is_dismissal')
+
+# Need requested_region, which only the LLM extracts
+LLM_ONLY_INTENTS = {'scope_override', 'preference_change'}
+
+_indexes_ready = False
+
+
+def normalize_message(text: str) -> str:
+    """Lower-case, single-spaced message text (training + inference key)"""
+    return ' '.join((text or '').lower().split())
+
+
+def has_conversation_context(conversation_context: Optional[Dict]) -> bool:
+    """True when the mandate prompt would include a context block (regions / agents / topics)"""
+    return bool(conversation_context) and any(
+        conversation_context.get(field) for field in ('regions', 'agents', 'topics')
+    )
+
+
+# ============================================================
+# MODEL
+# ============================================================
+
+class LocalIntentClassifier:
+    """
+    Char n-gram TF-IDF features, one logistic-regression head per decision field
+
+    Heads are folded into one weight matrix after training so prediction is one
+    n-gram lookup + a row gather over that matrix, then a softmax / sigmoid per head.
+    """
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.ngram_range = (2, 5)
+        self.heads: List[Dict] = []
+        self.weights = None
+        self.bias = None
+        self.idf = None
+        self.trained_samples = 0
+
+    def fit(self, messages: Sequence[str], decisions: Sequence[Dict]) -> 'LocalIntentClassifier':
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+
+        vectorizer = TfidfVectorizer(
+            analyzer='char_wb', ngram_range=self.ngram_range, sublinear_tf=True, min_df=2,
+            max_features=INTENT_MAX_FEATURES, dtype=np.float32
+        )
+        X = vectorizer.fit_transform([normalize_message(m) for m in messages])
+
+        columns, biases, self.heads = [], [], []
+
+        for field in LABEL_FIELDS + FLAG_FIELDS:
+            if field in FLAG_FIELDS:
+                y = np.array([bool(d.get(field, False)) for d in decisions])
+            else:
+                y = np.array([str(d.get(field) or 'unknown') for d in decisions])
+
+            classes = np.unique(y)
+            head = {'field': field, 'binary': len(classes) == 2, 'start': sum(c.shape[1] for c in columns)}
+
+            if len(classes) == 1:
+                # Constant field in the training data - always predict it, full confidence
+                head.update({'constant': classes[0].item(), 'classes': classes.tolist(), 'width': 0})
+                self.heads.append(head)
+                continue
+
+            model = LogisticRegression(C=10.0, max_iter=2000)
+            model.fit(X, y)
+
+            coef = model.coef_.T.astype(np.float32)  # (features, 1) binary, (features, classes) otherwise
+            columns.append(coef)
+            biases.append(model.intercept_.astype(np.float32))
+            head.update({'constant': None, 'classes': model.classes_.tolist(), 'width': coef.shape[1]})
+            self.heads.append(head)
+
+        self.vocabulary = {ngram: int(index) for ngram, index in vectorizer.vocabulary_.items()}
+        self.idf = vectorizer.idf_.astype(np.float32)
+        n_features = X.shape[1]
+        self.weights = np.hstack(columns) if columns else np.zeros((n_features, 0), dtype=np.float32)
+        self.bias = np.concatenate(biases) if biases else np.zeros(0, dtype=np.float32)
+        self.trained_samples = len(messages)
+        return self
+
+    def _features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Same vector as vectorizer.transform (char_wb n-grams, sublinear tf, idf, l2)
+        without its per-call validation and sparse-matrix overhead
+
+        Returns: (vocabulary indices, weights)
+        """
+        vocabulary = self.vocabulary
+        min_n, max_n = self.ngram_range
+        counts: Dict[int, int] = {}
+
+        for word in text.split():
+            word = f' {word} '
+            for n in range(min_n, max_n + 1):
+                for offset in range(max(len(word) - n, 0) + 1):
+                    index = vocabulary.get(word[offset:offset + n])
+                    if index is not None:
+                        counts[index] = counts.get(index, 0) + 1
+                if len(word) <= n:
+                    break
+
+        if not counts:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float32)
+
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        values = (1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts))))
+        values *= self.idf[indices]
+        values /= np.sqrt(np.dot(values, values))
+        return indices, values
+
+    def predict(self, message: str) -> Dict:
+        """
+        Returns: decision dict (LABEL_FIELDS + FLAG_FIELDS) plus 'confidence',
+        the lowest per-field probability (every field must be confident)
+        """
+        indices, values = self._features(normalize_message(message))
+        scores = values @ self.weights[indices] + self.bias
+
+        decision = {}
+        confidence = 1.0
+
+        for head in self.heads:
+            if head['constant'] is not None:
+                decision[head['field']] = head['constant']
+                continue
+
+            s = scores[head['start']:head['start'] + head['width']]
+
+            if head['binary']:
+                p = 1.0 / (1.0 + np.exp(-s[0]))
+                label, prob = (head['classes'][1], p) if p >= 0.5 else (head['classes'][0], 1.0 - p)
+            else:
+                e = np.exp(s - s.max())
+                probs = e / e.sum()
+                best = int(probs.argmax())
+                label, prob = head['classes'][best], probs[best]
+
+            decision[head['field']] = label
+            confidence = min(confidence, float(prob))
+
+        decision['confidence'] = confidence
+        return decision
+
+    # ------------------------------------------------------------
+    # STORAGE (plain data only - loading never executes stored content)
+    # ------------------------------------------------------------
+
+    def to_document(self) -> Tuple[Dict, List[List[float]]]:
+        """
+        Returns: (model document, weight columns)
+
+        N-grams go in index order as a list (they contain '.', so can't be BSON keys).
+        Weight columns are stored one per document to stay under the 16MB limit.
+        """
+        ngrams = [''] * len(self.vocabulary)
+        for ngram, index in self.vocabulary.items():
+            ngrams[index] = ngram
+
+        document = {
+            'ngrams': ngrams,
+            'ngram_range': list(self.ngram_range),
+            'idf': self.idf.tolist(),
+            'bias': self.bias.tolist(),
+            'heads': self.heads,
+            'trained_samples': self.trained_samples
+        }
+        return document, [self.weights[:, column].tolist() for column in range(self.weights.shape[1])]
+
+    @classmethod
+    def from_document(cls, document: Dict, columns: Sequence[Sequence[float]]) -> 'LocalIntentClassifier':
+        """Rebuild from to_document() output; raises ValueError on inconsistent shapes"""
+        clf = cls()
+        ngrams = list(document['ngrams'])
+        clf.vocabulary = {ngram: index for index, ngram in enumerate(ngrams)}
+        clf.ngram_range = tuple(int(n) for n in document['ngram_range'])
+        clf.idf = np.asarray(document['idf'], dtype=np.float32)
+        clf.bias = np.asarray(document['bias'], dtype=np.float32)
+        clf.trained_samples = int(document.get('trained_samples', 0))
+        clf.heads = [
+            {
+                'field': str(head['field']),
+                'binary': bool(head['binary']),
+                'start': int(head['start']),
+                'width': int(head['width']),
+                'constant': head.get('constant'),
+                'classes': list(head['classes'])
+            }
+            for head in document['heads']
+        ]
+
+        if columns:
+            clf.weights = np.asarray(columns, dtype=np.float32).T
+        else:
+            clf.weights = np.zeros((len(ngrams), 0), dtype=np.float32)
+
+        width = sum(head['width'] for head in clf.heads)
+        if (len(clf.vocabulary) != len(ngrams) or clf.idf.shape != (len(ngrams),)
+                or clf.weights.shape != (len(ngrams), width) or clf.bias.shape != (width,)):
+            raise ValueError(f"Inconsistent intent model: {len(ngrams)} n-grams, weights {clf.weights.shape}, "
+                             f"bias {clf.bias.shape}, heads width {width}")
+        return clf
+
+
+# ============================================================
+# DECISION LOG
+# ============================================================
+
+def _collections():
+    global _indexes_ready
+
+    db = get_mongo_client()['Voxmill']
+    decisions, models, weights = db['governance_decisions'], db['intent_models'], db['intent_model_weights']
+
+    if not _indexes_ready:
+        decisions.create_index('timestamp', name='decision_ttl',
+                               expireAfterSeconds=INTENT_DECISION_RETENTION_DAYS * 86400)
+        decisions.create_index([('source', 1), ('timestamp', -1)], name='source_timestamp')
+        models.create_index([('trained_at', -1)], name='trained_at')
+        weights.create_index([('model_id', 1), ('column', 1)], name='model_column')
+        _indexes_ready = True
+
+    return decisions, models, weights
+
+
+def log_governance_decision(message: str, decision: Dict, source: str = 'llm', has_context: bool = False):
+    """Record one mandate-check decision (LLM decisions are the training labels)"""
+    if not get_mongo_client():
+        return
+
+    decisions, _, _ = _collections()
+    decisions.insert_one({
+        'message': (message or '')[:500],
+        'normalized': normalize_message(message)[:500],
+        **{field: decision.get(field) for field in LABEL_FIELDS + FLAG_FIELDS},
+        'confidence': decision.get('confidence'),
+        'requested_region': decision.get('requested_region'),
+        'has_context': has_context,
+        'source': source,
+        'timestamp': datetime.now(timezone.utc)
+    })
+
+
+def load_training_samples(days: int = INTENT_TRAINING_DAYS) -> Tuple[List[str], List[Dict]]:
+    """
+    LLM-labelled messages, oldest first, one per normalised message (latest label wins)
+
+    Only decisions made without conversation context: the classifier sees the
+    message alone, and context can change the LLM's label for the same text.
+
+    Returns: (messages, decisions)
+    """
+    if not get_mongo_client():
+        return [], []
+
+    decisions, _, _ = _collections()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    query = {'source': 'llm', 'has_context': {'$ne': True}, 'timestamp': {'$gte': cutoff}}
+
+    latest: Dict[str, Dict] = {}
+    for doc in decisions.find(query).sort('timestamp', 1):
+        key = doc.get('normalized') or normalize_message(doc.get('message', ''))
+        if key:
+            latest.pop(key, None)
+            latest[key] = doc
+
+    docs = list(latest.values())
+    return [d['message'] for d in docs], docs
+
+
+# ============================================================
+# EVALUATION
+# ============================================================
+
+def decisions_agree(predicted: Dict, reference: Dict) -> bool:
+    """Same routing outcome: intent, category and relevance all match"""
+    return (
+        str(predicted.get('intent_type') or 'unknown') == str(reference.get('intent_type') or 'unknown')
+        and str(predicted.get('semantic_category') or 'unknown') == str(reference.get('semantic_category') or 'unknown')
+        and bool(predicted.get('is_mandate_relevant')) == bool(reference.get('is_mandate_relevant'))
+    )
+
+
+def evaluate_classifier(clf: LocalIntentClassifier, messages: Sequence[str], decisions: Sequence[Dict],
+                        thresholds: Sequence[float] = (0.7, 0.8, 0.9, 0.95)) -> Dict:
+    """
+    Compare local predictions with the LLM's decisions
+
+    Returns: {
+        'samples', 'overall_agreement',
+        'thresholds': {t: {'coverage', 'agreement', 'covered'}},
+        'latency_ms': {'p50', 'p99'},
+        'disagreements': [(message, predicted, llm)] at the configured threshold
+    }
+    """
+    predictions, latencies = [], []
+
+    for message in messages:
+        started = time.perf_counter()
+        predictions.append(clf.predict(message))
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    agree = [decisions_agree(p, d) for p, d in zip(predictions, decisions)]
+    results = {'samples': len(messages), 'overall_agreement': sum(agree) / max(len(agree), 1), 'thresholds': {}}
+
+    for threshold in thresholds:
+        covered = [
+            ok for p, ok in zip(predictions, agree)
+            if p['confidence'] >= threshold and p.get('intent_type') not in LLM_ONLY_INTENTS
+        ]
+        results['thresholds'][threshold] = {
+            'covered': len(covered),
+            'coverage': len(covered) / max(len(messages), 1),
+            'agreement': sum(covered) / len(covered) if covered else None
+        }
+
+    ordered = sorted(latencies)
+    results['latency_ms'] = {
+        'p50': ordered[len(ordered) // 2] if ordered else None,
+        'p99': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else None
+    }
+    results['disagreements'] = [
+        (m, p, d) for m, p, d, ok in zip(messages, predictions, decisions, agree)
+        if not ok and p['confidence'] >= INTENT_FASTPATH_THRESHOLD
+    ]
+    return results
+
+
+# ============================================================
+# TRAINING + MODEL STORE
+# ============================================================
+
+def train_intent_classifier(days: int = INTENT_TRAINING_DAYS, save: bool = True, test_fraction: float = 0.2) -> Dict:
+    """
+    Train on logged LLM decisions, evaluate on the newest slice, then refit on everything
+
+    Returns: Training stats (status, samples, holdout metrics)
+    """
+    messages, decisions = load_training_samples(days)
+
+    if len(messages) < INTENT_MIN_TRAINING_SAMPLES:
+        logger.info(f"Intent classifier: {len(messages)} labelled messages (< {INTENT_MIN_TRAINING_SAMPLES}), not training")
+        return {'status': 'insufficient_data', 'samples': len(messages)}
+
+    split = int(len(messages) * (1 - test_fraction))
+    holdout = evaluate_classifier(
+        LocalIntentClassifier().fit(messages[:split], decisions[:split]),
+        messages[split:], decisions[split:],
+        thresholds=(INTENT_FASTPATH_THRESHOLD,)
+    )
+    at_threshold = holdout['thresholds'][INTENT_FASTPATH_THRESHOLD]
+
+    clf = LocalIntentClassifier().fit(messages, decisions)
+    stats = {
+        'status': 'trained',
+        'samples': len(messages),
+        'holdout_samples': holdout['samples'],
+        'holdout_coverage': round(at_threshold['coverage'], 4),
+        'holdout_agreement': round(at_threshold['agreement'], 4) if at_threshold['agreement'] is not None else None,
+        'threshold': INTENT_FASTPATH_THRESHOLD,
+        'latency_ms_p50': holdout['latency_ms']['p50']
+    }
+
+    if save:
+        save_intent_classifier(clf, stats)
+
+    logger.info(f"✅ Intent classifier trained on {len(messages)} decisions: holdout coverage "
+                f"{stats['holdout_coverage']:.0%}, agreement {stats['holdout_agreement']}")
+    return stats
+
+
+def save_intent_classifier(clf: LocalIntentClassifier, stats: Optional[Dict] = None):
+    """Store a trained model (weights first, so a visible model is always complete)"""
+    _, models, weights = _collections()
+    document, columns = clf.to_document()
+    model_id = f"intent-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')}"
+
+    if columns:
+        weights.insert_many([
+            {'model_id': model_id, 'column': column, 'values': values}
+            for column, values in enumerate(columns)
+        ])
+    models.insert_one({
+        'model_id': model_id,
+        'version': MODEL_VERSION,
+        'trained_at': datetime.now(timezone.utc),
+        **(stats or {}),
+        'model': document
+    })
+
+    # Keep the last few versions for rollback
+    stale = [doc['model_id'] for doc in models.find({}, {'model_id': 1}).sort('trained_at', -1).skip(KEEP_MODEL_VERSIONS)]
+    if stale:
+        models.delete_many({'model_id': {'$in': stale}})
+        weights.delete_many({'model_id': {'$in': stale}})
+
+
+def load_latest_intent_classifier() -> Optional[LocalIntentClassifier]:
+    """Most recent stored model for this MODEL_VERSION, or None"""
+    _, models, weights = _collections()
+    doc = models.find_one({'version': MODEL_VERSION}, sort=[('trained_at', -1)])
+    if not doc:
+        return None
+
+    columns = [w['values'] for w in weights.find({'model_id': doc['model_id']}).sort('column', 1)]
+    clf = LocalIntentClassifier.from_document(doc['model'], columns)
+    logger.info(f"✅ Intent classifier loaded ({doc.get('samples')} samples, trained {doc['trained_at']})")
+    return clf
+
+
+class _ModelHolder:
+    """Latest stored model, refreshed in the background"""
+
+    def __init__(self):
+        self.model: Optional[LocalIntentClassifier] = None
+        self.loaded_at = 0.0
+        self.loading = False
+        self.lock = threading.Lock()
+
+    def _load(self):
+        try:
+            if not get_mongo_client():
+                return
+            model = load_latest_intent_classifier()
+            if model is not None:
+                self.model = model
+        except Exception as e:
+            logger.warning(f"Intent classifier load failed: {e}")
+        finally:
+            self.loaded_at = time.time()
+            self.loading = False
+
+    def get(self) -> Optional[LocalIntentClassifier]:
+        if time.time() - self.loaded_at > INTENT_MODEL_RELOAD_SECONDS:
+            with self.lock:
+                if not self.loading and time.time() - self.loaded_at > INTENT_MODEL_RELOAD_SECONDS:
+                    self.loading = True
+                    from app.async_executor import fire_and_forget
+                    fire_and_forget(self._load)
+        return self.model
+
+    def set(self, model: Optional[LocalIntentClassifier]):
+        self.model = model
+        self.loaded_at = time.time()
+
+
+_model_holder = _ModelHolder()
+_fastpath_stats = {'local': 0, 'fallback': 0, 'skipped_context': 0}
+
+
+def set_intent_classifier(model: Optional[LocalIntentClassifier]):
+    """Install a model directly (tests, offline evaluation, freshly trained)"""
+    _model_holder.set(model)
+
+
+def classify_locally(message: str, conversation_context: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    Fast-path decision, or None when the LLM should decide
+
+    None when: disabled, no model loaded yet, the message comes with
+    conversation context (the model is trained without it), confidence
+    below threshold, or the predicted intent needs LLM-only fields.
+    """
+    if not INTENT_FASTPATH_ENABLED:
+        return None
+
+    clf = _model_holder.get()
+    if clf is None:
+        return None
+
+    if has_conversation_context(conversation_context):
+        _fastpath_stats['skipped_context'] += 1
+        return None
+
+    try:
+        decision = clf.predict(message)
+    except Exception as e:
+        logger.warning(f"Local intent prediction failed: {e}")
+        return None
+
+    if decision['confidence'] < INTENT_FASTPATH_THRESHOLD or decision.get('intent_type') in LLM_ONLY_INTENTS:
+        _fastpath_stats['fallback'] += 1
+        return None
+
+    _fastpath_stats['local'] += 1
+    return decision
+
+
+def get_fastpath_stats() -> Dict:
+    """Share of mandate checks answered locally since startup"""
+    total = sum(_fastpath_stats.values())
+    return {**_fastpath_stats, 'local_ratio': round(_fastpath_stats['local'] / total, 3) if total else None}
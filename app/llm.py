@@ -2,8 +2,10 @@ import os
 import logging
 import json
 import re
-from typing import Dict, Tuple, List
-from openai import OpenAI
+from collections import deque
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Tuple, List, Optional
+from openai import AsyncOpenAI
 from datetime import datetime
 from app.adaptive_llm import get_adaptive_llm_config, AdaptiveLLMController
 from app.conversation_manager import generate_contextualized_prompt, ConversationSession
@@ -25,7 +27,12 @@ except ImportError:
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+# Async client - classify_and_respond runs on the event loop
+openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+
+# Main response model (provider-side prefix caching needs a model that supports it, e.g. gpt-4o)
+PRIMARY_LLM_MODEL = os.getenv("PRIMARY_LLM_MODEL", "gpt-4-turbo")
+PROMPT_PREFIX_CACHE_SIZE = int(os.getenv("PROMPT_PREFIX_CACHE_SIZE", "256"))
 
 # ============================================================
 # PHASE 4B: STARTUP ASSERTIONS + STATUS DUMP
@@ -110,7 +117,6 @@ NEVER describe Voxmill unless explicitly asked "What is Voxmill?"
 
 CLIENT: {client_name} | {client_company} | {client_tier} | INDUSTRY: {industry}
 REGION: {preferred_region}
-TIME: {current_time_uk}, {current_date}
 
 CRITICAL: You help THE CLIENT think through sparse data, not provide comprehensive reports.
 
@@ -788,7 +794,467 @@ MANDATORY RULES
 You are world-class. Act like it.
 """
 
-async def classify_and_respond(message: str, dataset: dict, client_profile: dict = None, comparison_datasets: list = None, governance_result = None) -> tuple[str, str, dict]:
+# Per-call context, appended after the static prefix (never inside it)
+SESSION_CONTEXT_TEMPLATE = """
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+SESSION CONTEXT
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+TIME: {current_time_uk}, {current_date}
+"""
+
+
+# ============================================================
+# PROMPT PREFIX CACHE + USAGE LOGGING
+# ============================================================
+
+@lru_cache(maxsize=PROMPT_PREFIX_CACHE_SIZE)
+def render_static_prefix(client_name: str, agency_name: str, client_company: str, client_tier: str,
+                         preferred_region: str, industry: str, industry_context: str, agency_context: str,
+                         identity_anchor: str, confidence_tier: str) -> str:
+    """
+    Client-personalised SYSTEM_PROMPT + identity anchor + tone block
+    
+    Memoised on every rendering input, i.e. per (client, industry, confidence tier);
+    a profile change produces a new entry rather than a stale hit.
+    """
+    prefix = SYSTEM_PROMPT.format(
+        client_name=client_name,
+        agency_name=agency_name,
+        client_company=client_company,
+        client_tier=client_tier,
+        preferred_region=preferred_region,
+        industry=industry,
+        industry_context=industry_context,
+        agency_context=agency_context
+    ) + identity_anchor
+    
+    return prefix + "\n" + AdaptiveLLMController.tone_modulation_for_tier(confidence_tier)
+
+
+_prompt_usage_totals = {'calls': 0, 'prompt_tokens': 0, 'cached_tokens': 0, 'completion_tokens': 0}
+
+
+def log_prompt_usage(response, label: str):
+    """Log token counts + provider cache hits for one completion, and running ratios"""
+    try:
+        usage = getattr(response, 'usage', None)
+        if not usage:
+            return
+        
+        prompt_tokens = usage.prompt_tokens or 0
+        completion_tokens = usage.completion_tokens or 0
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = (getattr(details, 'cached_tokens', 0) or 0) if details else 0
+        
+        _prompt_usage_totals['calls'] += 1
+        _prompt_usage_totals['prompt_tokens'] += prompt_tokens
+        _prompt_usage_totals['cached_tokens'] += cached_tokens
+        _prompt_usage_totals['completion_tokens'] += completion_tokens
+        
+        call_ratio = cached_tokens / prompt_tokens if prompt_tokens else 0.0
+        total_ratio = _prompt_usage_totals['cached_tokens'] / max(_prompt_usage_totals['prompt_tokens'], 1)
+        prefix_info = render_static_prefix.cache_info()
+        prefix_ratio = prefix_info.hits / max(prefix_info.hits + prefix_info.misses, 1)
+        
+        logger.info(f"📊 LLM usage [{label}]: prompt={prompt_tokens} (cached {cached_tokens}, {call_ratio:.0%}), "
+                    f"completion={completion_tokens} | provider cache {total_ratio:.0%} over "
+                    f"{_prompt_usage_totals['calls']} calls | prefix LRU {prefix_ratio:.0%} "
+                    f"({prefix_info.currsize}/{prefix_info.maxsize})")
+    except Exception as e:
+        logger.debug(f"Usage logging failed: {e}")
+
+
+def get_prompt_cache_stats() -> Dict:
+    """Running prompt-cache counters (provider cached tokens + prefix LRU)"""
+    prefix_info = render_static_prefix.cache_info()
+    return {
+        **_prompt_usage_totals,
+        'provider_cache_ratio': round(_prompt_usage_totals['cached_tokens'] / max(_prompt_usage_totals['prompt_tokens'], 1), 3),
+        'prefix_hits': prefix_info.hits,
+        'prefix_misses': prefix_info.misses,
+        'prefix_size': prefix_info.currsize
+    }
+
+
+# ============================================================
+# POST-GENERATION VALIDATORS (buffered + streaming paths)
+# ============================================================
+
+# Self-description that must never reach an onboarded client
+FORBIDDEN_AUTOPILOT_PHRASES = [
+    'i provide real-time market intelligence across industries',
+    'analysis includes inventory levels',
+    'i provide', 'i offer', 'i deliver', 'i analyze',
+    'across industries', 'voxmill delivers'
+]
+
+FORBIDDEN_MONITORING_PHRASES = [
+    'monitoring initiated',
+    'surveillance established',
+    'tracking in progress',
+    'establish monitoring',
+    'consider engaging monitoring'
+]
+
+# Fabricated financial figures (£X per instruction etc.)
+FABRICATED_MONEY_PATTERN = r'[£$€]\s*\d+[,\d]*k?\s+per\s+(instruction|property|unit|deal|transaction)'
+
+# User asked for agent names outright (fabrications become a full refusal)
+NAME_REQUEST_PHRASES = [
+    'name the', 'which agents', 'who are the', 'list the',
+    'top 3 agents', 'top agents', 'leading agencies'
+]
+
+# Common London markets that might be confused
+SCOPE_CHECK_MARKETS = [
+    'mayfair', 'chelsea', 'kensington', 'knightsbridge',
+    'belgravia', 'south kensington', 'notting hill',
+    'marylebone', 'holland park', 'fitzrovia'
+]
+
+
+def requested_out_of_scope_market(dataset: Dict, user_message: str):
+    """First market named in the user message if it differs from the dataset's area, else None"""
+    dataset_area = dataset.get('metadata', {}).get('area', '').lower()
+
+    if not dataset_area or dataset_area == 'unknown':
+        return None
+
+    user_msg_lower = user_message.lower()
+    mentioned_markets = [m for m in SCOPE_CHECK_MARKETS if m in user_msg_lower]
+
+    if mentioned_markets and mentioned_markets[0] != dataset_area:
+        return mentioned_markets[0]
+    return None
+
+
+def contains_numeric_violations(text: str, dataset: Dict) -> Tuple[bool, List[str]]:
+    """
+    Detect numeric content that violates grounding rules
+
+    Returns: (has_violations, list_of_violations)
+    """
+    violations = []
+
+    # Extract allowed numbers from dataset (if real data)
+    is_synthetic = dataset.get('metadata', {}).get('is_synthetic', False)
+
+    if is_synthetic:
+        # Synthetic data: numbers are allowed (they're in mock data)
+        return False, []
+
+    # For real data: detect numeric violations
+
+    # Detect numeric confidence scores
+    if re.search(r'Confidence:\s*\d+/\d+', text, re.IGNORECASE):
+        violations.append("numeric_confidence_score")
+
+    if re.search(r'Confidence:\s*\d+', text, re.IGNORECASE):
+        violations.append("numeric_confidence")
+
+    # Detect standalone percentages without context
+    if re.search(r'\d+\.?\d*%', text):
+        violations.append("percentage")
+
+    # Detect currency amounts
+    if re.search(r'£\d+|€\d+|\$\d+', text):
+        violations.append("currency")
+
+    # Detect numeric patterns like "3+" or "drops 3+ prices"
+    if re.search(r'\d+\+', text):
+        violations.append("numeric_plus_pattern")
+
+    # Detect inventory/velocity scores
+    if re.search(r'Inventory:\s*\d+|Velocity:\s*\d+', text, re.IGNORECASE):
+        violations.append("fabricated_metrics")
+
+    return len(violations) > 0, violations
+
+
+def contains_agent_violations(text: str, dataset: Dict) -> Tuple[bool, List[str]]:
+    """
+    Detect fabricated agent names that aren't in the dataset
+
+    Returns: (has_violations, list_of_agent_names_found)
+    """
+
+    # Get verified agents from dataset
+    is_synthetic = dataset.get('metadata', {}).get('is_synthetic', False)
+
+    # Extract agent names from dataset
+    verified_agents = set()
+
+    # Check top_agents in intelligence layer
+    intelligence = dataset.get('intelligence', {})
+    top_agents = intelligence.get('top_agents', [])
+    for agent_entry in top_agents:
+        if isinstance(agent_entry, dict):
+            agent_name = agent_entry.get('agent', '')
+            if agent_name:
+                verified_agents.add(agent_name.lower())
+        elif isinstance(agent_entry, str):
+            verified_agents.add(agent_entry.lower())
+
+    # Check properties for agent names
+    properties = dataset.get('properties', [])
+    for prop in properties:
+        agent = prop.get('agent', '')
+        if agent:
+            verified_agents.add(agent.lower())
+
+    # Known London luxury agencies (common fabrications)
+    known_agencies = [
+        'knight frank', 'savills', 'strutt & parker', 'chestertons',
+        'beauchamp estates', 'rokstone', 'aylesford international',
+        'wetherell', 'aston chase', 'hamptons', 'foxtons',
+        'douglas & gordon', 'john d wood', 'lurot brand'
+    ]
+
+    violations = []
+
+    # Check if response mentions any known agencies
+    text_lower = text.lower()
+    for agency in known_agencies:
+        if agency in text_lower:
+            # Check if this agency is verified
+            if agency not in verified_agents and not is_synthetic:
+                violations.append(agency)
+
+    return len(violations) > 0, violations
+
+
+def check_geographic_scope(text: str, dataset: Dict, user_message: str) -> Tuple[bool, str]:
+    """
+    Check if response violates geographic scope boundaries
+
+    Returns: (is_violation, corrected_response_or_none)
+    """
+
+    # Get dataset's market
+    metadata = dataset.get('metadata', {})
+    dataset_area = metadata.get('area', '').lower()
+
+    if not dataset_area or dataset_area == 'unknown':
+        # No valid dataset - can't validate scope
+        return False, None
+
+    # If user asked about a specific market different from dataset
+    requested_market = requested_out_of_scope_market(dataset, user_message)
+    if requested_market:
+        # Check if response discusses the wrong market
+        # Look for data leakage patterns
+        has_stats = bool(re.search(r'\d+\.?\d*%|£\d+|inventory|velocity|pricing', text.lower()))
+
+        if has_stats:
+            # Response contains stats but user asked about different market = VIOLATION
+            logger.warning(f"⚠️ SCOPE VIOLATION: User asked about {requested_market}, dataset is {dataset_area}, response has stats")
+
+            corrected_response = f"I don't have data for {requested_market.title()}. My current coverage is {dataset_area.title()}. Would you like insights on {dataset_area.title()} instead?"
+
+            return True, corrected_response
+
+    return False, None
+
+
+# ============================================================
+# STREAMING (sentence-validated early delivery)
+# ============================================================
+
+LLM_STREAMING_ENABLED = os.getenv("LLM_STREAMING_ENABLED", "true").lower() == "true"
+STREAM_FIRST_CHUNK_MIN_WORDS = int(os.getenv("STREAM_FIRST_CHUNK_MIN_WORDS", "20"))
+STREAM_FIRST_CHUNK_MAX_WORDS = int(os.getenv("STREAM_FIRST_CHUNK_MAX_WORDS", "60"))
+
+
+class SentenceSplitter:
+    """
+    Cuts a token stream into sentences / lines
+    
+    Trailing whitespace stays on each segment so segments re-join to the exact text.
+    """
+    
+    _BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n\s*')
+    
+    def __init__(self):
+        self.buffer = ""
+    
+    def feed(self, delta: str) -> List[Tuple[str, bool]]:
+        """Add streamed text; returns completed (segment, ends_paragraph) pairs"""
+        self.buffer += delta
+        segments = []
+        pos = 0
+        
+        for match in self._BOUNDARY.finditer(self.buffer):
+            if match.end() >= len(self.buffer):
+                break  # Whitespace may continue in the next delta
+            segments.append((self.buffer[pos:match.end()], match.group().count('\n') >= 2))
+            pos = match.end()
+        
+        self.buffer = self.buffer[pos:]
+        return segments
+    
+    def flush(self) -> List[Tuple[str, bool]]:
+        tail, self.buffer = self.buffer, ""
+        return [(tail, True)] if tail else []
+
+
+def stream_sentence_violations(sentence: str, dataset: Dict, client_profile: Dict, message: str,
+                               is_early_phase: bool) -> Tuple[List[str], List[str]]:
+    """
+    Run the post-generation validators over one streamed sentence
+    
+    Returns: (blocking, rewrites)
+        blocking - violations the buffered path answers by regenerating or
+                   replacing the whole response (numeric, scope, autopilot)
+        rewrites - violations the buffered path fixes in place (agent names,
+                   monitoring language, fabricated fees, early-phase metrics)
+    """
+    blocking, rewrites = [], []
+    is_synthetic = dataset.get('metadata', {}).get('is_synthetic', False)
+    lower = sentence.lower()
+    
+    has_numeric, numeric = contains_numeric_violations(sentence, dataset)
+    if has_numeric:
+        blocking.extend(numeric)
+    
+    if not is_synthetic and check_geographic_scope(sentence, dataset, message)[0]:
+        blocking.append("scope")
+    
+    if client_profile and client_profile.get('agency_name') and any(p in lower for p in FORBIDDEN_AUTOPILOT_PHRASES):
+        blocking.append("autopilot")
+    
+    if not is_synthetic and contains_agent_violations(sentence, dataset)[0]:
+        rewrites.append("agent_name")
+    
+    if any(p in lower for p in FORBIDDEN_MONITORING_PHRASES):
+        rewrites.append("monitoring_language")
+    
+    if re.search(FABRICATED_MONEY_PATTERN, sentence, re.IGNORECASE):
+        rewrites.append("fabricated_fee")
+    
+    if is_early_phase and re.search(r'\d+\.?\d*/100|\d+\.?\d*%', sentence):
+        rewrites.append("early_phase_metric")
+    
+    return blocking, rewrites
+
+
+async def stream_completion(messages: List[Dict], temperature: float,
+                            check_sentence: Callable[[str], Tuple[List[str], List[str]]],
+                            on_first_chunk: Callable[[str], Awaitable[bool]]) -> Tuple[str, Optional[str]]:
+    """
+    Stream a completion, validating each sentence as it completes
+    
+    The opening paragraph is handed to on_first_chunk as soon as it is long
+    enough and every sentence in it is clean. Any violation before that point
+    turns early delivery off (the caller's buffered validators then see the
+    full text as usual). After it, sentences with blocking violations are
+    dropped so the delivered prefix stays consistent with the final response.
+    
+    Returns: (response_text, delivered_first_chunk or None)
+    """
+    splitter = SentenceSplitter()
+    kept: List[str] = []
+    state = {'released': None, 'early': True, 'dropped': 0}
+    
+    async def _handle(segment: str, ends_paragraph: bool, final: bool = False):
+        sentence = segment.strip()
+        
+        if state['released'] is not None:
+            if sentence and check_sentence(sentence)[0]:
+                state['dropped'] += 1
+                logger.warning(f"⚠️ Streamed sentence dropped after first chunk: {sentence[:80]}")
+                return
+            kept.append(segment)
+            return
+        
+        kept.append(segment)
+        
+        if not sentence or not state['early']:
+            return
+        
+        blocking, rewrites = check_sentence(sentence)
+        if blocking or rewrites or ''.join(kept).lstrip().startswith('{'):
+            state['early'] = False
+            logger.info(f"Early delivery off for this response ({', '.join(blocking + rewrites) or 'json'})")
+            return
+        
+        if final:
+            return  # Generation finished - the caller sends everything in one go
+        
+        chunk = ''.join(kept).strip()
+        words = len(chunk.split())
+        
+        if (ends_paragraph and words >= STREAM_FIRST_CHUNK_MIN_WORDS) or words >= STREAM_FIRST_CHUNK_MAX_WORDS:
+            if await on_first_chunk(chunk):
+                state['released'] = chunk
+                logger.info(f"⚡ First chunk delivered while streaming ({words} words)")
+            else:
+                state['early'] = False
+    
+    stream = await openai_client.chat.completions.create(
+        model=PRIMARY_LLM_MODEL,
+        messages=messages,
+        max_tokens=350,
+        temperature=temperature,
+        timeout=90.0,
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+    
+    try:
+        async for event in stream:
+            if getattr(event, 'usage', None):
+                log_prompt_usage(event, "primary_stream")
+            
+            if not event.choices:
+                continue
+            
+            delta = event.choices[0].delta.content
+            if delta:
+                for segment, ends_paragraph in splitter.feed(delta):
+                    await _handle(segment, ends_paragraph)
+        
+        for segment, ends_paragraph in splitter.flush():
+            await _handle(segment, ends_paragraph, final=True)
+    
+    except Exception as e:
+        if state['released'] is None:
+            raise
+        # First chunk is already with the user - keep what arrived
+        logger.error(f"❌ Stream interrupted after first chunk: {e}")
+    
+    if state['dropped']:
+        logger.warning(f"⚠️ {state['dropped']} streamed sentence(s) dropped by validators")
+    
+    return ''.join(kept), state['released']
+
+
+_ttfm_samples = {'streamed': deque(maxlen=500), 'buffered': deque(maxlen=500)}
+
+
+def record_time_to_first_message(seconds: float, streamed: bool):
+    """Time from LLM call start to the first WhatsApp message for this query"""
+    mode = 'streamed' if streamed else 'buffered'
+    _ttfm_samples[mode].append(seconds)
+    logger.info(f"⏱️ Time to first message: {seconds:.2f}s ({mode})")
+
+
+def get_ttfm_stats() -> Dict:
+    """Recent time-to-first-message percentiles, per delivery mode"""
+    stats = {}
+    for mode, samples in _ttfm_samples.items():
+        ordered = sorted(samples)
+        stats[mode] = {
+            'count': len(ordered),
+            'p50': round(ordered[len(ordered) // 2], 3) if ordered else None,
+            'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3) if ordered else None
+        }
+    return stats
+
+
+async def classify_and_respond(message: str, dataset: dict, client_profile: dict = None, comparison_datasets: list = None, governance_result = None,
+                               on_first_chunk: Callable[[str], Awaitable[bool]] = None) -> tuple[str, str, dict]:
     """
     Classify message intent and generate response using LLM with Waves 3+4 adaptive intelligence + DECISION MODE + AUTHORITY MODE.
     
@@ -799,6 +1265,9 @@ async def classify_and_respond(message: str, dataset: dict, client_profile: dict
         dataset: Primary dataset (current region)
         client_profile: Client preferences and history (optional)
         comparison_datasets: Additional datasets for comparative analysis (optional)
+        on_first_chunk: Async sender for streaming mode (optional). Gets the first
+            validated paragraph while generation continues, returns True if sent;
+            the delivered text is reported as metadata['streamed_first_chunk']
     
     Returns: (category, response_text, metadata)
     """
@@ -832,7 +1301,7 @@ async def classify_and_respond(message: str, dataset: dict, client_profile: dict
             logger.info("="*70)
             logger.info("FIRST LLM CALL - RUNTIME STATUS")
             logger.info("="*70)
-            logger.info(f"Model: gpt-4-turbo")
+            logger.info(f"Model: {PRIMARY_LLM_MODEL}")
             logger.info(f"Temperature: 0.25 (adaptive)")
             logger.info(f"Data Source: {data_source}")
             logger.info(f"Is Synthetic: {is_synthetic}")
@@ -980,26 +1449,6 @@ NO abstractions. NO "navigate complexities". Just that sentence.
         else:
             identity_anchor = ""
         
-        # Get UK time for context
-        uk_tz = pytz.timezone('Europe/London')
-        uk_now = datetime.now(uk_tz)
-        current_time_uk = uk_now.strftime('%H:%M GMT')
-        current_date = uk_now.strftime('%A, %B %d, %Y')
-        
-        # Format system prompt with client context + industry + agency
-        system_prompt_personalized = SYSTEM_PROMPT.format(
-            current_time_uk=current_time_uk,
-            current_date=current_date,
-            client_name=name,
-            agency_name=agency_name if agency_name else client_company if client_company else "your organization",  
-            client_company=client_company if client_company else "your organization",
-            client_tier=client_tier_display,
-            preferred_region=preferred_region,
-            industry=industry,
-            industry_context=industry_context,
-            agency_context=agency_context
-        ) + identity_anchor
-        
         # ============================================================
         # WAVE 3: Get adaptive LLM configuration
         # ============================================================
@@ -1016,15 +1465,37 @@ NO abstractions. NO "navigate complexities". Just that sentence.
                    f"confidence={adaptive_config['confidence_level']}")
         
         # ============================================================
-        # WAVE 3: Apply confidence-based tone modulation
+        # STATIC PREFIX (client + industry + confidence tier, memoised)
         # ============================================================
+        # Byte-stable per client so provider-side prompt caching can hit;
+        # everything per-call goes into dynamic_blocks after it.
+        confidence_tier = AdaptiveLLMController.confidence_tier(
+            adaptive_config['confidence_level'],
+            adaptive_config['data_quality']
+        )
         
-        enhanced_system_prompt = AdaptiveLLMController.modulate_tone_for_confidence(
-            system_prompt=system_prompt_personalized,
-            confidence_level=adaptive_config['confidence_level'],
-            data_quality=adaptive_config['data_quality']
+        static_prefix = render_static_prefix(
+            client_name=name,
+            agency_name=agency_name if agency_name else client_company if client_company else "your organization",
+            client_company=client_company if client_company else "your organization",
+            client_tier=client_tier_display,
+            preferred_region=preferred_region,
+            industry=industry,
+            industry_context=industry_context,
+            agency_context=agency_context,
+            identity_anchor=identity_anchor,
+            confidence_tier=confidence_tier
         )
         
+        # ============================================================
+        # DYNAMIC SUFFIX BLOCKS (per call)
+        # ============================================================
+        uk_now = datetime.now(pytz.timezone('Europe/London'))
+        dynamic_blocks = [SESSION_CONTEXT_TEMPLATE.format(
+            current_time_uk=uk_now.strftime('%H:%M GMT'),
+            current_date=uk_now.strftime('%A, %B %d, %Y')
+        )]
+        
         # ========================================
         # ANTI-REPETITION STRATEGY (TWO-LAYER)
         # ========================================
@@ -1066,7 +1537,7 @@ BANNED for this response. Use alternatives:
             else:
                 dedup_instruction = ""
             
-            enhanced_system_prompt += dedup_instruction
+            dynamic_blocks.append(dedup_instruction)
             
         except Exception as e:
             logger.warning(f"Could not apply phrase deduplication: {e}")
@@ -1194,7 +1665,7 @@ Respond naturally (2-3 sentences max) explaining:
 NO marketing speak. Conversational. Specific to their context."""
 
             # Call LLM with minimal tokens
-            value_response = openai_client.chat.completions.create(
+            value_response = await openai_client.chat.completions.create(
                 model="gpt-4o-mini",  # Cheaper model, simple task
                 messages=[
                     {"role": "system", "content": "You explain Voxmill's value proposition naturally and specifically."},
@@ -1271,7 +1742,7 @@ REQUIRED:
 - Advisor tone (you're sitting next to them)
 """
             
-            enhanced_system_prompt += human_mode_override
+            dynamic_blocks.append(human_mode_override)
         
         # Build context
         context_parts = [f"PRIMARY DATASET:\n{json.dumps(primary_summary, indent=2)}"]
@@ -1616,7 +2087,7 @@ DO NOT invent specific data. State "data not available" if asked for metrics.
             logger.info(f"✅ Applied {industry} vocabulary to prompt")
         
         # Apply dismissal override if needed
-        enhanced_system_prompt += dismissal_override
+        dynamic_blocks.append(dismissal_override)
         
         # ============================================================
         # PATCH 3: ADD DEMO DATA BANNER IF SYNTHETIC
@@ -1653,7 +2124,7 @@ Note: All entities and figures are synthetic for demonstration purposes."
 VIOLATION = TRUST BREACH. Demo data presented as real = product death.
 """
             
-            enhanced_system_prompt += synthetic_override
+            dynamic_blocks.append(synthetic_override)
         else:
             logger.info("✅ Real data mode — no demo banner needed")
         
@@ -1665,20 +2136,48 @@ VIOLATION = TRUST BREACH. Demo data presented as real = product death.
         # Use temperature from adaptive config (now 0.25 for anti-repetition)
         temperature = adaptive_config['temperature']  # 0.25 - balances brevity with variation
         
+        # Static prefix first, per-call blocks last
+        enhanced_system_prompt = static_prefix + "".join(dynamic_blocks)
+        
+        # Streaming only where no whole-response validator can replace the text
+        # after the first chunk has gone out (decision/meta formats, scope refusals,
+        # direct agent-naming refusals)
+        is_early_phase_query = (client_profile.get('total_queries', 0) if client_profile else 0) < 3
+        stream_eligible = (
+            on_first_chunk is not None
+            and LLM_STREAMING_ENABLED
+            and not is_decision_mode
+            and not is_meta_strategic
+            and not requested_out_of_scope_market(dataset, message)
+            and not any(phrase in message.lower() for phrase in NAME_REQUEST_PHRASES)
+        )
+        streamed_first_chunk = None
+        
         if openai_client:
-            response = openai_client.chat.completions.create(
-                model="gpt-4-turbo",
-                messages=[
-                    {"role": "system", "content": enhanced_system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=350,  # Force brevity - institutional standard
-                temperature=temperature,
-                timeout=90.0,
-                stream=False
-            )
+            llm_messages = [
+                {"role": "system", "content": enhanced_system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
             
-            response_text = response.choices[0].message.content
+            if stream_eligible:
+                response_text, streamed_first_chunk = await stream_completion(
+                    llm_messages,
+                    temperature,
+                    lambda sentence: stream_sentence_violations(sentence, dataset, client_profile, message, is_early_phase_query),
+                    on_first_chunk
+                )
+            else:
+                response = await openai_client.chat.completions.create(
+                    model=PRIMARY_LLM_MODEL,
+                    messages=llm_messages,
+                    max_tokens=350,  # Force brevity - institutional standard
+                    temperature=temperature,
+                    timeout=90.0,
+                    stream=False
+                )
+                
+                response_text = response.choices[0].message.content
+                log_prompt_usage(response, "primary")
         else:
             logger.error("No LLM provider configured")
             return "market_overview", "System configuration error. Please contact support.", {}
@@ -1687,49 +2186,6 @@ VIOLATION = TRUST BREACH. Demo data presented as real = product death.
         # PHASE 1B: POST-GENERATION NUMERIC VALIDATOR
         # ============================================================
         
-        def contains_numeric_violations(text: str, dataset: Dict) -> Tuple[bool, List[str]]:
-            """
-            Detect numeric content that violates grounding rules
-            
-            Returns: (has_violations, list_of_violations)
-            """
-            violations = []
-            
-            # Extract allowed numbers from dataset (if real data)
-            is_synthetic = dataset.get('metadata', {}).get('is_synthetic', False)
-            
-            if is_synthetic:
-                # Synthetic data: numbers are allowed (they're in mock data)
-                return False, []
-            
-            # For real data: detect numeric violations
-             
-            
-            # Detect numeric confidence scores
-            if re.search(r'Confidence:\s*\d+/\d+', text, re.IGNORECASE):
-                violations.append("numeric_confidence_score")
-            
-            if re.search(r'Confidence:\s*\d+', text, re.IGNORECASE):
-                violations.append("numeric_confidence")
-            
-            # Detect standalone percentages without context
-            if re.search(r'\d+\.?\d*%', text):
-                violations.append("percentage")
-            
-            # Detect currency amounts
-            if re.search(r'£\d+|€\d+|\$\d+', text):
-                violations.append("currency")
-            
-            # Detect numeric patterns like "3+" or "drops 3+ prices"
-            if re.search(r'\d+\+', text):
-                violations.append("numeric_plus_pattern")
-            
-            # Detect inventory/velocity scores
-            if re.search(r'Inventory:\s*\d+|Velocity:\s*\d+', text, re.IGNORECASE):
-                violations.append("fabricated_metrics")
-            
-            return len(violations) > 0, violations
-        
         # Run validator
         has_violations, violations = contains_numeric_violations(response_text, dataset)
         
@@ -1755,8 +2211,8 @@ Use ONLY qualitative language. If you cannot answer without numbers, say: "I can
 
 Original user question: {message}"""
             
-            retry_response = openai_client.chat.completions.create(
-                model="gpt-4-turbo",
+            retry_response = await openai_client.chat.completions.create(
+                model=PRIMARY_LLM_MODEL,
                 messages=[
                     {"role": "system", "content": enhanced_system_prompt},
                     {"role": "user", "content": strict_prompt}
@@ -1768,6 +2224,7 @@ Original user question: {message}"""
             )
             
             retry_text = retry_response.choices[0].message.content
+            log_prompt_usage(retry_response, "numeric_retry")
             
             # Check retry
             retry_has_violations, retry_violations = contains_numeric_violations(retry_text, dataset)
@@ -1787,58 +2244,6 @@ Original user question: {message}"""
         # PHASE 2B: POST-GENERATION AGENT NAME VALIDATOR
         # ============================================================
         
-        def contains_agent_violations(text: str, dataset: Dict) -> Tuple[bool, List[str]]:
-            """
-            Detect fabricated agent names that aren't in the dataset
-            
-            Returns: (has_violations, list_of_agent_names_found)
-            """
-             
-            
-            # Get verified agents from dataset
-            is_synthetic = dataset.get('metadata', {}).get('is_synthetic', False)
-            
-            # Extract agent names from dataset
-            verified_agents = set()
-            
-            # Check top_agents in intelligence layer
-            intelligence = dataset.get('intelligence', {})
-            top_agents = intelligence.get('top_agents', [])
-            for agent_entry in top_agents:
-                if isinstance(agent_entry, dict):
-                    agent_name = agent_entry.get('agent', '')
-                    if agent_name:
-                        verified_agents.add(agent_name.lower())
-                elif isinstance(agent_entry, str):
-                    verified_agents.add(agent_entry.lower())
-            
-            # Check properties for agent names
-            properties = dataset.get('properties', [])
-            for prop in properties:
-                agent = prop.get('agent', '')
-                if agent:
-                    verified_agents.add(agent.lower())
-            
-            # Known London luxury agencies (common fabrications)
-            known_agencies = [
-                'knight frank', 'savills', 'strutt & parker', 'chestertons',
-                'beauchamp estates', 'rokstone', 'aylesford international',
-                'wetherell', 'aston chase', 'hamptons', 'foxtons',
-                'douglas & gordon', 'john d wood', 'lurot brand'
-            ]
-            
-            violations = []
-            
-            # Check if response mentions any known agencies
-            text_lower = text.lower()
-            for agency in known_agencies:
-                if agency in text_lower:
-                    # Check if this agency is verified
-                    if agency not in verified_agents and not is_synthetic:
-                        violations.append(agency)
-            
-            return len(violations) > 0, violations
-        
         # Run agent validator (only for real data)
         is_synthetic = dataset.get('metadata', {}).get('is_synthetic', False)
         
@@ -1860,10 +2265,7 @@ Original user question: {message}"""
                 logger.warning(f"Verified agents in dataset: {list(verified_agents) if verified_agents else 'none'}")
                 
                 # Check if user specifically asked to "name agents"
-                user_asked_for_names = any(phrase in message.lower() for phrase in [
-                    'name the', 'which agents', 'who are the', 'list the', 
-                    'top 3 agents', 'top agents', 'leading agencies'
-                ])
+                user_asked_for_names = any(phrase in message.lower() for phrase in NAME_REQUEST_PHRASES)
                 
                 if user_asked_for_names:
                     # User explicitly asked for names - refuse
@@ -1893,51 +2295,6 @@ Original user question: {message}"""
         # PHASE 3B: POST-GENERATION SCOPE VALIDATOR
         # ============================================================
         
-        def check_geographic_scope(text: str, dataset: Dict, user_message: str) -> Tuple[bool, str]:
-            """
-            Check if response violates geographic scope boundaries
-            
-            Returns: (is_violation, corrected_response_or_none)
-            """
-             
-            
-            # Get dataset's market
-            metadata = dataset.get('metadata', {})
-            dataset_area = metadata.get('area', '').lower()
-            
-            if not dataset_area or dataset_area == 'unknown':
-                # No valid dataset - can't validate scope
-                return False, None
-            
-            # Common London markets that might be confused
-            london_markets = [
-                'mayfair', 'chelsea', 'kensington', 'knightsbridge', 
-                'belgravia', 'south kensington', 'notting hill', 
-                'marylebone', 'holland park', 'fitzrovia'
-            ]
-            
-            # Extract market mentions from user message
-            user_msg_lower = user_message.lower()
-            mentioned_markets = [m for m in london_markets if m in user_msg_lower]
-            
-            # If user asked about a specific market different from dataset
-            if mentioned_markets and mentioned_markets[0] != dataset_area:
-                requested_market = mentioned_markets[0]
-                
-                # Check if response discusses the wrong market
-                # Look for data leakage patterns
-                has_stats = bool(re.search(r'\d+\.?\d*%|£\d+|inventory|velocity|pricing', text.lower()))
-                
-                if has_stats:
-                    # Response contains stats but user asked about different market = VIOLATION
-                    logger.warning(f"⚠️ SCOPE VIOLATION: User asked about {requested_market}, dataset is {dataset_area}, response has stats")
-                    
-                    corrected_response = f"I don't have data for {requested_market.title()}. My current coverage is {dataset_area.title()}. Would you like insights on {dataset_area.title()} instead?"
-                    
-                    return True, corrected_response
-            
-            return False, None
-        
         # Run scope validator (only for real data)
         if not is_synthetic:
             is_scope_violation, corrected_response = check_geographic_scope(response_text, dataset, message)
@@ -1994,7 +2351,7 @@ Original user question: {message}"""
         # ========================================
         
         # Detect fabricated financial figures (£X, $X, €X with precision)
-        fabricated_money_pattern = r'[£$€]\s*\d+[,\d]*k?\s+per\s+(instruction|property|unit|deal|transaction)'
+        fabricated_money_pattern = FABRICATED_MONEY_PATTERN
         
         if re.search(fabricated_money_pattern, response_text, re.IGNORECASE):
             logger.warning(f"⚠️ HALLUCINATION DETECTED: Fabricated financial figure in response")
@@ -2038,13 +2395,7 @@ Original user question: {message}"""
         # MONITORING LANGUAGE VALIDATOR
         # ========================================
         
-        forbidden_monitoring_phrases = [
-            'monitoring initiated',
-            'surveillance established', 
-            'tracking in progress',
-            'establish monitoring',
-            'consider engaging monitoring'
-        ]
+        forbidden_monitoring_phrases = FORBIDDEN_MONITORING_PHRASES
         
         has_forbidden_monitoring = any(phrase.lower() in response_text.lower() 
                                        for phrase in forbidden_monitoring_phrases)
@@ -2115,12 +2466,7 @@ Conviction: pricing elasticity"""
         
         # If client is authenticated, NEVER output Voxmill self-description
         if client_profile and client_profile.get('agency_name'):
-            forbidden_autopilot = [
-                'i provide real-time market intelligence across industries',
-                'analysis includes inventory levels',
-                'i provide', 'i offer', 'i deliver', 'i analyze',
-                'across industries', 'voxmill delivers'
-            ]
+            forbidden_autopilot = FORBIDDEN_AUTOPILOT_PHRASES
             
             has_autopilot = any(phrase in response_text.lower() for phrase in forbidden_autopilot)
             
@@ -2230,12 +2576,7 @@ Conviction: pricing elasticity"""
         
         # If client is authenticated, NEVER output Voxmill self-description
         if client_profile and client_profile.get('agency_name'):
-            forbidden_autopilot = [
-                'i provide real-time market intelligence across industries',
-                'analysis includes inventory levels',
-                'i provide', 'i offer', 'i deliver', 'i analyze',
-                'across industries', 'voxmill delivers'
-            ]
+            forbidden_autopilot = FORBIDDEN_AUTOPILOT_PHRASES
             
             has_autopilot = any(phrase in response_text.lower() for phrase in forbidden_autopilot)
             
@@ -2395,6 +2736,11 @@ Current focus: competitive positioning, pricing trends, instruction flow."""
             logger.warning(f"Invalid category returned: {category}, defaulting")
             category = "decision_mode" if is_decision_mode else "meta_strategic" if is_meta_strategic else "market_overview"
         
+        if streamed_first_chunk:
+            response_metadata['streamed_first_chunk'] = streamed_first_chunk
+            if not response_text.startswith(streamed_first_chunk):
+                logger.warning("⚠️ Final response no longer starts with the streamed first chunk")
+        
         logger.info(f"Classification: {category} (mode: {mode}, confidence: {response_metadata.get('confidence_level')})")
         return category, response_text, response_metadata
         
@@ -14,7 +14,11 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from fastapi import FastAPI, Request, BackgroundTasks, HTTPException
 from fastapi.responses import PlainTextResponse
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client, get_db
+from app.async_executor import (
+    run_blocking, shutdown_executor,
+    start_loop_lag_monitor, stop_loop_lag_monitor, get_loop_lag_stats
+)
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 # Configure logging FIRST
@@ -72,9 +76,9 @@ except Exception as e:
 # INITIALIZE MONGODB
 # ============================================================================
 MONGODB_URI = os.getenv('MONGODB_URI')
-mongo_client = MongoClient(MONGODB_URI)
-db = mongo_client['Voxmill']
-logger.info("✅ MongoDB connected")
+mongo_client = get_mongo_client()
+db = get_db()
+logger.info("✅ MongoDB connected (shared pool)")
 
 # ============================================================================
 # UTILITY FUNCTIONS
@@ -125,7 +129,7 @@ async def warm_cache():
         formula = "AND({is_active}=TRUE())"
         params = {'filterByFormula': formula}
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = await run_blocking(requests.get, url, headers=headers, params=params, timeout=10)
         
         if response.status_code == 200:
             records = response.json().get('records', [])
@@ -137,8 +141,8 @@ async def warm_cache():
                 
                 if industry and market:
                     try:
-                        # Route to appropriate dataset loader
-                        load_dataset(area=market, max_properties=100, industry=industry)
+                        # Route to appropriate dataset loader (bypass cache, publish fresh)
+                        await run_blocking(load_dataset, area=market, max_properties=100, industry=industry, force_refresh=True)
                         logger.info(f"✅ Cache warmed: {industry} / {market}")
                     except Exception as e:
                         logger.error(f"Cache warm failed for {industry}/{market}: {e}")
@@ -149,66 +153,30 @@ async def warm_cache():
     except Exception as e:
         logger.error(f"Cache warming failed: {e}")
 
+async def refresh_hot_datasets_task():
+    """Keep the most-requested regions fresh (stale-while-revalidate)"""
+    try:
+        from app.dataset_loader import refresh_hot_datasets
+        queued = await run_blocking(refresh_hot_datasets)
+        if queued:
+            logger.info(f"🔄 Hot dataset refresh: {queued} region(s) queued")
+    except Exception as e:
+        logger.error(f"Hot dataset refresh failed: {e}")
+
 async def check_and_send_alerts_task():
     """Background task to check and send alerts"""
     try:
-        from app.intelligence.alert_detector import detect_alerts_for_region, format_alert_message
-        from app.whatsapp import send_twilio_message
+        from app.alert_engine import run_alert_cycle
         
         logger.info("="*70)
         logger.info("ALERT CHECKER - Starting")
         logger.info("="*70)
         
-        clients = list(db['client_profiles'].find({
-            "tier": {"$in": ["tier_2", "tier_3"]},
-            "whatsapp_number": {"$exists": True}
-        }))
-        
-        logger.info(f"Found {len(clients)} clients eligible for alerts")
+        # Region-first: each (region, vertical) evaluated once, fanned out to subscribers
+        stats = await run_alert_cycle(db)
         
-        total_alerts_sent = 0
-        
-        for client in clients:
-            client_name = client.get('name', 'Unknown')
-            whatsapp_number = client.get('whatsapp_number')
-            preferred_regions = client.get('preferences', {}).get('preferred_regions', [])
-            
-            alert_preferences = client.get('alert_preferences', {})
-            alerts_enabled = alert_preferences.get('enabled', True)
-            
-            if not alerts_enabled or not whatsapp_number or not preferred_regions:
-                continue
-            
-            for region in preferred_regions:
-                try:
-                    alerts = detect_alerts_for_region(region)
-                    if not alerts:
-                        continue
-                    
-                    for alert in alerts:
-                        message = format_alert_message(alert)
-                        try:
-                            await send_twilio_message(whatsapp_number, message)
-                            logger.info(f"✅ Sent {alert['type']} alert to {client_name}")
-                            
-                            db['alerts_sent'].insert_one({
-                                "client_id": client.get('_id'),
-                                "client_name": client_name,
-                                "whatsapp_number": whatsapp_number,
-                                "alert_type": alert['type'],
-                                "region": region,
-                                "urgency": alert['urgency'],
-                                "timestamp": datetime.now(timezone.utc),
-                                "alert_data": alert
-                            })
-                            
-                            total_alerts_sent += 1
-                        except Exception as e:
-                            logger.error(f"❌ Failed to send alert to {client_name}: {e}")
-                except Exception as e:
-                    logger.error(f"Error detecting alerts for {region}: {e}", exc_info=True)
-        
-        logger.info(f"ALERT CHECKER COMPLETE - Sent {total_alerts_sent} total alerts")
+        logger.info(f"ALERT CHECKER COMPLETE - Sent {stats['sent']} total alerts "
+                    f"({stats['regions']} regions, {stats['alerts_detected']} detected, {stats['failed']} failed)")
         
     except Exception as e:
         logger.error(f"Fatal error in alert checker: {e}", exc_info=True)
@@ -216,6 +184,7 @@ async def check_and_send_alerts_task():
 async def store_daily_snapshots_all_regions():
     """Store daily snapshots for all active markets across ALL industries"""
     from app.dataset_loader import load_dataset
+    from app.historical_storage import store_daily_snapshot
     
     try:
         # ========================================
@@ -236,7 +205,7 @@ async def store_daily_snapshots_all_regions():
         formula = "AND({is_active}=TRUE())"
         params = {'filterByFormula': formula}
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = await run_blocking(requests.get, url, headers=headers, params=params, timeout=10)
         
         if response.status_code == 200:
             records = response.json().get('records', [])
@@ -249,8 +218,9 @@ async def store_daily_snapshots_all_regions():
                 if industry and market:
                     try:
                         logger.info(f"📸 Storing daily snapshot for {industry}/{market}...")
-                        dataset = load_dataset(area=market, max_properties=100, industry=industry)
-                        # Snapshot storage happens automatically inside load_dataset
+                        dataset = await run_blocking(load_dataset, area=market, max_properties=100, industry=industry)
+                        # Delta write: only new / repriced / delisted listings hit MongoDB
+                        await run_blocking(store_daily_snapshot, dataset, market)
                         logger.info(f"✅ Snapshot stored for {industry}/{market}")
                     except Exception as e:
                         logger.error(f"Failed to store snapshot for {industry}/{market}: {e}")
@@ -261,6 +231,24 @@ async def store_daily_snapshots_all_regions():
     except Exception as e:
         logger.error(f"Snapshot storage failed: {e}")
 
+async def purge_expired_history_task():
+    """Daily retention sweep for historical snapshots (kept off the write path)"""
+    from app.historical_storage import purge_expired_history
+    
+    try:
+        await run_blocking(purge_expired_history)
+    except Exception as e:
+        logger.error(f"History retention failed: {e}")
+
+async def retrain_intent_classifier_task():
+    """Daily refit of the local mandate-check classifier on logged LLM decisions"""
+    from app.intent_classifier import train_intent_classifier
+    
+    try:
+        await run_blocking(train_intent_classifier)
+    except Exception as e:
+        logger.error(f"Intent classifier retrain failed: {e}")
+
 async def reset_monthly_message_counters():
     """
     Reset Messages Used This Month to 0 for all clients
@@ -272,11 +260,10 @@ async def reset_monthly_message_counters():
         logger.info("="*70)
         
         # Reset MongoDB
-        from pymongo import MongoClient
         MONGODB_URI = os.getenv('MONGODB_URI')
         
         if MONGODB_URI:
-            mongo_client = MongoClient(MONGODB_URI)
+            mongo_client = get_mongo_client()
             db = mongo_client['Voxmill']
             
             # Reset all client profiles
@@ -309,7 +296,7 @@ async def reset_monthly_message_counters():
                     record_id=airtable_record_id
                 )
         
-        logger.info(f"✅ Queued Airtable reset for {len(clients)} clients")
+        logger.info(f"✅ Queued Airtable reset for {len(clients)} clients (sent as 10-record batches)")
         logger.info("="*70)
         logger.info("MONTHLY RESET COMPLETE")
         logger.info("="*70)
@@ -345,6 +332,16 @@ async def startup_event():
     except Exception as e:
         logger.error(f"❌ Airtable queue processor failed to start: {e}")
     
+    # ========================================
+    # MONITOR STORE (indexes + embedded-monitor migration)
+    # ========================================
+    try:
+        from app.monitoring import ensure_monitor_store
+        await run_blocking(ensure_monitor_store)
+        logger.info("✅ Monitor store ready")
+    except Exception as e:
+        logger.error(f"⚠️ Monitor store setup failed: {e}")
+    
     # ========================================
     # START SCHEDULERS
     # ========================================
@@ -355,6 +352,9 @@ async def startup_event():
         # Daily cache warming + historical snapshot
         scheduler.add_job(warm_cache, 'cron', hour=7, minute=0)
         
+        # Access-ranked dataset refresh ahead of the soft TTL
+        scheduler.add_job(refresh_hot_datasets_task, 'interval', minutes=10)
+        
         # NEW: Daily historical snapshot for ALL core regions
         scheduler.add_job(
             store_daily_snapshots_all_regions,
@@ -364,6 +364,24 @@ async def startup_event():
             timezone='Europe/London'
         )
         
+        # Historical retention (separate from the snapshot writes)
+        scheduler.add_job(
+            purge_expired_history_task,
+            'cron',
+            hour=3,
+            minute=15,
+            timezone='Europe/London'
+        )
+        
+        # Local intent classifier refit (fast path in front of the mandate LLM)
+        scheduler.add_job(
+            retrain_intent_classifier_task,
+            'cron',
+            hour=4,
+            minute=0,
+            timezone='Europe/London'
+        )
+        
         # NEW: Monthly message counter reset
         scheduler.add_job(
             reset_monthly_message_counters,
@@ -375,7 +393,7 @@ async def startup_event():
         )
         
         scheduler.start()
-        logger.info("✅ Scheduler started: monitors (15min), cache (7am), snapshots (6:30am), monthly reset (1st/midnight)")
+        logger.info("✅ Scheduler started: monitors (15min), cache (7am + hot refresh 10min), snapshots (6:30am), history retention (3:15am), intent retrain (4am), monthly reset (1st/midnight)")
         
     except Exception as e:
         logger.error(f"Scheduler startup failed: {e}")
@@ -392,6 +410,17 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"⚠️ Background scheduler not started: {e}")
     
+    # ========================================
+    # AIRTABLE PROFILE INDEX (background sync)
+    # ========================================
+    from app.airtable_profiles import airtable_profiles
+    airtable_profiles.start()
+    
+    # ========================================
+    # EVENT LOOP LAG MONITOR
+    # ========================================
+    start_loop_lag_monitor()
+    
     logger.info("✅ Voxmill service ready")
 
 
@@ -421,6 +450,50 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Scheduler shutdown failed: {e}")
     
+    # ========================================
+    # STOP AIRTABLE PROFILE SYNC
+    # ========================================
+    from app.airtable_profiles import airtable_profiles
+    airtable_profiles.stop()
+    
+    # ========================================
+    # DRAIN OUTBOUND TWILIO QUEUE
+    # ========================================
+    try:
+        from app.twilio_sender import twilio_sender
+        await twilio_sender.aclose()
+        logger.info("✅ Twilio sender drained")
+    except Exception as e:
+        logger.error(f"Twilio sender shutdown failed: {e}")
+    
+    # ========================================
+    # DRAIN BLOCKING I/O EXECUTOR
+    # ========================================
+    stop_loop_lag_monitor()
+    try:
+        await asyncio.to_thread(shutdown_executor)
+    except Exception as e:
+        logger.error(f"Executor shutdown failed: {e}")
+    
+    # ========================================
+    # CLOSE UPSTASH CONNECTIONS
+    # ========================================
+    try:
+        from app.upstash_client import redis_client as upstash_client
+        if upstash_client:
+            await upstash_client.aclose()
+    except Exception as e:
+        logger.error(f"Upstash client shutdown failed: {e}")
+    
+    # ========================================
+    # CLOSE MONGODB POOL
+    # ========================================
+    try:
+        from app.mongo_pool import close_mongo_client
+        close_mongo_client()
+    except Exception as e:
+        logger.error(f"MongoDB pool shutdown failed: {e}")
+    
     logger.info("✅ Shutdown complete")
 
 # ============================================================================
@@ -509,7 +582,11 @@ async def process_message_async(sender: str, message_body: str):
     """Process message asynchronously"""
     try:
         from app.whatsapp import handle_whatsapp_message
-        await handle_whatsapp_message(sender, message_body)
+        from app.conversation_manager import async_session_unit_of_work
+        
+        # One session load + one write-back for the whole message (both off the event loop)
+        async with async_session_unit_of_work(sender):
+            await handle_whatsapp_message(sender, message_body)
     except Exception as e:
         logger.error(f"❌ Error processing message for {sender}: {e}", exc_info=True)
         try:
@@ -578,6 +655,12 @@ async def sync_preferences_from_airtable(request: Request):
             upsert=True  # Create if doesn't exist
         )
         
+        # Push invalidation for the cached Airtable profile
+        profile = await run_blocking(db.client_profiles.find_one, {"email": email}, {"whatsapp_number": 1})
+        if profile and profile.get('whatsapp_number'):
+            from app.airtable_profiles import airtable_profiles
+            await run_blocking(airtable_profiles.invalidate, profile['whatsapp_number'])
+        
         logger.info(f"✅ AIRTABLE SYNC: {email} → {preferences}")
         
         # Return success response
@@ -643,16 +726,21 @@ async def admin_broadcast(request: Request):
         
         from app.whatsapp import send_twilio_message
         
+        # Fan out - TwilioSender caps concurrency and keeps per-recipient order
+        results = await asyncio.gather(
+            *(send_twilio_message(recipient, message) for recipient in recipients),
+            return_exceptions=True
+        )
+        
         sent_count = 0
         failed_count = 0
         
-        for recipient in recipients:
-            try:
-                await send_twilio_message(recipient, message)
-                sent_count += 1
-            except Exception as e:
-                logger.error(f"Failed to send to {recipient}: {e}")
+        for recipient, result in zip(recipients, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to send to {recipient}: {result}")
                 failed_count += 1
+            else:
+                sent_count += 1
         
         return {
             "status": "completed",
@@ -774,6 +862,30 @@ async def emergency_regenerate(request: Request):
         "status": "Generating"
     })
     
+    # On-demand jobs go to the PDF worker's high-priority lane (ahead of the nightly batch)
+    if redis_client:
+        from voxmill_worker import enqueue_pdf_job
+        
+        preferences = client.get('preferences', {})
+        job_id = enqueue_pdf_job(redis_client, {
+            'regions': client.get('regions') or [client.get('default_region', 'Mayfair')],
+            'city': client.get('city', 'London'),
+            'client_email': email,
+            'client_name': client.get('name', 'Client'),
+            'whatsapp_number': client.get('whatsapp_number'),
+            'competitor_focus': preferences.get('competitor_focus', 'medium'),
+            'report_depth': preferences.get('report_depth', 'detailed')
+        }, priority='high')
+        
+        logger.info(f"🚨 EMERGENCY REGENERATION QUEUED: {email} (job {job_id})")
+        
+        return {
+            "status": "queued",
+            "email": email,
+            "job_id": job_id,
+            "eta_seconds": 90
+        }
+    
     # Trigger generation in background
     subprocess.Popen([
         sys.executable, 'voxmill_master.py',
@@ -825,12 +937,63 @@ async def get_cache_metrics():
     """Get cache performance metrics"""
     from app.cache_manager import CacheManager
     
+    from app.airtable_profiles import airtable_profiles
+    
     cache_mgr = CacheManager()
     stats = cache_mgr.get_cache_stats()
     
     return {
         "status": "success",
         "cache_stats": stats,
+        "airtable_profiles": airtable_profiles.get_stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
+@app.get("/metrics/loop")
+async def get_loop_metrics():
+    """Event loop lag + blocking I/O executor stats"""
+    return {
+        "status": "success",
+        "loop_lag": get_loop_lag_stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
+@app.get("/metrics/twilio")
+async def get_twilio_metrics():
+    """Outbound delivery counters + latency percentiles"""
+    from app.twilio_sender import twilio_sender
+    
+    return {
+        "status": "success",
+        "twilio": twilio_sender.get_stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
+@app.get("/metrics/governance")
+async def get_governance_metrics():
+    """Mandate-check decision cache hit rate + local classifier coverage"""
+    from app.governance_cache import governance_cache
+    from app.intent_classifier import get_fastpath_stats
+
+    return {
+        "status": "success",
+        "decision_cache": governance_cache.get_stats(),
+        "intent_fastpath": get_fastpath_stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
+@app.get("/metrics/mongo")
+async def get_mongo_metrics():
+    """Get MongoDB connection pool metrics (checkout wait times, open connections)"""
+    from app.mongo_pool import get_pool_stats
+    
+    return {
+        "status": "success",
+        "pool_stats": get_pool_stats(),
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
@@ -1022,6 +1185,10 @@ async def sync_client_from_airtable(request: Request):
         
         action = "updated" if result.matched_count > 0 else "created"
         
+        # Push invalidation - next message re-resolves from Airtable (all workers)
+        from app.airtable_profiles import airtable_profiles
+        await run_blocking(airtable_profiles.invalidate, whatsapp_formatted)
+        
         logger.info(f"✅ Client {action}: {whatsapp_formatted}")
         logger.info(f"   Industry: {industry}")
         logger.info(f"   Status: {account_status}")
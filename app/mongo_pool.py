@@ -0,0 +1,237 @@
+"""
+VOXMILL MONGODB CONNECTION REGISTRY
+====================================
+One pooled MongoClient per process, shared by every module
+
+FEATURES:
+- Lazy, thread-safe creation of a single tuned connection pool
+- Fork-aware (a child process gets its own pool, never the parent's sockets)
+- Database / collection handle helpers
+- Pool checkout wait-time metrics via pymongo's ConnectionPoolListener
+
+USAGE:
+    from app.mongo_pool import get_mongo_client, get_db, get_collection
+
+    mongo_client = get_mongo_client()      # None if MONGODB_URI not configured
+    db = get_db()                          # Voxmill database handle (or None)
+    profiles = get_collection('client_profiles')
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Optional, Dict
+
+from pymongo import MongoClient, monitoring
+
+logger = logging.getLogger(__name__)
+
+MONGODB_URI = os.getenv("MONGODB_URI")
+DEFAULT_DB_NAME = "Voxmill"
+
+# Pool tuning (overridable per deployment)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+
+SLOW_CHECKOUT_MS = 100  # Log checkouts that wait longer than this
+CHECKOUT_SAMPLE_SIZE = 1000  # Rolling window for percentile metrics
+
+
+# ============================================================
+# POOL METRICS
+# ============================================================
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Records how long callers wait to check a connection out of the pool
+
+    Checkout started/finished events fire on the calling thread, so the
+    start time is kept in a thread-local and paired with the completion.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=CHECKOUT_SAMPLE_SIZE)
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.checked_out = 0
+        self.open_connections = 0
+        self.pool_clears = 0
+
+    def _record_wait(self) -> Optional[float]:
+        started = getattr(self._local, 'checkout_started', None)
+        self._local.checkout_started = None
+        if started is None:
+            return None
+        return (time.perf_counter() - started) * 1000
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait_ms = self._record_wait()
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            if wait_ms is not None:
+                self.total_wait_ms += wait_ms
+                self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+                self._samples.append(wait_ms)
+
+        if wait_ms is not None and wait_ms > SLOW_CHECKOUT_MS:
+            logger.warning(f"⚠️ Slow MongoDB pool checkout: {wait_ms:.0f}ms ({event.address})")
+
+    def connection_check_out_failed(self, event):
+        self._record_wait()
+        with self._lock:
+            self.checkout_failures += 1
+        logger.warning(f"⚠️ MongoDB pool checkout failed: {event.reason} ({event.address})")
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections = max(0, self.open_connections - 1)
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def snapshot(self) -> Dict:
+        """Point-in-time copy of pool metrics"""
+        with self._lock:
+            samples = sorted(self._samples)
+            checkouts = self.checkouts
+
+            def percentile(pct: float) -> float:
+                if not samples:
+                    return 0.0
+                idx = min(len(samples) - 1, int(len(samples) * pct))
+                return round(samples[idx], 2)
+
+            return {
+                "checkouts": checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checked_out_now": self.checked_out,
+                "open_connections": self.open_connections,
+                "pool_clears": self.pool_clears,
+                "avg_wait_ms": round(self.total_wait_ms / checkouts, 2) if checkouts else 0.0,
+                "p50_wait_ms": percentile(0.50),
+                "p95_wait_ms": percentile(0.95),
+                "max_wait_ms": round(self.max_wait_ms, 2),
+            }
+
+
+# ============================================================
+# CLIENT REGISTRY
+# ============================================================
+
+_client: Optional[MongoClient] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+_pool_metrics = PoolMetricsListener()
+
+
+def get_mongo_client() -> Optional[MongoClient]:
+    """
+    Get the process-wide MongoClient (created on first use)
+
+    Returns: Shared MongoClient, or None if MONGODB_URI is not configured
+    """
+    global _client, _client_pid
+
+    if not MONGODB_URI:
+        return None
+
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _client_lock:
+        if _client is not None and _client_pid == pid:
+            return _client
+
+        # After a fork the inherited client is unusable - build a fresh pool
+        _client = MongoClient(
+            MONGODB_URI,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+            waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            retryWrites=True,
+            event_listeners=[_pool_metrics],
+        )
+        _client_pid = pid
+
+        logger.info(
+            f"✅ MongoDB pool initialised (maxPoolSize={MONGO_MAX_POOL_SIZE}, "
+            f"maxIdleTimeMS={MONGO_MAX_IDLE_TIME_MS}, "
+            f"serverSelectionTimeoutMS={MONGO_SERVER_SELECTION_TIMEOUT_MS})"
+        )
+
+    return _client
+
+
+def get_db(name: str = DEFAULT_DB_NAME):
+    """Get a database handle from the shared pool (None if MongoDB not configured)"""
+    client = get_mongo_client()
+    return client[name] if client is not None else None
+
+
+def get_collection(collection: str, db_name: str = DEFAULT_DB_NAME):
+    """Get a collection handle from the shared pool (None if MongoDB not configured)"""
+    db = get_db(db_name)
+    return db[collection] if db is not None else None
+
+
+def get_pool_stats() -> Dict:
+    """Get connection pool configuration and checkout wait-time metrics"""
+    return {
+        "configured": bool(MONGODB_URI),
+        "initialised": _client is not None and _client_pid == os.getpid(),
+        "max_pool_size": MONGO_MAX_POOL_SIZE,
+        "max_idle_time_ms": MONGO_MAX_IDLE_TIME_MS,
+        "server_selection_timeout_ms": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        **_pool_metrics.snapshot(),
+    }
+
+
+def close_mongo_client():
+    """Close the shared pool (application shutdown)"""
+    global _client, _client_pid
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            logger.info("MongoDB pool closed")
+        _client = None
+        _client_pid = None
@@ -8,19 +8,22 @@ Institutional-grade market monitoring with explicit consent and lifecycle manage
 """
 
 import os
+import asyncio
 import logging
 import requests
 import re
 from datetime import datetime, timezone, timedelta
-from pymongo import MongoClient
-from typing import Tuple, Optional
+from app.mongo_pool import get_mongo_client, get_db
+from typing import Dict, List, Tuple, Optional
 from dateutil import parser as dateutil_parser
+from pymongo import ASCENDING, UpdateOne
+from app.async_executor import run_blocking
 
 logger = logging.getLogger(__name__)
 
 MONGODB_URI = os.getenv('MONGODB_URI')
-mongo_client = MongoClient(MONGODB_URI)
-db = mongo_client['Voxmill']
+mongo_client = get_mongo_client()
+db = get_db()
 
 
 # ============================================================
@@ -91,6 +94,122 @@ def get_available_markets_from_db(industry_code: str) -> list:
     return get_markets(industry_code)
 
 
+# ============================================================
+# MONITOR STORE
+# ============================================================
+# One document per monitor in `monitors` (previously embedded in
+# client_profiles.active_monitors). The sweep reads due monitors through
+# the (status, next_check) index instead of scanning every client.
+
+_monitor_store_ready = False
+
+
+def _as_utc(value) -> Optional[datetime]:
+    """Parse stored timestamps (str or naive datetime) to aware UTC"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = dateutil_parser.parse(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def migrate_embedded_monitors() -> int:
+    """Move client_profiles.active_monitors into the monitors collection (idempotent)"""
+    moved = 0
+    
+    for client in db['client_profiles'].find(
+        {'active_monitors': {'$exists': True}},
+        {'whatsapp_number': 1, 'active_monitors': 1}
+    ):
+        whatsapp_number = client.get('whatsapp_number')
+        monitors = client.get('active_monitors') or []
+        
+        for monitor in monitors:
+            monitor = dict(monitor, whatsapp_number=whatsapp_number)
+            
+            # Due-time index needs real datetimes; unset next_check on an active monitor means "due now"
+            monitor['next_check'] = _as_utc(monitor.get('next_check'))
+            if monitor.get('status') == 'active' and monitor['next_check'] is None:
+                monitor['next_check'] = datetime.now(timezone.utc)
+            
+            db['monitors'].update_one(
+                {'whatsapp_number': whatsapp_number, 'id': monitor['id']},
+                {'$setOnInsert': monitor},
+                upsert=True
+            )
+            moved += 1
+        
+        db['client_profiles'].update_one(
+            {'_id': client['_id']},
+            {'$set': {'monitor_count': len(monitors)}, '$unset': {'active_monitors': ''}}
+        )
+    
+    if moved:
+        logger.info(f"✅ Migrated {moved} embedded monitors to monitors collection")
+    
+    return moved
+
+
+def ensure_monitor_store():
+    """
+    Build monitors indexes and run the embedded-monitor migration
+    
+    Called once at startup (off the event loop); later calls are no-ops.
+    """
+    global _monitor_store_ready
+    
+    if _monitor_store_ready:
+        return
+    
+    collection = db['monitors']
+    collection.create_index(
+        [('whatsapp_number', ASCENDING), ('id', ASCENDING)], unique=True, name='client_monitor'
+    )
+    collection.create_index(
+        [('status', ASCENDING), ('next_check', ASCENDING)], name='status_next_check'
+    )
+    collection.create_index(
+        [('whatsapp_number', ASCENDING), ('status', ASCENDING)], name='client_status'
+    )
+    migrate_embedded_monitors()
+    _monitor_store_ready = True
+
+
+def monitors_collection():
+    """monitors collection (indexes are built at startup by ensure_monitor_store)"""
+    return db['monitors']
+
+
+def get_client_monitors(whatsapp_number: str, statuses: Optional[List[str]] = None) -> List[Dict]:
+    """A client's monitors in creation order, optionally filtered by status"""
+    query = {'whatsapp_number': whatsapp_number}
+    if statuses:
+        query['status'] = {'$in': list(statuses)}
+    return list(monitors_collection().find(query).sort('created_at', ASCENDING))
+
+
+def update_monitor(whatsapp_number: str, monitor_id: str, fields: Dict):
+    monitors_collection().update_one(
+        {'whatsapp_number': whatsapp_number, 'id': monitor_id},
+        {'$set': fields}
+    )
+
+
+def delete_monitors(whatsapp_number: str, monitor_id: Optional[str] = None):
+    """Delete one monitor (or all for the client) and keep monitor_count in step"""
+    query = {'whatsapp_number': whatsapp_number}
+    if monitor_id:
+        query['id'] = monitor_id
+    
+    deleted = monitors_collection().delete_many(query).deleted_count
+    
+    if deleted:
+        update = {'$set': {'monitor_count': 0}} if not monitor_id else {'$inc': {'monitor_count': -deleted}}
+        db['client_profiles'].update_one({'whatsapp_number': whatsapp_number}, update)
+
+
 # ============================================================
 # MONITOR MANAGER CLASS
 # ============================================================
@@ -334,11 +453,10 @@ class MonitorManager:
         
         # Check tier limits
         tier = client_profile.get('tier', 'tier_1')
-        existing_monitors = db['client_profiles'].find_one(
-            {'whatsapp_number': whatsapp_number}
-        ).get('active_monitors', [])
-        
-        active_count = len([m for m in existing_monitors if m.get('status') == 'active'])
+        active_count = await run_blocking(
+            monitors_collection().count_documents,
+            {'whatsapp_number': whatsapp_number, 'status': 'active'}
+        )
         
         if active_count >= MonitorManager.TIER_LIMITS[tier]:
             return f"""MONITOR LIMIT REACHED
@@ -351,7 +469,7 @@ Stop an existing monitor or upgrade tier."""
         
         # Get baseline data
         from app.dataset_loader import load_dataset
-        dataset = load_dataset(area=config['region'], industry=config['industry'])
+        dataset = await run_blocking(load_dataset, area=config['region'], industry=config['industry'])
         
         baseline_data = {
             "avg_price": dataset.get('metrics', {}).get('avg_price', 0),
@@ -368,6 +486,7 @@ Stop an existing monitor or upgrade tier."""
         
         monitor = {
             "id": monitor_id,
+            "whatsapp_number": whatsapp_number,
             "created_at": datetime.now(timezone.utc),
             "expires_at": datetime.now(timezone.utc) + timedelta(days=config['duration_days']),
             "duration_days": config['duration_days'],
@@ -394,9 +513,11 @@ Stop an existing monitor or upgrade tier."""
         }
         
         # Save to MongoDB
-        db['client_profiles'].update_one(
+        await run_blocking(monitors_collection().insert_one, monitor)
+        await run_blocking(
+            db['client_profiles'].update_one,
             {'whatsapp_number': whatsapp_number},
-            {'$push': {'active_monitors': monitor}}
+            {'$inc': {'monitor_count': 1}}
         )
         
         # Format trigger list
@@ -466,14 +587,8 @@ Request expires: 5 minutes.{execution_receipt}"""
                 custom_duration = amount * 30
         
         # Find pending monitor
-        client = db['client_profiles'].find_one({'whatsapp_number': whatsapp_number})
-        monitors = client.get('active_monitors', [])
-        
-        pending_monitor = None
-        for m in monitors:
-            if m.get('status') == 'pending_confirmation':
-                pending_monitor = m
-                break
+        pending = await run_blocking(get_client_monitors, whatsapp_number, ['pending_confirmation'])
+        pending_monitor = pending[0] if pending else None
         
         if not pending_monitor:
             return """No pending monitors found.
@@ -494,10 +609,7 @@ Example: "Monitor Knight Frank Mayfair, alert if prices drop 5%"""
             
             if datetime.now(timezone.utc) > pending_expires:
                 # Remove expired pending monitor
-                db['client_profiles'].update_one(
-                    {'whatsapp_number': whatsapp_number},
-                    {'$pull': {'active_monitors': {'id': pending_monitor['id']}}}
-                )
+                await run_blocking(delete_monitors, whatsapp_number, pending_monitor['id'])
                 
                 return """Confirmation expired (5 minutes).
 Please create a new monitoring request."""
@@ -514,22 +626,14 @@ Please create a new monitoring request."""
         next_check = now + timedelta(hours=pending_monitor['check_frequency_hours'])
         
         # Activate monitor
-        db['client_profiles'].update_one(
-            {
-                'whatsapp_number': whatsapp_number,
-                'active_monitors.id': pending_monitor['id']
-            },
-            {
-                '$set': {
-                    'active_monitors.$.status': 'active',
-                    'active_monitors.$.confirmed_at': now,
-                    'active_monitors.$.next_check': next_check,
-                    'active_monitors.$.expires_at': new_expires_at,
-                    'active_monitors.$.duration_days': duration_days,
-                    'active_monitors.$.pending_expires': None
-                }
-            }
-        )
+        await run_blocking(update_monitor, whatsapp_number, pending_monitor['id'], {
+            'status': 'active',
+            'confirmed_at': now,
+            'next_check': next_check,
+            'expires_at': new_expires_at,
+            'duration_days': duration_days,
+            'pending_expires': None
+        })
         
         # Format response
         trigger_list = "\n".join([
@@ -570,10 +674,7 @@ Standing by."""
         
         if not region:
             # Stop all monitors
-            result = db['client_profiles'].update_one(
-                {'whatsapp_number': whatsapp_number},
-                {'$set': {'active_monitors': []}}
-            )
+            await run_blocking(delete_monitors, whatsapp_number)
             
             return """ALL MONITORING STOPPED
 
@@ -583,12 +684,11 @@ Reactivate anytime with:
 "Monitor [agent] [region], alert if [condition]" """
         
         # Find specific monitor
-        client = db['client_profiles'].find_one({'whatsapp_number': whatsapp_number})
-        monitors = client.get('active_monitors', [])
+        monitors = await run_blocking(get_client_monitors, whatsapp_number, ['active', 'paused'])
         
         monitor_to_stop = None
         for m in monitors:
-            if m.get('region').lower() == region.lower() and m.get('status') in ['active', 'paused']:
+            if m.get('region').lower() == region.lower():
                 monitor_to_stop = m
                 break
         
@@ -598,14 +698,11 @@ Reactivate anytime with:
 Use "Show monitors" to see active monitors."""
         
         # Calculate runtime
-        runtime_hours = (datetime.now(timezone.utc) - monitor_to_stop['created_at']).total_seconds() / 3600
+        runtime_hours = (datetime.now(timezone.utc) - _as_utc(monitor_to_stop['created_at'])).total_seconds() / 3600
         runtime_days = int(runtime_hours / 24)
         
         # Remove monitor
-        db['client_profiles'].update_one(
-            {'whatsapp_number': whatsapp_number},
-            {'$pull': {'active_monitors': {'id': monitor_to_stop['id']}}}
-        )
+        await run_blocking(delete_monitors, whatsapp_number, monitor_to_stop['id'])
         
         agent_str = f"{monitor_to_stop['agent']} " if monitor_to_stop.get('agent') else ""
         
@@ -641,23 +738,8 @@ Try: "Monitor Mayfair for 30 days"
 
 Standing by."""
         
-        # Query client's monitors
-        client = db['client_profiles'].find_one({'whatsapp_number': client_id})
-        
-        if not client:
-            logger.warning(f"Client not found: {client_id}")
-            return """ACTIVE MONITORS
-
-Unable to retrieve monitor list.
-
-Try: "Monitor Mayfair for 30 days"
-
-Standing by."""
-        
-        monitors = client.get('active_monitors', [])
-        
-        # Filter for active/paused monitors only
-        active_monitors = [m for m in monitors if m.get('status') in ['active', 'paused']]
+        # Query client's monitors (active/paused only)
+        active_monitors = get_client_monitors(client_id, ['active', 'paused'])
         
         if not active_monitors:
             return """ACTIVE MONITORS
@@ -766,7 +848,7 @@ Required:
     
     # ✅ FIX 6: Show monitors - defensive implementation
     if 'show monitor' in message_lower or 'list monitor' in message_lower or 'my monitor' in message_lower:
-        return list_monitors(whatsapp_number)
+        return await run_blocking(list_monitors, whatsapp_number)
     
     # Resume monitoring
     if 'resume monitor' in message_lower:
@@ -862,80 +944,92 @@ Standing by."""
     
     return await MonitorManager.create_monitor_pending(whatsapp_number, config, client_profile)
 
-Provide monitoring directive:
 
-Format: "Monitor [target], alert if [condition]"
+# ============================================================
+# MONITOR CHECKING BACKGROUND JOB
+# ============================================================
 
-Examples:
-- "Monitor [competitor] {available_markets[0] if available_markets else 'MARKET'}, alert if prices drop 5%"
-- "Track inventory, notify if listings increase 10%"
+def _monitor_snapshot(dataset: dict) -> dict:
+    return {
+        "avg_price": dataset.get('metrics', {}).get('avg_price', 0),
+        "inventory_count": len(dataset.get('properties', [])),
+        "velocity_score": dataset.get('liquidity_velocity', {}).get('velocity_score', 0)
+    }
 
-Available markets: {markets_str}
 
-Standing by."""
+def _evaluate_triggers(monitor: dict, current_data: dict) -> List[str]:
+    """Breach descriptions for this monitor (empty = no alert)"""
+    baseline = monitor['baseline_data']
+    alert_details = []
     
-    return await MonitorManager.create_monitor_pending(whatsapp_number, config, client_profile)
-
+    for trigger in monitor['triggers']:
+        if trigger['type'] == 'price_drop' and baseline.get('avg_price'):
+            pct_change = ((current_data['avg_price'] - baseline['avg_price']) / baseline['avg_price']) * 100
+            
+            if pct_change <= -trigger['threshold']:
+                alert_details.append(f"Price dropped {abs(pct_change):.1f}% (threshold: {trigger['threshold']}%)")
+    
+    return alert_details
 
-# ============================================================
-# MONITOR CHECKING BACKGROUND JOB
-# ============================================================
 
 async def check_monitors_and_alert():
-    """Check all active monitors and send alerts if thresholds breached"""
+    """
+    Check due monitors and send alerts if thresholds breached
+    
+    Due monitors come from the (status, next_check) index; monitors on the
+    same region share one dataset load; state goes out in one bulk_write.
+    """
+    from app.dataset_loader import load_dataset
+    from app.whatsapp import send_twilio_message
+    
+    collection = monitors_collection()
+    now = datetime.now(timezone.utc)
+    
+    due = await run_blocking(lambda: list(collection.find({'status': 'active', 'next_check': {'$lte': now}})))
+    
+    if not due:
+        return
+    
+    # Group by dataset so each (region, industry) loads once per sweep
+    groups: Dict[Tuple[str, str], List[dict]] = {}
+    for monitor in due:
+        groups.setdefault((monitor['region'], monitor.get('industry', 'real_estate')), []).append(monitor)
+    
+    async def _load(region: str, industry: str) -> Optional[dict]:
+        try:
+            return await run_blocking(load_dataset, area=region, industry=industry)
+        except Exception as e:
+            logger.error(f"Monitor dataset load failed for {region}: {e}")
+            return None
     
-    clients = db['client_profiles'].find({'active_monitors': {'$exists': True}})
+    keys = list(groups.keys())
+    datasets = dict(zip(keys, await asyncio.gather(*(_load(region, industry) for region, industry in keys))))
     
-    for client in clients:
-        monitors = client.get('active_monitors', [])
+    operations = []
+    alerts = []
+    
+    for key, monitors in groups.items():
+        dataset = datasets.get(key)
+        if dataset is None:
+            continue  # Stays due; retried next sweep
+        
+        current_data = _monitor_snapshot(dataset)
         
         for monitor in monitors:
-            if monitor.get('status') != 'active':
-                continue
-            
-            # ✅ FIX: Ensure next_check is timezone-aware before comparison
-            next_check = monitor.get('next_check')
-            
-            if next_check:
-                # Convert string to datetime if needed
-                if isinstance(next_check, str):
-                    next_check = dateutil_parser.parse(next_check)
-                
-                # Make timezone-aware if naive
-                if next_check.tzinfo is None:
-                    next_check = next_check.replace(tzinfo=timezone.utc)
-                
-                # Now safe to compare
-                if datetime.now(timezone.utc) < next_check:
-                    continue
-            
-            # Load current data
-            from app.dataset_loader import load_dataset
-            industry = monitor.get('industry', 'real_estate')
-            dataset = load_dataset(area=monitor['region'], industry=industry)
-            
-            current_data = {
-                "avg_price": dataset.get('metrics', {}).get('avg_price', 0),
-                "inventory_count": len(dataset.get('properties', [])),
-                "velocity_score": dataset.get('liquidity_velocity', {}).get('velocity_score', 0)
+            checked_at = datetime.now(timezone.utc)
+            update = {
+                '$set': {
+                    'next_check': checked_at + timedelta(hours=monitor['check_frequency_hours']),
+                    'last_checked': checked_at,
+                    'current_data': current_data
+                },
+                '$inc': {'total_checks': 1}
             }
             
-            baseline = monitor['baseline_data']
+            alert_details = _evaluate_triggers(monitor, current_data)
             
-            # Check each trigger
-            alert_triggered = False
-            alert_details = []
-            
-            for trigger in monitor['triggers']:
-                if trigger['type'] == 'price_drop':
-                    pct_change = ((current_data['avg_price'] - baseline['avg_price']) / baseline['avg_price']) * 100
-                    
-                    if pct_change <= -trigger['threshold']:
-                        alert_triggered = True
-                        alert_details.append(f"Price dropped {abs(pct_change):.1f}% (threshold: {trigger['threshold']}%)")
-            
-            if alert_triggered:
-                # Send alert
+            if alert_details:
+                baseline = monitor['baseline_data']
                 agent_str = f"{monitor['agent']} " if monitor.get('agent') else ""
                 alert_msg = f""" MONITORING ALERT
 
@@ -948,32 +1042,32 @@ Current: £{current_data['avg_price']:,.0f}
 
 Monitor paused until you resume."""
                 
-                from app.whatsapp import send_twilio_message
-                await send_twilio_message(client['whatsapp_number'], alert_msg)
-                
-                # Pause monitor
-                db['client_profiles'].update_one(
-                    {'whatsapp_number': client['whatsapp_number'], 'active_monitors.id': monitor['id']},
-                    {'$set': {
-                        'active_monitors.$.status': 'paused',
-                        'active_monitors.$.pause_reason': 'alert_sent',
-                        'active_monitors.$.last_alert': datetime.now(timezone.utc),
-                        'active_monitors.$.alerts_sent': monitor.get('alerts_sent', 0) + 1
-                    }}
-                )
-            
-            # Update next check time
-            next_check_time = datetime.now(timezone.utc) + timedelta(hours=monitor['check_frequency_hours'])
-            
-            db['client_profiles'].update_one(
-                {'whatsapp_number': client['whatsapp_number'], 'active_monitors.id': monitor['id']},
-                {'$set': {
-                    'active_monitors.$.next_check': next_check_time,
-                    'active_monitors.$.last_checked': datetime.now(timezone.utc),
-                    'active_monitors.$.total_checks': monitor.get('total_checks', 0) + 1,
-                    'active_monitors.$.current_data': current_data
-                }}
-            )
+                alerts.append((monitor, alert_msg, update))
+            else:
+                operations.append(UpdateOne({'_id': monitor['_id']}, update))
+    
+    async def _send(monitor: dict, alert_msg: str, update: dict):
+        try:
+            await send_twilio_message(monitor['whatsapp_number'], alert_msg)
+        except Exception as e:
+            logger.error(f"Monitor alert failed for {monitor['whatsapp_number']}: {e}")
+            return
+        
+        # Pause monitor
+        update['$set'].update({
+            'status': 'paused',
+            'pause_reason': 'alert_sent',
+            'last_alert': datetime.now(timezone.utc)
+        })
+        update['$inc']['alerts_sent'] = 1
+    
+    await asyncio.gather(*(_send(monitor, alert_msg, update) for monitor, alert_msg, update in alerts))
+    operations.extend(UpdateOne({'_id': monitor['_id']}, update) for monitor, _, update in alerts)
+    
+    if operations:
+        await run_blocking(collection.bulk_write, operations, ordered=False)
+    
+    logger.info(f"Monitor sweep: {len(due)} due, {len(groups)} datasets, {len(alerts)} alerts")
 
 
 # ============================================================
@@ -1043,10 +1137,7 @@ def extract_duration(message: str) -> Optional[int]:
 async def show_monitors(whatsapp_number: str) -> str:
     """Show all active monitors"""
     
-    client = db['client_profiles'].find_one({'whatsapp_number': whatsapp_number})
-    monitors = client.get('active_monitors', [])
-    
-    active_monitors = [m for m in monitors if m.get('status') in ['active', 'paused']]
+    active_monitors = await run_blocking(get_client_monitors, whatsapp_number, ['active', 'paused'])
     
     if not active_monitors:
         return """No active monitors.
@@ -1067,7 +1158,7 @@ Example: "Monitor [competitor] [market], alert if prices drop 5%"""
             for t in m['triggers']
         ])
         
-        days_left = (m['expires_at'] - datetime.now(timezone.utc)).days
+        days_left = (_as_utc(m['expires_at']) - datetime.now(timezone.utc)).days
         
         monitor_list.append(
             f"{status_emoji} {agent_str}{m['region']}\n"
@@ -1089,12 +1180,11 @@ Commands:
 async def resume_monitor(whatsapp_number: str, region: str, industry: str) -> str:
     """Resume paused monitor with updated baseline"""
     
-    client = db['client_profiles'].find_one({'whatsapp_number': whatsapp_number})
-    monitors = client.get('active_monitors', [])
+    monitors = await run_blocking(get_client_monitors, whatsapp_number, ['paused'])
     
     paused_monitor = None
     for m in monitors:
-        if m.get('region').lower() == region.lower() and m.get('status') == 'paused':
+        if m.get('region').lower() == region.lower():
             paused_monitor = m
             break
     
@@ -1103,7 +1193,7 @@ async def resume_monitor(whatsapp_number: str, region: str, industry: str) -> st
     
     # Get new baseline
     from app.dataset_loader import load_dataset
-    dataset = load_dataset(area=region, industry=industry)
+    dataset = await run_blocking(load_dataset, area=region, industry=industry)
     
     new_baseline = {
         "avg_price": dataset.get('metrics', {}).get('avg_price', 0),
@@ -1115,20 +1205,12 @@ async def resume_monitor(whatsapp_number: str, region: str, industry: str) -> st
     next_check = datetime.now(timezone.utc) + timedelta(hours=paused_monitor['check_frequency_hours'])
     
     # Update monitor
-    db['client_profiles'].update_one(
-        {
-            'whatsapp_number': whatsapp_number,
-            'active_monitors.id': paused_monitor['id']
-        },
-        {
-            '$set': {
-                'active_monitors.$.status': 'active',
-                'active_monitors.$.pause_reason': None,
-                'active_monitors.$.baseline_data': new_baseline,
-                'active_monitors.$.next_check': next_check
-            }
-        }
-    )
+    await run_blocking(update_monitor, whatsapp_number, paused_monitor['id'], {
+        'status': 'active',
+        'pause_reason': None,
+        'baseline_data': new_baseline,
+        'next_check': next_check
+    })
     
     agent_str = f"{paused_monitor['agent']} " if paused_monitor.get('agent') else ""
     
@@ -1137,7 +1219,7 @@ async def resume_monitor(whatsapp_number: str, region: str, industry: str) -> st
 {agent_str}{region}
 
 Baseline updated: £{new_baseline['avg_price']:,.0f}
-Expires: {paused_monitor['expires_at'].strftime('%d %b')}
+Expires: {_as_utc(paused_monitor['expires_at']).strftime('%d %b')}
 Next check: {next_check.strftime('%d %b %H:%M')}
 
 Standing by."""
@@ -1146,32 +1228,23 @@ Standing by."""
 async def extend_monitor(whatsapp_number: str, region: str, days: int = 30) -> str:
     """Extend monitor expiry by X days"""
     
-    client = db['client_profiles'].find_one({'whatsapp_number': whatsapp_number})
-    monitors = client.get('active_monitors', [])
+    monitors = await run_blocking(get_client_monitors, whatsapp_number, ['active'])
     
     monitor_to_extend = None
     for m in monitors:
-        if m.get('region').lower() == region.lower() and m.get('status') == 'active':
+        if m.get('region').lower() == region.lower():
             monitor_to_extend = m
             break
     
     if not monitor_to_extend:
         return f"No active monitor found for {region}."
     
-    new_expiry = monitor_to_extend['expires_at'] + timedelta(days=days)
+    new_expiry = _as_utc(monitor_to_extend['expires_at']) + timedelta(days=days)
     
-    db['client_profiles'].update_one(
-        {
-            'whatsapp_number': whatsapp_number,
-            'active_monitors.id': monitor_to_extend['id']
-        },
-        {
-            '$set': {
-                'active_monitors.$.expires_at': new_expiry,
-                'active_monitors.$.last_extended': datetime.now(timezone.utc)
-            }
-        }
-    )
+    await run_blocking(update_monitor, whatsapp_number, monitor_to_extend['id'], {
+        'expires_at': new_expiry,
+        'last_extended': datetime.now(timezone.utc)
+    })
     
     agent_str = f"{monitor_to_extend['agent']} " if monitor_to_extend.get('agent') else ""
     
@@ -10,7 +10,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client
 import gridfs
 from bson.objectid import ObjectId
 
@@ -18,7 +18,7 @@ logger = logging.getLogger(__name__)
 
 # MongoDB Configuration
 MONGODB_URI = os.getenv("MONGODB_URI")
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
 
 # Cloudflare R2 Configuration
 R2_ENDPOINT = os.getenv("R2_ENDPOINT")
@@ -16,14 +16,14 @@ import string
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any
 from enum import Enum
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client, get_db
 import os
 
 logger = logging.getLogger(__name__)
 
 MONGODB_URI = os.getenv('MONGODB_URI')
-mongo_client = MongoClient(MONGODB_URI)
-db = mongo_client['Voxmill']
+mongo_client = get_mongo_client()
+db = get_db()
 
 
 class ActionState(Enum):
@@ -16,13 +16,13 @@ import logging
 import bcrypt
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Tuple
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client
 
 logger = logging.getLogger(__name__)
 
 # MongoDB connection
 MONGODB_URI = os.getenv('MONGODB_URI')
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
 db = mongo_client['Voxmill'] if mongo_client else None
 
 
@@ -21,14 +21,14 @@ from datetime import datetime, timezone
 from typing import Dict, Optional
 from dataclasses import dataclass
 from enum import Enum
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client, get_db
 import os
 
 logger = logging.getLogger(__name__)
 
 MONGODB_URI = os.getenv('MONGODB_URI')
-mongo_client = MongoClient(MONGODB_URI)
-db = mongo_client['Voxmill']
+mongo_client = get_mongo_client()
+db = get_db()
 
 
 # ============================================================================
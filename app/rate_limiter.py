@@ -13,7 +13,6 @@ LAYERS:
 6. Global budget (infrastructure protection)
 """
 
-import os
 import logging
 import hashlib
 import time
@@ -23,98 +22,124 @@ from typing import Tuple, Optional, Dict
 logger = logging.getLogger(__name__)
 
 # ============================================================
-# UPSTASH REDIS CONNECTION
+# UPSTASH REDIS CONNECTION (shared REST client)
 # ============================================================
 
-UPSTASH_REDIS_REST_URL = os.getenv("UPSTASH_REDIS_REST_URL")
-UPSTASH_REDIS_REST_TOKEN = os.getenv("UPSTASH_REDIS_REST_TOKEN")
-redis_client = None
-redis_available = False
+from app.upstash_client import redis_client, redis_available
 
-try:
-    if UPSTASH_REDIS_REST_URL and UPSTASH_REDIS_REST_TOKEN:
-        import httpx
-        
-        class UpstashRedisClient:
-            """REST API client for Upstash Redis"""
-            
-            def __init__(self, url: str, token: str):
-                self.url = url.rstrip('/')
-                self.token = token
-                self.client = httpx.Client(timeout=5.0)
-            
-            def _execute(self, command: list):
-                """Execute Redis command via REST API"""
-                try:
-                    response = self.client.post(
-                        self.url,
-                        headers={"Authorization": f"Bearer {self.token}"},
-                        json=command
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    return result.get("result")
-                except Exception as e:
-                    logger.debug(f"Upstash command failed: {e}")
-                    return None
-            
-            def incr(self, key: str):
-                """Increment counter"""
-                return self._execute(["INCR", key])
-            
-            def incrby(self, key: str, amount: int):
-                """Increment by amount"""
-                return self._execute(["INCRBY", key, amount])
-            
-            def expire(self, key: str, seconds: int):
-                """Set expiry"""
-                return self._execute(["EXPIRE", key, seconds])
-            
-            def ttl(self, key: str):
-                """Get TTL"""
-                return self._execute(["TTL", key])
-            
-            def get(self, key: str):
-                """Get value"""
-                return self._execute(["GET", key])
-            
-            def set(self, key: str, value: str):
-                """Set value"""
-                return self._execute(["SET", key, value])
-            
-            def setex(self, key: str, seconds: int, value: str):
-                """Set with expiry"""
-                return self._execute(["SETEX", key, seconds, value])
-            
-            def setnx(self, key: str, value: str):
-                """
-                Set if not exists
-                Returns True if key was SET (first time), False if key already exists
-                
-                ✅ FIX 1: Proper handling of Upstash REST API integer response
-                """
-                result = self._execute(["SETNX", key, value])
-                
-                # Upstash REST API returns integer:
-                # 1 = key was set (didn't exist before) = True
-                # 0 = key already exists (not set) = False
-                if result is None:
-                    return False
-                
-                # Convert properly: int/str to boolean
-                try:
-                    return bool(int(result))
-                except (ValueError, TypeError):
-                    # Fallback for unexpected response types
-                    return bool(result)
-        
-        redis_client = UpstashRedisClient(UPSTASH_REDIS_REST_URL, UPSTASH_REDIS_REST_TOKEN)
-        redis_available = True
-        logger.info("✅ Rate limiter: Redis connected")
-    else:
-        logger.warning("⚠️ Rate limiter: Redis not configured - rate limiting DISABLED")
-except Exception as e:
-    logger.error(f"❌ Rate limiter: Redis connection failed: {e}")
+if not redis_available:
+    logger.warning("⚠️ Rate limiter: Redis not configured - rate limiting DISABLED")
+
+BUCKET_TTL = 3600  # token bucket state expiry (seconds)
+
+# ============================================================
+# LUA SCRIPTS (ATOMIC SERVER-SIDE GATES)
+# ============================================================
+# Each script runs as a single EVALSHA: no read-modify-write races between
+# concurrent webhook deliveries, and one REST round trip per call.
+
+_LUA_HELPERS = """
+local function token_bucket(bucket_key, time_key, capacity, refill_rate, cost, now, ttl)
+    local tokens = tonumber(redis.call('GET', bucket_key))
+    local last_refill = tonumber(redis.call('GET', time_key))
+    if tokens == nil then
+        tokens = capacity
+        last_refill = now
+    end
+    if last_refill == nil then
+        last_refill = now
+    end
+    local tokens_to_add = math.floor((now - last_refill) * refill_rate)
+    if tokens_to_add > 0 then
+        tokens = math.min(capacity, tokens + tokens_to_add)
+        last_refill = now
+    end
+    local allowed = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    end
+    redis.call('SETEX', bucket_key, ttl, tokens)
+    redis.call('SETEX', time_key, ttl, tostring(last_refill))
+    return allowed, tokens
+end
+
+local function burst(burst_key, window)
+    local count = redis.call('INCR', burst_key)
+    if count == 1 then
+        redis.call('EXPIRE', burst_key, window)
+    end
+    return count
+end
+
+local function add_abuse(score_key, delta, window)
+    local score = tonumber(redis.call('GET', score_key)) or 0
+    score = math.max(0, score + delta)
+    redis.call('SETEX', score_key, window, score)
+    return score
+end
+"""
+
+# KEYS: bucket, bucket_time | ARGV: capacity, refill_rate, cost, now, ttl
+_TOKEN_BUCKET_LUA = _LUA_HELPERS + """
+local allowed, tokens = token_bucket(KEYS[1], KEYS[2], tonumber(ARGV[1]), tonumber(ARGV[2]),
+                                     tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[5]))
+return {allowed, tokens}
+"""
+
+# KEYS: burst | ARGV: window
+_BURST_LUA = _LUA_HELPERS + """
+return burst(KEYS[1], tonumber(ARGV[1]))
+"""
+
+# KEYS: abuse_score | ARGV: delta, window
+_ABUSE_LUA = _LUA_HELPERS + """
+return add_abuse(KEYS[1], tonumber(ARGV[1]), tonumber(ARGV[2]))
+"""
+
+# KEYS: bucket, bucket_time, burst, abuse_score, challenge
+# ARGV: capacity, refill_rate, cost, now, ttl,
+#       burst_window, burst_limit, burst_penalty, abuse_window, lock_threshold, hard_threshold (-1 = off)
+_GATES_LUA = _LUA_HELPERS + """
+local allowed, tokens = token_bucket(KEYS[1], KEYS[2], tonumber(ARGV[1]), tonumber(ARGV[2]),
+                                     tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[5]))
+local abuse_score = tonumber(redis.call('GET', KEYS[4])) or 0
+local challenge = redis.call('GET', KEYS[5]) or ''
+local burst_count = -1
+
+if allowed == 1 and challenge == '' then
+    local lock_threshold = tonumber(ARGV[10])
+    local hard_threshold = tonumber(ARGV[11])
+    local abuse_blocked = abuse_score >= lock_threshold or (hard_threshold >= 0 and abuse_score >= hard_threshold)
+    if not abuse_blocked then
+        burst_count = burst(KEYS[3], tonumber(ARGV[6]))
+        if burst_count > tonumber(ARGV[7]) then
+            -- Penalty applies from the next message; this one is decided on the pre-burst score
+            add_abuse(KEYS[4], tonumber(ARGV[8]), tonumber(ARGV[9]))
+        end
+    end
+end
+
+return {allowed, tokens, abuse_score, challenge, burst_count}
+"""
+
+_registered_scripts = {}
+
+
+def _scripts() -> Dict:
+    """Lazily wrap the Lua scripts around the shared client"""
+    if not _registered_scripts:
+        _registered_scripts.update({
+            'token_bucket': redis_client.register_script(_TOKEN_BUCKET_LUA),
+            'burst': redis_client.register_script(_BURST_LUA),
+            'abuse': redis_client.register_script(_ABUSE_LUA),
+            'gates': redis_client.register_script(_GATES_LUA),
+        })
+    return _registered_scripts
+
+
+def _bucket_keys(client_id: str) -> list:
+    return [f"voxmill:bucket:{client_id}", f"voxmill:bucket_time:{client_id}"]
 
 
 class RateLimiter:
@@ -164,6 +189,7 @@ class RateLimiter:
     # Burst limits
     BURST_WINDOW = 2      # seconds
     BURST_LIMIT = 4       # messages
+    BURST_ABUSE_PENALTY = 5  # abuse score added per burst violation
     
     # Abuse scoring
     ABUSE_SCORE_WINDOW = 600  # 10 minutes
@@ -205,12 +231,10 @@ class RateLimiter:
             
             dedup_key = f"voxmill:dedup:{fingerprint}"
             
-            # ✅ FIX: SETNX returns True if key was SET (first time seeing it)
-            was_set = redis_client.setnx(dedup_key, "1")
+            # SET NX EX: returns True if key was SET (first time seeing it), expiry in the same call
+            was_set = redis_client.set_nx_ex(dedup_key, "1", 60)
             
             if was_set:
-                # First time seeing this message - set expiry
-                redis_client.expire(dedup_key, 60)
                 logger.debug(f"✅ NEW MESSAGE: {sender} (fingerprint: {fingerprint})")
                 return False, None  # NOT a duplicate
             else:
@@ -255,12 +279,38 @@ class RateLimiter:
     # LAYER 2: TOKEN BUCKET (CORE LIMITER)
     # ================================================================
     
+    @classmethod
+    def _bucket_args(cls, client_tier: str, operation: str) -> Tuple[int, list]:
+        config = cls.TOKEN_BUCKET_CONFIG.get(client_tier, cls.TOKEN_BUCKET_CONFIG['tier_1'])
+        cost = cls.OPERATION_COSTS.get(operation, 1)
+        args = [config['capacity'], config['refill_rate'], cost, repr(time.time()), BUCKET_TTL]
+        return config['capacity'], args
+    
+    @classmethod
+    def _evaluate_token_bucket(cls, client_id: str, operation: str, capacity: int, cost: int,
+                               result) -> Tuple[bool, int, int]:
+        if not result:
+            # Script failed - fail open
+            return True, 0, 0
+        
+        allowed, tokens = bool(int(result[0])), int(result[1])
+        
+        if allowed:
+            logger.debug(f"✅ Token bucket OK: {client_id} ({tokens}/{capacity} after {operation})")
+        else:
+            logger.warning(f"🚫 TOKEN BUCKET DEPLETED: {client_id} ({tokens}/{capacity}, need {cost})")
+        
+        return allowed, tokens, capacity
+    
     @classmethod
     def check_token_bucket(cls, client_id: str, operation: str = 'message', 
                           client_tier: str = 'tier_1') -> Tuple[bool, int, int]:
         """
         Token bucket rate limiter with operation costs
         
+        Refill + deduct run atomically server-side (one EVALSHA round trip),
+        so concurrent webhook deliveries can't double-spend tokens.
+        
         Returns: (allowed, current_tokens, capacity)
         """
         
@@ -268,55 +318,26 @@ class RateLimiter:
             return True, 0, 0
         
         try:
-            # Get tier config
-            config = cls.TOKEN_BUCKET_CONFIG.get(client_tier, cls.TOKEN_BUCKET_CONFIG['tier_1'])
-            
-            capacity = config['capacity']
-            refill_rate = config['refill_rate']
-            
-            # Get operation cost
-            cost = cls.OPERATION_COSTS.get(operation, 1)
-            
-            bucket_key = f"voxmill:bucket:{client_id}"
-            last_refill_key = f"voxmill:bucket_time:{client_id}"
-            
-            # Get current tokens and last refill time
-            current_tokens_str = redis_client.get(bucket_key)
-            last_refill_str = redis_client.get(last_refill_key)
-            
-            now = time.time()
-            
-            if current_tokens_str is None:
-                # First time - start with full capacity
-                current_tokens = capacity
-                last_refill = now
-            else:
-                current_tokens = int(current_tokens_str)
-                last_refill = float(last_refill_str) if last_refill_str else now
-            
-            # Refill tokens based on time elapsed
-            time_elapsed = now - last_refill
-            tokens_to_add = int(time_elapsed * refill_rate)
-            
-            if tokens_to_add > 0:
-                current_tokens = min(capacity, current_tokens + tokens_to_add)
-                last_refill = now
-                
-                # Update Redis
-                redis_client.setex(bucket_key, 3600, str(current_tokens))
-                redis_client.setex(last_refill_key, 3600, str(last_refill))
-            
-            # Check if enough tokens
-            if current_tokens >= cost:
-                # Deduct tokens
-                current_tokens -= cost
-                redis_client.setex(bucket_key, 3600, str(current_tokens))
-                
-                logger.debug(f"✅ Token bucket OK: {client_id} ({current_tokens}/{capacity} after {operation})")
-                return True, current_tokens, capacity
-            else:
-                logger.warning(f"🚫 TOKEN BUCKET DEPLETED: {client_id} ({current_tokens}/{capacity}, need {cost})")
-                return False, current_tokens, capacity
+            capacity, args = cls._bucket_args(client_tier, operation)
+            result = _scripts()['token_bucket'](_bucket_keys(client_id), args)
+            return cls._evaluate_token_bucket(client_id, operation, capacity, args[2], result)
+        
+        except Exception as e:
+            logger.error(f"Token bucket error: {e}")
+            return True, 0, 0
+    
+    @classmethod
+    async def check_token_bucket_async(cls, client_id: str, operation: str = 'message',
+                                       client_tier: str = 'tier_1') -> Tuple[bool, int, int]:
+        """Async variant of check_token_bucket (does not block the event loop)"""
+        
+        if not redis_available or not redis_client:
+            return True, 0, 0
+        
+        try:
+            capacity, args = cls._bucket_args(client_tier, operation)
+            result = await _scripts()['token_bucket'].acall(_bucket_keys(client_id), args)
+            return cls._evaluate_token_bucket(client_id, operation, capacity, args[2], result)
         
         except Exception as e:
             logger.error(f"Token bucket error: {e}")
@@ -326,6 +347,17 @@ class RateLimiter:
     # LAYER 3: BURST PROTECTION
     # ================================================================
     
+    @classmethod
+    def _evaluate_burst(cls, client_id: str, count) -> Tuple[bool, int]:
+        if count is None:
+            count = 0
+        
+        if count > cls.BURST_LIMIT:
+            logger.warning(f"🚫 BURST FLOOD: {client_id} ({count} in {cls.BURST_WINDOW}s)")
+            return False, count
+        
+        return True, count
+    
     @classmethod
     def check_burst_limit(cls, client_id: str) -> Tuple[bool, int]:
         """
@@ -338,24 +370,23 @@ class RateLimiter:
             return True, 0
         
         try:
-            burst_key = f"voxmill:burst:{client_id}"
-            
-            # Increment counter
-            count = redis_client.incr(burst_key)
-            
-            if count is None:
-                count = 0
-            
-            # Set expiry on first message
-            if count == 1:
-                redis_client.expire(burst_key, cls.BURST_WINDOW)
-            
-            # Check threshold
-            if count > cls.BURST_LIMIT:
-                logger.warning(f"🚫 BURST FLOOD: {client_id} ({count} in {cls.BURST_WINDOW}s)")
-                return False, count
-            
-            return True, count
+            count = _scripts()['burst']([f"voxmill:burst:{client_id}"], [cls.BURST_WINDOW])
+            return cls._evaluate_burst(client_id, count)
+        
+        except Exception as e:
+            logger.error(f"Burst check error: {e}")
+            return True, 0
+    
+    @classmethod
+    async def check_burst_limit_async(cls, client_id: str) -> Tuple[bool, int]:
+        """Async variant of check_burst_limit"""
+        
+        if not redis_available or not redis_client:
+            return True, 0
+        
+        try:
+            count = await _scripts()['burst'].acall([f"voxmill:burst:{client_id}"], [cls.BURST_WINDOW])
+            return cls._evaluate_burst(client_id, count)
         
         except Exception as e:
             logger.error(f"Burst check error: {e}")
@@ -384,17 +415,11 @@ class RateLimiter:
             return
         
         try:
-            score_key = f"voxmill:abuse_score:{client_id}"
-            
-            # Get current score
-            current_score_str = redis_client.get(score_key)
-            current_score = int(current_score_str) if current_score_str else 0
-            
-            # Update score
-            new_score = max(0, current_score + delta)
-            
-            # Store with 10-minute expiry (rolling window)
-            redis_client.setex(score_key, cls.ABUSE_SCORE_WINDOW, str(new_score))
+            # Read-modify-write runs atomically server-side (floor at 0, rolling expiry)
+            new_score = _scripts()['abuse'](
+                [f"voxmill:abuse_score:{client_id}"],
+                [delta, cls.ABUSE_SCORE_WINDOW]
+            )
             
             logger.debug(f"📊 Abuse score: {client_id} = {new_score} (event: {event} {delta:+d})")
             
@@ -425,8 +450,10 @@ class RateLimiter:
         - action: 'none', 'soft_throttle', 'hard_block', 'require_verification'
         """
         
-        score = cls.get_abuse_score(client_id)
-        
+        return cls._classify_abuse_score(cls.get_abuse_score(client_id))
+    
+    @classmethod
+    def _classify_abuse_score(cls, score: int) -> Tuple[bool, str, int]:
         if score >= cls.ABUSE_THRESHOLDS['lock']:
             return True, 'require_verification', score
         elif score >= cls.ABUSE_THRESHOLDS['hard']:
@@ -486,6 +513,77 @@ class RateLimiter:
         except Exception as e:
             logger.error(f"Challenge clear error: {e}")
     
+    # ================================================================
+    # COMBINED GATES (LAYERS 2-5 IN ONE ROUND TRIP)
+    # ================================================================
+    
+    @classmethod
+    async def check_gates_async(cls, client_id: str, client_tier: str = 'tier_1',
+                                operation: str = 'message',
+                                enforce_hard_block: bool = False) -> Dict:
+        """
+        Evaluate token bucket, abuse score, challenge and burst gates atomically
+        
+        One EVALSHA round trip. Gates short-circuit in the same order as the
+        webhook handler: the burst counter only moves if the earlier gates
+        pass, and a burst violation adds BURST_ABUSE_PENALTY to the abuse
+        score inside the same script.
+        
+        Returns: {
+            'token_bucket': (allowed, current_tokens, capacity),
+            'abuse': (blocked, action, score),
+            'challenge': (challenge_required, challenge_type),
+            'burst': (allowed, count_in_window) or None if not evaluated
+        }
+        """
+        
+        decisions = {
+            'token_bucket': (True, 0, 0),
+            'abuse': (False, 'none', 0),
+            'challenge': (False, None),
+            'burst': (True, 0)
+        }
+        
+        if not redis_available or not redis_client:
+            return decisions
+        
+        try:
+            capacity, args = cls._bucket_args(client_tier, operation)
+            keys = _bucket_keys(client_id) + [
+                f"voxmill:burst:{client_id}",
+                f"voxmill:abuse_score:{client_id}",
+                f"voxmill:challenge:{client_id}"
+            ]
+            args += [
+                cls.BURST_WINDOW,
+                cls.BURST_LIMIT,
+                cls.BURST_ABUSE_PENALTY,
+                cls.ABUSE_SCORE_WINDOW,
+                cls.ABUSE_THRESHOLDS['lock'],
+                cls.ABUSE_THRESHOLDS['hard'] if enforce_hard_block else -1
+            ]
+            
+            result = await _scripts()['gates'].acall(keys, args)
+            
+            if not result:
+                # Script failed - fail open
+                return decisions
+            
+            _, _, abuse_score, challenge_type, burst_count = result
+            
+            decisions['token_bucket'] = cls._evaluate_token_bucket(
+                client_id, operation, capacity, args[2], result[:2]
+            )
+            decisions['abuse'] = cls._classify_abuse_score(int(abuse_score))
+            decisions['challenge'] = (True, challenge_type) if challenge_type else (False, None)
+            decisions['burst'] = cls._evaluate_burst(client_id, int(burst_count)) if int(burst_count) >= 0 else None
+            
+            return decisions
+        
+        except Exception as e:
+            logger.error(f"Gate check error: {e}")
+            return decisions
+    
     # ================================================================
     # LAYER 6: GLOBAL BUDGET (INFRASTRUCTURE PROTECTION)
     # ================================================================
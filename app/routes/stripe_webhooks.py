@@ -2,7 +2,7 @@
 Stripe Webhook Handler with Welcome Messages
 """
 from fastapi import APIRouter, Request, HTTPException, Header
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client
 from datetime import datetime, timezone
 import os
 import logging
@@ -15,7 +15,7 @@ STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
 
 # MongoDB connection
 MONGODB_URI = os.getenv("MONGODB_URI")
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
 db = mongo_client['Voxmill'] if mongo_client else None
 
 
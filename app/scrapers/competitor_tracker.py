@@ -1,14 +1,14 @@
 import os
 import logging
 from datetime import datetime, timezone, timedelta
-from pymongo import MongoClient
+from app.mongo_pool import get_mongo_client
 import asyncio
 from app.dataset_loader import load_dataset
 
 logger = logging.getLogger(__name__)
 
 MONGODB_URI = os.getenv("MONGODB_URI")
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
 
 async def track_competitor_prices(area: str = "Mayfair", industry: str = "real_estate"):
     """
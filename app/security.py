@@ -408,12 +408,12 @@ def log_security_event(event_type: str, details: dict):
     
     try:
         from datetime import datetime, timezone
-        from pymongo import MongoClient
+        from app.mongo_pool import get_mongo_client
         import os
         
         MONGODB_URI = os.getenv("MONGODB_URI")
         if MONGODB_URI:
-            mongo_client = MongoClient(MONGODB_URI)
+            mongo_client = get_mongo_client()
             db = mongo_client['Voxmill']
             
             security_log = {
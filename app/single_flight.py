@@ -0,0 +1,213 @@
+"""
+VOXMILL SINGLE-FLIGHT
+=====================
+Request coalescing for expensive loads (dataset cache misses)
+
+FEATURES:
+- In-process: one loader per key, concurrent callers wait for its result
+- Cross-worker: Redis lock doubles as a "loading" marker, other workers poll the cache
+- Fail-open: Redis down or stalled lock holder → caller loads itself
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from app.upstash_client import redis_client, redis_available
+
+logger = logging.getLogger(__name__)
+
+LOADING_LOCK_TTL = int(os.getenv('SINGLE_FLIGHT_LOCK_TTL', '60'))        # > worst-case load time
+FOLLOWER_WAIT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_WAIT_TIMEOUT', '45'))
+POLL_INTERVAL = 0.5
+
+FAILED_MARKER_TTL = 15  # Followers return their fallback instead of re-running a failing load
+
+# Only the holder (matching token) may release the lock.
+# ARGV: token, [replacement marker, ttl] - replace instead of delete
+_RELEASE_LUA = """
+local marker = redis.call('GET', KEYS[1])
+if marker and cjson.decode(marker)['token'] == ARGV[1] then
+    if ARGV[2] then
+        return redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    end
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_release_script = None
+
+
+def _release_lock(lock_key: str, token: str, failed: bool = False):
+    global _release_script
+    try:
+        if _release_script is None:
+            _release_script = redis_client.register_script(_RELEASE_LUA)
+        args = [token]
+        if failed:
+            args += [json.dumps({'token': token, 'state': 'failed'}), FAILED_MARKER_TTL]
+        _release_script([lock_key], args)
+    except Exception as e:
+        logger.warning(f"Single-flight lock release failed for {lock_key}: {e}")
+
+
+# ============================================================
+# IN-PROCESS COALESCING
+# ============================================================
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Run fn once per key; concurrent callers for the same key share the result
+
+    Usage:
+        group = SingleFlight('dataset')
+        dataset = group.do(('Mayfair', 'real_estate'), lambda: expensive_load())
+    """
+
+    def __init__(self, name: str, wait_timeout: float = FOLLOWER_WAIT_TIMEOUT):
+        self.name = name
+        self.wait_timeout = wait_timeout
+        self._calls: Dict[Any, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {'leaders': 0, 'followers': 0, 'timeouts': 0}
+
+    def do(self, key, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+                self.stats['leaders'] += 1
+            else:
+                self.stats['followers'] += 1
+
+        if not is_leader:
+            logger.info(f"⏳ SINGLE-FLIGHT [{self.name}]: waiting on in-flight load for {key}")
+            if call.event.wait(self.wait_timeout):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+
+            # Leader stalled - don't hold the caller hostage
+            self.stats['timeouts'] += 1
+            logger.warning(f"⚠️ SINGLE-FLIGHT [{self.name}]: wait timed out for {key}, loading directly")
+            return fn()
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+
+# ============================================================
+# CROSS-WORKER COALESCING
+# ============================================================
+
+def load_with_redis_lock(lock_key: str,
+                         loader: Callable[[], Any],
+                         cache_lookup: Callable[[], Optional[Any]],
+                         cache_store: Callable[[Any], bool],
+                         on_failure: Optional[Callable[[], Any]] = None,
+                         wait_timeout: float = FOLLOWER_WAIT_TIMEOUT) -> Any:
+    """
+    Cross-worker single-flight backed by the shared cache
+
+    The worker that wins SET NX on lock_key loads and publishes via
+    cache_store (returns False if the result isn't cacheable). Everyone
+    else sees the lock (the "loading" marker) and polls cache_lookup until
+    the result lands, or wait_timeout elapses. If the leader's load wasn't
+    cacheable the marker flips to "failed" and followers return on_failure()
+    rather than repeating it; if the lock vanishes they try to take over.
+    """
+
+    if not (redis_available and redis_client):
+        result = loader()
+        cache_store(result)
+        return result
+
+    token = uuid.uuid4().hex
+    marker = json.dumps({
+        'token': token,
+        'pid': os.getpid(),
+        'started_at': datetime.now(timezone.utc).isoformat()
+    })
+    deadline = time.monotonic() + wait_timeout
+    waited = False
+
+    while True:
+        # None = Redis errored (not "held elsewhere") - fail open
+        try:
+            acquired = redis_client.try_set_nx_ex(lock_key, marker, LOADING_LOCK_TTL)
+        except Exception as e:
+            logger.warning(f"Single-flight lock error ({e})")
+            acquired = None
+
+        if acquired is None or acquired:
+            # Leader (or Redis failed - fail open)
+            if acquired is None:
+                logger.warning(f"Single-flight lock unavailable for {lock_key}, loading directly")
+            if acquired and waited:
+                # Previous holder gave up - another worker may have published meanwhile
+                cached = cache_lookup()
+                if cached is not None:
+                    _release_lock(lock_key, token)
+                    return cached
+            published = False
+            try:
+                result = loader()
+                published = cache_store(result)
+                return result
+            finally:
+                if acquired:
+                    _release_lock(lock_key, token, failed=not published and on_failure is not None)
+
+        # Follower - another worker is loading
+        if not waited:
+            logger.info(f"⏳ SINGLE-FLIGHT: {lock_key} loading in another worker, waiting for cache")
+            waited = True
+
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+
+            cached = cache_lookup()
+            if cached is not None:
+                return cached
+
+            try:
+                current, error = redis_client.get_checked(lock_key)
+            except Exception as e:
+                current, error = None, str(e)
+
+            if error or not current:
+                break  # Leader died / released without publishing, or Redis failed - retry the lock (fails open)
+
+            if on_failure is not None and json.loads(current).get('state') == 'failed':
+                logger.warning(f"⚠️ SINGLE-FLIGHT: leader load for {lock_key} failed, using fallback")
+                return on_failure()
+        else:
+            logger.warning(f"⚠️ SINGLE-FLIGHT: timed out waiting on {lock_key}, loading directly")
+            result = loader()
+            cache_store(result)
+            return result
@@ -0,0 +1,245 @@
+"""
+VOXMILL TWILIO SENDER
+=====================
+Long-lived outbound WhatsApp delivery over a pooled async HTTP session
+
+FEATURES:
+- One keep-alive httpx session to the Twilio REST API (no client per send)
+- Per-recipient FIFO queues: chunks arrive in order, recipients send in parallel
+- Global concurrency cap across recipients
+- Retry with exponential backoff on 429/5xx (honours Retry-After)
+- Delivery latency + queue wait metrics
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+TWILIO_API_BASE = "https://api.twilio.com/2010-04-01"
+TWILIO_MAX_CONCURRENCY = int(os.getenv('TWILIO_MAX_CONCURRENCY', '20'))
+TWILIO_MAX_ATTEMPTS = int(os.getenv('TWILIO_MAX_ATTEMPTS', '4'))
+TWILIO_BACKOFF_BASE = 0.5     # seconds, doubled per retry
+TWILIO_BACKOFF_MAX = 8.0
+RECIPIENT_IDLE_TIMEOUT = 30   # seconds before an idle per-recipient worker exits
+LATENCY_WINDOW = 500          # samples kept for percentiles
+
+
+class TwilioSendError(Exception):
+    """Twilio rejected a message (after retries, or a non-retryable status)"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Twilio send failed ({status_code}): {message}")
+        self.status_code = status_code
+
+
+class _OutboundMessage:
+    __slots__ = ('to', 'body', 'future', 'enqueued_at')
+
+    def __init__(self, to: str, body: str, future: asyncio.Future):
+        self.to = to
+        self.body = body
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class TwilioSender:
+    """
+    Async outbound queue in front of the Twilio Messages API
+
+    Usage:
+        await twilio_sender.send_many('whatsapp:+44...', ['part 1', 'part 2'])
+    """
+
+    def __init__(self):
+        self.account_sid = os.getenv('TWILIO_ACCOUNT_SID')
+        self.auth_token = os.getenv('TWILIO_AUTH_TOKEN')
+        self.from_number = os.getenv('TWILIO_WHATSAPP_NUMBER', 'whatsapp:+14155238886')
+
+        # Loop-bound state (reset if used from a different event loop, e.g. scripts)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._queue_waits = deque(maxlen=LATENCY_WINDOW)
+        self.stats = {'sent': 0, 'failed': 0, 'retries': 0, 'rate_limited': 0}
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.account_sid and self.auth_token)
+
+    def _ensure_loop_state(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._http = httpx.AsyncClient(
+                base_url=f"{TWILIO_API_BASE}/Accounts/{self.account_sid}",
+                auth=(self.account_sid, self.auth_token),
+                timeout=httpx.Timeout(15.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=TWILIO_MAX_CONCURRENCY,
+                    max_keepalive_connections=TWILIO_MAX_CONCURRENCY
+                )
+            )
+            self._semaphore = asyncio.Semaphore(TWILIO_MAX_CONCURRENCY)
+            self._queues = {}
+            self._workers = {}
+
+    # ============================================================
+    # PUBLIC API
+    # ============================================================
+
+    def enqueue(self, to: str, body: str) -> asyncio.Future:
+        """Queue one message; the future resolves to the message SID"""
+        self._ensure_loop_state()
+
+        future = self._loop.create_future()
+        queue = self._queues.get(to)
+        if queue is None:
+            queue = self._queues[to] = asyncio.Queue()
+
+        queue.put_nowait(_OutboundMessage(to, body, future))
+
+        worker = self._workers.get(to)
+        if worker is None or worker.done():
+            self._workers[to] = self._loop.create_task(self._recipient_worker(to, queue))
+
+        return future
+
+    async def send_many(self, to: str, bodies: List[str]) -> List[str]:
+        """Queue messages for one recipient in order and wait for delivery"""
+        if not self.configured:
+            raise TwilioSendError(0, "Twilio credentials missing")
+
+        futures = [self.enqueue(to, body) for body in bodies]
+        return await asyncio.gather(*futures)
+
+    async def aclose(self):
+        """Let queued messages drain, then close the HTTP session"""
+        if self._loop is not asyncio.get_running_loop():
+            return
+
+        queues = list(self._queues.values())
+        if queues:
+            try:
+                await asyncio.wait_for(asyncio.gather(*(q.join() for q in queues)), timeout=10)
+            except asyncio.TimeoutError:
+                logger.warning("⚠️ Twilio sender closed with undelivered messages")
+
+        for worker in self._workers.values():
+            worker.cancel()
+
+        if self._http is not None:
+            await self._http.aclose()
+        self._loop = None
+
+    def get_stats(self) -> Dict:
+        """Delivery counters + latency percentiles (ms)"""
+
+        def _percentiles(samples):
+            if not samples:
+                return {'p50': 0, 'p95': 0, 'max': 0}
+            ordered = sorted(samples)
+            return {
+                'p50': round(ordered[len(ordered) // 2] * 1000, 1),
+                'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+                'max': round(ordered[-1] * 1000, 1)
+            }
+
+        return {
+            **self.stats,
+            'active_recipients': sum(1 for w in self._workers.values() if not w.done()),
+            'queued': sum(q.qsize() for q in self._queues.values()),
+            'delivery_latency_ms': _percentiles(self._latencies),
+            'queue_wait_ms': _percentiles(self._queue_waits)
+        }
+
+    # ============================================================
+    # DELIVERY
+    # ============================================================
+
+    async def _recipient_worker(self, to: str, queue: asyncio.Queue):
+        """Drain one recipient's queue strictly in order"""
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=RECIPIENT_IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+
+                try:
+                    sid = await self._deliver(message)
+                    if not message.future.done():
+                        message.future.set_result(sid)
+                except Exception as e:
+                    if not message.future.done():
+                        message.future.set_exception(e)
+                finally:
+                    queue.task_done()
+        finally:
+            if self._queues.get(to) is queue and queue.empty():
+                self._queues.pop(to, None)
+                self._workers.pop(to, None)
+
+    async def _deliver(self, message: _OutboundMessage) -> str:
+        async with self._semaphore:
+            started = time.monotonic()
+            self._queue_waits.append(started - message.enqueued_at)
+
+            for attempt in range(1, TWILIO_MAX_ATTEMPTS + 1):
+                try:
+                    response = await self._http.post(
+                        "/Messages.json",
+                        data={'To': message.to, 'From': self.from_number, 'Body': message.body}
+                    )
+                except httpx.TransportError as e:
+                    status, detail, retry_after = 0, str(e), None
+                else:
+                    if response.status_code < 300:
+                        self._latencies.append(time.monotonic() - started)
+                        self.stats['sent'] += 1
+                        return response.json().get('sid', '')
+
+                    status = response.status_code
+                    try:
+                        detail = response.json().get('message', response.text)
+                    except ValueError:
+                        detail = response.text
+                    retry_after = response.headers.get('Retry-After')
+
+                retryable = status == 0 or status == 429 or status >= 500
+                if status == 429:
+                    self.stats['rate_limited'] += 1
+
+                if not retryable or attempt == TWILIO_MAX_ATTEMPTS:
+                    self.stats['failed'] += 1
+                    raise TwilioSendError(status, detail)
+
+                delay = min(TWILIO_BACKOFF_MAX, TWILIO_BACKOFF_BASE * (2 ** (attempt - 1)))
+                if retry_after:
+                    try:
+                        delay = max(delay, float(retry_after))
+                    except ValueError:
+                        pass
+                delay += random.uniform(0, delay * 0.25)
+
+                self.stats['retries'] += 1
+                logger.warning(f"⚠️ Twilio {status or 'network error'} for {message.to}, retry {attempt} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+
+# ============================================================
+# GLOBAL INSTANCE
+# ============================================================
+
+twilio_sender = TwilioSender()
@@ -0,0 +1,476 @@
+"""
+VOXMILL UPSTASH REDIS CLIENT
+=============================
+Single shared REST client for Upstash Redis (cache, rate limiter, sessions)
+
+FEATURES:
+- One keep-alive HTTP connection pool per process (sync + async)
+- Async interface for code running on the event loop
+- Pipelining via Upstash /pipeline (N commands, 1 round trip)
+- Atomic transactions via Upstash /multi-exec
+- Lua scripts via EVALSHA (EVAL fallback on NOSCRIPT)
+- Fails soft: command errors return None, never raise into callers
+
+USAGE:
+    from app.upstash_client import redis_client, redis_available
+
+    value = redis_client.get("voxmill:key")               # sync
+    value = await redis_client.aget("voxmill:key")        # async
+
+    pipe = redis_client.pipeline()
+    pipe.get("a").setex("b", 60, "1").incr("c")
+    results = await pipe.aexecute()                        # [get_a, 'OK', 1]
+"""
+
+import os
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+UPSTASH_REDIS_REST_URL = os.getenv("UPSTASH_REDIS_REST_URL")
+UPSTASH_REDIS_REST_TOKEN = os.getenv("UPSTASH_REDIS_REST_TOKEN")
+
+UPSTASH_TIMEOUT = 5.0
+UPSTASH_MAX_CONNECTIONS = int(os.getenv("UPSTASH_MAX_CONNECTIONS", "20"))
+UPSTASH_KEEPALIVE_EXPIRY = 30.0
+
+redis_client = None
+redis_available = False
+
+
+class UpstashPipeline:
+    """
+    Queue of commands sent to Upstash in a single HTTP request
+
+    transaction=False -> /pipeline   (commands run in order, not atomic)
+    transaction=True  -> /multi-exec (commands run atomically)
+
+    Results come back in command order; a failed command yields None.
+    """
+
+    def __init__(self, client: 'UpstashRedisClient', transaction: bool = False):
+        self._client = client
+        self._transaction = transaction
+        self._commands: List[list] = []
+
+    def __len__(self):
+        return len(self._commands)
+
+    def command(self, *args) -> 'UpstashPipeline':
+        """Queue a raw Redis command"""
+        self._commands.append(list(args))
+        return self
+
+    def get(self, key: str):
+        return self.command("GET", key)
+
+    def mget(self, *keys):
+        return self.command("MGET", *keys)
+
+    def set(self, key: str, value: str, ex: Optional[int] = None, nx: bool = False):
+        args = ["SET", key, value]
+        if ex is not None:
+            args += ["EX", ex]
+        if nx:
+            args.append("NX")
+        return self.command(*args)
+
+    def setex(self, key: str, seconds: int, value: str):
+        return self.command("SETEX", key, seconds, value)
+
+    def delete(self, *keys):
+        return self.command("DEL", *keys)
+
+    def exists(self, key: str):
+        return self.command("EXISTS", key)
+
+    def incr(self, key: str):
+        return self.command("INCR", key)
+
+    def incrby(self, key: str, amount: int):
+        return self.command("INCRBY", key, amount)
+
+    def expire(self, key: str, seconds: int):
+        return self.command("EXPIRE", key, seconds)
+
+    def ttl(self, key: str):
+        return self.command("TTL", key)
+
+    def _endpoint(self) -> str:
+        return "/multi-exec" if self._transaction else "/pipeline"
+
+    def execute(self) -> List[Any]:
+        """Send queued commands (blocking)"""
+        if not self._commands:
+            return []
+        commands, self._commands = self._commands, []
+        return self._client._execute_batch(self._endpoint(), commands)
+
+    async def aexecute(self) -> List[Any]:
+        """Send queued commands (async)"""
+        if not self._commands:
+            return []
+        commands, self._commands = self._commands, []
+        return await self._client._aexecute_batch(self._endpoint(), commands)
+
+
+class UpstashScript:
+    """
+    Server-side Lua script, executed atomically in one round trip
+
+    Runs EVALSHA with the locally computed SHA1; the first call on a
+    fresh Redis (NOSCRIPT) falls back to EVAL, which also caches it.
+    Returns None on failure so callers can fail open.
+    """
+
+    def __init__(self, client: 'UpstashRedisClient', source: str):
+        self._client = client
+        self.source = source
+        self.sha = hashlib.sha1(source.encode()).hexdigest()
+
+    @staticmethod
+    def _is_noscript(error: str) -> bool:
+        return "NOSCRIPT" in error or "No matching script" in error
+
+    def _command(self, op: str, body: str, keys: list, args: list) -> list:
+        return [op, body, len(keys), *keys, *args]
+
+    def __call__(self, keys: list = None, args: list = None):
+        keys, args = keys or [], args or []
+        result, error = self._client._execute_checked(self._command("EVALSHA", self.sha, keys, args))
+        if error and self._is_noscript(error):
+            result, error = self._client._execute_checked(self._command("EVAL", self.source, keys, args))
+        if error:
+            logger.debug(f"Upstash script {self.sha[:8]} failed: {error}")
+            return None
+        return result
+
+    async def acall(self, keys: list = None, args: list = None):
+        keys, args = keys or [], args or []
+        result, error = await self._client._aexecute_checked(self._command("EVALSHA", self.sha, keys, args))
+        if error and self._is_noscript(error):
+            result, error = await self._client._aexecute_checked(self._command("EVAL", self.source, keys, args))
+        if error:
+            logger.debug(f"Upstash script {self.sha[:8]} failed: {error}")
+            return None
+        return result
+
+
+class UpstashRedisClient:
+    """REST API client for Upstash Redis with keep-alive, async and pipelining"""
+
+    def __init__(self, url: str, token: str):
+        import httpx
+
+        self.url = url.rstrip('/')
+        self.token = token
+        self._headers = {"Authorization": f"Bearer {self.token}"}
+        self._limits = httpx.Limits(
+            max_connections=UPSTASH_MAX_CONNECTIONS,
+            max_keepalive_connections=UPSTASH_MAX_CONNECTIONS,
+            keepalive_expiry=UPSTASH_KEEPALIVE_EXPIRY,
+        )
+        self.client = httpx.Client(
+            timeout=UPSTASH_TIMEOUT,
+            headers=self._headers,
+            limits=self._limits,
+        )
+
+        # AsyncClient is bound to the loop it was first used on
+        self._async_client = None
+        self._async_loop = None
+        self._async_lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # TRANSPORT
+    # ------------------------------------------------------------
+
+    def _get_async_client(self):
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            if self._async_client is None or self._async_loop is not loop:
+                self._async_client = httpx.AsyncClient(
+                    timeout=UPSTASH_TIMEOUT,
+                    headers=self._headers,
+                    limits=self._limits,
+                )
+                self._async_loop = loop
+            return self._async_client
+
+    @staticmethod
+    def _parse_response(response) -> Tuple[Any, Optional[str]]:
+        # Upstash reports command errors (e.g. NOSCRIPT) as {"error": ...} with HTTP 400
+        try:
+            payload = response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise
+        if isinstance(payload, dict) and "error" in payload:
+            return None, str(payload["error"])
+        response.raise_for_status()
+        return payload.get("result"), None
+
+    def _execute_checked(self, command: list) -> Tuple[Any, Optional[str]]:
+        """Execute Redis command via REST API, returning (result, error)"""
+        try:
+            return self._parse_response(self.client.post(self.url, json=command))
+        except Exception as e:
+            return None, str(e)
+
+    async def _aexecute_checked(self, command: list) -> Tuple[Any, Optional[str]]:
+        """Execute Redis command via REST API (async), returning (result, error)"""
+        try:
+            response = await self._get_async_client().post(self.url, json=command)
+            return self._parse_response(response)
+        except Exception as e:
+            return None, str(e)
+
+    def _execute(self, command: list):
+        """Execute Redis command via REST API"""
+        result, error = self._execute_checked(command)
+        if error:
+            logger.debug(f"Upstash command failed: {error}")
+        return result
+
+    async def _aexecute(self, command: list):
+        """Execute Redis command via REST API (async)"""
+        result, error = await self._aexecute_checked(command)
+        if error:
+            logger.debug(f"Upstash command failed: {error}")
+        return result
+
+    @staticmethod
+    def _unpack_batch(payload, count: int) -> List[Any]:
+        if not isinstance(payload, list):
+            # /multi-exec returns a single error object if the transaction aborts
+            logger.debug(f"Upstash batch failed: {payload}")
+            return [None] * count
+
+        results = []
+        for item in payload:
+            if isinstance(item, dict) and "error" in item:
+                logger.debug(f"Upstash batch command failed: {item['error']}")
+                results.append(None)
+            else:
+                results.append(item.get("result") if isinstance(item, dict) else item)
+        return results
+
+    def _execute_batch(self, endpoint: str, commands: List[list]) -> List[Any]:
+        try:
+            response = self.client.post(f"{self.url}{endpoint}", json=commands)
+            response.raise_for_status()
+            return self._unpack_batch(response.json(), len(commands))
+        except Exception as e:
+            logger.debug(f"Upstash {endpoint} failed: {e}")
+            return [None] * len(commands)
+
+    async def _aexecute_batch(self, endpoint: str, commands: List[list]) -> List[Any]:
+        try:
+            response = await self._get_async_client().post(f"{self.url}{endpoint}", json=commands)
+            response.raise_for_status()
+            return self._unpack_batch(response.json(), len(commands))
+        except Exception as e:
+            logger.debug(f"Upstash {endpoint} failed: {e}")
+            return [None] * len(commands)
+
+    def pipeline(self, transaction: bool = False) -> UpstashPipeline:
+        """Start a pipeline (transaction=True for atomic MULTI/EXEC)"""
+        return UpstashPipeline(self, transaction=transaction)
+
+    def multi_exec(self) -> UpstashPipeline:
+        """Start an atomic MULTI/EXEC transaction"""
+        return UpstashPipeline(self, transaction=True)
+
+    def register_script(self, source: str) -> 'UpstashScript':
+        """Wrap a Lua script for EVALSHA execution (EVAL fallback on NOSCRIPT)"""
+        return UpstashScript(self, source)
+
+    # ------------------------------------------------------------
+    # SYNC COMMANDS
+    # ------------------------------------------------------------
+
+    def ping(self):
+        """Test connection"""
+        return self._execute(["PING"]) == "PONG"
+
+    def get(self, key: str):
+        """Get value"""
+        return self._execute(["GET", key])
+
+    def mget(self, *keys):
+        """Get several values in one call"""
+        result = self._execute(["MGET", *keys])
+        return result if result else [None] * len(keys)
+
+    def set(self, key: str, value: str):
+        """Set value"""
+        return self._execute(["SET", key, value])
+
+    def setex(self, key: str, seconds: int, value: str):
+        """Set value with expiry"""
+        return self._execute(["SETEX", key, seconds, value]) == "OK"
+
+    def setnx(self, key: str, value: str):
+        """
+        Set if not exists
+        Returns True if key was SET (first time), False if key already exists
+        """
+        result = self._execute(["SETNX", key, value])
+
+        # Upstash REST API returns integer: 1 = set, 0 = already exists
+        if result is None:
+            return False
+        try:
+            return bool(int(result))
+        except (ValueError, TypeError):
+            return bool(result)
+
+    def set_nx_ex(self, key: str, value: str, seconds: int) -> bool:
+        """SET key value NX EX seconds - returns True if the key was set"""
+        return self._execute(["SET", key, value, "NX", "EX", seconds]) == "OK"
+
+    def try_set_nx_ex(self, key: str, value: str, seconds: int) -> Optional[bool]:
+        """
+        SET key value NX EX seconds, distinguishing errors from "already held"
+        Returns True if set, False if the key exists, None if the command failed
+        """
+        result, error = self._execute_checked(["SET", key, value, "NX", "EX", seconds])
+        if error:
+            logger.debug(f"Upstash SET NX failed: {error}")
+            return None
+        return result == "OK"
+
+    def get_checked(self, key: str) -> Tuple[Any, Optional[str]]:
+        """GET returning (value, error) so a missing key and a failed call differ"""
+        return self._execute_checked(["GET", key])
+
+    def delete(self, *keys):
+        """Delete keys"""
+        if not keys:
+            return 0
+        return self._execute(["DEL", *keys])
+
+    def exists(self, key: str):
+        """Check if key exists"""
+        return self._execute(["EXISTS", key]) == 1
+
+    def incr(self, key: str):
+        """Increment counter"""
+        return self._execute(["INCR", key])
+
+    def incrby(self, key: str, amount: int):
+        """Increment by amount"""
+        return self._execute(["INCRBY", key, amount])
+
+    def expire(self, key: str, seconds: int):
+        """Set expiry"""
+        return self._execute(["EXPIRE", key, seconds])
+
+    def ttl(self, key: str):
+        """Get TTL"""
+        return self._execute(["TTL", key])
+
+    def execute(self, *command):
+        """Execute any Redis command"""
+        return self._execute(list(command))
+
+    def keys(self, pattern: str):
+        """Get keys matching pattern"""
+        result = self._execute(["KEYS", pattern])
+        return result if result else []
+
+    def dbsize(self):
+        """Get database size"""
+        result = self._execute(["DBSIZE"])
+        return result if result else 0
+
+    def info(self, section: str = 'stats'):
+        """Get info (limited in Upstash)"""
+        # Upstash doesn't support full INFO, return minimal stats
+        return {
+            'keyspace_hits': 0,
+            'keyspace_misses': 0,
+            'used_memory_human': 'Unknown (Upstash)'
+        }
+
+    # ------------------------------------------------------------
+    # ASYNC COMMANDS
+    # ------------------------------------------------------------
+
+    async def aexecute(self, *command):
+        """Execute any Redis command (async)"""
+        return await self._aexecute(list(command))
+
+    async def aget(self, key: str):
+        return await self._aexecute(["GET", key])
+
+    async def amget(self, *keys):
+        result = await self._aexecute(["MGET", *keys])
+        return result if result else [None] * len(keys)
+
+    async def asetex(self, key: str, seconds: int, value: str):
+        return await self._aexecute(["SETEX", key, seconds, value]) == "OK"
+
+    async def aset_nx_ex(self, key: str, value: str, seconds: int) -> bool:
+        return await self._aexecute(["SET", key, value, "NX", "EX", seconds]) == "OK"
+
+    async def adelete(self, *keys):
+        if not keys:
+            return 0
+        return await self._aexecute(["DEL", *keys])
+
+    async def aexists(self, key: str):
+        return await self._aexecute(["EXISTS", key]) == 1
+
+    async def aincr(self, key: str):
+        return await self._aexecute(["INCR", key])
+
+    async def aexpire(self, key: str, seconds: int):
+        return await self._aexecute(["EXPIRE", key, seconds])
+
+    # ------------------------------------------------------------
+    # LIFECYCLE
+    # ------------------------------------------------------------
+
+    async def aclose(self):
+        """Close pooled connections (application shutdown)"""
+        try:
+            self.client.close()
+            if self._async_client is not None:
+                await self._async_client.aclose()
+        except Exception as e:
+            logger.debug(f"Upstash client close failed: {e}")
+        finally:
+            self._async_client = None
+            self._async_loop = None
+
+
+# ============================================================
+# SHARED INSTANCE
+# ============================================================
+
+try:
+    if UPSTASH_REDIS_REST_URL and UPSTASH_REDIS_REST_TOKEN:
+        redis_client = UpstashRedisClient(UPSTASH_REDIS_REST_URL, UPSTASH_REDIS_REST_TOKEN)
+
+        # Test connection
+        if redis_client.ping():
+            redis_available = True
+            logger.info("✅ Upstash Redis connected successfully (REST API, shared keep-alive pool)")
+        else:
+            redis_client = None
+            logger.warning("⚠️ Upstash Redis ping failed")
+    else:
+        logger.warning("⚠️ UPSTASH_REDIS_REST_URL or UPSTASH_REDIS_REST_TOKEN not configured - using in-memory fallbacks only")
+except ImportError:
+    redis_client = None
+    logger.error("❌ httpx library not installed (required for Upstash)")
+except Exception as e:
+    redis_client = None
+    logger.error(f"❌ Upstash Redis connection failed: {e}")
@@ -6,6 +6,7 @@ Logging, formatting, and helper functions
 UPDATED: Airtable Usage Logs integration + format_analyst_response
 """
 
+import re
 import logging
 from datetime import datetime, timezone
 from typing import Optional
@@ -182,3 +183,35 @@ def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
         return text
     
     return text[:max_length - len(suffix)] + suffix
+
+
+def normalize_query(text: str) -> str:
+    """Normalize common typos and variations"""
+    corrections = {
+        'markrt': 'market',
+        'overveiw': 'overview',
+        'overviw': 'overview',
+        'competitve': 'competitive',
+        'competetive': 'competitive',
+        'oppertunities': 'opportunities',
+        'oportunities': 'opportunities',
+        'analyise': 'analyse',
+        'analize': 'analyse',
+        'scenerio': 'scenario',
+        'forcast': 'forecast',
+        'forceast': 'forecast',
+        'whats': 'what is',
+        'whta': 'what',
+        'teh': 'the',
+        'adn': 'and',
+        'hte': 'the',
+        'reportt': 'report',
+        'reprot': 'report'
+    }
+    
+    normalized = text
+    for typo, correct in corrections.items():
+        pattern = re.compile(re.escape(typo), re.IGNORECASE)
+        normalized = pattern.sub(correct, normalized)
+    
+    return normalized
@@ -401,12 +401,12 @@ def log_hallucination_event(violations: List[str], response_snippet: str):
     """Log hallucination events for monitoring"""
     
     try:
-        from pymongo import MongoClient
+        from app.mongo_pool import get_mongo_client
         import os
         
         MONGODB_URI = os.getenv("MONGODB_URI")
         if MONGODB_URI:
-            mongo_client = MongoClient(MONGODB_URI)
+            mongo_client = get_mongo_client()
             db = mongo_client['Voxmill']
             
             # Calculate severity
@@ -18,26 +18,33 @@ Changes from V1:
 ✅ FIX 2: Canonical market resolver integrated
 ✅ FIX 3: Structural comparison fallback
 ✅ FIX 6: Defensive monitor listing
+✅ Non-blocking: Mongo/Airtable/dataset calls run on the bounded executor
+✅ Outbound messages via pooled async TwilioSender (ordered per recipient)
+✅ Client profiles + markets served from the local Airtable index
 """
 
 import os
 import logging
 import hashlib 
 import re
+import time
 from dateutil import parser as dateutil_parser
 import requests
 import pytz
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 import asyncio
-from twilio.rest import Client
+from app.twilio_sender import twilio_sender
+from app.airtable_profiles import airtable_profiles
 from app.instant_response import InstantIntelligence, should_use_instant_response
 from app.dataset_loader import load_dataset
-from app.llm import classify_and_respond
-from app.utils import format_analyst_response, log_interaction, calculate_tokens_estimate
+from app.llm import classify_and_respond, record_time_to_first_message
+from app.utils import format_analyst_response, log_interaction, calculate_tokens_estimate, normalize_query
 from app.conversation_manager import ConversationSession, resolve_reference, generate_contextualized_prompt
 from app.security import SecurityValidator, log_security_event
 from app.cache_manager import CacheManager
+from app.mongo_pool import get_mongo_client
+from app.async_executor import run_blocking, fire_and_forget
 from app.client_manager import get_client_profile, update_client_history
 # PIN imports removed - PR2
 from app.response_enforcer import ResponseEnforcer, ResponseShape
@@ -104,8 +111,7 @@ TWILIO_WHATSAPP_NUMBER = os.getenv("TWILIO_WHATSAPP_NUMBER")
 # Run startup logging AFTER variables are defined
 log_whatsapp_startup_status()
 
-# Initialize Twilio client
-twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN) if TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN else None
+# Outbound delivery goes through the shared pooled sender (app.twilio_sender)
 
 
 # ============================================================================
@@ -175,286 +181,19 @@ def parse_regions(regions_raw):
 
 def get_client_from_airtable(sender: str) -> dict:
     """
-    WORLD-CLASS: Query new Control Plane database
+    WORLD-CLASS: Resolve client from the Control Plane database
     
-    ✅ FIXED: No hardcoded markets - queries Markets table by industry
+    Served from the local Airtable index (app.airtable_profiles) - Accounts,
+    Permissions, Preferences and Markets are synced in the background, so
+    known numbers resolve without an Airtable round trip.
     
-    New Schema:
+    Schema:
     - accounts: Account Status, Service Tier, Industry, execution_allowed
     - permissions: allowed_modules, monthly_message_limit
     - preferences: active_market_id, coverage_markets
     - markets: market_name, is_active, Selectable, industry
     """
-    
-    AIRTABLE_API_KEY = os.getenv('AIRTABLE_API_KEY')
-    AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
-    
-    if not AIRTABLE_API_KEY or not AIRTABLE_BASE_ID:
-        logger.error("Airtable credentials missing")
-        return None
-    
-    headers = {"Authorization": f"Bearer {AIRTABLE_API_KEY}"}
-    
-    search_number = sender.replace('whatsapp:', '').replace('whatsapp%3A', '')
-    if not search_number.startswith('+'):
-        search_number = '+' + search_number
-    
-    # ========================================
-    # QUERY ACCOUNTS TABLE
-    # ========================================
-    
-    try:
-        accounts_url = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Accounts"
-        params = {'filterByFormula': f"{{WhatsApp Number}}='{search_number}'"}
-        
-        # ✅ DEBUG LOGGING
-        logger.info(f"🔍 AIRTABLE DEBUG:")
-        logger.info(f"   Base ID: {AIRTABLE_BASE_ID}")
-        logger.info(f"   Table: Accounts")
-        logger.info(f"   Search number: {search_number}")
-        logger.info(f"   Filter: {params['filterByFormula']}")
-        
-        response = requests.get(accounts_url, headers=headers, params=params, timeout=5)
-        
-        # ✅ DEBUG RESPONSE
-        logger.info(f"   Status: {response.status_code}")
-        
-        if response.status_code != 200:
-            logger.error(f"Airtable query failed: {response.status_code}")
-            logger.error(f"   Error response: {response.text[:500]}")
-            return None
-        
-        response_data = response.json()
-        records = response_data.get('records', [])
-        
-        logger.info(f"   Records found: {len(records)}")
-        
-        if not records:
-            logger.warning(f"No account found for {sender}")
-            logger.warning(f"   Response body: {response.text[:500]}")
-            return None
-        
-        account = records[0]
-        account_id = account['id']
-        fields = account['fields']
-        
-        logger.info(f"   First record ID: {account_id}")
-        logger.info(f"   Available fields: {list(fields.keys())}")
-        logger.info(f"🔍 DEBUG: agency_name = {fields.get('agency_name')}")
-        logger.info(f"🔍 DEBUG: agency_type = {fields.get('agency_type')}")
-        logger.info(f"🔍 DEBUG: name = {fields.get('name')}")
-        
-        # ========================================
-        # CRITICAL: Read Industry from Airtable
-        # ========================================
-        
-        industry_code = fields.get('Industry', 'real_estate')  # Read from Airtable
-        
-        # ========================================
-        # CRITICAL: Trust execution_allowed formula
-        # ========================================
-        
-        # ✅ FIXED: Defensive type normalization
-        execution_allowed_raw = fields.get('execution_allowed')
-        
-        if isinstance(execution_allowed_raw, str):
-            execution_allowed = execution_allowed_raw.lower() in ['1', 'true', 'yes']
-        elif isinstance(execution_allowed_raw, (int, float)):
-            execution_allowed = bool(execution_allowed_raw)
-        elif isinstance(execution_allowed_raw, bool):
-            execution_allowed = execution_allowed_raw
-        else:
-            execution_allowed = False
-            logger.warning(f"Unexpected execution_allowed type: {type(execution_allowed_raw)} = {execution_allowed_raw}")
-        
-        logger.info(f"🔍 execution_allowed: {execution_allowed_raw} → {execution_allowed}")
-        
-        if not execution_allowed:
-            # Return minimal profile - access denied
-            status = fields.get('Account Status (Execution Safe)', 'blocked')
-            trial_expired = fields.get('Is Trial Expired') == 1
-            
-            logger.warning(f"Execution blocked for {sender}: status={status}, trial_expired={trial_expired}, execution_allowed={execution_allowed_raw}")
-            
-            # ✅ Query default market from Markets table by industry
-            default_markets = get_available_markets_from_db(industry_code)
-            default_region = default_markets[0] if default_markets else None
-            
-            return {
-                'subscription_status': status.capitalize() if status != 'blocked' else 'Blocked',
-                'access_enabled': False,
-                'trial_expired': trial_expired,
-                'name': fields.get('name', 'there'),
-                'email': '',
-                'airtable_record_id': account_id,
-                'table': 'Accounts',
-                'tier': 'tier_1',
-                'industry': industry_code,
-                
-                # ✅ ADD AGENCY CONTEXT (EVEN FOR BLOCKED USERS)
-                'agency_name': fields.get('agency_name'),
-                'agency_type': fields.get('agency_type'),
-                'role': fields.get('role'),
-                'typical_price_band': fields.get('typical_price_band'),
-                'objectives': fields.get('objectives', []),
-                
-                'preferences': {'preferred_regions': [default_region] if default_region else []},
-                'usage_metrics': {'messages_used_this_month': 0, 'monthly_message_limit': 0},
-                'execution_allowed': False,
-                'active_market': default_region
-            }
-        
-        # ========================================
-        # QUERY PERMISSIONS TABLE
-        # ========================================
-        
-        permissions_url = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Permissions"
-        params = {'filterByFormula': f"SEARCH('{account_id}', ARRAYJOIN({{account_id}}))"}
-        perm_response = requests.get(permissions_url, headers=headers, params=params, timeout=5)
-        
-        permissions = {}
-        if perm_response.status_code == 200:
-            perm_records = perm_response.json().get('records', [])
-            if perm_records:
-                permissions = perm_records[0]['fields']
-        
-        # ========================================
-        # QUERY PREFERENCES TABLE
-        # ========================================
-        
-        preferences_url = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Preferences"
-        params = {'filterByFormula': f"SEARCH('{account_id}', ARRAYJOIN({{account_id}}))"}
-        pref_response = requests.get(preferences_url, headers=headers, params=params, timeout=5)
-        
-        preferences_data = {}
-        active_market_name = None  # ✅ No default
-        
-        if pref_response.status_code == 200:
-            pref_records = pref_response.json().get('records', [])
-            if pref_records:
-                preferences_data = pref_records[0]['fields']
-                
-                # Get active market name from Markets table
-                active_market_ids = preferences_data.get('active_market_id', [])
-                if active_market_ids:
-                    active_market_name = get_market_name_by_id(active_market_ids[0])
-        
-        # ✅ FALLBACK: Query Markets table for first available market in industry
-        if not active_market_name:
-            available_markets = get_available_markets_from_db(industry_code)
-            active_market_name = available_markets[0] if available_markets else None
-            
-            if not active_market_name:
-                logger.error(f"❌ NO MARKETS CONFIGURED for industry: {industry_code}")
-                
-                # ✅ FIX: RETURN BLOCKING PROFILE (no markets configured)
-                # Map Service Tier to tier_1/tier_2/tier_3
-                tier_map = {
-                    'core': 'tier_1',
-                    'premium': 'tier_2',
-                    'sigma': 'tier_3'
-                }
-                
-                tier = tier_map.get(fields.get('Service Tier', 'core'), 'tier_1')
-                status = fields.get('Account Status', 'trial')
-                
-                return {
-                    'name': fields.get('name', 'there'),
-                    'email': '',
-                    'subscription_status': status.capitalize(),
-                    'tier': tier,
-                    'trial_expired': fields.get('Is Trial Expired') == 1,
-                    'airtable_record_id': account_id,
-                    'airtable_table': 'Accounts',
-                    
-                    # ✅ ADD AGENCY CONTEXT
-                    'agency_name': fields.get('agency_name'),
-                    'agency_type': fields.get('agency_type'),
-                    'role': fields.get('role'),
-                    'typical_price_band': fields.get('typical_price_band'),
-                    'objectives': fields.get('objectives', []),
-                    
-                    'preferences': {
-                        'preferred_regions': [],  # ✅ Empty - no markets
-                        'competitor_focus': 'medium',
-                        'report_depth': 'detailed'
-                    },
-                    'usage_metrics': {
-                        'messages_used_this_month': 0,
-                        'monthly_message_limit': permissions.get('monthly_message_limit', 100),
-                        'total_messages_sent': 0
-                    },
-                    'airtable_is_source_of_truth': True,
-                    'access_enabled': True,
-                    'subscription_gate_enforced': True,
-                    'industry': industry_code,
-                    'allowed_intelligence_modules': permissions.get('allowed_modules', []),
-                    'pin_enforcement_mode': fields.get('PIN Mode', 'strict').capitalize(),
-                    'execution_allowed': True,
-                    'active_market': None,  # ✅ CRITICAL: None = no market configured
-                    'no_markets_configured': True  # ✅ NEW FLAG
-                }
-        
-        # ========================================
-        # MAP TO OLD SCHEMA FOR COMPATIBILITY
-        # ========================================
-        
-        # Map Service Tier to tier_1/tier_2/tier_3
-        tier_map = {
-            'core': 'tier_1',
-            'premium': 'tier_2',
-            'sigma': 'tier_3'
-        }
-        
-        tier = tier_map.get(fields.get('Service Tier', 'core'), 'tier_1')
-        
-        # Map Account Status to subscription_status
-        status = fields.get('Account Status', 'trial')
-        
-        # ✅ KEEP Industry as lowercase code (read directly from Airtable)
-        industry = industry_code  # Use code, not display name
-        
-        logger.info(f"✅ Client found: {search_number} (industry={industry}, status={status}, tier={tier}, market={active_market_name})")
-        
-        return {
-            'name': fields.get('name', search_number),
-            'email': '',
-            'subscription_status': status.capitalize(),
-            'tier': tier,
-            'trial_expired': fields.get('Is Trial Expired') == 1,
-            'airtable_record_id': account_id,
-            'airtable_table': 'Accounts',
-            
-            # ✅ ADD AGENCY CONTEXT (LOWERCASE FIELD NAMES)
-            'agency_name': fields.get('agency_name'),
-            'agency_type': fields.get('agency_type'),
-            'role': fields.get('role'),
-            'typical_price_band': fields.get('typical_price_band'),
-            'objectives': fields.get('objectives', []),
-            
-            'preferences': {
-                'preferred_regions': [active_market_name] if active_market_name else [],  # ✅ From Markets table
-                'competitor_focus': 'medium',
-                'report_depth': 'detailed'
-            },
-            'usage_metrics': {
-                'messages_used_this_month': 0,
-                'monthly_message_limit': permissions.get('monthly_message_limit', 100),
-                'total_messages_sent': 0
-            },
-            'airtable_is_source_of_truth': True,
-            'access_enabled': True,
-            'subscription_gate_enforced': True,
-            'industry': industry,  # ✅ Lowercase code from Airtable
-            'allowed_intelligence_modules': permissions.get('allowed_modules', []),
-            'pin_enforcement_mode': fields.get('PIN Mode', 'strict').capitalize(),
-            'execution_allowed': True,  # ✅ FIXED: Add this field
-            'active_market': active_market_name  # ✅ FIXED: Add active_market field
-        }
-    
-    except Exception as e:
-        logger.error(f"Error querying Airtable: {e}", exc_info=True)
-        return None
+    return airtable_profiles.get_profile(sender)
 
 def get_market_name_by_id(market_id: str) -> Optional[str]:
     """
@@ -463,6 +202,11 @@ def get_market_name_by_id(market_id: str) -> Optional[str]:
     ✅ FIXED: Returns None if not found (no hardcoded fallback)
     """
     
+    # Local index first
+    market_name = airtable_profiles.market_name(market_id)
+    if market_name:
+        return market_name
+    
     AIRTABLE_API_KEY = os.getenv('AIRTABLE_API_KEY')
     AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
     
@@ -500,17 +244,21 @@ def check_market_availability(industry: str, market_name: str) -> dict:
     industry_code = industry
     
     try:
-        headers = {"Authorization": f"Bearer {AIRTABLE_API_KEY}"}
-        url = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Markets"
+        index_loaded, indexed_market = airtable_profiles.find_market(industry_code, market_name)
         
-        formula = f"AND({{industry}}='{industry_code}', {{market_name}}='{market_name}')"
-        params = {'filterByFormula': formula}
-        
-        response = requests.get(url, headers=headers, params=params, timeout=5)
-        
-        if response.status_code == 200:
-            records = response.json().get('records', [])
+        if index_loaded:
+            records = [{'fields': indexed_market}] if indexed_market else []
+        else:
+            headers = {"Authorization": f"Bearer {AIRTABLE_API_KEY}"}
+            url = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/Markets"
+            
+            formula = f"AND({{industry}}='{industry_code}', {{market_name}}='{market_name}')"
+            params = {'filterByFormula': formula}
             
+            response = requests.get(url, headers=headers, params=params, timeout=5)
+            records = response.json().get('records', []) if response.status_code == 200 else None
+        
+        if records is not None:
             if records:
                 fields = records[0]['fields']
                 is_active = fields.get('is_active', False)
@@ -573,6 +321,13 @@ def get_available_markets_from_db(industry_code: str) -> list:
         List of market names or empty list if none configured
     """
     
+    # Local index first
+    markets = airtable_profiles.available_markets(industry_code)
+    if markets is not None:
+        if not markets:
+            logger.error(f"❌ NO MARKETS CONFIGURED in Airtable for industry: {industry_code}")
+        return markets
+    
     AIRTABLE_API_KEY = os.getenv('AIRTABLE_API_KEY')
     AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
     
@@ -657,76 +412,72 @@ Voxmill Intelligence - Precision at Scale"""
         logger.error(f"Error sending welcome message: {str(e)}", exc_info=True)
 
 
-def normalize_query(text: str) -> str:
-    """Normalize common typos and variations"""
-    corrections = {
-        'markrt': 'market',
-        'overveiw': 'overview',
-        'overviw': 'overview',
-        'competitve': 'competitive',
-        'competetive': 'competitive',
-        'oppertunities': 'opportunities',
-        'oportunities': 'opportunities',
-        'analyise': 'analyse',
-        'analize': 'analyse',
-        'scenerio': 'scenario',
-        'forcast': 'forecast',
-        'forceast': 'forecast',
-        'whats': 'what is',
-        'whta': 'what',
-        'teh': 'the',
-        'adn': 'and',
-        'hte': 'the',
-        'reportt': 'report',
-        'reprot': 'report'
-    }
-    
-    normalized = text
-    for typo, correct in corrections.items():
-        pattern = re.compile(re.escape(typo), re.IGNORECASE)
-        normalized = pattern.sub(correct, normalized)
-    
-    return normalized
-
-
 async def send_twilio_message(to: str, message: str):
-    """Send WhatsApp message via Twilio with smart chunking"""
+    """
+    Send WhatsApp message via Twilio with smart chunking
+    
+    Chunks go through the shared TwilioSender: in order for this recipient,
+    concurrently with other recipients, retried on 429/5xx.
+    """
     try:
-        from twilio.rest import Client
-        
-        account_sid = os.getenv('TWILIO_ACCOUNT_SID')
-        auth_token = os.getenv('TWILIO_AUTH_TOKEN')
-        from_number = os.getenv('TWILIO_WHATSAPP_NUMBER', 'whatsapp:+14155238886')
-        
-        if not account_sid or not auth_token:
+        if not twilio_sender.configured:
             logger.error("Twilio credentials missing")
             return
         
-        client = Client(account_sid, auth_token)
-        
         if not to.startswith('whatsapp:'):
             to = f'whatsapp:{to}'
         
         MAX_LENGTH = 1500
         
-        if len(message) <= MAX_LENGTH:
-            client.messages.create(body=message, from_=from_number, to=to)
+        chunks = smart_split_message(message, MAX_LENGTH)
+        await twilio_sender.send_many(to, chunks)
+        
+        if len(chunks) == 1:
             logger.info(f"Message sent to {to} ({len(message)} chars)")
         else:
-            chunks = smart_split_message(message, MAX_LENGTH)
-            
-            for i, chunk in enumerate(chunks, 1):
-                client.messages.create(body=chunk, from_=from_number, to=to)
-                logger.info(f"Chunk {i}/{len(chunks)} sent to {to} ({len(chunk)} chars)")
-                
-                if i < len(chunks):
-                    await asyncio.sleep(0.5)
+            logger.info(f"{len(chunks)} chunks sent to {to} ({len(message)} chars)")
         
     except Exception as e:
         logger.error(f"Failed to send Twilio message: {e}", exc_info=True)
         raise
 
 
+_STREAM_SENTENCE_START = re.compile(r'(?<=[.!?])\s+|\n\s*')
+
+
+def remainder_after_streamed_chunk(full_text: str, chunk: str) -> Tuple[str, bool]:
+    """
+    Text still to send after chunk went out early
+    
+    Shape enforcement may re-join words with single spaces, so when the exact
+    prefix fails the chunk is matched word by word and full_text is sliced at
+    the matched character offset (keeping its paragraph / line breaks).
+    
+    Returns: (remainder, matched)
+        matched=False means full_text diverged inside the chunk; remainder then
+        starts at the sentence where it diverged so the streamed text is not resent
+    """
+    if full_text.startswith(chunk):
+        return full_text[len(chunk):].strip(), True
+    
+    chunk_words = chunk.split()
+    matched_end = 0
+    for index, word in enumerate(re.finditer(r'\S+', full_text)):
+        if index == len(chunk_words):
+            break
+        if word.group() != chunk_words[index]:
+            sentence_start = 0
+            for boundary in _STREAM_SENTENCE_START.finditer(full_text, 0, word.start()):
+                sentence_start = boundary.end()
+            return full_text[sentence_start:].strip(), False
+        matched_end = word.end()
+    else:
+        if len(full_text.split()) < len(chunk_words):
+            return '', False  # Final text is shorter than what already went out
+    
+    return full_text[matched_end:].strip(), True
+
+
 def smart_split_message(message: str, max_length: int) -> list:
     """Split message intelligently at natural break points with part numbers"""
     if len(message) <= max_length:
@@ -812,7 +563,6 @@ async def handle_whatsapp_message(sender: str, message_text: str):
     from app.airtable_auto_sync import sync_usage_metrics
     from app.conversational_governor import ConversationalGovernor, Intent
     from app.pending_actions import action_manager, ActionType
-    from pymongo import MongoClient
     
     try:
         logger.info(f"📱 Processing message from {sender}: {message_text}")
@@ -888,7 +638,7 @@ async def handle_whatsapp_message(sender: str, message_text: str):
         # STEP 1: CHECK MONGODB CACHE
         # ========================================
         
-        client_profile = get_client_profile(sender)
+        client_profile = await run_blocking(get_client_profile, sender)
         
         if client_profile:
             logger.info(f"🔍 DEBUG: Cached profile agency_name = {client_profile.get('agency_name')}")
@@ -919,7 +669,7 @@ async def handle_whatsapp_message(sender: str, message_text: str):
         # ========================================
         
         if not client_profile or should_refresh or client_profile.get('total_queries', 0) == 0:
-            client_profile_airtable = get_client_from_airtable(sender)
+            client_profile_airtable = await run_blocking(get_client_from_airtable, sender)
             
             if client_profile_airtable:
                 # Preserve MongoDB-only fields
@@ -975,9 +725,9 @@ async def handle_whatsapp_message(sender: str, message_text: str):
                 # Update MongoDB cache
                 MONGODB_URI = os.getenv('MONGODB_URI')
                 if MONGODB_URI:
-                    mongo_client = MongoClient(MONGODB_URI)
+                    mongo_client = get_mongo_client()
                     db = mongo_client['Voxmill']
-                    db['client_profiles'].update_one(
+                    await run_blocking(db['client_profiles'].update_one, 
                         {'whatsapp_number': sender},
                         {'$set': client_profile},
                         upsert=True
@@ -1030,13 +780,17 @@ Contact intel@voxmill.uk to activate market coverage."""
         
         client_tier = client_profile.get('tier', 'tier_1')
         
-        # Check token bucket with message cost
-        allowed, current_tokens, capacity = RateLimiter.check_token_bucket(
+        # Gates 2-2.5 are evaluated atomically server-side in one round trip
+        # (token bucket, abuse score, challenge flag, burst counter)
+        gates = await RateLimiter.check_gates_async(
             client_id=sender,
+            client_tier=client_tier,
             operation='message',
-            client_tier=client_tier
+            enforce_hard_block=ENABLE_ABUSE_SCORING_BLOCKS
         )
         
+        allowed, current_tokens, capacity = gates['token_bucket']
+        
         if not allowed:
             logger.warning(f"🚫 GATE 2 FAILED: TOKEN BUCKET DEPLETED: {sender} ({current_tokens}/{capacity})")
             
@@ -1063,13 +817,13 @@ For higher limits, contact: intel@voxmill.uk"""
         
         logger.info(f"🔐 GATE 2.3: Checking abuse score...")
         
-        blocked, action, abuse_score = RateLimiter.check_abuse_threshold(sender)
+        blocked, action, abuse_score = gates['abuse']
         
         if blocked:
             if action == 'require_verification':
                 logger.warning(f"🚫 GATE 2.3 FAILED: VERIFICATION REQUIRED: {sender} (score: {abuse_score})")
                 
-                RateLimiter.set_challenge_required(sender, 'verify')
+                await run_blocking(RateLimiter.set_challenge_required, sender, 'verify')
                 
                 await send_twilio_message(
                     sender,
@@ -1111,7 +865,7 @@ Contact intel@voxmill.uk if this is an error."""
         
         logger.info(f"🔐 GATE 2.4: Checking for challenge requirement...")
         
-        challenge_required, challenge_type = RateLimiter.is_challenge_required(sender)
+        challenge_required, challenge_type = gates['challenge']
         
         if challenge_required:
             # Check if this message is the challenge response
@@ -1124,9 +878,9 @@ Contact intel@voxmill.uk if this is an error."""
                     # Verify PIN
                     from app.pin_auth import verify_pin
                     
-                    if verify_pin(sender, submitted_pin, client_profile):
-                        RateLimiter.clear_challenge(sender)
-                        RateLimiter.update_abuse_score(sender, 'successful_pin', -10)
+                    if await run_blocking(verify_pin, sender, submitted_pin, client_profile):
+                        await run_blocking(RateLimiter.clear_challenge, sender)
+                        await run_blocking(RateLimiter.update_abuse_score, sender, 'successful_pin', -10)
                         
                         await send_twilio_message(sender, "✅ Verification successful. Access restored.\n\n")
                         logger.info(f"✅ Challenge passed: {sender}")
@@ -1157,17 +911,12 @@ Contact intel@voxmill.uk if you need assistance."""
         
         logger.info(f"🔐 GATE 2.5: Checking burst limit...")
         
-        burst_allowed, burst_count = RateLimiter.check_burst_limit(sender)
+        burst_allowed, burst_count = gates['burst'] or (True, 0)
         
         if not burst_allowed:
+            # Abuse score already raised by BURST_ABUSE_PENALTY inside the gate script
             logger.warning(f"🚫 GATE 2.5 FAILED: BURST FLOOD: {sender} ({burst_count} in 3s)")
             
-            # Update abuse score (with error handling)
-            try:
-                RateLimiter.update_abuse_score(sender, 'burst_flood', 5)
-            except Exception as e:
-                logger.error(f"Failed to update abuse score: {e}")
-            
             # Send ONE warning, then silence
             if burst_count == 6:  # First violation
                 response = "Rate limit active. Wait 30 seconds."
@@ -1197,8 +946,8 @@ Contact intel@voxmill.uk if you need assistance."""
         
         logger.info(f"🔐 GATE 2.65: Checking for repeat queries...")
         
-        # Get session data for last message comparison
-        session_data = conversation.get_session()
+        # Get session data for last message comparison (the one session load for this message)
+        session_data = await run_blocking(conversation.get_session)
         
         # Normalize current message for comparison
         current_message_clean = message_text.strip().lower()
@@ -1210,7 +959,7 @@ Contact intel@voxmill.uk if you need assistance."""
         if current_message_clean == last_user_message and last_user_message != '':
             # Track consecutive repeats silently
             repeat_count = session_data.get('consecutive_repeats', 0) + 1
-            session_data['consecutive_repeats'] = repeat_count
+            conversation.set_fields(consecutive_repeats=repeat_count)
             
             logger.info(f"🔁 REPEAT DETECTED (silent): {repeat_count}/3")
             
@@ -1219,7 +968,7 @@ Contact intel@voxmill.uk if you need assistance."""
                 conversation.set_silence_mode(duration=300)  # 5 minutes
                 
                 try:
-                    RateLimiter.update_abuse_score(sender, 'extreme_repeat_spam', 20)
+                    await run_blocking(RateLimiter.update_abuse_score, sender, 'extreme_repeat_spam', 20)
                 except Exception:
                     pass
                 
@@ -1227,10 +976,10 @@ Contact intel@voxmill.uk if you need assistance."""
                 return  # Silent return, no message to user
         else:
             # Reset repeat counter if message is different
-            session_data['consecutive_repeats'] = 0
+            conversation.set_fields(consecutive_repeats=0)
 
         # Store current message for next comparison
-        session_data['last_user_message_raw'] = current_message_clean
+        conversation.set_fields(last_user_message_raw=current_message_clean)
 
         
 
@@ -1245,13 +994,13 @@ Contact intel@voxmill.uk if you need assistance."""
         
         if SecurityValidator.is_obvious_gibberish(message_text):
             # Don't call LLM - just increment gibberish counter
-            gibberish_count = conversation.get_consecutive_gibberish_count()
+            gibberish_count = await run_blocking(conversation.get_consecutive_gibberish_count)
             gibberish_count += 1
-            conversation.set_consecutive_gibberish_count(gibberish_count)
+            await run_blocking(conversation.set_consecutive_gibberish_count, gibberish_count)
             
             # Update abuse score (with error handling)
             try:
-                RateLimiter.update_abuse_score(sender, 'gibberish', 2)
+                await run_blocking(RateLimiter.update_abuse_score, sender, 'gibberish', 2)
             except Exception as e:
                 logger.error(f"Failed to update abuse score: {e}")
             
@@ -1262,7 +1011,7 @@ Contact intel@voxmill.uk if you need assistance."""
                 conversation.set_silence_mode(duration=300)  # 5 minutes
                 
                 try:
-                    RateLimiter.update_abuse_score(sender, 'gibberish_spam', 5)
+                    await run_blocking(RateLimiter.update_abuse_score, sender, 'gibberish_spam', 5)
                 except Exception as e:
                     logger.error(f"Failed to update abuse score: {e}")
                 
@@ -1282,18 +1031,17 @@ Contact intel@voxmill.uk if you need assistance."""
         # AUTOMATED WELCOME MESSAGE DETECTION (FIRST MESSAGE ONLY)
         # ====================================================================
         
-        from pymongo import MongoClient
         MONGODB_URI = os.getenv('MONGODB_URI')
         
         should_send_welcome = False
         welcome_message_type = None
         
         if MONGODB_URI:
-            mongo_client = MongoClient(MONGODB_URI)
+            mongo_client = get_mongo_client()
             db = mongo_client['Voxmill']
             
             # Get previous profile state (if exists)
-            previous_profile = db['client_profiles'].find_one({'whatsapp_number': sender})
+            previous_profile = await run_blocking(db['client_profiles'].find_one, {'whatsapp_number': sender})
             
             # ================================================================
             # DETECTION 1: BRAND NEW USER (NO PREVIOUS RECORD)
@@ -1405,7 +1153,7 @@ Voxmill Intelligence — Precision at Scale"""
                 
                 # Mark welcome as sent in MongoDB (atomic operation to prevent race condition)
                 if welcome_message_type == 'reactivation':
-                    db['client_profiles'].update_one(
+                    await run_blocking(db['client_profiles'].update_one, 
                         {
                             'whatsapp_number': sender,
                             'reactivation_welcome_sent': {'$ne': True}  # Only if not already sent
@@ -1418,7 +1166,7 @@ Voxmill Intelligence — Precision at Scale"""
                         }
                     )
                 else:
-                    db['client_profiles'].update_one(
+                    await run_blocking(db['client_profiles'].update_one, 
                         {
                             'whatsapp_number': sender,
                             'welcome_message_sent': {'$ne': True}  # Only if not already sent
@@ -1508,7 +1256,7 @@ All properties removed."""
                         action_manager.complete_action(pending_action.action_id, {'success': False})
                     
                     await send_twilio_message(sender, response)
-                    log_interaction(sender, message_text, "portfolio_reset", response, 0, client_profile)
+                    fire_and_forget(log_interaction, sender, message_text, "portfolio_reset", response, 0, client_profile)
                     return  # TERMINAL
                 
                 elif pending_action.action_type == ActionType.REMOVE_PROPERTY:
@@ -1524,7 +1272,7 @@ All properties removed."""
                     )
                     
                     await send_twilio_message(sender, response)
-                    log_interaction(sender, message_text, "portfolio_remove", response, 0, client_profile)
+                    fire_and_forget(log_interaction, sender, message_text, "portfolio_remove", response, 0, client_profile)
                     logger.info(f"✅ FSM: Removal executed and logged")
                     return  # TERMINAL
             
@@ -1537,7 +1285,7 @@ All properties removed."""
 {pending_action.action_type.value.replace('_', ' ').title()} cancelled."""
                 
                 await send_twilio_message(sender, response)
-                log_interaction(sender, message_text, "action_cancelled", response, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "action_cancelled", response, 0, client_profile)
                 logger.info(f"✅ FSM: Action cancelled")
                 return  # TERMINAL
             
@@ -1555,7 +1303,7 @@ Or: CANCEL {pending_action.action_id}
 No other actions permitted."""
                 
                 await send_twilio_message(sender, response)
-                log_interaction(sender, message_text, "fsm_locked", response, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "fsm_locked", response, 0, client_profile)
                 logger.info(f"🚫 FSM LOCKED: Rejected non-confirmation message")
                 return  # TERMINAL
         
@@ -1576,7 +1324,7 @@ No other actions permitted."""
             
             response = await execute_portfolio_command(sender, command, client_profile)
             await send_twilio_message(sender, response)
-            log_interaction(sender, message_text, f"portfolio_{command.type}", response, 0, client_profile)
+            fire_and_forget(log_interaction, sender, message_text, f"portfolio_{command.type}", response, 0, client_profile)
             logger.info(f"✅ GATE 6: Command executed")
             return  # TERMINAL
         
@@ -1606,7 +1354,7 @@ No other actions permitted."""
                 "threats": threats
             })
             
-            log_interaction(sender, message_text, "security_block", 
+            fire_and_forget(log_interaction, sender, message_text, "security_block", 
                           "Security violation", 0, client_profile)
     
             return  # Block processing
@@ -1634,7 +1382,6 @@ No other actions permitted."""
             session_data = conversation.get_session()
             last_refresh_time = session_data.get('last_profile_refresh_time', 0)
             
-            import time
             cooldown_seconds = 60
             time_since_last = time.time() - last_refresh_time
             
@@ -1642,13 +1389,12 @@ No other actions permitted."""
                 remaining = int(cooldown_seconds - time_since_last)
                 response = f"Profile was just refreshed. Wait {remaining}s."
                 await send_twilio_message(sender, response)
-                log_interaction(sender, message_text, "refresh_cooldown", response, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "refresh_cooldown", response, 0, client_profile)
                 logger.info(f"⏱️ Refresh rate-limited: {remaining}s remaining")
                 return  # TERMINAL
             
             # GATE 2: Execute refresh
             try:
-                from pymongo import MongoClient
                 MONGODB_URI = os.getenv('MONGODB_URI')
                 
                 if not MONGODB_URI:
@@ -1656,27 +1402,27 @@ No other actions permitted."""
                     await send_twilio_message(sender, response)
                     return
                 
-                mongo_client = MongoClient(MONGODB_URI)
+                mongo_client = get_mongo_client()
                 db = mongo_client['Voxmill']
                 
                 # Delete cached profile
-                db['client_profiles'].delete_one({'whatsapp_number': sender})
+                await run_blocking(db['client_profiles'].delete_one, {'whatsapp_number': sender})
                 logger.info(f"✅ Profile cache cleared for {sender}")
                 
                 # Reload from Airtable
-                fresh_profile = get_client_from_airtable(sender)
+                fresh_profile = await run_blocking(get_client_from_airtable, sender)
                 
                 if not fresh_profile:
                     response = "Profile refresh failed — account not found in Airtable."
                     await send_twilio_message(sender, response)
-                    log_interaction(sender, message_text, "refresh_failed", response, 0, client_profile)
+                    fire_and_forget(log_interaction, sender, message_text, "refresh_failed", response, 0, client_profile)
                     return
                 
                 # Cache refreshed profile
-                db['client_profiles'].insert_one(fresh_profile)
+                await run_blocking(db['client_profiles'].insert_one, fresh_profile)
                 
                 # Update session timestamp
-                session_data['last_profile_refresh_time'] = time.time()
+                conversation.set_fields(last_profile_refresh_time=time.time())
                 conversation.update_session(user_message=message_text, assistant_response="Profile refreshed.", metadata={'last_profile_refresh_time': time.time()})
                 
                 # Confirm
@@ -1690,7 +1436,7 @@ No other actions permitted."""
 Active market: {market}"""
                 
                 await send_twilio_message(sender, response)
-                log_interaction(sender, message_text, "profile_refresh", response, 0, fresh_profile)
+                fire_and_forget(log_interaction, sender, message_text, "profile_refresh", response, 0, fresh_profile)
                 logger.info(f"✅ Profile refreshed successfully for {sender}")
                 return  # TERMINAL
                 
@@ -1723,7 +1469,7 @@ Active market: {market}"""
 
 Try: "Compare Mayfair vs Knightsbridge"""
                     await send_twilio_message(sender, response)
-                    log_interaction(sender, message_text, "reverse_failed", response, 0, client_profile)
+                    fire_and_forget(log_interaction, sender, message_text, "reverse_failed", response, 0, client_profile)
                     return  # TERMINAL
                 
                 # Get original markets (list: [region1, region2])
@@ -1739,7 +1485,7 @@ Try: "Compare Mayfair vs Knightsbridge"""
                 
                 # Load dataset for new_market2 (which was original_market1)
                 try:
-                    dataset_2 = load_dataset(area=new_market2, city='London')
+                    dataset_2 = await run_blocking(load_dataset, area=new_market2, city='London')
                     logger.info(f"✅ Loaded comparison dataset: {new_market2}")
                 except Exception as e:
                     logger.error(f"Failed to load dataset for {new_market2}: {e}")
@@ -1749,7 +1495,7 @@ Try: "Compare Mayfair vs Knightsbridge"""
                 
                 # Load primary dataset for new_market1
                 try:
-                    dataset_1 = load_dataset(area=new_market1, city='London')
+                    dataset_1 = await run_blocking(load_dataset, area=new_market1, city='London')
                     logger.info(f"✅ Loaded primary dataset: {new_market1}")
                 except Exception as e:
                     logger.error(f"Failed to load dataset for {new_market1}: {e}")
@@ -1775,7 +1521,7 @@ Try: "Compare Mayfair vs Knightsbridge"""
                 
                 # Send recomputed response
                 await send_twilio_message(sender, reversed_response)
-                log_interaction(sender, message_text, "comparison_reversed_recompute", reversed_response, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "comparison_reversed_recompute", reversed_response, 0, client_profile)
                 
                 logger.info(f"✅ Reverse RECOMPUTED: {new_market1} vs {new_market2}")
                 return  # TERMINAL
@@ -1784,7 +1530,7 @@ Try: "Compare Mayfair vs Knightsbridge"""
             from app.market_canonicalizer import MarketCanonicalizer
             
             industry_code = client_profile.get('industry', 'real_estate')
-            available_markets = get_available_markets_from_db(industry_code)
+            available_markets = await run_blocking(get_available_markets_from_db, industry_code)
             
             # ✅ FIX: PRE-FILTER TIMEFRAMES BEFORE PARSING
             # Strip common timeframe phrases that break entity extraction
@@ -1870,7 +1616,7 @@ Try: "Compare Mayfair vs Knightsbridge"
 
 Available: {', '.join(available_markets[:5])}"""
                     await send_twilio_message(sender, response)
-                    log_interaction(sender, message_text, "comparison_incomplete", response, 0, client_profile)
+                    fire_and_forget(log_interaction, sender, message_text, "comparison_incomplete", response, 0, client_profile)
                     return  # TERMINAL
             
             if len(entities) > 2:
@@ -1896,7 +1642,7 @@ Available: {', '.join(available_markets[:5])}"""
                 else:
                     response = "I can compare any two markets — specify both. Try: 'Compare Mayfair vs Chelsea'."
                     await send_twilio_message(sender, response)
-                    log_interaction(sender, message_text, "comparison_self_resolved", response, 0, client_profile)
+                    fire_and_forget(log_interaction, sender, message_text, "comparison_self_resolved", response, 0, client_profile)
                     return
             # ── END PATCH ────────────────────────────────────────────────
             
@@ -1934,7 +1680,7 @@ Comparison framework:
 Want to pressure-test this?"""
                 
                 await send_twilio_message(sender, structural_response)
-                log_interaction(sender, message_text, "structural_comparison", structural_response, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "structural_comparison", structural_response, 0, client_profile)
                 
                 logger.info(f"✅ Structural comparison sent (no dataset load)")
                 return  # TERMINAL
@@ -1944,8 +1690,11 @@ Want to pressure-test this?"""
             
             from app.dataset_loader import load_dataset
             
-            dataset = load_dataset(area=market1, industry=industry_code)
-            dataset_2 = load_dataset(area=market2, industry=industry_code)
+            # Both markets load concurrently on the executor
+            dataset, dataset_2 = await asyncio.gather(
+                run_blocking(load_dataset, area=market1, industry=industry_code),
+                run_blocking(load_dataset, area=market2, industry=industry_code)
+            )
             
             # Check if dataset_2 actually loaded
             if dataset_2.get('metadata', {}).get('is_fallback') or dataset_2.get('metadata', {}).get('property_count', 0) == 0:
@@ -1967,7 +1716,7 @@ Comparison framework:
 - Buyer profile: {market1} = UHNW/sovereign, {market2} = local/domestic"""
                 
                 await send_twilio_message(sender, structural_response)
-                log_interaction(sender, message_text, "structural_comparison", structural_response, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "structural_comparison", structural_response, 0, client_profile)
                 return  # TERMINAL
             
             # ✅ SET VARIABLES (don't execute here — let it fall through to GPT handler below)
@@ -2061,9 +1810,9 @@ Contact intel@voxmill.uk to activate market coverage."""
                     try:
                         MONGODB_URI = os.getenv('MONGODB_URI')
                         if MONGODB_URI:
-                            mongo_client = MongoClient(MONGODB_URI)
+                            mongo_client = get_mongo_client()
                             db = mongo_client['Voxmill']
-                            trial_usage = db['client_profiles'].find_one({'whatsapp_number': sender})
+                            trial_usage = await run_blocking(db['client_profiles'].find_one, {'whatsapp_number': sender})
                             if trial_usage:
                                 trial_sample_used = trial_usage.get('trial_sample_used', False)
                     except Exception as e:
@@ -2093,7 +1842,7 @@ Contact intel@voxmill.uk to activate market coverage."""
                         'subscription_active': client_profile.get('subscription_status', '').lower() == 'active',
                         'pin_unlocked': True,
                         'quota_remaining': 100,
-                        'monitoring_active': len(client_profile.get('active_monitors', [])) > 0,
+                        'monitoring_active': client_profile.get('monitor_count', len(client_profile.get('active_monitors', []))) > 0,
                         'trial_sample_used': trial_sample_used
                     },
                     conversation_context=conversation_context
@@ -2144,7 +1893,7 @@ Contact intel@voxmill.uk to activate market coverage."""
                         conversation.set_pending_question('market_context', segment)
                         
                         await send_twilio_message(sender, clarification_response)
-                        log_interaction(sender, segment, "clarification_request", clarification_response, 0, client_profile)
+                        fire_and_forget(log_interaction, sender, segment, "clarification_request", clarification_response, 0, client_profile)
                         
                         # Don't continue processing - wait for user's market selection
                         continue
@@ -2179,7 +1928,7 @@ For detailed analysis, contact intel@voxmill.uk"""
                         responses.append(structural_response)
                         continue
                     
-                    dataset = load_dataset(area=canonical_region, industry=industry)
+                    dataset = await run_blocking(load_dataset, area=canonical_region, industry=industry)
                     
                     response = InstantIntelligence.get_full_market_snapshot(
                         canonical_region, 
@@ -2237,14 +1986,13 @@ For detailed analysis, contact intel@voxmill.uk"""
         # ✅ FIXED: Case-insensitive comparison
         if client_profile.get('subscription_status', '').lower() == 'trial':
             try:
-                from pymongo import MongoClient
                 MONGODB_URI = os.getenv('MONGODB_URI')
                 
                 if MONGODB_URI:
-                    mongo_client = MongoClient(MONGODB_URI)
+                    mongo_client = get_mongo_client()
                     db = mongo_client['Voxmill']
                     
-                    trial_usage = db['client_profiles'].find_one({'whatsapp_number': sender})
+                    trial_usage = await run_blocking(db['client_profiles'].find_one, {'whatsapp_number': sender})
                     
                     if trial_usage:
                         trial_sample_used = trial_usage.get('trial_sample_used', False)
@@ -2264,7 +2012,7 @@ For detailed analysis, contact intel@voxmill.uk"""
                 'subscription_active': client_profile.get('subscription_status', '').lower() == 'active',
                 'pin_unlocked': True,
                 'quota_remaining': 100,
-                'monitoring_active': len(client_profile.get('active_monitors', [])) > 0,
+                'monitoring_active': client_profile.get('monitor_count', len(client_profile.get('active_monitors', []))) > 0,
                 'trial_sample_used': trial_sample_used
             },
             conversation_context=conversation_context
@@ -2299,14 +2047,13 @@ For detailed analysis, contact intel@voxmill.uk"""
         # ✅ FIXED: Case-insensitive comparison
         if client_profile.get('subscription_status', '').lower() == 'trial':
             try:
-                from pymongo import MongoClient
                 MONGODB_URI = os.getenv('MONGODB_URI')
                 
                 if MONGODB_URI:
-                    mongo_client = MongoClient(MONGODB_URI)
+                    mongo_client = get_mongo_client()
                     db = mongo_client['Voxmill']
                     
-                    trial_usage = db['client_profiles'].find_one({'whatsapp_number': sender})
+                    trial_usage = await run_blocking(db['client_profiles'].find_one, {'whatsapp_number': sender})
                     
                     if trial_usage:
                         trial_sample_used = trial_usage.get('trial_sample_used', False)
@@ -2326,7 +2073,7 @@ For detailed analysis, contact intel@voxmill.uk"""
                 'subscription_active': client_profile.get('subscription_status', '').lower() == 'active',
                 'pin_unlocked': True,
                 'quota_remaining': 100,
-                'monitoring_active': len(client_profile.get('active_monitors', [])) > 0,
+                'monitoring_active': client_profile.get('monitor_count', len(client_profile.get('active_monitors', []))) > 0,
                 'trial_sample_used': trial_sample_used
             },
             conversation_context=conversation_context
@@ -2362,9 +2109,9 @@ For detailed analysis, contact intel@voxmill.uk"""
         from app.conversational_governor import Intent
         
         if governance_result.intent == Intent.GIBBERISH:
-            gibberish_count = conversation.get_consecutive_gibberish_count()
+            gibberish_count = await run_blocking(conversation.get_consecutive_gibberish_count)
             gibberish_count += 1
-            conversation.set_consecutive_gibberish_count(gibberish_count)
+            await run_blocking(conversation.set_consecutive_gibberish_count, gibberish_count)
             
             logger.warning(f"🗑️ Gibberish classified by LLM ({gibberish_count}/3): '{message_text}'")
             
@@ -2379,7 +2126,7 @@ For detailed analysis, contact intel@voxmill.uk"""
                 return  # TERMINAL
         else:
             # Real query - reset gibberish counter
-            conversation.set_consecutive_gibberish_count(0)
+            await run_blocking(conversation.set_consecutive_gibberish_count, 0)
             logger.debug(f"✅ Real query detected - gibberish counter reset")
         
         # ====================================================================
@@ -2391,14 +2138,13 @@ For detailed analysis, contact intel@voxmill.uk"""
                 if not trial_sample_used:
                     # Mark as used in MongoDB
                     try:
-                        from pymongo import MongoClient
                         MONGODB_URI = os.getenv('MONGODB_URI')
                         
                         if MONGODB_URI:
-                            mongo_client = MongoClient(MONGODB_URI)
+                            mongo_client = get_mongo_client()
                             db = mongo_client['Voxmill']
                             
-                            db['client_profiles'].update_one(
+                            await run_blocking(db['client_profiles'].update_one, 
                                 {'whatsapp_number': sender},
                                 {
                                     '$set': {
@@ -2461,13 +2207,13 @@ Reply: CONFIRM {pending.action_type.value.upper().replace('_', ' ')} {pending.ac
 Expires: {pending.expires_at.strftime('%H:%M UTC')}"""
                             
                             await send_twilio_message(sender, response)
-                            log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
+                            fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
                             logger.info(f"✅ Confirmation prompt sent for {pending.action_id}")
                             return
                         else:
                             response = "No pending actions."
                             await send_twilio_message(sender, response)
-                            log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
+                            fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
                             logger.info(f"✅ No pending actions for {sender}")
                             return
                     
@@ -2480,7 +2226,7 @@ Expires: {pending.expires_at.strftime('%H:%M UTC')}"""
                         if not confirmed_action:
                             response = "No pending actions."
                             await send_twilio_message(sender, response)
-                            log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
+                            fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
                             logger.info(f"❌ Invalid confirmation for {sender}")
                             return
                         
@@ -2513,8 +2259,8 @@ All properties removed."""
                                 action_manager.complete_action(action_id, {'success': False})
                             
                             await send_twilio_message(sender, response)
-                            log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
-                            update_client_history(sender, message_text, "portfolio_management", preferred_region)
+                            fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
+                            fire_and_forget(update_client_history, sender, message_text, "portfolio_management", preferred_region)
                             logger.info(f"✅ Portfolio cleared successfully")
                             return
                         
@@ -2532,8 +2278,8 @@ All properties removed."""
                             )
                             
                             await send_twilio_message(sender, response)
-                            log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
-                            update_client_history(sender, message_text, "portfolio_management", preferred_region)
+                            fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
+                            fire_and_forget(update_client_history, sender, message_text, "portfolio_management", preferred_region)
                             logger.info(f"✅ Property removal processed: {action_id}")
                             return
                 
@@ -2554,7 +2300,7 @@ All properties removed."""
                     
                     # Get current portfolio count
                     from app.portfolio import get_portfolio_summary
-                    portfolio = get_portfolio_summary(sender, client_profile)
+                    portfolio = await run_blocking(get_portfolio_summary, sender, client_profile)
                     property_count = len(portfolio.get('properties', [])) if not portfolio.get('error') else 0
                     
                     try:
@@ -2574,7 +2320,7 @@ Current portfolio: {property_count} asset{"s" if property_count != 1 else ""}
 Reply: CONFIRM RESET {pending.action_id} within 5 minutes."""
                         
                         await send_twilio_message(sender, response)
-                        log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
+                        fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
                         logger.info(f"✅ Reset confirmation required: {pending.action_id}")
                         return
                         
@@ -2582,7 +2328,7 @@ Reply: CONFIRM RESET {pending.action_id} within 5 minutes."""
                         # Already has pending action
                         response = str(e)
                         await send_twilio_message(sender, response)
-                        log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
+                        fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
                         return
                 
                 elif is_remove and not is_reset:
@@ -2609,7 +2355,7 @@ Specify property:
 Example: "remove property: One Hyde Park"""
                         
                         await send_twilio_message(sender, response)
-                        log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
+                        fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
                         return
                     
                     try:
@@ -2629,14 +2375,14 @@ Target: {address}
 Reply: CONFIRM REMOVE {pending.action_id} within 5 minutes."""
                         
                         await send_twilio_message(sender, response)
-                        log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
+                        fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
                         logger.info(f"✅ Removal confirmation required: {pending.action_id}")
                         return
                         
                     except ValueError as e:
                         response = str(e)
                         await send_twilio_message(sender, response)
-                        log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
+                        fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
                         return
                 
                 # ========================================
@@ -2664,15 +2410,15 @@ Format:
 Example: "add property: One Hyde Park, Knightsbridge, SW1X"""
                         
                         await send_twilio_message(sender, response)
-                        log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
+                        fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
                         return
                     
                     # Execute add (no confirmation needed for adds)
                     response = add_property_to_portfolio(sender, property_data)
                     
                     await send_twilio_message(sender, response)
-                    log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
-                    update_client_history(sender, message_text, "portfolio_management", preferred_region)
+                    fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
+                    fire_and_forget(update_client_history, sender, message_text, "portfolio_management", preferred_region)
                     logger.info(f"✅ Property added to portfolio")
                     return
                 
@@ -2685,7 +2431,7 @@ Remove: "remove property: [address]"
 Reset: "reset portfolio"""
                 
                 await send_twilio_message(sender, response)
-                log_interaction(sender, message_text, "portfolio_management", response, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "portfolio_management", response, 0, client_profile)
                 return
                 
             except Exception as e:
@@ -2705,7 +2451,7 @@ Reset: "reset portfolio"""
                 logger.info(f"📊 Portfolio query detected")
                 
                 # Get portfolio data
-                portfolio = get_portfolio_summary(sender, client_profile)
+                portfolio = await run_blocking(get_portfolio_summary, sender, client_profile)
                 
                 if portfolio.get('error'):
                     response = """Your portfolio is currently empty.
@@ -2756,10 +2502,10 @@ Value: £{total_value:,.0f} ({total_gain_loss:+.1f}%)"""
                 )
                 
                 # Log interaction
-                log_interaction(sender, message_text, "portfolio_status", response, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "portfolio_status", response, 0, client_profile)
                 
                 # Update client history
-                update_client_history(sender, message_text, "portfolio_status", preferred_region)
+                fire_and_forget(update_client_history, sender, message_text, "portfolio_status", preferred_region)
                 
                 logger.info(f"✅ Message processed: category=portfolio_status, intent=portfolio_status")
                 
@@ -2924,10 +2670,10 @@ NEVER use generic statements like "analysis backed by verified data sources"."""
                 )
                 
                 # Log interaction
-                log_interaction(sender, message_text, "trust_authority", trust_response, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "trust_authority", trust_response, 0, client_profile)
                 
                 # Update client history
-                update_client_history(sender, message_text, "trust_authority", preferred_region)
+                fire_and_forget(update_client_history, sender, message_text, "trust_authority", preferred_region)
                 
                 logger.info(f"✅ Trust authority response sent: {len(trust_response)} chars")
                 
@@ -3044,10 +2790,10 @@ CRITICAL RULES:
                 )
                 
                 # Log interaction
-                log_interaction(sender, message_text, "executive_compression", compressed_response, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "executive_compression", compressed_response, 0, client_profile)
                 
                 # Update client history
-                update_client_history(sender, message_text, "executive_compression", preferred_region)
+                fire_and_forget(update_client_history, sender, message_text, "executive_compression", preferred_region)
                 
                 logger.info(f"✅ Executive compression sent: {compression_format}, {len(compressed_response)} chars")
                 
@@ -3067,7 +2813,7 @@ CRITICAL RULES:
             # ✅ FIX 6: Use defensive list_monitors function
             from app.monitoring import list_monitors
             
-            response = list_monitors(sender)
+            response = await run_blocking(list_monitors, sender)
             
             await send_twilio_message(sender, response)
             
@@ -3077,8 +2823,8 @@ CRITICAL RULES:
                 metadata={'category': 'status_monitoring', 'intent': 'status_monitoring'}
             )
             
-            log_interaction(sender, message_text, "status_monitoring", response, 0, client_profile)
-            update_client_history(sender, message_text, "status_monitoring", preferred_region)
+            fire_and_forget(log_interaction, sender, message_text, "status_monitoring", response, 0, client_profile)
+            fire_and_forget(update_client_history, sender, message_text, "status_monitoring", preferred_region)
             
             # Auto-sync to Airtable
             from app.airtable_auto_sync import sync_usage_metrics
@@ -3168,8 +2914,8 @@ CRITICAL RULES:
                     metadata={'category': 'value_justification', 'intent': 'value_justification'}
                 )
                 
-                log_interaction(sender, message_text, "value_justification", vj_response, 0, client_profile)
-                update_client_history(sender, message_text, "value_justification", preferred_region)
+                fire_and_forget(log_interaction, sender, message_text, "value_justification", vj_response, 0, client_profile)
+                fire_and_forget(update_client_history, sender, message_text, "value_justification", preferred_region)
                 
                 logger.info(f"✅ Value justification response sent: {len(vj_response)} chars")
                 return
@@ -3205,8 +2951,7 @@ CRITICAL RULES:
         if not is_safe:
             logger.warning(f"Security violation: {threats}")
             await send_twilio_message(sender, "Your message contains suspicious content and cannot be processed.")
-            session_data['last_response_type'] = 'security_block'
-            conversation.save_session()
+            conversation.set_fields(last_response_type='security_block')
             return
         
         if threats:
@@ -3288,10 +3033,10 @@ CRITICAL RULES:
         #             }
         #             
         #             # Update MongoDB cache
-        #             from pymongo import MongoClient
+        #             from app.mongo_pool import get_mongo_client
         #             MONGODB_URI = os.getenv('MONGODB_URI')
         #             if MONGODB_URI:
-        #                 mongo_client = MongoClient(MONGODB_URI)
+        #                 mongo_client = get_mongo_client()
         #                 db = mongo_client['Voxmill']
         #                 db['client_profiles'].update_one(
         #                     {'whatsapp_number': sender},
@@ -3321,7 +3066,8 @@ CRITICAL RULES:
         # RESPONSE CACHE CHECK
         # ====================================================================
         
-        cached_response = CacheManager.get_response_cache(
+        cached_response = await run_blocking(
+            CacheManager.get_response_cache,
             query=message_normalized,
             region=preferred_region,
             client_tier=client_profile.get('tier', 'tier_1')
@@ -3331,8 +3077,8 @@ CRITICAL RULES:
             logger.info(f"Cache hit")
             await send_twilio_message(sender, cached_response)
             conversation.update_session(user_message=message_text, assistant_response=cached_response, metadata={'cached': True, 'region': preferred_region})
-            log_interaction(sender, message_text, "cached", cached_response, 0, client_profile)
-            update_client_history(sender, message_text, "cached", preferred_region)
+            fire_and_forget(log_interaction, sender, message_text, "cached", cached_response, 0, client_profile)
+            fire_and_forget(update_client_history, sender, message_text, "cached", preferred_region)
             return
         
         # ====================================================================
@@ -3343,7 +3089,7 @@ CRITICAL RULES:
         
         # ✅ DYNAMIC: Query available markets from database (no hardcoded regions)
         industry_code = client_profile.get('industry', 'real_estate')
-        available_markets = get_available_markets_from_db(industry_code)
+        available_markets = await run_blocking(get_available_markets_from_db, industry_code)
         
         # Build dynamic region map from database
         region_map = {}
@@ -3392,7 +3138,7 @@ CRITICAL RULES:
                 conversation = ConversationSession(sender)
                 conversation.set_pending_question('market_context', message_text)
                 await send_twilio_message(sender, _clarification)
-                log_interaction(sender, message_text, "clarification_request", _clarification, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "clarification_request", _clarification, 0, client_profile)
                 logger.info(f"🔍 CLARIFICATION SENT (single-intent): {_clarification}")
                 return
             # ================================================================
@@ -3420,7 +3166,7 @@ For detailed analysis, contact intel@voxmill.uk"""
                 logger.info(f"✅ Structural analysis sent (no dataset load)")
                 return
             
-            dataset = load_dataset(area=canonical_region, industry=industry_code)
+            dataset = await run_blocking(load_dataset, area=canonical_region, industry=industry_code)
             
             if dataset['metadata'].get('is_fallback') or dataset['metadata'].get('property_count', 0) == 0:
                 # ✅ CHATGPT FIX: Guided error with available markets
@@ -3433,18 +3179,18 @@ Available markets: {markets_list}
 Try: "Show Mayfair overview"""
                 
                 await send_twilio_message(sender, fallback_response)
-                log_interaction(sender, message_text, "dataset_unavailable", fallback_response, 0, client_profile)
+                fire_and_forget(log_interaction, sender, message_text, "dataset_unavailable", fallback_response, 0, client_profile)
                 logger.info(f"Empty dataset handled")
                 return
             
             # ✅ CHATGPT FIX: Lock metrics for session consistency
             session = conversation.get_session()
             if 'session_metrics' not in session:
-                session['session_metrics'] = {
-                    'start_time': datetime.now(timezone.utc),
+                conversation.set_fields(session_metrics={
+                    'start_time': datetime.now(timezone.utc).isoformat(),
                     'message_count': 0,
                     'topics_covered': []
-                }
+                })
         
                 # Save the updated session back
                 conversation.update_session(
@@ -3463,7 +3209,7 @@ Try: "Show Mayfair overview"""
             if last_category == 'market_overview':
                 # Second+ identical status_check — send to GPT for variation
                 repeat_count_check += 1
-                session_data_check['status_check_repeat_count'] = repeat_count_check
+                conversation.set_fields(status_check_repeat_count=repeat_count_check)
                 logger.info(f"🔁 REPEAT STATUS_CHECK detected (#{repeat_count_check}) — routing to GPT for variation")
                 
                 variation_angles = [
@@ -3481,7 +3227,7 @@ Try: "Show Mayfair overview"""
                     governance_result=governance_result
                 )
             else:
-                session_data_check['status_check_repeat_count'] = 0
+                conversation.set_fields(status_check_repeat_count=0)
                 formatted_response = InstantIntelligence.get_full_market_snapshot(canonical_region, dataset, client_profile)
                 category = "market_overview"
             # ── END P1.3 ────────────────────────────────────────────────
@@ -3489,9 +3235,10 @@ Try: "Show Mayfair overview"""
             await send_twilio_message(sender, formatted_response)
             
             # Cache response for repeat detection
-            session_data = conversation.get_session()
-            session_data['last_bot_response_raw'] = formatted_response
-            session_data['last_response_category'] = category  # P1.3: track for repeat variation
+            conversation.set_fields(
+                last_bot_response_raw=formatted_response,
+                last_response_category=category  # P1.3: track for repeat variation
+            )
             
             conversation.update_session(
                 user_message=message_text, 
@@ -3503,8 +3250,8 @@ Try: "Show Mayfair overview"""
                 }
             )
             
-            log_interaction(sender, message_text, category, formatted_response, 0, client_profile)
-            update_client_history(sender, message_text, category, canonical_region)
+            fire_and_forget(log_interaction, sender, message_text, category, formatted_response, 0, client_profile)
+            fire_and_forget(update_client_history, sender, message_text, category, canonical_region)
             
             logger.info(f"✅ Instant response sent (<1s)")
             return
@@ -3523,7 +3270,19 @@ Try: "Show Mayfair overview"""
         # ✅ SAFETY CHECK: Ensure dataset is loaded before classification
         if dataset is None:
             logger.info(f"📊 Loading dataset for {query_region} before classification")
-            dataset = load_dataset(area=query_region, industry=industry_code)
+            dataset = await run_blocking(load_dataset, area=query_region, industry=industry_code)
+        
+        # Streaming: briefs can go out paragraph by paragraph (shorter shapes are truncated as a whole)
+        response_shape = ResponseEnforcer.select_shape_before_generation(governance_result.intent, allowed_response_shape, message_text)
+        llm_started = time.perf_counter()
+        
+        async def _send_first_chunk(chunk: str) -> bool:
+            chunk_safe, _ = ResponseValidator.validate_response(chunk)
+            if not chunk_safe:
+                return False
+            await send_twilio_message(sender, chunk)
+            record_time_to_first_message(time.perf_counter() - llm_started, streamed=True)
+            return True
         
         # Store comparison response for reverse functionality
         try:
@@ -3532,7 +3291,8 @@ Try: "Show Mayfair overview"""
                 dataset,
                 client_profile=client_profile,
                 comparison_datasets=comparison_datasets,
-                governance_result=governance_result  # ✅ NEW: Pass governance result
+                governance_result=governance_result,  # ✅ NEW: Pass governance result
+                on_first_chunk=_send_first_chunk if response_shape == ResponseShape.STRUCTURED_BRIEF else None
             )
         except Exception as e:
             logger.error(f"❌ LLM call failed: {e}", exc_info=True)
@@ -3543,7 +3303,7 @@ Try: "Show Mayfair overview"""
             response_metadata = {}
             
             await send_twilio_message(sender, response_text)
-            log_interaction(sender, message_text, "llm_error", response_text, 0, client_profile)
+            fire_and_forget(log_interaction, sender, message_text, "llm_error", response_text, 0, client_profile)
             return  # TERMINAL
         
         # ✅ STORE COMPARISON RESPONSE FOR REVERSE (PR6: proper session persistence)
@@ -3555,14 +3315,13 @@ Try: "Show Mayfair overview"""
         tokens_used = calculate_tokens_estimate(message_text, response_text)
         
         try:
-            from pymongo import MongoClient
             MONGODB_URI = os.getenv('MONGODB_URI')
             
             if MONGODB_URI:
-                mongo_client = MongoClient(MONGODB_URI)
+                mongo_client = get_mongo_client()
                 db = mongo_client['Voxmill']
                 
-                db['client_profiles'].update_one(
+                await run_blocking(db['client_profiles'].update_one, 
                     {'whatsapp_number': sender},
                     {
                         '$inc': {
@@ -3591,9 +3350,6 @@ Try: "Show Mayfair overview"""
             formatted_response = format_analyst_response(response_text, category)
         
         # Enforce response shape
-        from app.response_enforcer import ResponseEnforcer
-        
-        response_shape = ResponseEnforcer.select_shape_before_generation(governance_result.intent, allowed_response_shape, message_text)
         formatted_response = ResponseEnforcer.enforce_shape(formatted_response, response_shape, max_words)
         
         # Validate response
@@ -3612,7 +3368,8 @@ Try: "Show Mayfair overview"""
             formatted_response = f"{formatted_response}\n\n⚠️ Note: Limited data coverage."
         
         # Cache response
-        CacheManager.set_response_cache(
+        await run_blocking(
+            CacheManager.set_response_cache,
             query=message_normalized,
             region=query_region,
             client_tier=client_profile.get('tier', 'tier_1'),
@@ -3629,12 +3386,21 @@ Try: "Show Mayfair overview"""
             logger.critical(f"Security validation failed: {reason}")
             formatted_response = "An error occurred processing your request."
         
-        # Send response
-        await send_twilio_message(sender, formatted_response)
+        # Send response (only the remainder if the first paragraph went out while streaming)
+        streamed_chunk = response_metadata.get('streamed_first_chunk')
+        
+        if streamed_chunk:
+            remainder, matched = remainder_after_streamed_chunk(formatted_response, streamed_chunk)
+            if not matched:
+                logger.warning("⚠️ Final response diverged from streamed first chunk - sending from the diverging sentence")
+            if remainder:
+                await send_twilio_message(sender, remainder)
+        else:
+            await send_twilio_message(sender, formatted_response)
+            record_time_to_first_message(time.perf_counter() - llm_started, streamed=False)
         
         # Cache response for repeat detection
-        session_data = conversation.get_session()
-        session_data['last_bot_response_raw'] = formatted_response
+        conversation.set_fields(last_bot_response_raw=formatted_response)
         
         # Update session
         conversation.update_session(
@@ -3650,7 +3416,7 @@ Try: "Show Mayfair overview"""
         )
         
         # Log interaction
-        log_interaction(
+        fire_and_forget(log_interaction, 
             sender=sender,
             message=message_text,
             category=category,
@@ -3659,7 +3425,7 @@ Try: "Show Mayfair overview"""
             client_profile=client_profile
         )
         
-        update_client_history(sender, message_text, category, query_region)
+        fire_and_forget(update_client_history, sender, message_text, category, query_region)
         
         # Auto-sync Airtable fields
         from app.airtable_auto_sync import sync_usage_metrics
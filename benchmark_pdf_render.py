@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+VOXMILL PDF RENDER BENCHMARK
+============================
+Per-PDF render time with a cold render cache vs a warm one.
+
+Cold runs clear the process render cache before every report, which is the
+pre-cache behaviour: Jinja environment rebuilt, template recompiled, CSS
+re-parsed, logo + Google Fonts re-fetched. Warm runs reuse all of it.
+
+REQUIRES:
+    WeasyPrint's system libraries (Pango, HarfBuzz, fontconfig) - without
+    them `import weasyprint` fails with "cannot load library 'libpango-1.0-0'".
+    Run on the production image, or after e.g.
+    `apt-get install libpango-1.0-0 libpangoft2-1.0-0 libharfbuzz0b`.
+
+USAGE:
+    python benchmark_pdf_render.py
+    python benchmark_pdf_render.py --runs 10 --scenario baseline_mayfair
+
+OUTPUT:
+    • /tmp/voxmill_render_bench/*.pdf
+    • Timing table (template render / PDF write / total per report)
+"""
+
+import os
+import sys
+import copy
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stress_scenarios import VoxmillDataFactory
+from pdf_generator import VoxmillPDFGenerator, render_cache
+
+
+def run_once(generator: VoxmillPDFGenerator, data: dict, output_filename: str) -> dict:
+    """Render one report, timing template + PDF stages separately"""
+    started = time.perf_counter()
+    html_content = generator.render_template(generator.validate_data(copy.deepcopy(data)))
+    rendered = time.perf_counter()
+    generator.generate_pdf(html_content, output_filename)
+    finished = time.perf_counter()
+
+    return {
+        'template': rendered - started,
+        'pdf': finished - rendered,
+        'total': finished - started
+    }
+
+
+def summarise(label: str, samples: list):
+    print(f"\n{label}")
+    for stage in ('template', 'pdf', 'total'):
+        values = [s[stage] for s in samples]
+        print(f"   {stage:<9} mean {statistics.mean(values):6.2f}s   "
+              f"median {statistics.median(values):6.2f}s   max {max(values):6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Voxmill PDF render benchmark (cold vs warm cache)')
+    parser.add_argument('--runs', type=int, default=5, help='Reports per mode')
+    parser.add_argument('--scenario', default='baseline_mayfair',
+                        choices=list(VoxmillDataFactory.SCENARIOS.keys()))
+    parser.add_argument('--template-dir', default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument('--output-dir', default='/tmp/voxmill_render_bench')
+    args = parser.parse_args()
+
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    data = VoxmillDataFactory().generate_scenario(args.scenario)
+
+    print("=" * 70)
+    print(f"VOXMILL PDF RENDER BENCHMARK - {args.scenario}, {args.runs} run(s) per mode")
+    print("=" * 70)
+
+    # Cold: every report pays the full setup (pre-cache behaviour)
+    cold = []
+    for i in range(args.runs):
+        render_cache.clear()
+        generator = VoxmillPDFGenerator(template_dir=args.template_dir, output_dir=args.output_dir)
+        cold.append(run_once(generator, data, f"cold_{i}.pdf"))
+
+    # Warm: one untimed render primes the cache, then reuse
+    render_cache.clear()
+    generator = VoxmillPDFGenerator(template_dir=args.template_dir, output_dir=args.output_dir)
+    run_once(generator, data, "warmup.pdf")
+
+    warm = []
+    for i in range(args.runs):
+        warm.append(run_once(generator, data, f"warm_{i}.pdf"))
+
+    summarise("COLD (cache cleared per report)", cold)
+    summarise("WARM (cached template, CSS, fonts, images)", warm)
+
+    cold_total = statistics.median(s['total'] for s in cold)
+    warm_total = statistics.median(s['total'] for s in warm)
+    print(f"\nPer-PDF median: {cold_total:.2f}s → {warm_total:.2f}s "
+          f"({cold_total - warm_total:.2f}s saved, {cold_total / max(warm_total, 1e-9):.1f}x)")
+    print(f"Cache stats: {render_cache.stats}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+VOXMILL SNAPSHOT DIFF BENCHMARK
+===============================
+Snapshot-to-snapshot diffing: legacy per-consumer scans vs the shared engine.
+
+Legacy = liquidity velocity's nested address scan (O(n·m)) plus the three
+alert detectors each rebuilding their own lookups. Engine = one
+address-indexed diff (NumPy price deltas) shared by all four consumers.
+
+USAGE:
+    python benchmark_snapshot_diff.py
+    python benchmark_snapshot_diff.py --sizes 1000 10000 --runs 3
+    python benchmark_snapshot_diff.py --skip-legacy
+
+OUTPUT:
+    • Timing table per snapshot size
+    • Consistency check (new / exited / repriced counts agree)
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.intelligence.snapshot_diff import diff_snapshots
+
+AGENTS = ['Knight Frank', 'Savills', 'Strutt & Parker', 'Hamptons', 'Chestertons',
+          'Foxtons', 'Harrods Estates', 'Beauchamp Estates', 'Wetherell', 'Aylesford']
+
+
+def make_snapshots(size: int, seed: int = 42):
+    """Previous + current snapshot: ~8% exits, ~8% new, ~15% repriced"""
+    rng = random.Random(seed)
+
+    previous = [{
+        'address': f"{i} {rng.choice(['Park', 'Mount', 'Hill', 'Curzon'])} Street, Mayfair, W1",
+        'price': rng.randint(800_000, 25_000_000),
+        'agent': rng.choice(AGENTS),
+        'property_type': rng.choice(['Flat', 'House', 'Penthouse'])
+    } for i in range(size)]
+
+    current = []
+    for prop in previous:
+        roll = rng.random()
+        if roll < 0.08:
+            continue
+        prop = dict(prop)
+        if roll < 0.23:
+            prop['price'] = int(prop['price'] * rng.uniform(0.85, 1.08))
+        current.append(prop)
+
+    for i in range(size, size + int(size * 0.08)):
+        current.append({
+            'address': f"{i} New Bond Street, Mayfair, W1",
+            'price': rng.randint(800_000, 25_000_000),
+            'agent': rng.choice(AGENTS),
+            'property_type': 'Flat'
+        })
+
+    rng.shuffle(current)
+    return current, previous
+
+
+# ============================================================
+# LEGACY (pre-engine consumer code, condensed)
+# ============================================================
+
+def legacy_diff(current: list, previous: list) -> dict:
+    # Liquidity velocity: address sets + nested scan for price matches
+    current_addresses = {p.get('address', '').strip() for p in current if p.get('address', '').strip()}
+    previous_addresses = {p.get('address', '').strip() for p in previous if p.get('address', '').strip()}
+
+    price_changes = 0
+    for prop in current:
+        addr = prop.get('address', '')
+        current_price = prop.get('price', 0)
+        historical_match = None
+        for hist_prop in previous:
+            if hist_prop.get('address', '') == addr:
+                historical_match = hist_prop
+                break
+        if historical_match and current_price > 0:
+            hist_price = historical_match.get('price', 0)
+            if hist_price > 0 and abs(current_price - hist_price) > hist_price * 0.01:
+                price_changes += 1
+
+    # Alert detector: price drops
+    hist_lookup = {p.get('address', ''): p for p in previous if p.get('address')}
+    drops = 0
+    for prop in current:
+        hist_prop = hist_lookup.get(prop.get('address', ''))
+        if hist_prop and prop['price'] < hist_prop['price']:
+            if (prop['price'] - hist_prop['price']) / hist_prop['price'] * 100 < -5:
+                drops += 1
+
+    # Alert detector: inventory + agent counts (rebuilt again)
+    new_addresses = {p['address'] for p in current} - {p['address'] for p in previous}
+    agent_counts = ({}, {})
+    for counts, props in zip(agent_counts, (current, previous)):
+        for p in props:
+            counts[p['agent']] = counts.get(p['agent'], 0) + 1
+
+    return {
+        'new': len(current_addresses - previous_addresses),
+        'exited': len(previous_addresses - current_addresses),
+        'repriced': price_changes,
+        'drops': drops,
+        'inventory_new': len(new_addresses)
+    }
+
+
+def engine_diff(current: list, previous: list) -> dict:
+    diff = diff_snapshots(current, previous)
+    drops = [m for m in diff.repriced(5.0) if m['change_pct'] < 0]
+    diff.agent_deltas()
+
+    return {
+        'new': len(diff.new_keys),
+        'exited': len(diff.removed_keys),
+        'repriced': int(diff.repriced_mask(1.0).sum()),
+        'drops': len(drops),
+        'inventory_new': len(diff.new_keys)
+    }
+
+
+def time_it(fn, current, previous, runs: int):
+    samples = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn(current, previous)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Voxmill snapshot diff benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help='Listings per snapshot')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per size (median reported)')
+    parser.add_argument('--skip-legacy', action='store_true', help='Only time the engine')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"VOXMILL SNAPSHOT DIFF BENCHMARK - sizes {args.sizes}, {args.runs} run(s)")
+    print("=" * 70)
+
+    for size in args.sizes:
+        current, previous = make_snapshots(size)
+        engine_time, engine_result = time_it(engine_diff, current, previous, args.runs)
+
+        print(f"\n{size:,} listings (current {len(current):,} / previous {len(previous):,})")
+        print(f"   engine    {engine_time * 1000:9.1f} ms   {engine_result}")
+
+        if not args.skip_legacy:
+            legacy_time, legacy_result = time_it(legacy_diff, current, previous, 1)
+            print(f"   legacy    {legacy_time * 1000:9.1f} ms   {legacy_result}")
+            print(f"   speedup   {legacy_time / max(engine_time, 1e-9):9.1f}x   "
+                  f"{'✅ results match' if legacy_result == engine_result else '❌ results differ'}")
+
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""
+Shared pytest fixtures
+"""
+
+import pytest
+
+
+def _replay_bulk_write(collection, operations, ordered=True):
+    """mongomock's bulk_write lags pymongo's operation objects; replay them one by one"""
+    from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+    for op in operations:
+        if isinstance(op, UpdateOne):
+            collection.update_one(op._filter, op._doc, upsert=op._upsert)
+        elif isinstance(op, ReplaceOne):
+            collection.replace_one(op._filter, op._doc, upsert=op._upsert)
+        elif isinstance(op, DeleteOne):
+            collection.delete_one(op._filter)
+        else:
+            raise TypeError(f"Unexpected bulk operation {op!r}")
+
+
+@pytest.fixture
+def mongomock_bulk_write(monkeypatch):
+    """Patch mongomock collections so bulk_write accepts current pymongo operations"""
+    mongomock = pytest.importorskip('mongomock')
+    monkeypatch.setattr(mongomock.collection.Collection, 'bulk_write', _replay_bulk_write)
+    return mongomock
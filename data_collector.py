@@ -18,7 +18,9 @@ import json
 import requests
 from datetime import datetime
 import time
+import threading
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 
 # Rightmove Location Mapping
 RIGHTMOVE_LOCATIONS = {
@@ -65,6 +67,11 @@ OUTSCRAPER_API_KEY = os.environ.get('OUTSCRAPER_API_KEY')
 WORKSPACE = os.environ.get('VOXMILL_WORKSPACE', '/tmp')
 OUTPUT_FILE = os.path.join(WORKSPACE, "voxmill_raw_data.json")
 
+# Parallel multi-region collection (regions run concurrently, each source has its own cap)
+REGION_COLLECTION_WORKERS = int(os.environ.get('REGION_COLLECTION_WORKERS', '4'))
+RIGHTMOVE_SLOTS = threading.BoundedSemaphore(int(os.environ.get('RIGHTMOVE_CONCURRENCY', '3')))
+OUTSCRAPER_SLOTS = threading.BoundedSemaphore(int(os.environ.get('OUTSCRAPER_CONCURRENCY', '2')))
+
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -571,92 +578,116 @@ def generate_demo_properties(area, count=25, city="London"):
 # 🔥 NEW: MULTI-REGION MASTER COLLECTOR
 # ============================================================================
 
-def collect_uk_real_estate_multi_region(regions, city="London", max_per_region=100):
+def _collect_single_region(region, city, max_per_region):
+    """
+    Collect one region through the Rightmove → Outscraper → demo chain
+    
+    Returns:
+        (properties, source label, seconds)
+    """
+    started = time.monotonic()
+    
+    # Try primary source (Rightmove)
+    if city == "London" or city in ["Edinburgh", "Manchester", "Birmingham", "Bristol"]:
+        try:
+            with RIGHTMOVE_SLOTS:
+                properties = collect_rightmove_data(region, max_per_region)
+        except Exception as e:
+            print(f"   ❌ [{region}] Rightmove error: {e}")
+            properties = None
+        
+        if properties and len(properties) >= 5:
+            print(f"\n   ✅ [{region}] PRIMARY SOURCE SUCCESS: {len(properties)} properties from Rightmove")
+            return properties, 'rightmove', time.monotonic() - started
+    
+    # Try fallback source (Outscraper)
+    print(f"\n   ⚠️  [{region}] Primary source insufficient, trying fallback...")
+    try:
+        with OUTSCRAPER_SLOTS:
+            properties = collect_outscraper_data(region, city, max_per_region)
+    except Exception as e:
+        print(f"   ❌ [{region}] Outscraper error: {e}")
+        properties = None
+    
+    if properties and len(properties) >= 5:
+        print(f"\n   ✅ [{region}] FALLBACK SUCCESS: {len(properties)} properties from Outscraper")
+        return properties, 'outscraper', time.monotonic() - started
+    
+    # Last resort: demo data
+    print(f"\n   ⚠️  [{region}] All API sources failed or returned insufficient data")
+    properties = generate_demo_properties(region, max_per_region, city)
+    print(f"\n   ✅ [{region}] DEMO DATA READY: {len(properties)} properties generated")
+    
+    return properties, 'demo', time.monotonic() - started
+
+
+def collect_uk_real_estate_multi_region(regions, city="London", max_per_region=100, region_stats=None):
     """
     ✅ NEW: Collect data for MULTIPLE regions in one pass
     
+    Regions are collected concurrently (bounded by REGION_COLLECTION_WORKERS);
+    Rightmove and Outscraper calls are capped separately so parallel regions
+    don't stampede either API.
+    
     Args:
         regions: List of region names ["Mayfair", "Chelsea", "Knightsbridge"]
         city: City name (default "London")
         max_per_region: Max properties per region (default 100)
+        region_stats: Optional dict, filled with per-region count/source/status/seconds
     
     Returns:
         List of properties with source_region tag
     """
     
+    workers = max(1, min(REGION_COLLECTION_WORKERS, len(regions)))
+    
     print(f"\n🏠 MULTI-REGION DATA COLLECTION")
     print(f"   Target Regions: {', '.join(regions)}")
     print(f"   Target City: {city}")
     print(f"   Properties per Region: {max_per_region}")
-    print(f"   Strategy: Multi-source with fallbacks")
+    print(f"   Strategy: Multi-source with fallbacks ({workers} regions in parallel)")
     
     all_properties = []
-    region_stats = {}
-    
-    for i, region in enumerate(regions, 1):
-        print(f"\n{'='*70}")
-        print(f"[{i}/{len(regions)}] COLLECTING: {region}")
-        print(f"{'='*70}")
-        
-        # Try primary source (Rightmove)
-        if city == "London" or city in ["Edinburgh", "Manchester", "Birmingham", "Bristol"]:
-            properties = collect_rightmove_data(region, max_per_region)
-            
-            if properties and len(properties) >= 5:
-                print(f"\n   ✅ PRIMARY SOURCE SUCCESS: {len(properties)} properties from Rightmove")
-                
-                # ✅ TAG each property with source_region
-                for prop in properties:
-                    prop['source_region'] = region
-                
-                all_properties.extend(properties)
-                region_stats[region] = len(properties)
-                continue
-        
-        # Try fallback source (Outscraper)
-        print(f"\n   ⚠️  Primary source insufficient, trying fallback...")
-        properties = collect_outscraper_data(region, city, max_per_region)
-        
-        if properties and len(properties) >= 5:
-            print(f"\n   ✅ FALLBACK SUCCESS: {len(properties)} properties from Outscraper")
-            
-            # ✅ TAG each property with source_region
-            for prop in properties:
-                prop['source_region'] = region
-            
-            all_properties.extend(properties)
-            region_stats[region] = len(properties)
-            continue
-        
-        # Last resort: demo data
-        print(f"\n   ⚠️  All API sources failed or returned insufficient data")
-        properties = generate_demo_properties(region, max_per_region, city)
+    if region_stats is None:
+        region_stats = {}
+    
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='region-collect') as pool:
+        futures = [pool.submit(_collect_single_region, region, city, max_per_region) for region in regions]
+    
+    # Merge in the order regions were requested
+    for region, future in zip(regions, futures):
+        try:
+            properties, source, seconds = future.result()
+            status = 'ok' if source != 'demo' else 'demo'
+        except Exception as e:
+            print(f"\n   ❌ [{region}] Collection failed: {e}")
+            properties, source, seconds, status = [], 'none', 0.0, 'failed'
         
         # ✅ TAG each property with source_region
         for prop in properties:
             prop['source_region'] = region
         
         all_properties.extend(properties)
-        region_stats[region] = len(properties)
-        
-        print(f"\n   ✅ DEMO DATA READY: {len(properties)} properties generated")
+        region_stats[region] = {
+            'count': len(properties),
+            'source': source,
+            'status': status,
+            'seconds': round(seconds, 2)
+        }
     
     # Summary
     print(f"\n{'='*70}")
-    print(f"MULTI-REGION COLLECTION COMPLETE")
+    print(f"MULTI-REGION COLLECTION COMPLETE ({time.monotonic() - started:.1f}s)")
     print(f"{'='*70}")
     print(f"Total Properties: {len(all_properties)}")
-    for region, count in region_stats.items():
-        print(f"   {region}: {count} properties")
+    for region, stats in region_stats.items():
+        print(f"   {region}: {stats['count']} properties ({stats['source']}, {stats['seconds']}s)")
     print(f"{'='*70}")
     
     return all_properties
 
 
-# ============================================================================
-# UK REAL ESTATE - SINGLE REGION (BACKWARDS COMPATIBLE)
-# ============================================================================
-
 def collect_uk_real_estate(area, city="London", max_properties=40):
     """
     Master UK real estate collector with intelligent fallbacks.
@@ -749,19 +780,23 @@ def collect_market_data(vertical, area, city, vertical_config_json='{}'):
     try:
         if vertical == 'uk-real-estate':
             # ✅ USE MULTI-REGION COLLECTOR if multiple regions detected
+            region_stats = {}
             if len(regions) > 1:
-                properties = collect_uk_real_estate_multi_region(regions, city)
+                properties = collect_uk_real_estate_multi_region(regions, city, region_stats=region_stats)
             else:
+                started = time.monotonic()
                 properties = collect_uk_real_estate(regions[0], city)
+                region_stats[regions[0]] = {
+                    'count': len(properties),
+                    'source': properties[0].get('source', 'unknown') if properties else 'none',
+                    'status': 'ok' if properties else 'empty',
+                    'seconds': round(time.monotonic() - started, 2)
+                }
             
             data['raw_data']['properties'] = properties
             data['metadata']['property_count'] = len(properties)
             
             # ✅ ADD REGION STATS
-            region_stats = {}
-            for region in regions:
-                count = sum(1 for p in properties if p.get('source_region') == region or p.get('area') == region)
-                region_stats[region] = count
             data['metadata']['region_stats'] = region_stats
             
         elif vertical == 'miami-real-estate':
@@ -786,8 +821,8 @@ def collect_market_data(vertical, area, city, vertical_config_json='{}'):
         print(f"Records Collected: {record_count} properties")
         if len(regions) > 1:
             print(f"Regions Covered: {', '.join(regions)}")
-            for region, count in region_stats.items():
-                print(f"   {region}: {count} properties")
+            for region, stats in region_stats.items():
+                print(f"   {region}: {stats['count']} properties ({stats['seconds']}s)")
         print(f"Data Source: {properties[0]['source'] if properties else 'None'}")
         print(f"Vertical: {vertical_config.get('name', 'Unknown')}")
         print("="*70)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+VOXMILL INTENT CLASSIFIER EVALUATION
+====================================
+Offline comparison of the local fast-path classifier against the LLM's
+logged mandate-check decisions.
+
+Samples are ordered by time; the classifier trains on the older slice and is
+scored on the newest one, so results reflect how it would have done on
+traffic it had not seen.
+
+USAGE:
+    python evaluate_intent_classifier.py
+    python evaluate_intent_classifier.py --days 30 --thresholds 0.8 0.9 0.95
+    python evaluate_intent_classifier.py --input decisions.jsonl
+    python evaluate_intent_classifier.py --save        # train on everything + store model
+
+OUTPUT:
+    • Coverage / agreement table per confidence threshold
+    • Per-intent agreement at the configured threshold
+    • Confident disagreements (what the fast path would have got wrong)
+    • Prediction latency (p50 / p99)
+"""
+
+import os
+import sys
+import json
+import argparse
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.intent_classifier import (
+    INTENT_FASTPATH_THRESHOLD, INTENT_TRAINING_DAYS, LLM_ONLY_INTENTS,
+    LocalIntentClassifier, decisions_agree, evaluate_classifier,
+    load_training_samples, train_intent_classifier
+)
+
+
+def load_jsonl(path: str):
+    """
+    One logged decision per line: {"message": ..., "intent_type": ..., ...}, oldest first
+
+    Decisions made with conversation context are skipped, as in training.
+    """
+    messages, decisions = [], []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                if record.get('has_context'):
+                    continue
+                messages.append(record['message'])
+                decisions.append(record)
+    return messages, decisions
+
+
+def per_intent_agreement(clf: LocalIntentClassifier, messages, decisions, threshold: float):
+    """LLM intent → (covered, agreed, total)"""
+    rows = defaultdict(lambda: [0, 0, 0])
+    for message, decision in zip(messages, decisions):
+        predicted = clf.predict(message)
+        row = rows[str(decision.get('intent_type') or 'unknown')]
+        row[2] += 1
+        if predicted['confidence'] >= threshold and predicted.get('intent_type') not in LLM_ONLY_INTENTS:
+            row[0] += 1
+            row[1] += decisions_agree(predicted, decision)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Voxmill local intent classifier vs LLM decisions')
+    parser.add_argument('--days', type=int, default=INTENT_TRAINING_DAYS, help='Logged decisions window')
+    parser.add_argument('--input', help='JSONL of decisions instead of MongoDB')
+    parser.add_argument('--test-fraction', type=float, default=0.2, help='Newest share held out for scoring')
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.7, 0.8, 0.9, 0.95])
+    parser.add_argument('--show', type=int, default=15, help='Disagreements to print')
+    parser.add_argument('--save', action='store_true', help='Train on all samples and store the model')
+    args = parser.parse_args()
+
+    messages, decisions = load_jsonl(args.input) if args.input else load_training_samples(args.days)
+    split = int(len(messages) * (1 - args.test_fraction))
+
+    if split < 10 or len(messages) - split < 10:
+        print(f"Not enough labelled decisions to evaluate ({len(messages)})")
+        return
+
+    print("=" * 70)
+    print(f"VOXMILL INTENT CLASSIFIER - {split} train / {len(messages) - split} test decisions")
+    print("=" * 70)
+
+    clf = LocalIntentClassifier().fit(messages[:split], decisions[:split])
+    test_messages, test_decisions = messages[split:], decisions[split:]
+    results = evaluate_classifier(clf, test_messages, test_decisions, thresholds=args.thresholds)
+
+    print(f"\nAgreement with LLM (all test messages): {results['overall_agreement']:.1%}")
+    print(f"\n{'threshold':>10} {'coverage':>10} {'agreement':>10} {'covered':>8}")
+    for threshold, row in results['thresholds'].items():
+        agreement = f"{row['agreement']:.1%}" if row['agreement'] is not None else '-'
+        print(f"{threshold:>10.2f} {row['coverage']:>10.1%} {agreement:>10} {row['covered']:>8}")
+
+    print(f"\nPer intent @ {INTENT_FASTPATH_THRESHOLD:.2f} (covered / agreed / total)")
+    rows = per_intent_agreement(clf, test_messages, test_decisions, INTENT_FASTPATH_THRESHOLD)
+    for intent, (covered, agreed, total) in sorted(rows.items(), key=lambda kv: -kv[1][2]):
+        print(f"   {intent:<28} {covered:>5} {agreed:>5} {total:>5}")
+
+    disagreements = results['disagreements']
+    print(f"\nConfident disagreements @ {INTENT_FASTPATH_THRESHOLD:.2f}: {len(disagreements)}")
+    for message, predicted, llm in disagreements[:args.show]:
+        print(f"   \"{message[:60]}\"")
+        print(f"      local: {predicted.get('intent_type')}/{predicted.get('semantic_category')} "
+              f"relevant={predicted.get('is_mandate_relevant')} ({predicted['confidence']:.2f})")
+        print(f"      llm:   {llm.get('intent_type')}/{llm.get('semantic_category')} "
+              f"relevant={llm.get('is_mandate_relevant')}")
+
+    latency = results['latency_ms']
+    print(f"\nLatency: p50 {latency['p50']:.3f}ms, p99 {latency['p99']:.3f}ms")
+
+    if args.save:
+        if args.input:
+            print("\n--save trains from MongoDB decisions; ignoring --input for the stored model")
+        print(f"\nStored model: {train_intent_classifier(days=args.days, save=True)}")
+
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -30,19 +30,35 @@ CHANGELOG V3.0:
    [CRITICAL #7] ✅ FIXED: Competitor agencies never return empty
    [CRITICAL #8] ✅ FIXED: Velocity scoring uses proper thresholds
    [HIGH #1-12]  ✅ FIXED: All layout breaks and missing null checks
+
+✅ RENDER CACHE:
+   • Jinja environment + compiled template shared per process
+   • Stylesheets parsed once (re-parsed only when the CSS file changes)
+   • Logo, stylesheets and web fonts served from an in-memory URL fetcher
+   • One FontConfiguration reused across reports
 """
 
 import os
 import sys
 import json
+import time
 import logging
 import argparse 
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from weasyprint import HTML, CSS
+from weasyprint.text.fonts import FontConfiguration
+
+try:
+    # WeasyPrint >= 68: fetchers are URLFetcher subclasses returning URLFetcherResponse
+    from weasyprint.urls import URLFetcher, URLFetcherResponse
+except ImportError:
+    URLFetcher = URLFetcherResponse = None
+    from weasyprint import default_url_fetcher
 
 # Configure logging
 logging.basicConfig(
@@ -52,6 +68,191 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# RENDER CACHE (PER PROCESS)
+# ============================================================================
+
+PAGE_CSS = '''
+    @page {
+        size: 1920px 1080px;
+        margin: 0;
+    }
+    body {
+        margin: 0;
+        padding: 0;
+    }
+'''
+
+RESOURCE_CACHE_MAX_ENTRIES = 200
+RESOURCE_FAILURE_TTL = 300  # Seconds before a failed URL (e.g. fonts CDN down) is retried
+
+
+class RenderCache:
+    """
+    Everything a report render used to re-read, kept for the life of the process.
+    
+    - Jinja environments per template dir (compiled templates live in their cache)
+    - Parsed CSS objects, keyed by file mtime
+    - One FontConfiguration, so @font-face fonts register once
+    - In-memory URL fetcher for the logo, stylesheets and Google Fonts
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._envs: Dict[str, Environment] = {}
+        self._stylesheets: Dict[str, Tuple[float, List[CSS]]] = {}
+        self._resources: Dict[str, Dict[str, Any]] = {}
+        self._failures: Dict[str, float] = {}
+        self._font_config: Optional[FontConfiguration] = None
+        self._url_fetcher = None
+        self.stats = {'resource_hits': 0, 'resource_misses': 0, 'css_parses': 0}
+    
+    def jinja_env(self, template_dir: Path) -> Environment:
+        key = str(template_dir)
+        with self._lock:
+            env = self._envs.get(key)
+            if env is None:
+                env = Environment(
+                    loader=FileSystemLoader(key),
+                    autoescape=select_autoescape(['html', 'xml']),
+                    trim_blocks=True,
+                    lstrip_blocks=True
+                )
+                
+                # Register helper functions for Jinja2
+                env.globals['abs'] = abs
+                env.globals['format_price'] = format_price
+                self._envs[key] = env
+            return env
+    
+    def font_config(self) -> FontConfiguration:
+        with self._lock:
+            if self._font_config is None:
+                self._font_config = FontConfiguration()
+            return self._font_config
+    
+    def stylesheets(self, template_dir: Path) -> List[CSS]:
+        """Page CSS + voxmill_style.css, parsed once per file version"""
+        css_path = template_dir / 'voxmill_style.css'
+        mtime = css_path.stat().st_mtime if css_path.exists() else 0.0
+        key = str(css_path)
+        
+        cached = self._stylesheets.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        font_config = self.font_config()
+        stylesheets = [CSS(string=PAGE_CSS, font_config=font_config)]
+        
+        if css_path.exists():
+            stylesheets.append(CSS(filename=str(css_path), font_config=font_config, url_fetcher=self.url_fetcher))
+            logger.info(f"Loaded CSS from {css_path}")
+        else:
+            logger.warning(f"CSS file not found: {css_path}")
+        
+        with self._lock:
+            self._stylesheets[key] = (mtime, stylesheets)
+            self.stats['css_parses'] += 1
+        return stylesheets
+    
+    def _fetch(self, url: str, load):
+        """Serve url from memory, or load it once (failures are remembered briefly)"""
+        if url.startswith('data:'):
+            return self._to_response(load())
+        
+        cached = self._resources.get(url)
+        if cached is not None:
+            self.stats['resource_hits'] += 1
+            return self._to_response(cached)
+        
+        failed_at = self._failures.get(url)
+        if failed_at is not None and time.time() - failed_at < RESOURCE_FAILURE_TTL:
+            raise ValueError(f"Resource unavailable (cached failure): {url}")
+        
+        self.stats['resource_misses'] += 1
+        try:
+            resource = load()
+        except Exception:
+            with self._lock:
+                self._failures[url] = time.time()
+            raise
+        
+        with self._lock:
+            if len(self._resources) < RESOURCE_CACHE_MAX_ENTRIES:
+                self._resources[url] = resource
+            self._failures.pop(url, None)
+        return self._to_response(resource)
+    
+    @staticmethod
+    def _to_response(resource: Dict[str, Any]):
+        if URLFetcherResponse is not None:
+            return URLFetcherResponse(resource['url'], resource['body'], resource['headers'], resource['status'])
+        return dict(resource)
+    
+    def _legacy_url_fetcher(self, url: str, timeout: int = 10, ssl_context=None) -> Dict[str, Any]:
+        """WeasyPrint < 68 url_fetcher (dict results)"""
+        def load():
+            result = default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context)
+            
+            # Materialise streamed responses so they can be replayed
+            file_obj = result.pop('file_obj', None)
+            if file_obj is not None:
+                try:
+                    result['string'] = file_obj.read()
+                finally:
+                    file_obj.close()
+            return result
+        
+        return self._fetch(url, load)
+    
+    @property
+    def url_fetcher(self):
+        """Fetcher to hand to HTML()/CSS() - same cache for either WeasyPrint API"""
+        if URLFetcher is None:
+            return self._legacy_url_fetcher
+        if self._url_fetcher is None:
+            self._url_fetcher = _CachingURLFetcher(self)
+        return self._url_fetcher
+    
+    def clear(self):
+        """Drop everything (next render is cold)"""
+        with self._lock:
+            self._envs.clear()
+            self._stylesheets.clear()
+            self._resources.clear()
+            self._failures.clear()
+            self._font_config = None
+            self._url_fetcher = None
+
+
+if URLFetcher is not None:
+    class _CachingURLFetcher(URLFetcher):
+        """URLFetcher that replays bodies from the render cache"""
+        
+        def __init__(self, cache: RenderCache, **kwargs):
+            super().__init__(**kwargs)
+            self._cache = cache
+        
+        def fetch(self, url, headers=None):
+            return self._cache._fetch(url, lambda: self._load(url, headers))
+        
+        def _load(self, url, headers):
+            response = super().fetch(url, headers)
+            try:
+                body = response.read()
+            finally:
+                response.close()
+            return {
+                'url': response.url,
+                'body': body,
+                'headers': dict(response.headers.items()),
+                'status': response.status
+            }
+
+
+render_cache = RenderCache()
+
+
 # ============================================================================
 # CENTRALIZED SCORING ENGINE (REPLACES SCATTERED LOGIC)
 # ============================================================================
@@ -310,17 +511,8 @@ class VoxmillPDFGenerator:
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize Jinja2 environment
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(str(self.template_dir)),
-            autoescape=select_autoescape(['html', 'xml']),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
-        
-        # Register helper functions for Jinja2
-        self.jinja_env.globals['abs'] = abs
-        self.jinja_env.globals['format_price'] = format_price
+        # Jinja2 environment (shared per process - compiled templates are reused)
+        self.jinja_env = render_cache.jinja_env(self.template_dir)
         
         logger.info(f"Initialized Voxmill PDF Generator V3.0 (Bulletproof Edition)")
         logger.info(f"Template directory: {self.template_dir}")
@@ -348,7 +540,17 @@ class VoxmillPDFGenerator:
         try:
             with open(self.data_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in data file: {e}")
+            raise
+        
+        return self.validate_data(data)
+    
+    def validate_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate + normalise an analysis dict (file-loaded or passed in-memory).
+        """
+        try:
             # COMPREHENSIVE VALIDATION
             required_keys = ['metadata']
             missing_keys = [k for k in required_keys if k not in data]
@@ -383,9 +585,6 @@ class VoxmillPDFGenerator:
             logger.info(f"Successfully loaded data with {len(data)} sections")
             return data
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in data file: {e}")
-            raise
         except Exception as e:
             logger.error(f"Error loading data: {e}")
             raise
@@ -1923,29 +2122,18 @@ class VoxmillPDFGenerator:
         logger.info(f"Generating PDF: {output_path}")
         
         try:
-            css_path = self.template_dir / 'voxmill_style.css'
+            stylesheets = render_cache.stylesheets(self.template_dir)
             
-            page_css = CSS(string='''
-                @page {
-                    size: 1920px 1080px;
-                    margin: 0;
-                }
-                body {
-                    margin: 0;
-                    padding: 0;
-                }
-            ''')
-            
-            if not css_path.exists():
-                logger.warning(f"CSS file not found: {css_path}")
-                stylesheets = [page_css]
-            else:
-                main_css = CSS(filename=str(css_path))
-                stylesheets = [page_css, main_css]
-                logger.info(f"Loaded CSS from {css_path}")
-            
-            html = HTML(string=html_content, base_url=str(self.template_dir))
-            html.write_pdf(str(output_path), stylesheets=stylesheets)
+            html = HTML(
+                string=html_content,
+                base_url=str(self.template_dir),
+                url_fetcher=render_cache.url_fetcher
+            )
+            html.write_pdf(
+                str(output_path),
+                stylesheets=stylesheets,
+                font_config=render_cache.font_config()
+            )
             
             logger.info(f"✅ PDF generated: {output_path}")
             logger.info(f"📄 File size: {output_path.stat().st_size / 1024:.2f} KB")
@@ -1962,9 +2150,16 @@ class VoxmillPDFGenerator:
     
     def generate(
         self,
-        output_filename: str = "Voxmill_Executive_Intelligence_Deck.pdf"
+        output_filename: str = "Voxmill_Executive_Intelligence_Deck.pdf",
+        data: Optional[Dict[str, Any]] = None
     ) -> Path:
-        """Main generation entry point"""
+        """
+        Main generation entry point.
+        
+        Args:
+            output_filename: PDF filename inside output_dir
+            data: In-memory analysis dict (library mode); read from data_path if omitted
+        """
         logger.info("=" * 70)
         logger.info("VOXMILL EXECUTIVE INTELLIGENCE DECK — PDF GENERATION V3.0")
         logger.info("=" * 70)
@@ -1972,7 +2167,7 @@ class VoxmillPDFGenerator:
         start_time = datetime.now()
         
         try:
-            data = self.load_data()
+            data = self.validate_data(data) if data is not None else self.load_data()
             html_content = self.render_template(data)
             pdf_path = self.generate_pdf(html_content, output_filename)
             
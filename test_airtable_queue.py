@@ -0,0 +1,166 @@
+"""
+Airtable Write Queue Tests
+Persistence, ack/requeue and cross-worker ownership (app/airtable_queue.py)
+
+USAGE:
+    python -m pytest test_airtable_queue.py
+"""
+
+import os
+import sys
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+mongomock = pytest.importorskip('mongomock')
+
+import app.airtable_queue as airtable_queue
+from app.airtable_queue import AirtableWriteQueue, QUEUE_COLLECTION, DEAD_LETTER_COLLECTION
+
+
+@pytest.fixture
+def db(mongomock_bulk_write):
+    return mongomock.MongoClient()['Voxmill']
+
+
+def _queue(db) -> AirtableWriteQueue:
+    queue = AirtableWriteQueue()
+    queue._collection = lambda name=QUEUE_COLLECTION: db[name]
+    return queue
+
+
+def _run(coro):
+    async def _with_background_tasks():
+        result = await coro
+        # _finish schedules persistence writes as tasks
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        if pending:
+            await asyncio.gather(*pending)
+        return result
+    return asyncio.run(_with_background_tasks())
+
+
+def _send(queue, op='update'):
+    """Take the next batch as the processor would; returns its items"""
+    batches = queue._take_batches()
+    assert len(batches) == 1 and batches[0][0] == op
+    return batches[0][2]
+
+
+def test_ack_deletes_persisted_update(db):
+    queue = _queue(db)
+    queue.enqueue_update('Accounts', 'rec1', {'PIN State': 'locked'})
+    _run(queue._persist_dirty())
+
+    items = _send(queue)
+
+    async def ack():
+        queue._finish('update', 'Accounts', items, acked=True)
+    _run(ack())
+
+    assert db[QUEUE_COLLECTION].count_documents({}) == 0
+
+
+def test_ack_keeps_newer_fields_persisted_during_send(db):
+    queue = _queue(db)
+    queue.enqueue_update('Accounts', 'rec1', {'PIN State': 'locked'})
+    _run(queue._persist_dirty())
+
+    items = _send(queue)
+    queue.enqueue_update('Accounts', 'rec1', {'Last Seen': '2026-10-16'})
+    _run(queue._persist_dirty())
+
+    async def ack():
+        queue._finish('update', 'Accounts', items, acked=True)
+    _run(ack())
+
+    doc = db[QUEUE_COLLECTION].find_one()
+    assert doc is not None
+    assert doc['fields']['Last Seen'] == '2026-10-16'
+    assert queue._updates['Accounts']['rec1']['fields'] == {'Last Seen': '2026-10-16'}
+
+
+def test_failed_update_merges_under_newer_fields(db):
+    queue = _queue(db)
+    queue.enqueue_update('Accounts', 'rec1', {'Status': 'old', 'Tier': 'tier_2'})
+    items = _send(queue)
+    queue.enqueue_update('Accounts', 'rec1', {'Status': 'new'})
+
+    async def fail():
+        queue._finish('update', 'Accounts', items, acked=False)
+    _run(fail())
+
+    entry = queue._updates['Accounts']['rec1']
+    assert entry['fields'] == {'Status': 'new', 'Tier': 'tier_2'}
+    assert entry['requeues'] == 1
+    assert ('Accounts', 'rec1') not in queue._inflight
+
+
+def test_exhausted_create_is_dead_lettered_and_removed(db):
+    queue = _queue(db)
+    queue.enqueue_create('Usage Logs', {'Message': 'hello'})
+    _run(queue._persist_dirty())
+    assert db[QUEUE_COLLECTION].count_documents({}) == 1
+
+    items = _send(queue, op='create')
+    items[0]['requeues'] = airtable_queue.AIRTABLE_MAX_REQUEUES
+
+    async def fail():
+        queue._finish('create', 'Usage Logs', items, acked=False)
+    _run(fail())
+
+    assert db[QUEUE_COLLECTION].count_documents({}) == 0
+    dead = db[DEAD_LETTER_COLLECTION].find_one()
+    assert dead['table'] == 'Usage Logs' and dead['fields'] == {'Message': 'hello'}
+    assert queue.pending_count() == 0
+
+
+def test_live_lease_is_not_claimed(db):
+    worker_a, worker_b = _queue(db), _queue(db)
+    worker_a.enqueue_create('Usage Logs', {'Message': 'a'})
+    _run(worker_a._persist_dirty())
+
+    async def restore():
+        worker_b._wakeup = asyncio.Event()
+        await worker_b._restore()
+    _run(restore())
+
+    assert worker_b.pending_count() == 0
+    assert db[QUEUE_COLLECTION].find_one()['owner'] == worker_a._owner
+
+
+def test_expired_lease_is_claimed_once(db):
+    worker_a, worker_b, worker_c = _queue(db), _queue(db), _queue(db)
+    worker_a.enqueue_create('Usage Logs', {'Message': 'orphan'})
+    worker_a.enqueue_update('Accounts', 'rec1', {'Status': 'active'})
+    _run(worker_a._persist_dirty())
+    db[QUEUE_COLLECTION].update_many({}, {'$set': {'lease_until': datetime.now(timezone.utc) - timedelta(seconds=1)}})
+
+    async def restore(worker):
+        worker._wakeup = asyncio.Event()
+        await worker._restore()
+    _run(restore(worker_b))
+    _run(restore(worker_c))
+
+    assert worker_b.pending_count() == 2
+    assert worker_c.pending_count() == 0
+    assert {d['owner'] for d in db[QUEUE_COLLECTION].find()} == {worker_b._owner}
+    # Update re-persisted under worker B's id, worker A's copy removed
+    assert db[QUEUE_COLLECTION].count_documents({'op': 'update'}) == 1
+
+
+def test_released_leases_are_claimable(db):
+    worker_a, worker_b = _queue(db), _queue(db)
+    worker_a.enqueue_create('Usage Logs', {'Message': 'shutdown'})
+    _run(worker_a._persist_dirty())
+    _run(worker_a._release_leases())
+
+    async def restore():
+        worker_b._wakeup = asyncio.Event()
+        await worker_b._restore()
+    _run(restore())
+
+    assert worker_b.pending_count() == 1
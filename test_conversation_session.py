@@ -0,0 +1,140 @@
+"""
+Conversation Session Tests
+Request-scoped unit of work and versioned write-back (app/conversation_manager.py)
+
+USAGE:
+    python -m pytest test_conversation_session.py
+"""
+
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app.conversation_manager as conversation_manager
+from app.conversation_manager import ConversationSession, session_unit_of_work
+
+CLIENT = '+447700900123'
+
+
+class FakeSessionRedis:
+    """Session + version keys with the CAS script's semantics"""
+
+    def __init__(self):
+        self.store = {}
+        self.reads = 0
+        self.writes = 0
+
+    def mget(self, *keys):
+        self.reads += 1
+        return [self.store.get(k) for k in keys]
+
+    def register_script(self, source):
+        def cas(keys, args):
+            session_key, version_key = keys
+            expected, payload, _ttl = args
+            current = int(self.store.get(version_key) or 0)
+            if expected != '*' and current != int(expected):
+                return -1
+            self.writes += 1
+            self.store[session_key] = payload
+            self.store[version_key] = str(current + 1)
+            return current + 1
+        return cas
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = FakeSessionRedis()
+    monkeypatch.setattr(conversation_manager, 'redis_client', client)
+    monkeypatch.setattr(conversation_manager, 'redis_available', True)
+    monkeypatch.setattr(conversation_manager, '_session_cas', None)
+    monkeypatch.setattr(conversation_manager, '_memory_sessions', {})
+    return client
+
+
+def _stored(redis):
+    return json.loads(redis.store[f"voxmill:session:{CLIENT}"])
+
+
+def test_unit_of_work_loads_once_and_writes_once(redis):
+    with session_unit_of_work(CLIENT):
+        ConversationSession(CLIENT).update_session("Mayfair update", "Steady.")
+        ConversationSession(CLIENT).lock_comparison_state('Mayfair', 'Chelsea')
+        assert ConversationSession(CLIENT).get_locked_comparison() == ['Mayfair', 'Chelsea']
+
+    assert redis.reads == 1
+    assert redis.writes == 1
+    stored = _stored(redis)
+    assert stored['total_exchanges'] == 1
+    assert stored['messages'][0]['user'] == "Mayfair update"
+
+
+def test_conflicting_commit_merges_only_changed_fields(redis):
+    ConversationSession(CLIENT).update_session("first", "one")
+
+    with session_unit_of_work(CLIENT):
+        ConversationSession(CLIENT).update_session("second", "two")
+
+        # Another worker commits while this message is in flight
+        concurrent = ConversationSession(CLIENT)
+        latest = concurrent._empty_session()
+        latest.update(_stored(redis))
+        latest['messages'].append({'user': 'parallel', 'assistant': 'p', 'timestamp': latest['last_updated'],
+                                   'metadata': {}})
+        latest['total_exchanges'] += 1
+        latest['locked_comparison'] = {'regions': ['Belgravia', 'Kensington']}
+        concurrent._write_session(latest)
+
+    stored = _stored(redis)
+    assert [m['user'] for m in stored['messages']] == ['first', 'parallel', 'second']
+    assert stored['total_exchanges'] == 3
+    # Field this request never touched keeps the concurrent writer's value
+    assert stored['locked_comparison'] == {'regions': ['Belgravia', 'Kensington']}
+
+
+def test_read_only_unit_of_work_skips_write(redis):
+    ConversationSession(CLIENT).update_session("first", "one")
+    writes = redis.writes
+
+    with session_unit_of_work(CLIENT):
+        ConversationSession(CLIENT).get_session()
+        ConversationSession(CLIENT).get_last_n_messages()
+
+    assert redis.writes == writes
+
+
+def test_writes_go_through_outside_unit_of_work(redis):
+    ConversationSession(CLIENT).update_session("first", "one")
+    ConversationSession(CLIENT).update_session("second", "two")
+
+    assert redis.writes == 2
+    assert _stored(redis)['total_exchanges'] == 2
+
+
+def test_set_fields_is_written_without_other_changes(redis):
+    with session_unit_of_work(CLIENT):
+        ConversationSession(CLIENT).set_fields(last_user_message_raw='mayfair', consecutive_repeats=0)
+
+    assert redis.writes == 1
+    assert _stored(redis)['last_user_message_raw'] == 'mayfair'
+
+
+def test_set_fields_survive_version_conflict(redis):
+    ConversationSession(CLIENT).update_session("first", "one")
+
+    with session_unit_of_work(CLIENT):
+        ConversationSession(CLIENT).set_fields(last_bot_response_raw='Mayfair steady.')
+
+        concurrent = ConversationSession(CLIENT)
+        latest = concurrent._empty_session()
+        latest.update(_stored(redis))
+        latest['total_exchanges'] += 1
+        concurrent._write_session(latest)
+
+    stored = _stored(redis)
+    assert stored['last_bot_response_raw'] == 'Mayfair steady.'
+    assert stored['total_exchanges'] == 2
@@ -0,0 +1,123 @@
+"""
+Governance Cache Tests
+Mandate-check decision memoisation (app/governance_cache.py)
+
+USAGE:
+    python -m pytest test_governance_cache.py
+"""
+
+import os
+import sys
+import json
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app.governance_cache as governance_cache_module
+from app.governance_cache import (
+    GovernanceDecisionCache, context_fingerprint, governance_cache_key, normalize_governance_message
+)
+
+DECISION = {'is_mandate_relevant': True, 'semantic_category': 'market_dynamics', 'confidence': 0.93,
+            'intent_type': 'status_check', 'is_human_signal': False, 'is_dismissal': False,
+            'requested_region': 'Knightsbridge', 'reasoning': 'not cached'}
+
+
+class FakeCacheRedis:
+    def __init__(self, fail=False):
+        self.store = {}
+        self.fail = fail
+
+    async def aget(self, key):
+        if self.fail:
+            raise ConnectionError("upstash unreachable")
+        return self.store.get(key)
+
+    async def asetex(self, key, seconds, value):
+        if self.fail:
+            raise ConnectionError("upstash unreachable")
+        self.store[key] = value
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = FakeCacheRedis()
+    monkeypatch.setattr(governance_cache_module, 'redis_client', client)
+    monkeypatch.setattr(governance_cache_module, 'redis_available', True)
+    return client
+
+
+def test_message_normalisation_folds_case_space_and_trailing_punctuation():
+    assert normalize_governance_message("Any updates on  Knightsbridge?") == "any updates on knightsbridge"
+    assert governance_cache_key("Any updates on  Knightsbridge?") == governance_cache_key("any updates on knightsbridge")
+    assert normalize_governance_message("!!!!") == "!!!!"
+
+
+def test_different_messages_get_different_keys():
+    assert governance_cache_key("lock it") != governance_cache_key("unlock it")
+    assert governance_cache_key("market overview").startswith(governance_cache_module.GOVERNANCE_CACHE_PREFIX + ':')
+
+
+def test_context_fingerprint_is_order_and_case_insensitive():
+    a = {'regions': ['Mayfair', 'Chelsea'], 'agents': ['Knight Frank'], 'topics': []}
+    b = {'regions': ['chelsea', 'MAYFAIR'], 'agents': ['knight frank'], 'topics': None}
+
+    assert context_fingerprint(a) == context_fingerprint(b)
+    assert context_fingerprint(a) != context_fingerprint({'regions': ['Mayfair'], 'agents': [], 'topics': []})
+
+
+def test_empty_context_keys_like_no_context():
+    empty = {'regions': [], 'agents': [], 'topics': []}
+
+    assert context_fingerprint(empty) == context_fingerprint(None) == '-'
+    assert governance_cache_key("tell me more", empty) == governance_cache_key("tell me more")
+    assert governance_cache_key("tell me more", {'regions': ['Mayfair']}) != governance_cache_key("tell me more")
+
+
+def test_put_then_get_hits_local_then_redis(redis):
+    cache = GovernanceDecisionCache()
+
+    async def scenario():
+        assert await cache.get("Any updates on Knightsbridge?") is None
+        await cache.put("Any updates on Knightsbridge?", None, DECISION)
+        local = await cache.get("any updates on knightsbridge")
+        cache.clear()
+        shared = await cache.get("any updates on knightsbridge")
+        return local, shared
+
+    local, shared = asyncio.run(scenario())
+
+    assert local == shared
+    assert 'reasoning' not in local and local['intent_type'] == 'status_check'
+    assert json.loads(next(iter(redis.store.values())))['requested_region'] == 'Knightsbridge'
+    stats = cache.get_stats()
+    assert (stats['misses'], stats['local_hits'], stats['redis_hits']) == (1, 1, 1)
+
+
+def test_redis_errors_are_misses(monkeypatch):
+    monkeypatch.setattr(governance_cache_module, 'redis_client', FakeCacheRedis(fail=True))
+    monkeypatch.setattr(governance_cache_module, 'redis_available', True)
+    cache = GovernanceDecisionCache()
+
+    async def scenario():
+        miss = await cache.get("market overview")
+        await cache.put("market overview", None, DECISION)
+        return miss, await cache.get("market overview")
+
+    miss, hit = asyncio.run(scenario())
+
+    assert miss is None and hit is not None
+    assert cache.get_stats()['errors'] == 2
+
+
+def test_local_level_is_bounded(redis):
+    cache = GovernanceDecisionCache(max_size=2)
+
+    async def fill():
+        for message in ("one", "two", "three"):
+            await cache.put(message, None, DECISION)
+    asyncio.run(fill())
+
+    assert cache.get_stats()['local_entries'] == 2
@@ -0,0 +1,103 @@
+"""
+Historical Storage Tests
+Delta snapshots and backward replay of past listing sets (app/historical_storage.py)
+
+USAGE:
+    python -m pytest test_historical_storage.py
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+mongomock = pytest.importorskip('mongomock')
+
+import app.historical_storage as historical_storage
+from app.historical_storage import get_snapshot_listings, store_daily_snapshot
+
+AREA = 'Mayfair'
+DAYS = ['2026-10-01', '2026-10-02', '2026-10-03']
+
+
+def _frozen(day: str):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.fromisoformat(f"{day}T06:30:00+00:00")
+    return FrozenDatetime
+
+
+def _prop(address, price, agent):
+    return {'address': address, 'price': price, 'agent': agent, 'price_per_sqft': None,
+            'lat': None, 'lng': None, 'type': 'Flat', 'bedrooms': 2}
+
+
+@pytest.fixture
+def history(monkeypatch, mongomock_bulk_write):
+    monkeypatch.setattr(historical_storage, 'mongo_client', mongomock.MongoClient())
+    monkeypatch.setattr(historical_storage, '_indexes_ready', False)
+
+    daily_listings = [
+        [_prop('1 Park Lane', 1_000_000, 'Knight Frank'), _prop('2 Mount St', 2_000_000, 'Knight Frank')],
+        [_prop('1 Park Lane', 900_000, 'Knight Frank'), _prop('2 Mount St', 2_000_000, 'Knight Frank'),
+         _prop('3 Hill St', 3_000_000, 'Savills')],
+        [_prop('1 Park Lane', 900_000, 'Knight Frank'), _prop('3 Hill St', 3_000_000, 'Savills')],
+    ]
+    for day, properties in zip(DAYS, daily_listings):
+        monkeypatch.setattr(historical_storage, 'datetime', _frozen(day))
+        store_daily_snapshot({'properties': properties, 'metrics': {}}, AREA)
+    monkeypatch.setattr(historical_storage, 'datetime', datetime)
+
+    return historical_storage.mongo_client['Voxmill']
+
+
+def _prices(listings):
+    return {key: listing['price'] for key, listing in listings.items()}
+
+
+def test_only_deltas_are_stored(history):
+    events = {(e['date'], e['property_key']): e['event'] for e in history['property_events'].find()}
+
+    assert events == {
+        ('2026-10-01', '1 park lane'): 'new',
+        ('2026-10-01', '2 mount st'): 'new',
+        ('2026-10-02', '1 park lane'): 'price_change',
+        ('2026-10-02', '3 hill st'): 'new',
+        ('2026-10-03', '2 mount st'): 'delisted',
+    }
+    assert history['historical_snapshots'].find_one({'date': '2026-10-03'})['deltas'] == \
+        {'new': 0, 'price_change': 0, 'delisted': 1}
+
+
+def test_backward_replay_rebuilds_each_day(history):
+    listings = get_snapshot_listings(AREA, DAYS)
+
+    assert _prices(listings['2026-10-01']) == {'1 park lane': 1_000_000, '2 mount st': 2_000_000}
+    assert _prices(listings['2026-10-02']) == {'1 park lane': 900_000, '2 mount st': 2_000_000, '3 hill st': 3_000_000}
+    assert _prices(listings['2026-10-03']) == {'1 park lane': 900_000, '3 hill st': 3_000_000}
+
+
+def test_replay_for_single_past_date_and_agent(history):
+    assert _prices(get_snapshot_listings(AREA, ['2026-10-01'])['2026-10-01']) == \
+        {'1 park lane': 1_000_000, '2 mount st': 2_000_000}
+
+    knight_frank = get_snapshot_listings(AREA, DAYS, agent='Knight Frank')
+    assert set(knight_frank['2026-10-02']) == {'1 park lane', '2 mount st'}
+    assert set(knight_frank['2026-10-03']) == {'1 park lane'}
+
+
+def test_date_before_history_has_no_listings(history):
+    assert get_snapshot_listings(AREA, ['2026-09-30']) == {'2026-09-30': {}}
+
+
+def test_fallback_dataset_does_not_delist(history, monkeypatch):
+    monkeypatch.setattr(historical_storage, 'datetime', _frozen('2026-10-04'))
+    store_daily_snapshot({'properties': [], 'metadata': {'is_fallback': True}}, AREA)
+
+    assert history['property_events'].count_documents({'date': '2026-10-04'}) == 0
+    assert history['property_state'].count_documents({'area': AREA, 'active': True}) == 2
+
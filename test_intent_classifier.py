@@ -0,0 +1,113 @@
+"""
+Intent Classifier Tests
+Local fast-path mandate classifier (app/intent_classifier.py)
+
+USAGE:
+    python -m pytest test_intent_classifier.py
+"""
+
+import os
+import sys
+import random
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip('sklearn')
+
+import app.intent_classifier as intent_classifier
+from app.intent_classifier import LocalIntentClassifier
+
+REGIONS = ['Mayfair', 'Chelsea', 'Knightsbridge', 'Belgravia', 'Kensington', 'Marylebone']
+TEMPLATES = {
+    ('status_check', 'market_dynamics', True): ["what's happening in {r}", "any updates on {r}?", "how's {r} looking"],
+    ('lock_request', 'administrative', False): ["lock it", "lock the line now", "lock access please"],
+    ('context_deepen', 'market_dynamics', True): ["tell me more about {r}", "go deeper on {r}", "elaborate on {r}"],
+}
+
+
+def _samples(n=240, seed=7):
+    rng = random.Random(seed)
+    messages, decisions = [], []
+    for _ in range(n):
+        (intent, category, relevant), templates = rng.choice(list(TEMPLATES.items()))
+        messages.append(rng.choice(templates).format(r=rng.choice(REGIONS)))
+        decisions.append({'intent_type': intent, 'semantic_category': category, 'is_mandate_relevant': relevant,
+                          'is_human_signal': False, 'is_dismissal': False})
+    return messages, decisions
+
+
+@pytest.fixture(scope='module')
+def trained():
+    messages, decisions = _samples()
+    return LocalIntentClassifier().fit(messages, decisions)
+
+
+def test_predicts_trained_intents(trained):
+    assert trained.predict("what's happening in Mayfair")['intent_type'] == 'status_check'
+    assert trained.predict("lock it")['intent_type'] == 'lock_request'
+    assert trained.predict("lock it")['is_mandate_relevant'] is False
+
+
+def test_document_round_trip_is_plain_data(trained):
+    document, columns = trained.to_document()
+
+    def plain(value):
+        if isinstance(value, dict):
+            return all(isinstance(k, str) and plain(v) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return all(plain(v) for v in value)
+        return value is None or isinstance(value, (str, int, float, bool))
+
+    assert plain(document) and plain(columns)
+
+    restored = LocalIntentClassifier.from_document(document, columns)
+    for message in ["what's happening in Chelsea", "lock access please", "go deeper on Belgravia", "zzz"]:
+        original, rebuilt = trained.predict(message), restored.predict(message)
+        assert original['intent_type'] == rebuilt['intent_type']
+        assert original['confidence'] == pytest.approx(rebuilt['confidence'], abs=1e-5)
+
+
+def test_inconsistent_document_is_rejected(trained):
+    document, columns = trained.to_document()
+    with pytest.raises(ValueError):
+        LocalIntentClassifier.from_document(document, columns[:-1])
+
+
+def test_store_and_load_latest(monkeypatch, trained):
+    mongomock = pytest.importorskip('mongomock')
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(intent_classifier, 'get_mongo_client', lambda: client)
+    monkeypatch.setattr(intent_classifier, '_indexes_ready', False)
+
+    intent_classifier.save_intent_classifier(trained, {'samples': trained.trained_samples})
+    loaded = intent_classifier.load_latest_intent_classifier()
+
+    assert loaded.predict("lock it")['intent_type'] == 'lock_request'
+    assert 'model' not in client['Voxmill']['intent_model_weights'].find_one()
+
+
+def test_training_samples_exclude_context_decisions(monkeypatch):
+    mongomock = pytest.importorskip('mongomock')
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(intent_classifier, 'get_mongo_client', lambda: client)
+    monkeypatch.setattr(intent_classifier, '_indexes_ready', False)
+
+    decision = {'intent_type': 'context_deepen', 'semantic_category': 'market_dynamics', 'is_mandate_relevant': True}
+    intent_classifier.log_governance_decision("tell me more", decision, has_context=True)
+    intent_classifier.log_governance_decision("market overview", decision, has_context=False)
+
+    messages, _ = intent_classifier.load_training_samples()
+    assert messages == ["market overview"]
+
+
+def test_fast_path_skips_messages_with_context(monkeypatch, trained):
+    intent_classifier.set_intent_classifier(trained)
+    monkeypatch.setattr(intent_classifier, 'INTENT_FASTPATH_THRESHOLD', 0.0)
+    try:
+        assert intent_classifier.classify_locally("lock it") is not None
+        assert intent_classifier.classify_locally("lock it", {'regions': ['Mayfair'], 'agents': [], 'topics': []}) is None
+        assert intent_classifier.classify_locally("lock it", {'regions': [], 'agents': [], 'topics': []}) is not None
+    finally:
+        intent_classifier.set_intent_classifier(None)
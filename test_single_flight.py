@@ -0,0 +1,120 @@
+"""
+Single-Flight Tests
+Cross-worker dataset load coalescing (app/single_flight.py)
+
+USAGE:
+    python -m pytest test_single_flight.py
+"""
+
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app.single_flight as single_flight
+from app.upstash_client import UpstashRedisClient
+
+
+class FakeLockRedis:
+    """Minimal stand-in for the Upstash client's lock commands"""
+
+    def __init__(self, lock_result=True, held_marker=None):
+        self.lock_result = lock_result
+        self.held_marker = held_marker
+
+    def try_set_nx_ex(self, key, value, seconds):
+        return self.lock_result
+
+    def get_checked(self, key):
+        return self.held_marker, None
+
+    def register_script(self, source):
+        return lambda keys, args: 1
+
+
+def _use_redis(monkeypatch, client):
+    monkeypatch.setattr(single_flight, 'redis_client', client)
+    monkeypatch.setattr(single_flight, 'redis_available', True)
+
+
+def test_upstash_transport_error_is_not_held_lock():
+    client = UpstashRedisClient('https://example.invalid', 'token')
+    client._execute_checked = lambda command: (None, 'connection refused')
+
+    assert client.try_set_nx_ex('k', 'v', 60) is None
+    assert client.get_checked('k') == (None, 'connection refused')
+
+
+def test_lock_already_held_is_false():
+    client = UpstashRedisClient('https://example.invalid', 'token')
+    client._execute_checked = lambda command: (None, None)  # SET NX on an existing key → nil
+
+    assert client.try_set_nx_ex('k', 'v', 60) is False
+
+
+def test_redis_error_loads_immediately(monkeypatch):
+    client = UpstashRedisClient('https://example.invalid', 'token')
+    client._execute_checked = lambda command: (None, 'connection refused')
+    _use_redis(monkeypatch, client)
+
+    stored = []
+    started = time.monotonic()
+    result = single_flight.load_with_redis_lock(
+        'lock:mayfair', loader=lambda: {'area': 'Mayfair'},
+        cache_lookup=lambda: None, cache_store=lambda r: stored.append(r) or True,
+        wait_timeout=5
+    )
+
+    assert result == {'area': 'Mayfair'}
+    assert stored == [result]
+    assert time.monotonic() - started < 1
+
+
+def test_follower_returns_leader_result_from_cache(monkeypatch):
+    _use_redis(monkeypatch, FakeLockRedis(lock_result=False, held_marker=json.dumps({'token': 'other'})))
+    monkeypatch.setattr(single_flight, 'POLL_INTERVAL', 0.01)
+
+    lookups = iter([None, {'area': 'Chelsea', 'from': 'leader'}])
+    loads = []
+
+    result = single_flight.load_with_redis_lock(
+        'lock:chelsea', loader=lambda: loads.append(1),
+        cache_lookup=lambda: next(lookups), cache_store=lambda r: True,
+        wait_timeout=5
+    )
+
+    assert result == {'area': 'Chelsea', 'from': 'leader'}
+    assert loads == []
+
+
+def test_follower_uses_fallback_when_leader_failed(monkeypatch):
+    _use_redis(monkeypatch, FakeLockRedis(lock_result=False,
+                                          held_marker=json.dumps({'token': 'other', 'state': 'failed'})))
+    monkeypatch.setattr(single_flight, 'POLL_INTERVAL', 0.01)
+
+    result = single_flight.load_with_redis_lock(
+        'lock:belgravia', loader=lambda: 'loaded',
+        cache_lookup=lambda: None, cache_store=lambda r: True,
+        on_failure=lambda: 'fallback', wait_timeout=5
+    )
+
+    assert result == 'fallback'
+
+
+def test_follower_takes_over_when_redis_fails_mid_wait(monkeypatch):
+    client = FakeLockRedis(lock_result=False)
+    client.get_checked = lambda key: (None, 'timeout')
+    attempts = iter([False, None])
+    client.try_set_nx_ex = lambda key, value, seconds: next(attempts)
+    _use_redis(monkeypatch, client)
+    monkeypatch.setattr(single_flight, 'POLL_INTERVAL', 0.01)
+
+    result = single_flight.load_with_redis_lock(
+        'lock:kensington', loader=lambda: 'loaded',
+        cache_lookup=lambda: None, cache_store=lambda r: True,
+        wait_timeout=5
+    )
+
+    assert result == 'loaded'
@@ -0,0 +1,93 @@
+"""
+Streaming Response Tests
+Sentence splitting of the token stream (app/llm.py) and the remainder sent
+after the first paragraph went out early (app/whatsapp.py)
+
+USAGE:
+    python -m pytest test_streaming.py
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip('openai')
+
+from app.llm import SentenceSplitter
+from app.whatsapp import remainder_after_streamed_chunk
+
+
+def _split(deltas):
+    splitter = SentenceSplitter()
+    segments = []
+    for delta in deltas:
+        segments.extend(splitter.feed(delta))
+    return segments + splitter.flush()
+
+
+def test_splitter_rejoins_to_exact_text():
+    text = "Mayfair is steady. Prices held at £2,150/sqft!\n\nTwo new listings this week.\nWatch Chelsea."
+    deltas = [text[i:i + 3] for i in range(0, len(text), 3)]
+
+    segments = _split(deltas)
+
+    assert ''.join(segment for segment, _ in segments) == text
+    assert [segment for segment, _ in segments][:2] == ["Mayfair is steady. ", "Prices held at £2,150/sqft!\n\n"]
+
+
+def test_splitter_marks_paragraph_ends():
+    segments = _split(["First line.\n", "Second line.\n\n", "Next paragraph."])
+
+    assert [ends for _, ends in segments] == [False, True, True]
+
+
+def test_splitter_waits_for_whitespace_to_finish():
+    splitter = SentenceSplitter()
+
+    # A trailing newline could be the start of a paragraph break
+    assert splitter.feed("Done.\n") == []
+    assert splitter.feed("\nMore") == [("Done.\n\n", True)]
+
+
+def test_splitter_keeps_decimals_in_one_sentence():
+    segments = _split(["Yield is 3.5% this quarter. ", "Stable."])
+
+    assert segments[0][0] == "Yield is 3.5% this quarter. "
+
+
+def test_remainder_after_exact_prefix():
+    full = "Mayfair is steady.\n\nTwo new listings.\n• Grosvenor Sq"
+
+    assert remainder_after_streamed_chunk(full, "Mayfair is steady.") == ("Two new listings.\n• Grosvenor Sq", True)
+
+
+def test_remainder_after_word_match_keeps_line_breaks():
+    full = "Mayfair  is\nsteady.\n\nTwo new listings.\n• Grosvenor Sq\n• Park Lane"
+
+    remainder, matched = remainder_after_streamed_chunk(full, "Mayfair is steady.")
+
+    assert matched
+    assert remainder == "Two new listings.\n• Grosvenor Sq\n• Park Lane"
+
+
+def test_remainder_after_divergence_starts_at_diverging_sentence():
+    full = "Mayfair is steady. Prices eased 2%.\n\nTwo new listings."
+
+    remainder, matched = remainder_after_streamed_chunk(full, "Mayfair is steady. Prices held.")
+
+    assert not matched
+    assert remainder == "Prices eased 2%.\n\nTwo new listings."
+
+
+def test_remainder_when_response_replaced_entirely():
+    full = "An error occurred processing your request."
+
+    assert remainder_after_streamed_chunk(full, "Mayfair is steady.") == (full, False)
+
+
+def test_nothing_left_when_final_text_is_shorter():
+    assert remainder_after_streamed_chunk("Mayfair is", "Mayfair is steady.") == ('', False)
+    assert remainder_after_streamed_chunk("Mayfair  is steady.", "Mayfair is steady.") == ('', True)
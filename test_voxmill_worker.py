@@ -0,0 +1,85 @@
+"""
+PDF Queue Worker Tests
+Leases, reaping and the max-runtime kill (voxmill_worker.py)
+
+USAGE:
+    python -m pytest test_voxmill_worker.py
+"""
+
+import os
+import sys
+import json
+import time
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+fakeredis = pytest.importorskip('fakeredis')
+
+import voxmill_worker
+from voxmill_worker import (
+    DEAD_LETTER_KEY, LEASES_KEY, PRIORITY_LANES, PDFJobWorker, enqueue_pdf_job
+)
+
+
+@pytest.fixture
+def worker():
+    return PDFJobWorker(fakeredis.FakeRedis(decode_responses=True), concurrency=2)
+
+
+def _claim_running(worker, future, area, claimed_at=None):
+    enqueue_pdf_job(worker.redis, {'area': area, 'client_email': f"{area.lower()}@example.com"})
+    payload, job = worker.claim()
+    worker.running[future] = (payload, job, claimed_at or time.time())
+    return payload
+
+
+def test_reaper_skips_jobs_still_running_here(worker):
+    payload = _claim_running(worker, Future(), 'Mayfair')
+    worker.redis.zadd(LEASES_KEY, {payload: time.time() - 1})
+
+    worker.reap_expired()
+
+    assert worker.redis.llen(PRIORITY_LANES['default']) == 0
+    assert worker.redis.zscore(LEASES_KEY, payload) > time.time()
+
+
+def test_reaper_requeues_lapsed_leases_from_other_workers(worker):
+    enqueue_pdf_job(worker.redis, {'area': 'Chelsea'})
+    payload, _ = worker.claim()
+    worker.redis.zadd(LEASES_KEY, {payload: time.time() - 1})
+
+    worker.reap_expired()
+
+    requeued = json.loads(worker.redis.lindex(PRIORITY_LANES['default'], 0))
+    assert requeued['area'] == 'Chelsea' and requeued['attempts'] == 1
+
+
+def test_over_time_job_is_killed_and_dead_lettered(worker):
+    worker.pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        stuck = worker.pool.submit(time.sleep, 60)
+        other = worker.pool.submit(time.sleep, 60)
+        stuck_payload = _claim_running(worker, stuck, 'Mayfair',
+                                       claimed_at=time.time() - voxmill_worker.JOB_MAX_RUNTIME - 1)
+        _claim_running(worker, other, 'Chelsea')
+
+        worker.heartbeat()
+        wait([stuck, other], timeout=30)
+        for future in [f for f in list(worker.running) if f.done()]:
+            worker.handle_done(future)
+    finally:
+        worker.pool.shutdown(wait=False)
+
+    dead = [json.loads(p) for p in worker.redis.lrange(DEAD_LETTER_KEY, 0, -1)]
+    assert [job['area'] for job in dead] == ['Mayfair']
+    assert worker.redis.zscore(LEASES_KEY, stuck_payload) is None
+
+    # The innocent job comes back without losing an attempt
+    requeued = json.loads(worker.redis.lindex(PRIORITY_LANES['default'], 0))
+    assert requeued['area'] == 'Chelsea' and requeued['attempts'] == 0
+    assert worker.pool_broken and not worker.running
+    assert worker.stats['timed_out'] == 1
@@ -14,6 +14,10 @@ CRITICAL FEATURES:
 3. Airtable preferences applied immediately (read fresh every run)
 4. MongoDB syncs automatically during batch (backup/cache)
 5. Complete audit trail of every execution
+6. Concurrent batch: client pipelines on a process pool, shared regions
+   collected/analyzed once, checkpointed so a crashed batch resumes
+7. Library-mode stages: analysis + PDF run in-process on in-memory dicts
+   (VOXMILL_PIPELINE_SUBPROCESS=1 restores subprocess isolation)
 """
 
 import os
@@ -26,7 +30,11 @@ from pathlib import Path
 from uuid import uuid4
 import shutil
 import time
-from pymongo import MongoClient
+import copy
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from app.mongo_pool import get_mongo_client
 import gridfs
 
 # Configure logging
@@ -38,6 +46,11 @@ logger = logging.getLogger(__name__)
 
 # ✅ Environment variables (UPDATED FOR CONTROL PLANE)
 MONGODB_URI = os.getenv('MONGODB_URI')
+REGION_COLLECTION_WORKERS = int(os.getenv('REGION_COLLECTION_WORKERS', '4'))
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', str(os.cpu_count() or 2)))
+BATCH_STATE_DIR = Path(os.getenv('VOXMILL_BATCH_DIR', '/tmp/voxmill_batch'))
+PIPELINE_SUBPROCESS = os.getenv('VOXMILL_PIPELINE_SUBPROCESS', 'false').lower() in ('1', 'true', 'yes')
+PDF_TEMPLATE_DIR = os.getenv('VOXMILL_TEMPLATE_DIR', '/opt/render/project/src')
 AIRTABLE_API_KEY = os.getenv('AIRTABLE_API_KEY')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID', 'apptsyINaEjzWgCha')
 
@@ -48,7 +61,7 @@ PREFERENCES_TABLE = 'Preferences'
 MARKETS_TABLE = 'Markets'
 
 # MongoDB connection
-mongo_client = MongoClient(MONGODB_URI) if MONGODB_URI else None
+mongo_client = get_mongo_client()
 db = mongo_client['Voxmill'] if mongo_client else None
 
 
@@ -420,6 +433,10 @@ class ExecutionWorkspace:
         regions_str = '_'.join(regions[:3])  # Max 3 regions in filename
         self.pdf_file = self.workspace / f"Voxmill_{client['city']}_{regions_str}_Intelligence.pdf"
         
+        # In-memory stage outputs (library mode passes dicts, not files)
+        self.raw_data = None
+        self.analysis = None
+        
         # Metadata
         self.client = client
         self.regions = regions
@@ -446,6 +463,20 @@ class ExecutionWorkspace:
         except Exception as e:
             logger.error(f"   ⚠️  Workspace cleanup failed: {e}")
     
+    def write_stage_files(self):
+        """Materialise in-memory stage outputs (subprocess stages / shared batch inputs)"""
+        for data, path in ((self.raw_data, self.raw_data_file), (self.analysis, self.analysis_file)):
+            if data is not None:
+                with open(path, 'w') as f:
+                    json.dump(data, f, default=str)
+    
+    def get_analysis(self) -> dict:
+        """Analysis dict from memory, or from the file a subprocess stage wrote"""
+        if self.analysis is None:
+            with open(self.analysis_file, 'r') as f:
+                self.analysis = json.load(f)
+        return self.analysis
+    
     def get_env_vars(self) -> dict:
         """Get environment variables for child processes"""
         return {
@@ -458,17 +489,84 @@ class ExecutionWorkspace:
         }
 
 
+# ============================================================================
+# LIBRARY-MODE STAGES
+# ============================================================================
+
+def warm_pipeline_imports() -> bool:
+    """
+    Import the analysis + PDF stacks once per process (pool initializer)
+    
+    ai_analyzer, Jinja2 and WeasyPrint take seconds to import; paying that
+    per worker instead of per client is most of the library-mode win.
+    
+    Returns: True if both stages can run in-process
+    """
+    started = time.monotonic()
+    try:
+        import ai_analyzer  # noqa: F401
+        import pdf_generator  # noqa: F401
+    except Exception as e:
+        logger.warning(f"⚠️  In-process pipeline unavailable ({e}) - stages will use subprocesses")
+        return False
+    
+    try:
+        # Compile the report template + parse stylesheets into the render cache up front
+        generator = get_pdf_generator()
+        generator.jinja_env.get_template('voxmill_report.html')
+        pdf_generator.render_cache.stylesheets(generator.template_dir)
+    except Exception as e:
+        logger.warning(f"⚠️  PDF template not pre-loaded: {e}")
+    
+    logger.info(f"   🔥 Pipeline imports warm ({time.monotonic() - started:.1f}s, pid {os.getpid()})")
+    return True
+
+
+_library_mode = None
+_pdf_generator = None
+
+
+def get_pdf_generator():
+    """
+    Per-process VoxmillPDFGenerator (Jinja environment + template cache kept warm)
+    
+    Stages in one process run one at a time, so callers point output_dir and
+    preferences at their own workspace before generating.
+    """
+    global _pdf_generator
+    if _pdf_generator is None:
+        from pdf_generator import VoxmillPDFGenerator
+        _pdf_generator = VoxmillPDFGenerator(template_dir=PDF_TEMPLATE_DIR)
+    return _pdf_generator
+
+
+def _use_library_mode() -> bool:
+    """In-process stages unless subprocess isolation is requested (or imports fail)"""
+    global _library_mode
+    if PIPELINE_SUBPROCESS:
+        return False
+    if _library_mode is None:
+        _library_mode = warm_pipeline_imports()
+    return _library_mode
+
+
 # ============================================================================
 # MULTI-REGION DATA COLLECTION
 # ============================================================================
 
-def run_multi_region_data_collection(workspace: ExecutionWorkspace) -> bool:
+def _region_slug(region: str) -> str:
+    """Filesystem-safe region name for shared batch files"""
+    return ''.join(c if c.isalnum() else '_' for c in region.lower())
+
+
+def run_multi_region_data_collection(workspace: ExecutionWorkspace, region_cache_dir: Path = None) -> bool:
     """
     Step 1: Collect data for ALL client regions
     Combines properties from multiple areas into single dataset
     
     Args:
         workspace: Execution workspace
+        region_cache_dir: Batch dir of pre-collected region datasets (reused instead of reloading)
     
     Returns: True if successful
     """
@@ -489,16 +587,21 @@ def run_multi_region_data_collection(workspace: ExecutionWorkspace) -> bool:
             logger.warning("   ⚠️  No regions configured for this client - using 'London' as default")
             workspace.regions = ['London']
         
-        # Collect data for each region
-        for i, region in enumerate(workspace.regions, 1):
-            logger.info(f"\n   [{i}/{len(workspace.regions)}] Collecting data for: {region}, {workspace.city}")
-            
+        def _collect_region(region: str) -> dict:
+            """Load one region; never raises so one bad region can't sink the batch"""
+            started = time.monotonic()
             try:
-                dataset = load_dataset(
-                    area=region,
-                    max_properties=100,
-                    industry='real_estate'  # ✅ FIX: Added industry parameter
-                )
+                cached_file = region_cache_dir / f"{_region_slug(region)}.json" if region_cache_dir else None
+                
+                if cached_file is not None and cached_file.exists():
+                    with open(cached_file) as f:
+                        dataset = json.load(f)
+                else:
+                    dataset = load_dataset(
+                        area=region,
+                        max_properties=100,
+                        industry='real_estate'  # ✅ FIX: Added industry parameter
+                    )
                 
                 properties = dataset.get('properties', [])
                 
@@ -507,14 +610,40 @@ def run_multi_region_data_collection(workspace: ExecutionWorkspace) -> bool:
                     prop['source_region'] = region
                     prop['area'] = region
                 
-                all_properties.extend(properties)
-                region_stats[region] = len(properties)
-                
-                logger.info(f"      ✅ {len(properties)} properties from {region}")
+                return {
+                    'properties': properties,
+                    'status': 'ok' if properties else 'empty',
+                    'data_source': dataset.get('metadata', {}).get('data_source', 'unknown'),
+                    'seconds': round(time.monotonic() - started, 2)
+                }
             
             except Exception as e:
-                logger.error(f"      ❌ {region} collection failed: {e}")
-                region_stats[region] = 0
+                return {
+                    'properties': [],
+                    'status': 'failed',
+                    'error': str(e),
+                    'seconds': round(time.monotonic() - started, 2)
+                }
+        
+        # Collect all regions concurrently (per-source caps + circuit breaker live in dataset_loader)
+        workers = max(1, min(REGION_COLLECTION_WORKERS, len(workspace.regions)))
+        logger.info(f"\n   Collecting {len(workspace.regions)} region(s) for {workspace.city} ({workers} parallel)")
+        
+        collection_started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='region-collect') as pool:
+            results = list(pool.map(_collect_region, workspace.regions))
+        collection_seconds = round(time.monotonic() - collection_started, 2)
+        
+        # Merge in configured region order so the combined dataset is deterministic
+        for i, (region, result) in enumerate(zip(workspace.regions, results), 1):
+            properties = result.pop('properties')
+            all_properties.extend(properties)
+            region_stats[region] = {'count': len(properties), **result}
+            
+            if result['status'] == 'failed':
+                logger.error(f"      [{i}/{len(workspace.regions)}] ❌ {region} collection failed after {result['seconds']}s: {result['error']}")
+            else:
+                logger.info(f"      [{i}/{len(workspace.regions)}] ✅ {len(properties)} properties from {region} ({result['seconds']}s)")
         
         # Check if we got any data
         if len(all_properties) == 0:
@@ -533,20 +662,23 @@ def run_multi_region_data_collection(workspace: ExecutionWorkspace) -> bool:
                 'city': workspace.city,
                 'timestamp': datetime.now(timezone.utc).isoformat(),
                 'client_name': workspace.client['name'],
-                'region_stats': region_stats
+                'region_stats': region_stats,
+                'partial': any(stats['status'] != 'ok' for stats in region_stats.values()),
+                'collection_seconds': collection_seconds
             },
             'raw_data': {
                 'properties': all_properties
             }
         }
         
-        with open(workspace.raw_data_file, 'w') as f:
-            json.dump(raw_data, f, indent=2)
+        workspace.raw_data = raw_data
+        if not _use_library_mode():
+            workspace.write_stage_files()
         
         logger.info(f"\n   ✅ Multi-region data collection complete")
-        logger.info(f"      Total properties: {len(all_properties)}")
-        for region, count in region_stats.items():
-            logger.info(f"      {region}: {count} properties")
+        logger.info(f"      Total properties: {len(all_properties)} in {collection_seconds}s")
+        for region, stats in region_stats.items():
+            logger.info(f"      {region}: {stats['count']} properties ({stats['status']}, {stats['seconds']}s)")
         
         return True
         
@@ -562,7 +694,24 @@ def run_ai_analysis(workspace: ExecutionWorkspace) -> bool:
     logger.info("STEP 2: AI ANALYSIS (MULTI-REGION)")
     logger.info("="*70)
     
+    if _use_library_mode():
+        try:
+            from ai_analyzer import analyze_dataset
+            
+            if workspace.raw_data is None:
+                with open(workspace.raw_data_file, 'r') as f:
+                    workspace.raw_data = json.load(f)
+            
+            workspace.analysis = analyze_dataset(workspace.raw_data)
+            logger.info(f"   ✅ Analysis complete (in-process): {len(workspace.analysis.get('properties', []))} properties scored")
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ AI analysis error: {e}", exc_info=True)
+            return False
+    
     try:
+        workspace.write_stage_files()
         cmd = [sys.executable, 'ai_analyzer.py']
         
         result = subprocess.run(
@@ -613,29 +762,21 @@ def run_pdf_generation(workspace: ExecutionWorkspace) -> bool:
         logger.info(f"   📋 Report Depth: {client['report_depth']}")
         logger.info(f"   🗺️  Regions: {', '.join(workspace.regions)}")
         
-        # Build command with preference flags
-        pdf_cmd = [
-            sys.executable, 'pdf_generator.py',
-            '--workspace', str(workspace.workspace),
-            '--output', workspace.pdf_file.name,
-            '--competitor-focus', client['competitor_focus'],
-            '--report-depth', client['report_depth']
-        ]
-        
-        # Execute
-        result = subprocess.run(
-            pdf_cmd,
-            env=workspace.get_env_vars(),
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-        
-        if result.returncode != 0:
-            logger.error(f"❌ PDF generation failed:")
-            logger.error(f"   STDOUT: {result.stdout[-500:]}")
-            logger.error(f"   STDERR: {result.stderr[-500:]}")
-            return False
+        if _use_library_mode():
+            generator = get_pdf_generator()
+            generator.output_dir = workspace.workspace
+            generator.data_path = workspace.analysis_file
+            generator.competitor_focus = client['competitor_focus']
+            generator.report_depth = client['report_depth']
+            
+            # Rendering annotates the dict - keep the stored analysis clean for MongoDB
+            generator.generate(
+                output_filename=workspace.pdf_file.name,
+                data=copy.deepcopy(workspace.get_analysis())
+            )
+        else:
+            if not _run_pdf_subprocess(workspace):
+                return False
         
         if not workspace.pdf_file.exists():
             logger.error(f"❌ PDF not created: {workspace.pdf_file}")
@@ -661,6 +802,38 @@ def run_pdf_generation(workspace: ExecutionWorkspace) -> bool:
         return False
 
 
+def _run_pdf_subprocess(workspace: ExecutionWorkspace) -> bool:
+    """Subprocess-isolated PDF stage (opt-in fallback)"""
+    client = workspace.client
+    workspace.write_stage_files()
+    
+    # Build command with preference flags
+    pdf_cmd = [
+        sys.executable, 'pdf_generator.py',
+        '--workspace', str(workspace.workspace),
+        '--output', workspace.pdf_file.name,
+        '--competitor-focus', client['competitor_focus'],
+        '--report-depth', client['report_depth']
+    ]
+    
+    # Execute
+    result = subprocess.run(
+        pdf_cmd,
+        env=workspace.get_env_vars(),
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    
+    if result.returncode != 0:
+        logger.error(f"❌ PDF generation failed:")
+        logger.error(f"   STDOUT: {result.stdout[-500:]}")
+        logger.error(f"   STDERR: {result.stderr[-500:]}")
+        return False
+    
+    return True
+
+
 def upload_pdf_to_r2(workspace: ExecutionWorkspace) -> str:
     """
     Step 4: Upload PDF to Cloudflare R2
@@ -712,9 +885,8 @@ def save_to_mongodb(workspace: ExecutionWorkspace, pdf_url: str = None) -> bool:
         
         db = mongo_client['Voxmill']
         
-        # Load analysis JSON
-        with open(workspace.analysis_file, 'r') as f:
-            analysis = json.load(f)
+        # Analysis from the in-process stage (or the subprocess output file)
+        analysis = dict(workspace.get_analysis())
         
         # Add PDF metadata
         if pdf_url:
@@ -861,19 +1033,32 @@ def log_execution(workspace: ExecutionWorkspace, status: str, steps_completed: l
 # MAIN PIPELINE
 # ============================================================================
 
-def execute_client_pipeline(client: dict) -> dict:
+@contextmanager
+def _stage_timer(timings: dict, stage: str):
+    """Record wall-clock seconds for one pipeline stage (even if it raises)"""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        timings[stage] = round(time.monotonic() - started, 2)
+
+
+def execute_client_pipeline(client: dict, shared_inputs: dict = None) -> dict:
     """
     Execute complete pipeline for ONE client
     Handles multiple regions in single PDF
     
     Args:
         client: Client dict from Airtable
+        shared_inputs: Pre-built raw data + analysis files for this client's
+            region set (batch mode) - skips collection and analysis
     
     Returns: Dict with execution results
     """
     
     workspace = None
     steps_completed = []
+    timings = {}
     pdf_url = None
     
     try:
@@ -893,36 +1078,60 @@ def execute_client_pipeline(client: dict) -> dict:
         logger.info(f"   Preferences: {client['competitor_focus']}, {client['report_depth']}")
         logger.info("="*70)
         
-        # Step 1: Multi-region data collection
-        if not run_multi_region_data_collection(workspace):
-            raise Exception("Multi-region data collection failed")
-        steps_completed.append('multi_region_data_collection')
-        
-        # Step 2: AI Analysis
-        if not run_ai_analysis(workspace):
-            raise Exception("AI analysis failed")
-        steps_completed.append('ai_analysis')
+        if shared_inputs:
+            # Steps 1-2 already ran once for this region set (batch mode)
+            with _stage_timer(timings, 'shared_inputs'):
+                if _use_library_mode():
+                    with open(shared_inputs['analysis_file'], 'r') as f:
+                        workspace.analysis = json.load(f)
+                else:
+                    shutil.copy(shared_inputs['raw_data_file'], workspace.raw_data_file)
+                    shutil.copy(shared_inputs['analysis_file'], workspace.analysis_file)
+            logger.info(f"   ♻️  Reusing shared data + analysis for {', '.join(client['regions'])}")
+            steps_completed.extend(['multi_region_data_collection', 'ai_analysis'])
+        else:
+            # Step 1: Multi-region data collection
+            with _stage_timer(timings, 'data_collection'):
+                collected = run_multi_region_data_collection(workspace)
+            if not collected:
+                raise Exception("Multi-region data collection failed")
+            steps_completed.append('multi_region_data_collection')
+            
+            # Step 2: AI Analysis
+            with _stage_timer(timings, 'ai_analysis'):
+                analyzed = run_ai_analysis(workspace)
+            if not analyzed:
+                raise Exception("AI analysis failed")
+            steps_completed.append('ai_analysis')
         
         # Step 3: PDF Generation
-        if not run_pdf_generation(workspace):
+        with _stage_timer(timings, 'pdf_generation'):
+            generated = run_pdf_generation(workspace)
+        if not generated:
             raise Exception("PDF generation failed")
         steps_completed.append('pdf_generation')
         
         # Step 4: Upload to R2
-        pdf_url = upload_pdf_to_r2(workspace)
+        with _stage_timer(timings, 'r2_upload'):
+            pdf_url = upload_pdf_to_r2(workspace)
         if pdf_url:
             steps_completed.append('r2_upload')
         
         # Step 5: Save to MongoDB
-        if save_to_mongodb(workspace, pdf_url):
+        with _stage_timer(timings, 'mongodb_save'):
+            saved = save_to_mongodb(workspace, pdf_url)
+        if saved:
             steps_completed.append('mongodb_save')
         
         # Step 6: Send Email
-        if send_email(workspace, pdf_url):
+        with _stage_timer(timings, 'email'):
+            emailed = send_email(workspace, pdf_url)
+        if emailed:
             steps_completed.append('email_sent')
         
         # Step 7: Sync client to MongoDB
-        sync_client_to_mongodb(client)
+        with _stage_timer(timings, 'mongodb_sync'):
+            sync_client_to_mongodb(client)
         steps_completed.append('mongodb_sync')
         
         # Log success
@@ -945,7 +1154,8 @@ def execute_client_pipeline(client: dict) -> dict:
             'exec_id': workspace.exec_id,
             'regions': client['regions'],
             'pdf_url': pdf_url,
-            'steps_completed': steps_completed
+            'steps_completed': steps_completed,
+            'timings': timings
         }
     
     except Exception as e:
@@ -960,7 +1170,8 @@ def execute_client_pipeline(client: dict) -> dict:
             'client_email': client.get('email', 'Unknown'),
             'error': str(e),
             'exec_id': workspace.exec_id if workspace else None,
-            'steps_completed': steps_completed
+            'steps_completed': steps_completed,
+            'timings': timings
         }
     
     finally:
@@ -972,15 +1183,167 @@ def execute_client_pipeline(client: dict) -> dict:
 # BATCH PROCESSING
 # ============================================================================
 
+class BatchCheckpoint:
+    """
+    Progress file for one batch run (resume after a crash)
+    
+    Records collected regions, shared analyses and finished clients. Only the
+    parent process writes it; every write is atomic (tmp file + rename).
+    """
+    
+    def __init__(self, batch_id: str):
+        self.batch_id = batch_id
+        self.dir = BATCH_STATE_DIR / batch_id
+        self.region_dir = self.dir / 'regions'
+        self.analysis_dir = self.dir / 'analyses'
+        self.path = self.dir / 'checkpoint.json'
+        
+        self.region_dir.mkdir(parents=True, exist_ok=True)
+        self.analysis_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.state = {
+            'batch_id': batch_id,
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'regions': {},
+            'analyses': {},
+            'clients': {}
+        }
+        
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    self.state.update(json.load(f))
+                logger.info(f"♻️  Resuming batch {batch_id}: {len(self.completed_clients())} client(s) already done")
+            except Exception as e:
+                logger.warning(f"⚠️  Checkpoint unreadable ({e}) - starting batch {batch_id} fresh")
+    
+    @staticmethod
+    def client_key(client: dict) -> str:
+        return f"{client['name']}|{client['email']}"
+    
+    def completed_clients(self) -> set:
+        return {key for key, result in self.state['clients'].items() if result.get('success')}
+    
+    def record(self, section: str, key: str, value):
+        self.state[section][key] = value
+        self.save()
+    
+    def save(self):
+        self.state['updated_at'] = datetime.now(timezone.utc).isoformat()
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=2, default=str)
+        os.replace(tmp_path, self.path)
+
+
+def _region_set_key(client: dict) -> str:
+    """Clients with the same city + region list share data and analysis"""
+    return _region_slug(client['city']) + '__' + '__'.join(_region_slug(r) for r in client['regions'])
+
+
+def _prefetch_region(region: str, region_dir: Path) -> dict:
+    """Collect one region for the whole batch (runs in the parent, threaded)"""
+    sys.path.insert(0, '/opt/render/project/src')
+    from app.dataset_loader import load_dataset
+    
+    started = time.monotonic()
+    dataset = load_dataset(area=region, max_properties=100, industry='real_estate')
+    
+    out_file = region_dir / f"{_region_slug(region)}.json"
+    with open(out_file, 'w') as f:
+        json.dump({
+            'properties': dataset.get('properties', []),
+            'metadata': {'data_source': dataset.get('metadata', {}).get('data_source', 'unknown')}
+        }, f, default=str)
+    
+    return {
+        'file': str(out_file),
+        'count': len(dataset.get('properties', [])),
+        'seconds': round(time.monotonic() - started, 2)
+    }
+
+
+def build_shared_analysis(city: str, regions: list, region_dir: str, out_dir: str) -> dict:
+    """
+    Steps 1-2 once for a region set (runs in a pool worker)
+    
+    Returns: Dict with shared file paths + timings (or success False)
+    """
+    timings = {}
+    workspace = ExecutionWorkspace(
+        client={'name': f"shared_{city}", 'email': '', 'city': city},
+        regions=regions
+    )
+    
+    try:
+        with _stage_timer(timings, 'data_collection'):
+            collected = run_multi_region_data_collection(workspace, region_cache_dir=Path(region_dir))
+        if not collected:
+            return {'success': False, 'error': 'data collection failed', 'timings': timings}
+        
+        with _stage_timer(timings, 'ai_analysis'):
+            analyzed = run_ai_analysis(workspace)
+        if not analyzed:
+            return {'success': False, 'error': 'AI analysis failed', 'timings': timings}
+        
+        out_path = Path(out_dir)
+        out_path.mkdir(parents=True, exist_ok=True)
+        workspace.write_stage_files()
+        shutil.copy(workspace.raw_data_file, out_path / workspace.raw_data_file.name)
+        shutil.copy(workspace.analysis_file, out_path / workspace.analysis_file.name)
+        
+        return {
+            'success': True,
+            'raw_data_file': str(out_path / workspace.raw_data_file.name),
+            'analysis_file': str(out_path / workspace.analysis_file.name),
+            'timings': timings
+        }
+    
+    finally:
+        workspace.cleanup(keep_pdf=False)
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def build_timing_report(phase_timings: dict, stage_samples: dict) -> dict:
+    """Per-phase wall clock + per-stage count/total/mean/p95/max seconds"""
+    stages = {}
+    for stage, samples in stage_samples.items():
+        if not samples:
+            continue
+        ordered = sorted(samples)
+        stages[stage] = {
+            'count': len(ordered),
+            'total': round(sum(ordered), 2),
+            'mean': round(sum(ordered) / len(ordered), 2),
+            'p95': round(_percentile(ordered, 0.95), 2),
+            'max': round(ordered[-1], 2)
+        }
+    
+    return {'phases': phase_timings, 'stages': stages}
+
+
 def process_all_clients():
     """
     Batch mode: Process ALL active clients from Airtable
+    
+    1. Collect every distinct region once (threaded)
+    2. Build data + AI analysis once per distinct region set (process pool)
+    3. Run per-client PDF/upload/email pipelines concurrently (process pool)
+    
+    Progress is checkpointed under VOXMILL_BATCH_DIR/<batch id>; rerunning
+    the same batch (VOXMILL_BATCH_ID, default today's UTC date) skips
+    clients that already succeeded.
     """
     
     logger.info("\n" + "="*70)
     logger.info("🔄 BATCH MODE: PROCESSING ALL ACTIVE CLIENTS")
     logger.info("="*70)
     
+    batch_started = time.monotonic()
+    
     # Load clients from Airtable (source of truth)
     clients = load_clients_from_airtable()
     
@@ -993,45 +1356,157 @@ def process_all_clients():
         logger.error("❌ No clients found in Airtable or MongoDB")
         return {'success': 0, 'failed': 0, 'total': 0}
     
-    logger.info(f"\n📋 Processing {len(clients)} client(s)")
+    for client in clients:
+        # Same default the collection step applies, so region sets match
+        if not client.get('regions'):
+            client['regions'] = ['London']
+    
+    batch_id = os.getenv('VOXMILL_BATCH_ID') or datetime.now(timezone.utc).strftime('%Y%m%d')
+    checkpoint = BatchCheckpoint(batch_id)
+    completed = checkpoint.completed_clients()
+    pending = [c for c in clients if BatchCheckpoint.client_key(c) not in completed]
+    
+    logger.info(f"\n📋 Processing {len(pending)} client(s) (batch {batch_id}, {len(clients) - len(pending)} resumed)")
     logger.info("="*70)
     
     stats = {
         'success': 0,
         'failed': 0,
+        'resumed': len(clients) - len(pending),
         'total': len(clients),
         'results': []
     }
+    phase_timings = {}
+    stage_samples = {}
     
-    # Process each client
-    for i, client in enumerate(clients, 1):
-        logger.info(f"\n[{i}/{len(clients)}] Processing: {client['name']}")
-        logger.info(f"   Email: {client['email']}")
-        logger.info(f"   Regions: {', '.join(client['regions'])}")
-        logger.info(f"   City: {client['city']}")
-        logger.info(f"   Preferences: {client['competitor_focus']}, {client['report_depth']}")
+    def _add_samples(timings: dict):
+        for stage, seconds in (timings or {}).items():
+            stage_samples.setdefault(stage, []).append(seconds)
+    
+    # ------------------------------------------------------------------
+    # PHASE 1: each distinct region collected once
+    # ------------------------------------------------------------------
+    phase_started = time.monotonic()
+    
+    regions = sorted({region for client in pending for region in client['regions']})
+    to_fetch = [r for r in regions if r not in checkpoint.state['regions']]
+    
+    if to_fetch:
+        logger.info(f"\n🗺️  Collecting {len(to_fetch)} distinct region(s) for {len(pending)} client(s)")
+        with ThreadPoolExecutor(max_workers=max(1, min(REGION_COLLECTION_WORKERS, len(to_fetch))),
+                                thread_name_prefix='batch-region') as pool:
+            futures = {pool.submit(_prefetch_region, region, checkpoint.region_dir): region for region in to_fetch}
+            
+            for future in as_completed(futures):
+                region = futures[future]
+                try:
+                    info = future.result()
+                    checkpoint.record('regions', region, info)
+                    _add_samples({'region_prefetch': info['seconds']})
+                    logger.info(f"   ✅ {region}: {info['count']} properties ({info['seconds']}s)")
+                except Exception as e:
+                    # Left out of the cache - the analysis step loads it directly
+                    logger.error(f"   ❌ {region} prefetch failed: {e}")
+    
+    phase_timings['region_prefetch'] = round(time.monotonic() - phase_started, 2)
+    
+    workers = max(1, min(BATCH_WORKERS, len(pending) or 1))
+    mp_context = multiprocessing.get_context('spawn')  # Fresh Mongo/HTTP clients per worker
+    
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                             initializer=_use_library_mode) as pool:
+        
+        # ------------------------------------------------------------------
+        # PHASE 2: data + analysis once per distinct region set
+        # ------------------------------------------------------------------
+        phase_started = time.monotonic()
+        
+        region_sets = {}
+        for client in pending:
+            region_sets.setdefault(_region_set_key(client), client)
+        
+        futures = {}
+        for key, client in region_sets.items():
+            shared = checkpoint.state['analyses'].get(key)
+            if shared and Path(shared['analysis_file']).exists():
+                continue
+            futures[pool.submit(
+                build_shared_analysis,
+                client['city'],
+                client['regions'],
+                str(checkpoint.region_dir),
+                str(checkpoint.analysis_dir / key)
+            )] = key
+        
+        if futures:
+            logger.info(f"\n🧠 Analyzing {len(futures)} distinct region set(s) on {workers} worker(s)")
+        
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                shared = future.result()
+            except Exception as e:
+                shared = {'success': False, 'error': str(e)}
+            
+            _add_samples(shared.get('timings'))
+            if shared['success']:
+                checkpoint.record('analyses', key, shared)
+                logger.info(f"   ✅ Shared analysis ready: {key}")
+            else:
+                # Clients in this set fall back to running every step themselves
+                logger.warning(f"   ⚠️  Shared analysis failed for {key}: {shared.get('error')}")
         
-        try:
-            result = execute_client_pipeline(client)
+        phase_timings['shared_analysis'] = round(time.monotonic() - phase_started, 2)
+        
+        # ------------------------------------------------------------------
+        # PHASE 3: per-client pipelines
+        # ------------------------------------------------------------------
+        phase_started = time.monotonic()
+        
+        futures = {}
+        for client in pending:
+            logger.info(f"\n   Queued: {client['name']} <{client['email']}> - {', '.join(client['regions'])}, {client['city']}")
+            shared = checkpoint.state['analyses'].get(_region_set_key(client))
+            futures[pool.submit(execute_client_pipeline, client, shared)] = client
+        
+        for i, future in enumerate(as_completed(futures), 1):
+            client = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker crashed (e.g. BrokenProcessPool) - retried on resume
+                logger.error(f"   ❌ Exception: {e}\n", exc_info=True)
+                result = {
+                    'success': False,
+                    'client_name': client['name'],
+                    'client_email': client['email'],
+                    'error': str(e)
+                }
             
             if result['success']:
                 stats['success'] += 1
-                logger.info(f"   ✅ Complete\n")
+                logger.info(f"[{i}/{len(pending)}] ✅ Complete: {client['name']}")
             else:
                 stats['failed'] += 1
-                logger.error(f"   ❌ Failed: {result.get('error')}\n")
+                logger.error(f"[{i}/{len(pending)}] ❌ Failed: {client['name']} - {result.get('error')}")
             
+            _add_samples(result.get('timings'))
             stats['results'].append(result)
+            checkpoint.record('clients', BatchCheckpoint.client_key(client), result)
         
-        except Exception as e:
-            stats['failed'] += 1
-            logger.error(f"   ❌ Exception: {e}\n", exc_info=True)
-            stats['results'].append({
-                'success': False,
-                'client_name': client['name'],
-                'client_email': client['email'],
-                'error': str(e)
-            })
+        phase_timings['client_pipelines'] = round(time.monotonic() - phase_started, 2)
+    
+    phase_timings['total'] = round(time.monotonic() - batch_started, 2)
+    
+    # Timing report
+    report = build_timing_report(phase_timings, stage_samples)
+    stats['timing_report'] = report
+    
+    try:
+        with open(checkpoint.dir / 'timing_report.json', 'w') as f:
+            json.dump(report, f, indent=2)
+    except Exception as e:
+        logger.warning(f"⚠️  Timing report not written: {e}")
     
     # Final summary
     logger.info("\n" + "="*70)
@@ -1039,7 +1514,11 @@ def process_all_clients():
     logger.info("="*70)
     logger.info(f"   ✅ Success: {stats['success']}")
     logger.info(f"   ❌ Failed: {stats['failed']}")
+    logger.info(f"   ♻️  Resumed: {stats['resumed']}")
     logger.info(f"   📊 Total: {stats['total']}")
+    logger.info(f"   ⏱️  Phases: " + ', '.join(f"{name} {seconds}s" for name, seconds in phase_timings.items()))
+    for stage, row in report['stages'].items():
+        logger.info(f"      {stage:<22} n={row['count']:<4} mean {row['mean']}s  p95 {row['p95']}s  max {row['max']}s  total {row['total']}s")
     logger.info("="*70)
     
     return stats
@@ -1062,6 +1541,7 @@ def main():
     print("✅ Airtable Primary + MongoDB Batch Sync", flush=True)
     print("✅ Multi-Region Support (1 PDF with all regions)", flush=True)
     print("✅ Individual Tailoring (separate PDFs per client)", flush=True)
+    print(f"✅ Concurrent Batch ({BATCH_WORKERS} workers, resumable)", flush=True)
     print("="*70, flush=True)
     
     # Run batch processing
@@ -1,70 +1,418 @@
 """
 Voxmill Queue Worker
-Processes PDF generation jobs from Redis queue sequentially
+Processes PDF generation jobs from Redis priority lanes concurrently
+
+FEATURES:
+- Priority lanes: on-demand (high) > default > nightly batch (low)
+- N jobs in parallel on a process pool, each process keeps a warm PDF renderer
+- Visibility timeout: claimed jobs hold a lease; crashed or stalled jobs re-queue
+- Jobs past PDF_JOB_MAX_RUNTIME are killed and dead-lettered, never re-run alongside
+- Dead-letter list after PDF_JOB_MAX_ATTEMPTS
+- Job timing metrics (queue wait, run time) in Redis + periodic log summary
 """
 
 import os
 import sys
 import json
 import time
+import uuid
 import redis
+import signal
 import logging
+import multiprocessing
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 REDIS_URL = os.getenv('REDIS_URL')
 
+# Lanes are drained in this order; 'default' keeps the original queue name for existing producers
+PRIORITY_LANES = {
+    'high': 'voxmill:pdf_jobs:high',
+    'default': 'voxmill:pdf_jobs',
+    'low': 'voxmill:pdf_jobs:low'
+}
+LEASES_KEY = 'voxmill:pdf_jobs:leases'
+DEAD_LETTER_KEY = 'voxmill:pdf_jobs:dead'
+METRICS_KEY = 'voxmill:pdf_jobs:metrics'
+
+PDF_WORKER_CONCURRENCY = int(os.getenv('PDF_WORKER_CONCURRENCY', str(os.cpu_count() or 2)))
+VISIBILITY_TIMEOUT = int(os.getenv('PDF_JOB_VISIBILITY_TIMEOUT', '300'))   # Lease length, renewed while running
+JOB_MAX_RUNTIME = int(os.getenv('PDF_JOB_MAX_RUNTIME', '900'))             # Kill + dead-letter after this
+MAX_ATTEMPTS = int(os.getenv('PDF_JOB_MAX_ATTEMPTS', '3'))
+HEARTBEAT_INTERVAL = 30
+REAP_INTERVAL = 10
+POLL_INTERVAL = 1.0
+SUMMARY_INTERVAL = 300
+
+# Pop the first job from the highest non-empty lane and lease it atomically.
+# KEYS: lanes (priority order)..., leases   ARGV: lease deadline
+_CLAIM_LUA = """
+local leases = KEYS[#KEYS]
+for i = 1, #KEYS - 1 do
+    local job = redis.call('RPOP', KEYS[i])
+    if job then
+        redis.call('ZADD', leases, ARGV[1], job)
+        return job
+    end
+end
+return false
+"""
+
+# Move a leased job back to a lane (or dead-letter) - only once, whoever holds the lease.
+# KEYS: leases, target list   ARGV: leased payload, new payload
+_REQUEUE_LUA = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 1 then
+    redis.call('RPUSH', KEYS[2], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+# ============================================================
+# PRODUCER
+# ============================================================
+
+def enqueue_pdf_job(client, job: dict, priority: str = 'default') -> str:
+    """
+    Queue a PDF job on a priority lane
+
+    Args:
+        client: redis client (decode_responses=True)
+        job: {'regions' or 'area', 'city', 'client_name', 'client_email', ...}
+        priority: 'high' (on-demand request), 'default', or 'low' (batch)
+
+    Returns: Job ID
+    """
+    if priority not in PRIORITY_LANES:
+        priority = 'default'
+
+    job = {
+        **job,
+        'id': job.get('id') or uuid.uuid4().hex,
+        'priority': priority,
+        'enqueued_at': time.time(),
+        'attempts': 0
+    }
+    client.lpush(PRIORITY_LANES[priority], json.dumps(job))
+    return job['id']
+
+
+# ============================================================
+# JOB EXECUTION (pool processes)
+# ============================================================
+
+def _init_worker_process():
+    """Warm the analysis + PDF stack once per pool process"""
+    import voxmill_master
+    voxmill_master.warm_pipeline_imports()
+
+
+def run_pdf_job(job: dict) -> dict:
+    """Run one client pipeline in a pool process"""
+    import voxmill_master
+
+    regions = job.get('regions') or [job.get('area', 'Mayfair')]
+    client = {
+        'name': job.get('client_name', 'Client'),
+        'email': job.get('client_email', 'none'),
+        'whatsapp_number': job.get('whatsapp_number'),
+        'city': job.get('city', 'London'),
+        'regions': regions,
+        'competitor_focus': job.get('competitor_focus', 'medium'),
+        'report_depth': job.get('report_depth', 'detailed')
+    }
+
+    started = time.monotonic()
+    result = voxmill_master.execute_client_pipeline(client)
+    result['run_seconds'] = round(time.monotonic() - started, 2)
+    return result
+
+
+# ============================================================
+# WORKER
+# ============================================================
+
+class PDFJobWorker:
+    """Claims leased jobs from the priority lanes and runs them on a process pool"""
+
+    def __init__(self, redis_client, concurrency: int = PDF_WORKER_CONCURRENCY):
+        self.redis = redis_client
+        self.concurrency = max(1, concurrency)
+        self.claim_script = redis_client.register_script(_CLAIM_LUA)
+        self.requeue_script = redis_client.register_script(_REQUEUE_LUA)
+        self.pool = None
+        self.running = {}  # future -> (payload, job, claimed_at)
+        self.stopping = False
+        self.pool_broken = False
+        self.pool_killed = False  # Broken on purpose (over-time job) - survivors keep their attempt
+
+        self.stats = {'completed': 0, 'failed': 0, 'requeued': 0, 'dead_lettered': 0, 'timed_out': 0}
+        self.wait_samples = []
+        self.run_samples = []
+
+    def _start_pool(self):
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.concurrency,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker_process
+        )
+
+    # ------------------------------------------------------------
+    # Queue operations
+    # ------------------------------------------------------------
+
+    def claim(self):
+        """Lease the next job by priority (None if every lane is empty)"""
+        lanes = [PRIORITY_LANES[name] for name in ('high', 'default', 'low')]
+        payload = self.claim_script(keys=lanes + [LEASES_KEY], args=[time.time() + VISIBILITY_TIMEOUT])
+        if not payload:
+            return None
+
+        try:
+            job = json.loads(payload)
+        except ValueError:
+            logger.error(f"❌ Unparseable job dropped to dead-letter: {payload[:200]}")
+            self.requeue_script(keys=[LEASES_KEY, DEAD_LETTER_KEY], args=[payload, payload])
+            return None
+
+        return payload, job
+
+    def ack(self, payload: str):
+        self.redis.zrem(LEASES_KEY, payload)
+
+    def requeue(self, payload: str, job: dict, reason: str, count_attempt: bool = True, dead_letter: bool = False):
+        """Put a failed/expired job back on its lane (front), or dead-letter it"""
+        job = {**job, 'attempts': job.get('attempts', 0) + int(count_attempt), 'last_error': reason}
+
+        if dead_letter or job['attempts'] >= MAX_ATTEMPTS:
+            target = DEAD_LETTER_KEY
+            counter = 'dead_lettered'
+        else:
+            target = PRIORITY_LANES.get(job.get('priority'), PRIORITY_LANES['default'])
+            counter = 'requeued'
+
+        if self.requeue_script(keys=[LEASES_KEY, target], args=[payload, json.dumps(job)]):
+            self.stats[counter] += 1
+            self.redis.hincrby(METRICS_KEY, counter, 1)
+            icon = '☠️' if counter == 'dead_lettered' else '🔁'
+            logger.warning(f"{icon} JOB {counter.upper()}: {self._label(job)} (attempt {job['attempts']}/{MAX_ATTEMPTS}: {reason})")
+
+    def reap_expired(self):
+        """Re-queue jobs whose lease lapsed (worker crashed or job stalled)"""
+        expired = self.redis.zrangebyscore(LEASES_KEY, '-inf', time.time(), start=0, num=100)
+        running_here = {payload for payload, _, _ in self.running.values()}
+
+        for payload in expired:
+            if payload in running_here:
+                # Still executing in this worker's pool - a second copy would duplicate the PDF + email
+                self.redis.zadd(LEASES_KEY, {payload: time.time() + VISIBILITY_TIMEOUT}, xx=True)
+                continue
+            try:
+                job = json.loads(payload)
+            except ValueError:
+                job = {}
+            self.requeue(payload, job, 'visibility timeout')
+
+    def enforce_max_runtime(self):
+        """
+        Dead-letter jobs running longer than JOB_MAX_RUNTIME and kill the pool
+
+        A ProcessPoolExecutor call can't be cancelled once started, and losing
+        any child breaks the whole pool - so the pool is killed and restarted.
+        The other in-flight jobs come back as BrokenProcessPool and are
+        re-queued without using up an attempt.
+        """
+        now = time.time()
+        overdue = [future for future, (_, _, claimed_at) in self.running.items()
+                   if now - claimed_at >= JOB_MAX_RUNTIME]
+        if not overdue:
+            return
+
+        for future in overdue:
+            payload, job, claimed_at = self.running.pop(future)
+            self.stats['timed_out'] += 1
+            self.redis.hincrby(METRICS_KEY, 'timed_out', 1)
+            logger.error(f"⏱️ JOB TIMED OUT: {self._label(job)} after {now - claimed_at:.0f}s - killing")
+            self.requeue(payload, job, f"exceeded max runtime ({JOB_MAX_RUNTIME}s)", dead_letter=True)
+
+        self._kill_pool()
+
+    def _kill_pool(self):
+        kill_workers = getattr(self.pool, 'kill_workers', None)  # Python 3.14+
+        if kill_workers:
+            kill_workers()
+        else:
+            for process in list((getattr(self.pool, '_processes', None) or {}).values()):
+                process.kill()
+        self.pool_killed = True
+        self.pool_broken = True
+
+    def heartbeat(self):
+        """Extend leases of jobs still running here (over-time jobs are killed first)"""
+        self.enforce_max_runtime()
+        now = time.time()
+        for payload, job, claimed_at in self.running.values():
+            self.redis.zadd(LEASES_KEY, {payload: now + VISIBILITY_TIMEOUT}, xx=True)
+
+    # ------------------------------------------------------------
+    # Results + metrics
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def _label(job: dict) -> str:
+        regions = job.get('regions') or [job.get('area', 'Unknown')]
+        return f"{', '.join(regions)} → {job.get('client_email', 'none')} [{job.get('priority', 'default')}]"
+
+    def _record_timing(self, job: dict, queue_wait: float, run_seconds: float):
+        self.wait_samples = (self.wait_samples + [queue_wait])[-500:]
+        self.run_samples = (self.run_samples + [run_seconds])[-500:]
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hincrbyfloat(METRICS_KEY, 'queue_wait_seconds_total', queue_wait)
+        pipe.hincrbyfloat(METRICS_KEY, 'run_seconds_total', run_seconds)
+        pipe.hincrby(METRICS_KEY, f"lane:{job.get('priority', 'default')}", 1)
+        pipe.execute()
+
+    def handle_done(self, future):
+        payload, job, claimed_at = self.running.pop(future)
+        queue_wait = max(0.0, claimed_at - job.get('enqueued_at', claimed_at))
+
+        try:
+            result = future.result()
+        except BrokenProcessPool as e:
+            # A crashed child poisons the whole pool - run loop restarts it
+            self.pool_broken = True
+            if self.pool_killed:
+                self.requeue(payload, job, 'pool restarted after a timed-out job', count_attempt=False)
+            else:
+                self.requeue(payload, job, f"worker process crashed: {e}")
+            return
+        except Exception as e:
+            self.requeue(payload, job, str(e))
+            return
+
+        run_seconds = result.get('run_seconds', time.time() - claimed_at)
+        self._record_timing(job, queue_wait, run_seconds)
+
+        if result.get('success'):
+            self.ack(payload)
+            self.stats['completed'] += 1
+            self.redis.hincrby(METRICS_KEY, 'completed', 1)
+            logger.info(f"✅ JOB COMPLETE: {self._label(job)} (wait {queue_wait:.1f}s, run {run_seconds:.1f}s)")
+        else:
+            self.stats['failed'] += 1
+            self.redis.hincrby(METRICS_KEY, 'failed', 1)
+            logger.error(f"❌ JOB FAILED: {self._label(job)} - {result.get('error')}")
+            self.requeue(payload, job, result.get('error') or 'pipeline failed')
+
+    def log_summary(self):
+        def _p(samples, pct):
+            if not samples:
+                return 0.0
+            ordered = sorted(samples)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+        logger.info(
+            f"📊 PDF WORKER: {self.stats} | running {len(self.running)}/{self.concurrency} | "
+            f"wait p50 {_p(self.wait_samples, 0.5):.1f}s p95 {_p(self.wait_samples, 0.95):.1f}s | "
+            f"run p50 {_p(self.run_samples, 0.5):.1f}s p95 {_p(self.run_samples, 0.95):.1f}s"
+        )
+
+    # ------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------
+
+    def run(self):
+        self._start_pool()
+        last_reap = last_heartbeat = last_summary = 0.0
+
+        while not self.stopping or self.running:
+            now = time.monotonic()
+
+            try:
+                if now - last_reap >= REAP_INTERVAL:
+                    self.reap_expired()
+                    last_reap = now
+
+                if now - last_heartbeat >= HEARTBEAT_INTERVAL:
+                    self.heartbeat()
+                    last_heartbeat = now
+
+                if now - last_summary >= SUMMARY_INTERVAL:
+                    self.log_summary()
+                    last_summary = now
+
+                # Fill free slots, highest lane first (not into a broken pool)
+                while not self.stopping and not self.pool_broken and len(self.running) < self.concurrency:
+                    claimed = self.claim()
+                    if claimed is None:
+                        break
+
+                    payload, job = claimed
+                    logger.info(f"\n📋 JOB RECEIVED: {self._label(job)}")
+                    future = self.pool.submit(run_pdf_job, job)
+                    self.running[future] = (payload, job, time.time())
+
+                if self.running:
+                    done, _ = wait(list(self.running), timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.handle_done(future)
+                else:
+                    time.sleep(POLL_INTERVAL)
+
+                if self.pool_broken and not self.running:
+                    logger.error("❌ Worker pool broken - restarting")
+                    self.pool.shutdown(wait=False)
+                    self._start_pool()
+                    self.pool_broken = False
+                    self.pool_killed = False
+
+            except redis.RedisError as e:
+                logger.error(f"Worker Redis error: {e}")
+                time.sleep(5)
+
+        self.pool.shutdown(wait=True)
+        self.log_summary()
+
+    def stop(self, *_):
+        """Stop claiming; in-flight jobs finish and are acked"""
+        if not self.stopping:
+            logger.info("\n🛑 Worker stopping - draining in-flight jobs")
+        self.stopping = True
+
+
 def main():
-    """Poll Redis queue and process jobs sequentially"""
-    
+    """Poll Redis priority lanes and process jobs concurrently"""
+
     if not REDIS_URL:
         logger.error("REDIS_URL not configured")
         sys.exit(1)
-    
+
     redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-    
+    worker = PDFJobWorker(redis_client)
+
     logger.info("="*70)
     logger.info("VOXMILL QUEUE WORKER STARTED")
     logger.info("="*70)
     logger.info(f"Redis: {REDIS_URL}")
-    logger.info(f"Polling queue: voxmill:pdf_jobs")
+    logger.info(f"Lanes: {', '.join(PRIORITY_LANES.values())}")
+    logger.info(f"Concurrency: {worker.concurrency} | Visibility timeout: {VISIBILITY_TIMEOUT}s")
+    logger.info(f"Started: {datetime.now().isoformat()}")
     logger.info("="*70)
-    
-    while True:
-        try:
-            # Block for 10 seconds waiting for job
-            job_data = redis_client.brpop('voxmill:pdf_jobs', timeout=10)
-            
-            if job_data:
-                queue_name, job_json = job_data
-                job = json.loads(job_json)
-                
-                logger.info(f"\n📋 JOB RECEIVED: {job.get('area', 'Unknown')}")
-                
-                # Call voxmill_master.py with job parameters
-                import subprocess
-                result = subprocess.run([
-                    sys.executable,
-                    'voxmill_master.py',
-                    '--area', job['area'],
-                    '--city', job.get('city', 'London'),
-                    '--email', job.get('client_email', 'none'),
-                    '--name', job.get('client_name', 'Client')
-                ])
-                
-                if result.returncode == 0:
-                    logger.info(f"✅ JOB COMPLETE: {job['area']}")
-                else:
-                    logger.error(f"❌ JOB FAILED: {job['area']}")
-            
-        except KeyboardInterrupt:
-            logger.info("\n🛑 Worker stopped by user")
-            break
-        except Exception as e:
-            logger.error(f"Worker error: {e}", exc_info=True)
-            time.sleep(5)
+
+    signal.signal(signal.SIGTERM, worker.stop)
+
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+        logger.info("\n🛑 Worker stopped by user")
+
 
 if __name__ == '__main__':
     main()